@@ -1,15 +1,13 @@
 # backend/activities/utilities/data_fetcher.py
-import requests
-from django.conf import settings
+from hanadbcon.services.query_executor import run_query, QueryError
 
-def fetch_hana_db_data(token):
-    headers = {'Authorization': f'Bearer {token}'}
-    url = f'http://{settings.SERVER_HOST}/api/v2/hanadbcon/query/crmactivities/'
+def fetch_hana_db_data(token=None):
+    """
+    'crmactivities' HANA sorgusunu süreç içinde çalıştırır (HTTP loopback yok).
+    """
     try:
-        response = requests.get(url, headers=headers, timeout=600)  # 10 dakikalık zaman aşımı
-        response.raise_for_status()  # Bu, HTTP hatalarını otomatik olarak yakalar
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return run_query('crmactivities', json_compatible=True)
+    except QueryError as e:
         # Hata işleme ve loglama
         print(f"Error fetching data from HANA DB: {e}")
         return None
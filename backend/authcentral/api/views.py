@@ -10,8 +10,8 @@ from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView as SimpleJWTTokenRefreshView
 
-from ..models import BlacklistedToken
 from ..serializers import CustomUserSerializer
+from ..services.token_blacklist import is_token_revoked, revoke_token
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -46,7 +46,14 @@ class LogoutView(APIView):
         try:
             token = RefreshToken(refresh_token)
             user = User.objects.get(id=token['user_id'])
-            BlacklistedToken.objects.create(token=refresh_token, user=user)
+            revoke_token(refresh_token, user)
+            # Oturumun access token'ı da süresi dolana kadar geçersiz olsun
+            header = request.META.get('HTTP_AUTHORIZATION', '').split()
+            if len(header) == 2:
+                try:
+                    revoke_token(header[1], user)
+                except ValueError:
+                    logger.warning("Access token could not be decoded during logout.")
             response = Response({"detail": "Successfully logged out."}, status=status.HTTP_205_RESET_CONTENT)
             response.delete_cookie("refresh_token")
             logger.info(f"User {user.email} logged out successfully.")
@@ -94,6 +101,13 @@ class TokenRefreshView(SimpleJWTTokenRefreshView):
             logger.error("No refresh token provided for refresh.")
             return Response({'error': 'Refresh token required.'}, status=status.HTTP_400_BAD_REQUEST)
 
+        if is_token_revoked(refresh_token):
+            logger.warning("Blacklisted refresh token used for refresh.")
+            return Response(
+                {'error': 'Refresh token has been revoked. Please login again.'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
         try:
             response = super().post(request, *args, **kwargs)
             logger.info("Token refreshed successfully.")
@@ -1,8 +1,12 @@
 # backend/authcentral/middleware.py
 from django.http import JsonResponse
-from .models import BlacklistedToken
+from .services.token_blacklist import is_token_revoked
 
 class CheckBlacklistedTokenMiddleware:
+    """
+    Kara listedeki JWT'leri reddeder. Kontrol süreç içi Bloom filtresiyle yapılır;
+    veritabanına yalnızca olası bir eşleşmede gidilir (bkz. services/token_blacklist.py).
+    """
     def __init__(self, get_response):
         self.get_response = get_response
 
@@ -10,8 +14,8 @@ class CheckBlacklistedTokenMiddleware:
         # Token kontrolü
         header = request.META.get('HTTP_AUTHORIZATION')
         if header:
-            token = header.split()[1]
-            if BlacklistedToken.objects.filter(token=token).exists():
+            parts = header.split()
+            if len(parts) == 2 and is_token_revoked(parts[1]):
                 return JsonResponse({'error': 'Token blacklisted'}, status=401)
 
         response = self.get_response(request)
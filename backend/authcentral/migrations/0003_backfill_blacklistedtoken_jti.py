@@ -0,0 +1,35 @@
+# Generated by Django 5.0.8
+
+import hashlib
+from datetime import datetime, timezone
+
+import jwt
+from django.db import migrations
+
+
+def backfill_claims(apps, schema_editor):
+    # 0002 öncesi kayıtlarda `token` ham JWT'dir ve `jti` boştur; bu kayıtlar kara liste filtresinde
+    # görünmez, iptal edilmiş token'lar süreleri dolana kadar yeniden geçerli olurdu.
+    # JTI ve `exp` token'dan okunur, `token` da yeni kayıtlar gibi SHA-256 özetine çevrilir.
+    BlacklistedToken = apps.get_model('authcentral', 'BlacklistedToken')
+    for row in BlacklistedToken.objects.filter(jti__isnull=True).iterator():
+        try:
+            payload = jwt.decode(row.token, options={'verify_signature': False, 'verify_exp': False})
+        except jwt.PyJWTError:
+            continue  # çözülemeyen kayıt (zaten özet ya da bozuk)
+        row.jti = payload.get('jti')
+        exp = payload.get('exp')
+        row.expires_at = datetime.fromtimestamp(exp, tz=timezone.utc) if exp else None
+        row.token = hashlib.sha256(row.token.encode('utf-8')).hexdigest()
+        row.save(update_fields=['jti', 'expires_at', 'token'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authcentral', '0002_blacklistedtoken_jti_expires_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_claims, migrations.RunPython.noop),
+    ]
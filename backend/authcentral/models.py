@@ -62,9 +62,11 @@ class CustomUser(AbstractBaseUser, PermissionsMixin, BaseModel):
 
 
 class BlacklistedToken(models.Model):
-    token = models.CharField(max_length=255, unique=True)
+    token = models.CharField(max_length=255, unique=True)  # token'ın SHA-256 özeti (bkz. token_blacklist.token_digest)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='blacklisted_tokens', on_delete=models.CASCADE)
     blacklisted_at = models.DateTimeField(default=timezone.now)
+    jti = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)  # token'ın `exp` değeri
 
     def __str__(self):
         return f"BlacklistedToken for {self.user}"
@@ -0,0 +1 @@
+# backend/authcentral/services/__init__.py
@@ -0,0 +1,265 @@
+# backend/authcentral/services/token_blacklist.py
+"""
+JWT kara listesi.
+
+`CheckBlacklistedTokenMiddleware` her istekte `BlacklistedToken` tablosunu sorguladığı için
+kapalıydı. Kontrol artık süreç içi bir Bloom filtresiyle yapılır; veritabanına yalnızca
+filtre "olabilir" dediğinde (gerçek eşleşme veya düşük olasılıklı yanlış pozitif) gidilir.
+
+    - İptal edilen token'ların JTI'ları Redis'te `exp` skorlu bir sorted set'te tutulur
+    - Her süreç filtresini bu set'ten kurar, yeni iptalleri Redis pub/sub kanalından dinler
+    - Süresi geçmiş token'lar zaten reddedildiği için set'ten düşülür; Bloom filtresinden
+      silme yapılamadığından filtre `JWT_BLACKLIST_REBUILD_INTERVAL` saniyede bir yeniden kurulur
+    - Redis'e erişilemezse (filtre hazır değilse) eski davranışa, veritabanı kontrolüne dönülür
+
+Kullanım:
+    from authcentral.services.token_blacklist import revoke_token, is_token_revoked
+
+    revoke_token(refresh_token, user)
+    is_token_revoked(access_token)   # bool
+"""
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+import jwt
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from ..models import BlacklistedToken
+
+logger = logging.getLogger(__name__)
+
+ZSET_KEY = 'jwt:blacklist'
+SEEDED_KEY = 'jwt:blacklist:seeded'  # set veritabanından dolduruldu mu (Redis temizlenince kaybolur)
+CHANNEL = 'jwt:blacklist'
+RETRY_AFTER = 30  # Redis'e erişilemediğinde yeniden deneme aralığı (sn)
+
+
+class BloomFilter:
+    """Sabit boyutlu bit dizisi; `k` indeks tek bir blake2b özetinden türetilir (çift hash)."""
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(int(capacity), 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _indexes(self, value):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        for index in self._indexes(value):
+            self.bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        bits = self.bits
+        return all(bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(value))
+
+
+def _redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def token_digest(raw_token):
+    """Token'ın SHA-256 özeti; JWT'ler 255 karakteri aşabildiği için tabloda token yerine bu saklanır."""
+    return hashlib.sha256(raw_token.encode('utf-8')).hexdigest()
+
+
+def token_claims(raw_token):
+    """Token'ın JTI ve `exp` değerleri; imza doğrulaması DRF kimlik doğrulamasına bırakılır."""
+    try:
+        payload = jwt.decode(raw_token, options={'verify_signature': False, 'verify_exp': False})
+    except jwt.PyJWTError:
+        return None, None
+    return payload.get('jti'), payload.get('exp')
+
+
+def seed_from_database(conn=None):
+    """
+    Süresi geçmemiş kara liste kayıtlarını veritabanından Redis set'ine yazar. Set henüz
+    doldurulmadıysa (ilk kurulum, Redis temizlendi) filtre kurulmadan önce bir kez çağrılır;
+    aksi halde Redis'e hiç yazılmamış iptaller filtrede görünmezdi.
+    """
+    conn = conn or _redis()
+    rows = (
+        BlacklistedToken.objects.filter(jti__isnull=False)
+        .exclude(expires_at__lte=timezone.now())
+        .values_list('jti', 'expires_at')
+    )
+    # `exp`'i bilinmeyen kayıtlar revoke_token'daki gibi refresh ömrü boyunca tutulur
+    fallback = time.time() + settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds()
+    members = {jti: expires_at.timestamp() if expires_at else fallback for jti, expires_at in rows.iterator()}
+    if members:
+        conn.zadd(ZSET_KEY, members)
+    return len(members)
+
+
+class TokenBlacklist:
+    """Süreç başına tek örnek; filtre ilk kullanımda ve her fork sonrası yeniden kurulur."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._next = None          # kurulmakta olan filtre; dinleyici yeni kayıtları buna da ekler
+        self._built_at = 0.0
+        self._pid = None
+        self._listener = None
+        self._failed_at = None
+
+    # ------------------------------------------------------------------ #
+    # Filtre
+    # ------------------------------------------------------------------ #
+    def _build(self):
+        conn = _redis()
+        if conn.set(SEEDED_KEY, 1, nx=True):
+            try:
+                seed_from_database(conn)
+            except Exception:
+                conn.delete(SEEDED_KEY)  # bir sonraki kurulumda yeniden denensin
+                raise
+        conn.zremrangebyscore(ZSET_KEY, '-inf', time.time())
+        bloom = BloomFilter(
+            max(settings.JWT_BLACKLIST_BLOOM_CAPACITY, conn.zcard(ZSET_KEY) * 2),
+            settings.JWT_BLACKLIST_BLOOM_ERROR_RATE,
+        )
+        self._next = bloom
+        try:
+            for member in conn.zrange(ZSET_KEY, 0, -1):
+                bloom.add(member.decode() if isinstance(member, bytes) else member)
+            # Önce yeni filtre devreye alınır, sonra `_next` bırakılır; aradaki iptaller kaçmaz
+            self._filter = bloom
+            self._built_at = time.monotonic()
+        finally:
+            self._next = None
+        logger.debug(f"JWT kara liste filtresi kuruldu: {bloom.count} kayıt")
+
+    def _ensure(self):
+        """Filtre hazırsa True; Redis'e erişilemiyorsa False (çağıran veritabanına döner)."""
+        stale = time.monotonic() - self._built_at > settings.JWT_BLACKLIST_REBUILD_INTERVAL
+        if self._filter is not None and self._pid == os.getpid() and not stale:
+            return True
+        if self._failed_at is not None and time.monotonic() - self._failed_at < RETRY_AFTER:
+            return False
+        with self._lock:
+            if self._pid != os.getpid():
+                self._filter, self._listener, self._pid = None, None, os.getpid()
+            stale = time.monotonic() - self._built_at > settings.JWT_BLACKLIST_REBUILD_INTERVAL
+            try:
+                # Önce abone ol, sonra set'i oku: arada yapılan iptaller kaçmaz
+                if self._listener is None or not self._listener.is_alive():
+                    self._start_listener()
+                if self._filter is None or stale:
+                    self._build()
+            except Exception as e:
+                logger.warning(f"JWT kara liste filtresi kurulamadı, veritabanı kullanılacak: {e}")
+                self._filter = None
+                self._failed_at = time.monotonic()
+                return False
+            self._failed_at = None
+        return True
+
+    def _start_listener(self):
+        pubsub = _redis().pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(CHANNEL)
+        self._listener = threading.Thread(
+            target=self._listen, args=(pubsub,), name='jwt-blacklist-listener', daemon=True
+        )
+        self._listener.start()
+
+    def _listen(self, pubsub):
+        try:
+            for message in pubsub.listen():
+                jti = message.get('data')
+                if not jti:
+                    continue
+                jti = jti.decode() if isinstance(jti, bytes) else jti
+                for bloom in (self._filter, self._next):
+                    if bloom is not None:
+                        bloom.add(jti)
+        except Exception as e:
+            # Bağlantı koptu: bir sonraki kontrolde dinleme yeniden başlar ve filtre yeniden kurulur
+            logger.warning(f"JWT kara liste dinleyicisi durdu: {e}")
+            self._built_at = 0.0
+        finally:
+            try:
+                pubsub.close()
+            except Exception:
+                pass
+
+    # ------------------------------------------------------------------ #
+    # Genel API
+    # ------------------------------------------------------------------ #
+    def might_contain(self, jti):
+        if not self._ensure():
+            return True
+        return jti in self._filter
+
+    def add(self, jti, exp):
+        conn = _redis()
+        conn.zadd(ZSET_KEY, {jti: exp})
+        conn.publish(CHANNEL, jti)
+        bloom = self._filter
+        if bloom is not None:
+            bloom.add(jti)
+
+
+blacklist = TokenBlacklist()
+
+
+def is_token_revoked(raw_token):
+    """Token kara listede mi? Çoğu istekte yalnızca Bloom filtresine bakılır."""
+    jti, exp = token_claims(raw_token)
+    if not jti:
+        return False
+    if exp is not None and exp <= time.time():
+        return False  # süresi dolmuş token zaten kimlik doğrulamada reddedilir
+    if not blacklist.might_contain(jti):
+        return False
+    return BlacklistedToken.objects.filter(jti=jti).exists()
+
+
+def revoke_token(raw_token, user):
+    """
+    Token'ı kara listeye alır (veritabanı + Redis). Token çözülemezse ValueError.
+    Redis güncellemesi transaction commit edildikten sonra yapılır.
+    """
+    jti, exp = token_claims(raw_token)
+    if not jti:
+        raise ValueError("Token içinde jti bulunamadı.")
+    expires_at = datetime.fromtimestamp(exp, tz=dt_timezone.utc) if exp else None
+
+    try:
+        with transaction.atomic():
+            BlacklistedToken.objects.create(token=token_digest(raw_token), jti=jti, expires_at=expires_at, user=user)
+    except IntegrityError:
+        pass  # aynı token daha önce iptal edilmiş
+
+    def publish():
+        try:
+            blacklist.add(jti, exp or time.time() + settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds())
+        except Exception as e:
+            logger.error(f"JWT kara liste Redis'e yazılamadı (jti={jti}): {e}")
+
+    transaction.on_commit(publish)
+
+
+def purge_expired_tokens():
+    """Süresi geçmiş kara liste kayıtlarını veritabanından ve Redis'ten siler."""
+    deleted, _ = BlacklistedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    try:
+        _redis().zremrangebyscore(ZSET_KEY, '-inf', time.time())
+    except Exception as e:
+        logger.warning(f"JWT kara liste Redis temizliği başarısız: {e}")
+    return deleted
@@ -0,0 +1,16 @@
+# backend/authcentral/tasks.py
+
+from celery import shared_task
+import logging
+
+from .services.token_blacklist import purge_expired_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def purge_expired_blacklisted_tokens():
+    """Süresi geçmiş kara liste kayıtlarını siler."""
+    deleted = purge_expired_tokens()
+    logger.info(f"Süresi geçmiş {deleted} kara liste kaydı silindi")
+    return {"deleted": deleted}
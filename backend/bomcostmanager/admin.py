@@ -4,6 +4,8 @@ from django.contrib import admin
 from import_export.admin import ImportExportModelAdmin
 from .models.bomcomponent_models import BOMComponent, BOMRecord
 from .models.bomproduct_models import BOMProduct
+from .models.exchange_rate_models import ExchangeRate
+from .services.bom_tree import BOMTree
 
 @admin.register(BOMComponent)
 class BOMComponentAdmin(ImportExportModelAdmin):
@@ -14,10 +16,18 @@ class BOMComponentAdmin(ImportExportModelAdmin):
         "sales_price", "sales_currency", "price_list_name", "item_group_name",
         "new_last_purchase_price", "new_currency", "labor_multiplier",
         "overhead_multiplier", "license_multiplier", "commission_multiplier",
-        "updated_cost"
+        "rollup_cost", "updated_cost"
     )
     search_fields = ("main_item", "component_item_code", "component_item_name")
     list_filter = ("level", "currency", "price_source", "item_group_name")
+    readonly_fields = ("rollup_cost", "updated_cost")
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Türetilmiş maliyetler ürün ağacı üzerinden yeniden hesaplanır (satır ve ataları)
+        tree = BOMTree.for_main_items([obj.main_item])
+        tree.recompute(obj.pk)
+        tree.save()
 
 
 @admin.register(BOMRecord)
@@ -39,3 +49,11 @@ class BOMProductAdmin(ImportExportModelAdmin):
     )
     search_fields = ("item_code", "item_name")
     list_filter = ("currency", "invnt_item", "sell_item", "purch_item")
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ("currency", "rate_date", "rate", "source", "fetched_at")
+    search_fields = ("currency",)
+    list_filter = ("currency", "source")
+    date_hierarchy = "rate_date"
@@ -9,10 +9,13 @@ from django.core.cache import cache
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.utils import timezone
+from decimal import Decimal, InvalidOperation
 
 from ..models.bomcomponent_models import BOMComponent
 from ..api.serializers import BOMComponentSerializer
-from ..services.bomcomponent_service import update_components_from_hana
+from ..services.bomcomponent_service import update_components_from_hana, apply_component_override
+from ..services.bom_tree import OVERRIDE_FIELDS
+from ..services.scenario_engine import ScenarioEngine, ScenarioError
 # from bomcostmanager.permissions import HasBOMProductAccess  # İzin sınıfı
 
 logger = logging.getLogger(__name__)
@@ -77,6 +80,103 @@ class BOMComponentFetchView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class BOMComponentOverrideView(APIView):
+    """
+    Tek bir BOM satırına override uygular (new_last_purchase_price, new_currency ve çarpanlar).
+    Yalnızca satırın kendisi ve ürün ağacındaki ataları yeniden hesaplanır; değişen tüm satırlar döner.
+    """
+    # permission_classes = [IsAuthenticated, HasBOMProductAccess]
+
+    def patch(self, request, pk, *args, **kwargs):
+        overrides = {}
+        for field in OVERRIDE_FIELDS:
+            if field not in request.data:
+                continue
+            value = request.data[field]
+            if field == 'new_currency':
+                overrides[field] = value or ''
+                continue
+            try:
+                overrides[field] = Decimal(str(value))
+            except (InvalidOperation, TypeError, ValueError):
+                return Response({"error": f"Geçersiz değer: {field}={value}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not overrides:
+            return Response({"error": "Güncellenecek override alanı gönderilmedi."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            component, changed = apply_component_override(pk, **overrides)
+        except BOMComponent.DoesNotExist:
+            return Response({"error": "BOM bileşeni bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+
+        cache.delete('bom_components')
+        return Response({
+            "component": BOMComponentSerializer(component).data,
+            "changed": BOMComponentSerializer(changed, many=True).data,
+        }, status=status.HTTP_200_OK)
+
+
+class BOMScenarioView(APIView):
+    """
+    Bir veya birden fazla ürün için "what-if" maliyet senaryolarını hesaplar.
+    Veritabanına yazmaz; tüm senaryolar tek vektörel geçişte değerlendirilir.
+
+    POST body:
+        {"main_items": ["30.EMO..."], "scenarios": [{...}, ...], "include_components": false}
+    Senaryo biçimi için bkz. services/scenario_engine.py
+    """
+    # permission_classes = [IsAuthenticated, HasBOMProductAccess]
+
+    MAX_SCENARIOS = 200
+
+    def post(self, request, *args, **kwargs):
+        main_items = request.data.get('main_items') or []
+        scenarios = request.data.get('scenarios') or []
+        if not main_items or not isinstance(scenarios, list) or not scenarios:
+            return Response({"error": "main_items ve scenarios alanları zorunludur."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(scenarios) > self.MAX_SCENARIOS:
+            return Response({"error": f"En fazla {self.MAX_SCENARIOS} senaryo gönderilebilir."}, status=status.HTTP_400_BAD_REQUEST)
+
+        engine = ScenarioEngine.for_main_items(main_items)
+        if not engine.components:
+            return Response({"error": "Ürünlere ait BOM bileşeni bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            results = engine.evaluate(scenarios, include_components=bool(request.data.get('include_components')))
+        except (ScenarioError, KeyError, TypeError, ValueError) as e:
+            return Response({"error": f"Geçersiz senaryo: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+class BOMScenarioCommitView(APIView):
+    """
+    Seçilen senaryonun override değerlerini BOM satırlarına kaydeder ve maliyetleri yeniden hesaplar.
+    Senaryo kurları (`rates`) yalnızca what-if içindir, kayıtta yok sayılır.
+
+    POST body: {"main_items": ["30.EMO..."], "scenario": {...}}
+    """
+    # permission_classes = [IsAuthenticated, HasBOMProductAccess]
+
+    def post(self, request, *args, **kwargs):
+        main_items = request.data.get('main_items') or []
+        scenario = request.data.get('scenario')
+        if not main_items or not isinstance(scenario, dict):
+            return Response({"error": "main_items ve scenario alanları zorunludur."}, status=status.HTTP_400_BAD_REQUEST)
+
+        engine = ScenarioEngine.for_main_items(main_items)
+        if not engine.components:
+            return Response({"error": "Ürünlere ait BOM bileşeni bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+        # Kurlar kaydedilmez (bkz. services/scenario_engine.py); dönen sonuç yazılanla aynı olsun
+        scenario = {**scenario, 'rates': {}}
+        try:
+            result = engine.evaluate([scenario])[0]
+            saved = engine.commit(scenario)
+        except (ScenarioError, KeyError, TypeError, ValueError) as e:
+            return Response({"error": f"Geçersiz senaryo: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        cache.delete('bom_components')
+        return Response({"result": result, "updated_rows": saved}, status=status.HTTP_200_OK)
+
+
 class BOMComponentLastUpdatedView(APIView):
     """
     Yerel veritabanındaki BOMComponent kayıtlarının en son güncelleme tarihini döner.
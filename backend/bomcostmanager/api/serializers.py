@@ -8,7 +8,7 @@ class BOMComponentSerializer(serializers.ModelSerializer):
     class Meta:
         model = BOMComponent
         fields = '__all__'
-        read_only_fields = ('updated_cost',)  # updated_cost, save() metodu ile hesaplanır.
+        read_only_fields = ('rollup_cost', 'updated_cost')  # BOMTree ile ürün ağacı üzerinden hesaplanır.
 
 class BOMRecordSerializer(serializers.ModelSerializer):
     class Meta:
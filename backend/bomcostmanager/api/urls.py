@@ -5,6 +5,9 @@ from .bomcomponent_views import (
     BOMComponentListView,
     BOMComponentFetchView,
     BOMComponentLastUpdatedView,
+    BOMComponentOverrideView,
+    BOMScenarioView,
+    BOMScenarioCommitView,
 )
 from .bomproduct_views import (
     BOMProductListView,
@@ -25,6 +28,9 @@ urlpatterns = [
     path('bomcomponents/list/', BOMComponentListView.as_view(), name='bomcomponent-list'),
     path('bomcomponents/fetch/', BOMComponentFetchView.as_view(), name='bomcomponent-fetch'),
     path('bomcomponents/last-updated/', BOMComponentLastUpdatedView.as_view(), name='bomcomponent-last-updated'),
+    path('bomcomponents/<int:pk>/override/', BOMComponentOverrideView.as_view(), name='bomcomponent-override'),
+    path('bomcomponents/scenarios/', BOMScenarioView.as_view(), name='bomcomponent-scenarios'),
+    path('bomcomponents/scenarios/commit/', BOMScenarioCommitView.as_view(), name='bomcomponent-scenario-commit'),
 
     # BOMProduct API Endpoint'leri
     path('bomproducts/', BOMProductListView.as_view(), name='bomproduct-list'),
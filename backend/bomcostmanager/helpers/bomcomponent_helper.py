@@ -4,6 +4,7 @@ import logging
 from decimal import Decimal, InvalidOperation
 from datetime import datetime
 from ..models.bomcomponent_models import BOMComponent
+from ..services.bom_tree import BOMTree
 
 logger = logging.getLogger(__name__)
 
@@ -144,32 +145,18 @@ def parse_hana_component_data(raw_data: dict) -> dict:
 
 def update_bom_component_cost(bom_component: BOMComponent) -> BOMComponent:
     """
-    Verilen BOMComponent instance'ının güncel maliyetini (updated_cost)
-    yeniden hesaplar ve kaydeder.
+    Verilen BOMComponent instance'ını kaydeder ve türetilmiş maliyetlerini (rollup_cost,
+    updated_cost) ürün ağacı üzerinden yeniden hesaplar. Yalnızca satırın grubu ve ataları
+    hesaplanır (bkz. BOMTree.recompute); değişen satırlar tek `bulk_update` ile yazılır.
 
-    Hesaplama mantığı:
-      effective_price = (new_last_purchase_price > 0 ise override fiyat,
-                         aksi halde last_purchase_price_upb)
-      updated_cost = effective_price * labor_multiplier * overhead_multiplier
-                     * license_multiplier * commission_multiplier
-
-    Kaydetme sonrasında bom_component örneğini geri döndürür.
+    Kaydetme sonrasında güncel bom_component örneğini geri döndürür.
     """
     try:
-        effective_price = (
-            bom_component.new_last_purchase_price
-            if bom_component.new_last_purchase_price and bom_component.new_last_purchase_price > 0
-            else bom_component.last_purchase_price_upb
-        )
-        bom_component.updated_cost = (
-            effective_price
-            * bom_component.labor_multiplier
-            * bom_component.overhead_multiplier
-            * bom_component.license_multiplier
-            * bom_component.commission_multiplier
-        )
         bom_component.save()
-        return bom_component
+        tree = BOMTree.for_main_items([bom_component.main_item])
+        tree.recompute(bom_component.pk)
+        tree.save()
+        return tree.nodes[bom_component.pk]
     except Exception as e:
         logger.error(f"Error updating BOM component cost for {bom_component.component_item_code}: {e}")
         raise
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.8
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bomcostmanager', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=10, verbose_name='Para Birimi')),
+                ('rate_date', models.DateField(verbose_name='Kur Tarihi')),
+                ('rate', models.DecimalField(decimal_places=6, max_digits=18, verbose_name='Kur (TRY)')),
+                ('source', models.CharField(default='', max_length=50, verbose_name='Kaynak')),
+                ('fetched_at', models.DateTimeField(auto_now=True, verbose_name='Çekilme Zamanı')),
+            ],
+            options={
+                'verbose_name': 'Döviz Kuru',
+                'verbose_name_plural': 'Döviz Kurları',
+                'indexes': [models.Index(fields=['currency', '-rate_date'], name='bcm_exrate_currency_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('currency', 'rate_date'), name='bcm_exchange_rate_currency_date_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.8
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bomcostmanager', '0002_exchangerate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bomcomponent',
+            name='rollup_cost',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Alt bileşenlerden yukarı toplanmış satır maliyeti (birim * miktar). Boşsa henüz hesaplanmadı.', max_digits=18, null=True, verbose_name='Ağaç Maliyeti'),
+        ),
+    ]
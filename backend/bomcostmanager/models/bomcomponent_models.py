@@ -57,6 +57,11 @@ class BOMComponent(BaseModel):
         help_text="Ürün satışından doğan komisyon giderlerini hesaplamak için kullanılacak çarpan"
     )
 
+    # Türetilmiş alanlar: ürün ağacı üzerinden BOMTree (services/bom_tree.py) tarafından hesaplanır
+    rollup_cost = models.DecimalField(
+        "Ağaç Maliyeti", max_digits=18, decimal_places=2, blank=True, null=True,
+        help_text="Alt bileşenlerden yukarı toplanmış satır maliyeti (birim * miktar). Boşsa henüz hesaplanmadı."
+    )
     # Güncel maliyet: Hesaplanan ham madde maliyeti * tüm master çarpanlar
     updated_cost = models.DecimalField(
         "Güncel Maliyet", max_digits=18, decimal_places=2, default=0,
@@ -64,13 +69,6 @@ class BOMComponent(BaseModel):
                   "ile hesaplanmış nihai maliyet"
     )
 
-    def save(self, *args, **kwargs):
-        # Override alanı girilmişse onu kullan; aksi halde orijinal birim fiyat üzerinden hesapla.
-        effective_price = self.new_last_purchase_price if self.new_last_purchase_price > 0 else self.last_purchase_price_upb
-        # Master çarpanların tamamı ile güncel maliyeti hesapla.
-        self.updated_cost = effective_price * self.labor_multiplier * self.overhead_multiplier * self.license_multiplier * self.commission_multiplier
-        super().save(*args, **kwargs)
-
     def __str__(self):
         return f"{self.main_item} - {self.component_item_code}"
 
@@ -0,0 +1,28 @@
+# backend/bomcostmanager/models/exchange_rate_models.py
+
+from django.db import models
+
+
+class ExchangeRate(models.Model):
+    """
+    Tarihli döviz kurları (1 birim döviz = x TRY).
+    Kayıtlar arka planda sağlayıcıdan (HANA ORTT vb.) yenilenir; maliyet hesapları bu tablodan okur.
+    """
+    currency = models.CharField("Para Birimi", max_length=10)
+    rate_date = models.DateField("Kur Tarihi")
+    rate = models.DecimalField("Kur (TRY)", max_digits=18, decimal_places=6)
+    source = models.CharField("Kaynak", max_length=50, default='')
+    fetched_at = models.DateTimeField("Çekilme Zamanı", auto_now=True)
+
+    def __str__(self):
+        return f"{self.currency} {self.rate_date}: {self.rate}"
+
+    class Meta:
+        verbose_name = "Döviz Kuru"
+        verbose_name_plural = "Döviz Kurları"
+        constraints = [
+            models.UniqueConstraint(fields=['currency', 'rate_date'], name='bcm_exchange_rate_currency_date_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['currency', '-rate_date'], name='bcm_exrate_currency_date_idx'),
+        ]
@@ -0,0 +1,271 @@
+# backend/bomcostmanager/services/bom_tree.py
+"""
+Çok seviyeli BOM maliyet toplama (rollup) motoru.
+
+`bomcomponent` sorgusu ürün ağacını düz satırlar halinde döndürür:
+
+    level -1 : Ana mamul (component_item_code == main_item)
+    level  0 : Ana mamulün doğrudan bileşenleri (sub_item == main_item)
+    level  n : sub_item == bir üst seviyedeki (n-1) bileşenin kodu
+
+Miktarlar kümülatiftir (üst seviye miktarlarıyla çarpılmış gelir); bu yüzden bir satırın
+satır maliyeti doğrudan `quantity * birim fiyat` olarak ana mamul cinsindendir.
+
+Motor, satırlardan ebeveyn/çocuk grafiğini kurar ve maliyetleri en alt seviyeden yukarı toplar:
+
+    - Yaprak satır      : birim = override (> 0) ya da last_purchase_price_upb
+                          (kur verilmişse: override * kur[new_currency], ya da
+                           last_purchase_price * kur[currency])
+    - Alt montaj (çocuğu olan) : birim = çocukların satır maliyetleri toplamı / miktar
+                          (override girilmişse override geçerlidir, alt ağaç yok sayılır)
+    - rollup_cost        = birim * quantity   (satır maliyeti)
+    - updated_cost       = birim * işçilik * genel gider * lisans * komisyon
+
+Motor yalnızca türetilmiş alanları (`rollup_cost`, `updated_cost`) yazar; HANA'dan gelen
+`component_cost_upb` ve fiyat alanlarına dokunulmaz.
+
+Aynı ana mamulde ve aynı seviyede aynı koda sahip alt montajlar (ör. iki farklı yerde kullanılan
+yarı mamul) aynı çocuk grubunu paylaşır; grubun maliyeti bir kez hesaplanıp hafızada tutulur.
+Gruplar (main_item, level, kod) ile anahtarlandığından farklı seviyelerde veya farklı ürünlerde
+kullanılan aynı yarı mamul ayrı gruplar olarak ayrı ayrı hesaplanır.
+Tek bir override değiştiğinde yalnızca o satır ve ataları yeniden hesaplanır (diğer dalların
+kayıtlı `rollup_cost` değerleri kullanılır); değişen satırlar `save()` ile tek bir `bulk_update`
+olarak yazılır.
+
+Kullanım:
+    BOMTree.for_main_items(['30.EMO.A16080.M1.E7']).rollup().save()   # HANA senkronizasyonundan sonra
+
+    tree = BOMTree.for_main_items(['30.EMO.A16080.M1.E7'])              # tek satır override
+    tree.set_override(component_id, new_last_purchase_price=Decimal('75'))
+    tree.save()
+"""
+import logging
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.utils import timezone
+
+from ..models.bomcomponent_models import BOMComponent
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal('0')
+CENT = Decimal('0.01')
+
+ROOT_LEVEL = -1
+
+# Kullanıcının satır bazında değiştirebileceği alanlar
+OVERRIDE_FIELDS = (
+    'new_last_purchase_price',
+    'new_currency',
+    'labor_multiplier',
+    'overhead_multiplier',
+    'license_multiplier',
+    'commission_multiplier',
+)
+
+# Rollup sonucunda değişen (türetilmiş) alanlar
+COMPUTED_FIELDS = ('rollup_cost', 'updated_cost')
+
+
+def _money(value):
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class BOMTree:
+    """
+    components : Aynı veya farklı ana mamullere ait BOMComponent nesneleri.
+                 Grafik (main_item, level, kod) üzerinden kurulur.
+    rates      : {döviz: TRY kuru}; verilmezse fiyatlar olduğu gibi (TRY) kabul edilir
+    """
+
+    def __init__(self, components, rates=None):
+        self.rates = {code: Decimal(str(rate)) for code, rate in (rates or {}).items()}
+        self.nodes = {}                       # pk → BOMComponent
+        self.groups = defaultdict(list)       # (main_item, level, kod) → aynı gruptaki satırların pk'ları
+        self.children = defaultdict(list)     # (main_item, level, kod) → çocuk satırların pk'ları
+        self._group_cost = {}                 # grup → çocukların toplam satır maliyeti (memo)
+        self._dirty = set()                   # veritabanına yazılacak pk'lar
+        self._override_dirty = set()          # override alanı değişen pk'lar
+
+        for component in components:
+            self.nodes[component.pk] = component
+            self.groups[self._group_key(component)].append(component.pk)
+
+        for pk, component in self.nodes.items():
+            parent = self._parent_key(component)
+            if parent is not None and parent in self.groups:
+                self.children[parent].append(pk)
+
+    @classmethod
+    def for_main_items(cls, main_items, rates=None):
+        """Verilen ana mamullere ait tüm satırları tek sorguyla yükler."""
+        return cls(BOMComponent.objects.filter(main_item__in=list(main_items)), rates=rates)
+
+    # ------------------------------------------------------------------ #
+    # Grafik
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _group_key(component):
+        return (component.main_item, component.level, component.component_item_code)
+
+    @staticmethod
+    def _parent_key(component):
+        if component.level <= ROOT_LEVEL:
+            return None
+        sub_item = component.sub_item or component.main_item
+        return (component.main_item, component.level - 1, sub_item)
+
+    def ancestors(self, pk):
+        """
+        Satırın maliyetini etkileyen üst grupları alttan yukarı (seviye sırasıyla) döndürür.
+        Paylaşılan bir grup birden fazla ebeveyne bağlı olabilir; hepsi dahil edilir.
+        """
+        keys = []
+        frontier = {self._group_key(self.nodes[pk])}
+        while frontier:
+            parents = set()
+            for key in frontier:
+                for member in self.groups[key]:
+                    parent = self._parent_key(self.nodes[member])
+                    if parent is not None and parent in self.groups:
+                        parents.add(parent)
+            keys.extend(sorted(parents))
+            frontier = parents
+        return keys
+
+    # ------------------------------------------------------------------ #
+    # Hesaplama
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _override_price(component):
+        price = component.new_last_purchase_price
+        return price if price and price > 0 else None
+
+    @staticmethod
+    def _multiplier(component):
+        return (component.labor_multiplier * component.overhead_multiplier
+                * component.license_multiplier * component.commission_multiplier)
+
+    def _unit_price(self, component):
+        override = self._override_price(component)
+        if override is not None:
+            currency = component.new_currency or component.currency
+            return override * self.rates.get(currency, Decimal('1'))
+        key = self._group_key(component)
+        if self.children.get(key):
+            # Alt montaj: grup maliyeti grubun toplam miktarına bölünür
+            quantity = sum((self.nodes[pk].quantity for pk in self.groups[key]), ZERO)
+            return self._group_cost[key] / quantity if quantity else ZERO
+        if component.currency in self.rates:
+            return component.last_purchase_price * self.rates[component.currency]
+        return component.last_purchase_price_upb
+
+    def _compute_node(self, pk):
+        component = self.nodes[pk]
+        unit = self._unit_price(component)
+        line_cost = _money(unit * component.quantity)
+        updated_cost = _money(unit * self._multiplier(component))
+        if component.rollup_cost != line_cost or component.updated_cost != updated_cost:
+            component.rollup_cost = line_cost
+            component.updated_cost = updated_cost
+            self._dirty.add(pk)
+
+    def _compute_group(self, key):
+        self._group_cost[key] = sum(
+            (self.nodes[pk].rollup_cost or ZERO for pk in self.children.get(key, ())), ZERO
+        )
+        for pk in self.groups[key]:
+            self._compute_node(pk)
+
+    def rollup(self):
+        """Tüm ağacı en alt seviyeden başlayarak yeniden hesaplar."""
+        for key in sorted(self.groups, key=lambda k: k[1], reverse=True):
+            self._compute_group(key)
+        return self
+
+    def _needs_rollup(self, keys):
+        """Yeniden hesaplanacak grupların çocuklarından biri hiç hesaplanmamışsa (rollup_cost boş) True."""
+        return any(
+            self.nodes[child].rollup_cost is None
+            for key in keys for child in self.children.get(key, ())
+        )
+
+    def set_override(self, pk, **values):
+        """
+        Tek bir satırın override alanlarını değiştirir ve yalnızca o satırın grubunu ve
+        atalarını yeniden hesaplar; diğer dallar için kayıtlı `rollup_cost` değerleri kullanılır.
+        Bu değerlerden biri henüz hesaplanmamışsa ağaç bir kez baştan hesaplanır.
+        """
+        unknown = set(values) - set(OVERRIDE_FIELDS)
+        if unknown:
+            raise ValueError(f"Override edilemeyen alan(lar): {', '.join(sorted(unknown))}")
+
+        component = self.nodes[pk]
+        for field, value in values.items():
+            if getattr(component, field) != value:
+                setattr(component, field, value)
+                self._override_dirty.add(pk)
+        return self.recompute(pk)
+
+    def recompute(self, pk):
+        """Satırın grubunu ve atalarını yeniden hesaplar (satır dışarıda değiştirildiyse)."""
+        component = self.nodes[pk]
+        keys = [self._group_key(component)] + self.ancestors(pk)
+        if self._needs_rollup(keys):
+            self.rollup()
+            return component
+        for key in keys:
+            self._compute_group(key)
+        return component
+
+    def apply_overrides(self, changes):
+        """
+        Birden fazla satırın override alanlarını birlikte değiştirir ({pk: {alan: değer}})
+        ve ağacı tek geçişte yeniden hesaplar.
+        """
+        for pk, values in changes.items():
+            unknown = set(values) - set(OVERRIDE_FIELDS)
+            if unknown:
+                raise ValueError(f"Override edilemeyen alan(lar): {', '.join(sorted(unknown))}")
+            component = self.nodes[pk]
+            for field, value in values.items():
+                if getattr(component, field) != value:
+                    setattr(component, field, value)
+                    self._override_dirty.add(pk)
+        return self.rollup()
+
+    def root_cost(self, main_item):
+        """Ana mamulün toplam maliyeti (level -1 satırı yoksa level 0 satırlarının toplamı)."""
+        root = self.groups.get((main_item, ROOT_LEVEL, main_item))
+        if root:
+            return sum((self.nodes[pk].rollup_cost or ZERO for pk in root), ZERO)
+        # Level -1 grubu yoksa `children` eşlemesi de kurulmaz; level 0 grupları doğrudan toplanır
+        return sum((self.nodes[pk].rollup_cost or ZERO
+                    for (item, level, _), pks in self.groups.items() if item == main_item and level == 0
+                    for pk in pks), ZERO)
+
+    # ------------------------------------------------------------------ #
+    # Kalıcılık
+    # ------------------------------------------------------------------ #
+    @property
+    def dirty(self):
+        return [self.nodes[pk] for pk in sorted(self._dirty | self._override_dirty)]
+
+    def save(self, batch_size=1000):
+        """Değişen satırları tek bir `bulk_update` ile yazar; yazılan satır sayısını döndürür."""
+        changed = self.dirty
+        if not changed:
+            return 0
+        fields = list(COMPUTED_FIELDS)
+        if self._override_dirty:
+            fields.extend(OVERRIDE_FIELDS)
+        now = timezone.now()
+        for component in changed:
+            component.updated_at = now  # bulk_update auto_now alanını kendisi güncellemez
+        fields.append('updated_at')
+        BOMComponent.objects.bulk_update(changed, fields, batch_size=batch_size)
+        self._dirty.clear()
+        self._override_dirty.clear()
+        logger.debug("BOMTree.save: %d satır güncellendi", len(changed))
+        return len(changed)
@@ -2,17 +2,41 @@
 
 import logging
 from django.db import transaction
+from django.utils import timezone
 from ..connect.bomcomponent_data_fetcher import fetch_hana_db_data
-from ..helpers.bomcomponent_helper import parse_hana_component_data, update_bom_component_cost
+from ..helpers.bomcomponent_helper import parse_hana_component_data
 from ..models.bomcomponent_models import BOMComponent
+from .bom_tree import BOMTree, OVERRIDE_FIELDS
 
 logger = logging.getLogger(__name__)
 
+# HANA satırında bulunursa override alanını güncelleyen anahtarlar; bulunmazsa
+# kullanıcının girdiği override değeri korunur.
+OVERRIDE_SOURCE_KEYS = {
+    "new_last_purchase_price": "NewLastPurchasePrice",
+    "new_currency": "NewCurrency",
+    "labor_multiplier": "LaborMultiplier",
+    "overhead_multiplier": "OverheadMultiplier",
+    "license_multiplier": "LicenseMultiplier",
+    "commission_multiplier": "CommissionMultiplier",
+}
+
+
+def _row_key(main_item, sub_item, component_item_code, level):
+    return (main_item, sub_item or main_item, component_item_code, level)
+
+
 def update_components_from_hana(token, item_code=None):
     """
     SAP HANA’dan BOM bileşen verisini çeker. Eğer istek üzerine gönderilen item_code parametresi varsa,
-    bu filtreyi de uygular. Her bir bileşeni parse edip, BOMComponent modeli üzerinden update_or_create yapar.
-    Ardından, override ve çarpanlar göz önünde bulundurularak maliyet güncellemesini gerçekleştirir.
+    bu filtreyi de uygular. Satırlar parse edilip BOMComponent tablosuna toplu olarak yazılır
+    (tek `bulk_create` + tek `bulk_update`); ardından ürün ağacı `BOMTree` ile alttan yukarı
+    yeniden hesaplanır ve değişen maliyetler tek bir `bulk_update` ile kaydedilir.
+
+    Bir satır ağaçtaki konumuyla (main_item, sub_item, component_item_code, level) tanımlanır;
+    aynı bileşen farklı alt montajlarda ayrı satır olarak tutulur. Eski (main_item,
+    component_item_code) anahtarıyla yazılmış mükerrer satırlar ve HANA'da artık bulunmayan
+    konumlar aynı transaction içinde silinir; override değerleri aynı bileşenin yeni satırlarına taşınır.
 
     Args:
         token (str): SAP HANA bağlantısı için kimlik doğrulama token'ı.
@@ -26,29 +50,93 @@ def update_components_from_hana(token, item_code=None):
         logger.error("HANA DB'den veri alınamadı. Token veya item_code kontrol edilmeli.")
         return None
 
-    updated_components = []
-    
+    incoming = {}
     for item in raw_data:
         try:
             # HANA’dan gelen veriyi model için uygun formata çeviriyoruz.
             component_dict = parse_hana_component_data(item)
-            # Veritabanı işlemlerini atomic blok içerisinde gerçekleştiriyoruz.
-            with transaction.atomic():
-                # Unique identifier olarak main_item ve component_item_code kullanılıyor.
-                component, created = BOMComponent.objects.update_or_create(
-                    main_item=component_dict.get("main_item"),
-                    component_item_code=component_dict.get("component_item_code"),
-                    defaults=component_dict
-                )
-                # Override ve çarpanlar uygulanarak güncel maliyet hesaplanıyor.
-                component = update_bom_component_cost(component)
-            
-            updated_components.append(component)
-            action = "oluşturuldu" if created else "güncellendi"
-            logger.info(f"{component.component_item_code} için {action}.")
         except Exception as e:
             logger.error(f"BOM bileşeni işlenirken hata oluştu. Veri: {item}. Hata: {e}")
             continue
+        # HANA'da bulunmayan override alanları mevcut kayıttaki değeri ezmesin
+        for field, source_key in OVERRIDE_SOURCE_KEYS.items():
+            if source_key not in item:
+                component_dict.pop(field, None)
+        key = _row_key(component_dict["main_item"], component_dict["sub_item"],
+                       component_dict["component_item_code"], component_dict["level"])
+        incoming[key] = component_dict
+
+    if not incoming:
+        logger.error("HANA verisindeki hiçbir BOM bileşeni işlenemedi.")
+        return None
+
+    main_items = {key[0] for key in incoming}
+    now = timezone.now()
+
+    with transaction.atomic():
+        existing, obsolete = {}, []
+        for c in BOMComponent.objects.filter(main_item__in=main_items).order_by("pk"):
+            key = _row_key(c.main_item, c.sub_item, c.component_item_code, c.level)
+            if key in incoming and key not in existing:
+                existing[key] = c
+            else:
+                obsolete.append(c)  # eski anahtarla yazılmış mükerrer satır veya artık olmayan konum
+
+        # Silinecek satırlardaki override değerleri aynı bileşenin yeni satırlarına taşınır
+        legacy_overrides = {
+            (c.main_item, c.component_item_code): {field: getattr(c, field) for field in OVERRIDE_FIELDS}
+            for c in obsolete
+        }
+
+        to_create, to_update, update_fields = [], [], set()
+        for key, data in incoming.items():
+            component = existing.get(key)
+            if component is None:
+                legacy = legacy_overrides.get((key[0], key[2]), {})
+                to_create.append(BOMComponent(**{**legacy, **data}))
+                continue
+            for field, value in data.items():
+                setattr(component, field, value)
+            component.updated_at = now
+            update_fields.update(data)
+            to_update.append(component)
+
+        if obsolete:
+            BOMComponent.objects.filter(pk__in=[c.pk for c in obsolete]).delete()
+        if to_create:
+            BOMComponent.objects.bulk_create(to_create, batch_size=1000)
+        if to_update:
+            update_fields.add("updated_at")
+            BOMComponent.objects.bulk_update(to_update, sorted(update_fields), batch_size=1000)
+
+        # Maliyetler ağaç üzerinden yeniden hesaplanır; yalnızca değişen satırlar yazılır
+        tree = BOMTree.for_main_items(main_items).rollup()
+        saved = tree.save()
+
+    logger.info(
+        "BOM bileşenleri güncellendi: %d yeni, %d güncellenen, %d silinen, %d maliyeti değişen satır",
+        len(to_create), len(to_update), len(obsolete), saved,
+    )
+    return sorted(tree.nodes.values(), key=lambda c: (c.main_item, c.level, c.sub_item or "", c.component_item_code))
+
+
+def apply_component_override(component_id, **overrides):
+    """
+    Tek bir BOM satırına override (yeni fiyat, döviz veya çarpanlar) uygular.
+    Ürün ağacı bir kez yüklenir; tüm ağaç değil yalnızca satırın grubu ve ataları yeniden
+    hesaplanır (diğer dallar kayıtlı `rollup_cost` değerlerini kullanır) ve değişiklikler
+    tek bir `bulk_update` ile yazılır.
+
+    Returns:
+        tuple: (BOMComponent, değişen satır listesi)
+    """
+    overrides = {field: value for field, value in overrides.items() if field in OVERRIDE_FIELDS}
+    component = BOMComponent.objects.get(pk=component_id)
+
+    with transaction.atomic():
+        tree = BOMTree.for_main_items([component.main_item])
+        tree.set_override(component.pk, **overrides)
+        changed = tree.dirty
+        tree.save()
 
-    logger.debug("update_components_from_hana: Toplam güncellenen bileşen sayısı: %d", len(updated_components))
-    return updated_components
+    return tree.nodes[component.pk], changed
@@ -0,0 +1,282 @@
+# backend/bomcostmanager/services/exchange_rates.py
+"""
+Döviz kuru servisi.
+
+Eskiden kur endpoint'leri önbellek boşaldığında dış API'yi istek içinde çağırıyordu
+(6 saatte bir ilk kullanıcı ~10 sn bekliyordu). Artık:
+
+    - Kurlar tarihli olarak `ExchangeRate` tablosunda tutulur
+    - Arka planda (Celery beat) `refresh_rates()` ile sağlayıcıdan yenilenir
+    - Okumalar worker içi LRU'dan yapılır; her kayıt `BCM_RATE_LRU_TTL` saniye tutulur.
+      `refresh_rates()` Redis'teki sürüm damgasını (`RATES_VERSION_KEY`) yeniler; damga LRU
+      anahtarının parçası olduğundan tüm worker'lar (web ve Celery) bir sonraki okumada yeni kurları görür
+    - İstenen tarihte kur yoksa (hafta sonu, tatil) o tarihten önceki son kur kullanılır
+
+Sağlayıcılar `BCM_RATE_PROVIDERS` ayarıyla sırayla denenir:
+    hana             : SAP B1 ORTT tablosu (maliyet sorgularıyla aynı kaynak)
+    exchangerate_api : api.exchangerate-api.com (eski davranış)
+    static           : `BCM_RATE_STATIC` ("USD=32.5,EUR=35.1"), yerel geliştirme için
+
+Kullanım:
+    from bomcostmanager.services.exchange_rates import get_rate, get_rates, convert
+
+    get_rate('EUR')                                   # Decimal
+    convert([10, 20, 5], ['EUR', 'USD', 'TRY'])       # numpy dizisi (TRY)
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..models.exchange_rate_models import ExchangeRate
+
+logger = logging.getLogger(__name__)
+
+BASE_CURRENCY = 'TRY'
+ONE = Decimal('1')
+
+# Son yenileme zamanı; worker içi LRU için sürüm damgası olarak da kullanılır
+RATES_VERSION_KEY = 'exchange_rates_last_updated'
+
+
+class ExchangeRateError(Exception):
+    """Kur bulunamadı veya sağlayıcılardan hiçbiri yanıt vermedi."""
+
+
+# ---------------------------------------------------------------------- #
+# Sağlayıcılar
+# ---------------------------------------------------------------------- #
+class RateProvider:
+    """Bir tarih için {döviz: TRY kuru} döndüren kaynak."""
+
+    name = ''
+
+    def fetch(self, rate_date):
+        raise NotImplementedError
+
+
+class HanaRateProvider(RateProvider):
+    """SAP B1 `ORTT` (günlük kurlar) tablosu."""
+
+    name = 'hana'
+
+    SQL = 'SELECT "Currency", "Rate" FROM "{schema}"."ORTT" WHERE "RateDate" = ? AND "Rate" > 0'
+
+    def fetch(self, rate_date):
+        from hanadbcon.utilities.connection_pool import hana_connection
+
+        with hana_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(self.SQL.format(schema=settings.HANADB_SCHEMA), (rate_date,))
+                return {currency.strip(): Decimal(str(rate)) for currency, rate in cursor.fetchall()}
+            finally:
+                cursor.close()
+
+
+class ExchangeRateApiProvider(RateProvider):
+    """api.exchangerate-api.com; yalnızca güncel kurları verir."""
+
+    name = 'exchangerate_api'
+
+    URL = "https://api.exchangerate-api.com/v4/latest/TRY"
+
+    def fetch(self, rate_date):
+        if rate_date != timezone.localdate():
+            return {}
+        response = requests.get(self.URL, timeout=10)
+        response.raise_for_status()
+        # API'den dönen kurlar 1 TRY = x döviz; tersini alıyoruz (1 döviz = x TRY)
+        return {
+            currency: (ONE / Decimal(str(rate))).quantize(Decimal('0.000001'))
+            for currency, rate in response.json()['rates'].items()
+            if rate and currency != BASE_CURRENCY
+        }
+
+
+class StaticRateProvider(RateProvider):
+    """Ayarlardan okunan sabit kurlar (yerel geliştirme ve testler için)."""
+
+    name = 'static'
+
+    def fetch(self, rate_date):
+        rates = {}
+        for pair in filter(None, (settings.BCM_RATE_STATIC or '').split(',')):
+            currency, _, rate = pair.partition('=')
+            rates[currency.strip().upper()] = Decimal(rate.strip())
+        return rates
+
+
+PROVIDERS = {
+    provider.name: provider
+    for provider in (HanaRateProvider, ExchangeRateApiProvider, StaticRateProvider)
+}
+
+
+def get_providers():
+    names = [name.strip() for name in settings.BCM_RATE_PROVIDERS.split(',') if name.strip()]
+    return [PROVIDERS[name]() for name in names if name in PROVIDERS]
+
+
+# ---------------------------------------------------------------------- #
+# Worker içi LRU
+# ---------------------------------------------------------------------- #
+class _RateLRU:
+    """(anahtar → (değer, okunma zamanı)); her kayıt `ttl` sonunda bayatlar."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, loaded_at = entry
+            # Geçmiş tarihler de süreye tabidir: bugün için okunan (önceki günün) kur, gün
+            # döndükten sonra kalıcı hale gelmemeli; geriye dönük yenilemeler de görülmeli
+            if time.monotonic() - loaded_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_lru = _RateLRU(settings.BCM_RATE_LRU_SIZE, settings.BCM_RATE_LRU_TTL)
+
+
+def _rates_version():
+    """Paylaşımlı sürüm damgası; Redis erişilemezse yalnızca LRU süresi geçerlidir."""
+    try:
+        return cache.get(RATES_VERSION_KEY)
+    except Exception as e:
+        logger.warning(f"[Kur] Sürüm damgası okunamadı: {e}")
+        return None
+
+
+# ---------------------------------------------------------------------- #
+# Okuma
+# ---------------------------------------------------------------------- #
+def get_rates(on_date=None):
+    """
+    Verilen tarihte (varsayılan bugün) geçerli tüm kurları {döviz: Decimal} olarak döndürür.
+    Her döviz için o tarihteki ya da öncesindeki son kur kullanılır; TRY her zaman 1'dir.
+    """
+    on_date = on_date or timezone.localdate()
+    key = ('*', on_date, _rates_version())
+    cached = _lru.get(key)
+    if cached is not None:
+        return dict(cached[0])
+
+    rates = {BASE_CURRENCY: ONE}
+    latest = (
+        ExchangeRate.objects.filter(rate_date__lte=on_date)
+        .order_by('currency', '-rate_date')
+        .distinct('currency')
+        .values_list('currency', 'rate')
+    )
+    rates.update(latest)
+    _lru.set(key, rates)
+    return dict(rates)
+
+
+def get_rate(currency, on_date=None):
+    """Tek bir dövizin kuru (Decimal); kur hiç yoksa None."""
+    currency = (currency or BASE_CURRENCY).upper()
+    if currency == BASE_CURRENCY:
+        return ONE
+    return get_rates(on_date).get(currency)
+
+
+def convert(amounts, currencies, on_date=None, missing=np.nan):
+    """
+    N tutarı tek seferde TRY'ye çevirir (vektörel).
+
+    amounts    : tutarlar (liste / numpy dizisi)
+    currencies : her tutarın dövizi (aynı uzunlukta) ya da tümü için tek döviz kodu
+    missing    : kuru bulunmayan dövizlerin sonucu (varsayılan NaN)
+
+    Dönüş: float64 numpy dizisi.
+    """
+    amounts = np.asarray(amounts, dtype=float)
+    rates = get_rates(on_date)
+    if isinstance(currencies, str):
+        rate = rates.get(currencies.upper())
+        return amounts * float(rate) if rate is not None else np.full(amounts.shape, missing)
+
+    codes, inverse = np.unique(
+        np.array([(c or BASE_CURRENCY).upper() for c in currencies], dtype=str), return_inverse=True
+    )
+    vector = np.array([float(rates[c]) if c in rates else missing for c in codes])
+    return amounts * vector[inverse.reshape(amounts.shape)]
+
+
+def last_updated():
+    """Kurların en son yazıldığı zaman (hiç yoksa None)."""
+    return ExchangeRate.objects.order_by('-fetched_at').values_list('fetched_at', flat=True).first()
+
+
+# ---------------------------------------------------------------------- #
+# Yenileme
+# ---------------------------------------------------------------------- #
+def refresh_rates(rate_date=None, days=1):
+    """
+    Sağlayıcılardan `rate_date` (varsayılan bugün) ve öncesindeki `days` günün kurlarını çekip
+    tabloya yazar (tek `bulk_create(update_conflicts=True)`). Her gün için ilk yanıt veren
+    sağlayıcı kullanılır. Yazılan kayıt sayısını döndürür.
+    """
+    rate_date = rate_date or timezone.localdate()
+    providers = get_providers()
+    if not providers:
+        raise ExchangeRateError("Geçerli bir kur sağlayıcısı tanımlı değil (BCM_RATE_PROVIDERS)")
+
+    records = []
+    for offset in range(days):
+        day = rate_date - timedelta(days=offset)
+        for provider in providers:
+            try:
+                rates = provider.fetch(day)
+            except Exception as e:
+                logger.warning(f"[Kur] {provider.name} sağlayıcısı {day} için yanıt vermedi: {e}")
+                continue
+            if rates:
+                records.extend(
+                    ExchangeRate(currency=currency, rate_date=day, rate=rate, source=provider.name)
+                    for currency, rate in rates.items() if currency != BASE_CURRENCY
+                )
+                break
+
+    if not records:
+        raise ExchangeRateError(f"{rate_date} için hiçbir sağlayıcıdan kur alınamadı")
+
+    ExchangeRate.objects.bulk_create(
+        records, batch_size=1000, update_conflicts=True,
+        unique_fields=['currency', 'rate_date'], update_fields=['rate', 'source', 'fetched_at'],
+    )
+    # Damga tüm worker'ların LRU anahtarını değiştirir; bu süreçteki eski kayıtlar hemen atılır
+    cache.set(RATES_VERSION_KEY, timezone.now().isoformat(), timeout=None)
+    _lru.clear()
+    logger.info(f"[Kur] {len(records)} kur kaydı güncellendi ({rate_date}, {days} gün)")
+    return len(records)
@@ -0,0 +1,296 @@
+# backend/bomcostmanager/services/scenario_engine.py
+"""
+Vektörel "what-if" maliyet simülasyonu.
+
+Bir ürünün BOM satırları bir kez NumPy dizilerine yüklenir; her senaryo bu dizilerin
+üzerinde tek geçişte uygulanır ve tüm senaryolar (S x N matris) birlikte hesaplanır.
+Veritabanına yalnızca `commit()` ile seçilen senaryo yazılır.
+
+Senaryo biçimi:
+    {
+        "name": "İşçilik +%5, EUR 38.5",
+        "rates": {"EUR": 38.5},
+        "adjustments": [
+            {"field": "labor_multiplier", "op": "mul", "value": 1.05,
+             "where": {"item_group_name": "PROFİL"}},
+            {"field": "new_currency", "op": "set", "value": "EUR",
+             "where": {"component_item_code__startswith": "151"}}
+        ]
+    }
+
+    field : labor_multiplier | overhead_multiplier | license_multiplier | commission_multiplier
+            | new_last_purchase_price | new_currency
+    op    : set | mul | add   (new_currency için yalnızca set)
+    where : item_group_name, type_description, sub_item, level, component_item_code,
+            component_item_code__in, component_item_code__startswith (boşsa tüm satırlar)
+
+Maliyet kuralları `BOMTree` ile aynıdır (bkz. bom_tree.py): satır birimi alttan yukarı toplanır,
+`updated_cost = birim * çarpanlar` ve çarpanlar yalnızca satırın kendisine uygulanır (alt seviyelerin
+çarpanları üst seviyeye taşınmaz). Ürün toplamı (`total` / `products`) en üst satırların
+`updated_cost * quantity` toplamıdır. Sonuçlar float ile hesaplandığından `BOMTree`'nin kuruş
+yuvarlamasından birkaç kuruş sapabilir.
+
+`rates` yalnızca "what-if" içindir ve kaydedilmez: kısmi yeniden hesaplamalar (tekil override) ve
+HANA senkronizasyonu ağacı kursuz (kayıtlı TRY fiyatlarıyla) hesaplar; senaryo kuruyla yazılan
+maliyetler ağaçta iki farklı kur tabanı oluştururdu. `commit()` bu yüzden yalnızca override ve
+çarpanları yazar, maliyetleri `BOMTree` ile kursuz hesaplar.
+"""
+import logging
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+
+from ..models.bomcomponent_models import BOMComponent
+from .bom_tree import BOMTree, ROOT_LEVEL
+
+logger = logging.getLogger(__name__)
+
+MULTIPLIER_FIELDS = ('labor_multiplier', 'overhead_multiplier', 'license_multiplier', 'commission_multiplier')
+NUMERIC_FIELDS = MULTIPLIER_FIELDS + ('new_last_purchase_price',)
+OPERATIONS = ('set', 'mul', 'add')
+
+SELECTORS = {
+    'item_group_name': lambda e, v: e.item_group == v,
+    'type_description': lambda e, v: e.type_description == v,
+    'sub_item': lambda e, v: e.sub_item == v,
+    'level': lambda e, v: e.level == int(v),
+    'component_item_code': lambda e, v: e.code == v,
+    'component_item_code__in': lambda e, v: np.isin(e.code, list(v)),
+    'component_item_code__startswith': lambda e, v: np.char.startswith(e.code, v),
+}
+
+
+class ScenarioError(ValueError):
+    """Senaryo tanımı geçersiz."""
+
+
+class ScenarioEngine:
+    """
+    components : Simüle edilecek BOMComponent satırları (bir veya birden fazla ana mamul)
+    """
+
+    def __init__(self, components):
+        self.components = list(components)
+        rows = self.components
+        n = len(rows)
+
+        self.pk = np.array([c.pk for c in rows], dtype=np.int64)
+        self.main_item = np.array([c.main_item for c in rows], dtype=object)
+        self.code = np.array([c.component_item_code for c in rows], dtype=str) if n else np.array([], dtype=str)
+        self.sub_item = np.array([c.sub_item or c.main_item for c in rows], dtype=object)
+        self.item_group = np.array([c.item_group_name or '' for c in rows], dtype=object)
+        self.type_description = np.array([c.type_description or '' for c in rows], dtype=object)
+        self.level = np.array([c.level for c in rows], dtype=np.int64)
+        self.quantity = np.array([float(c.quantity) for c in rows])
+        self.upb = np.array([float(c.last_purchase_price_upb) for c in rows])
+        self.price = np.array([float(c.last_purchase_price) for c in rows])
+        self.override = np.array([float(c.new_last_purchase_price or 0) for c in rows])
+        self.multipliers = {
+            field: np.array([float(getattr(c, field)) for c in rows]) for field in MULTIPLIER_FIELDS
+        }
+
+        # Döviz kodları tamsayı indekslerine çevrilir; senaryolar yeni kod ekleyebilir
+        self.currencies = []
+        self._currency_index = {}
+        self.currency = np.array([self._currency_id(c.currency) for c in rows], dtype=np.int64)
+        self.new_currency = np.array([self._currency_id(c.new_currency or c.currency) for c in rows], dtype=np.int64)
+
+        # Grafik: (main_item, level, kod) grupları ve çocuk → ebeveyn grup eşlemesi (bkz. BOMTree)
+        group_ids = {}
+        self.group = np.empty(n, dtype=np.int64)
+        for i, c in enumerate(rows):
+            self.group[i] = group_ids.setdefault((c.main_item, c.level, c.component_item_code), len(group_ids))
+        self.group_count = len(group_ids)
+        self.parent_group = np.full(n, -1, dtype=np.int64)
+        for i, c in enumerate(rows):
+            if c.level > ROOT_LEVEL:
+                self.parent_group[i] = group_ids.get((c.main_item, c.level - 1, c.sub_item or c.main_item), -1)
+        self.has_children = np.zeros(self.group_count, dtype=bool)
+        self.has_children[self.parent_group[self.parent_group >= 0]] = True
+        self.group_quantity = np.bincount(self.group, weights=self.quantity, minlength=self.group_count)
+
+        # Seviye bazında (alttan yukarı) satır indeksleri
+        self.levels = [(lvl, np.flatnonzero(self.level == lvl)) for lvl in sorted(set(self.level.tolist()), reverse=True)]
+
+        # Ürün toplamı: level -1 satırları, yoksa ebeveyni olmayan level 0 satırları
+        self.main_items = sorted(set(self.main_item.tolist()))
+        is_root = (self.level == ROOT_LEVEL) & (self.code == self.main_item.astype(str))
+        top = np.flatnonzero(is_root)
+        roots_present = set(self.main_item[top].tolist())
+        fallback = np.flatnonzero((self.level == 0) & ~np.isin(self.main_item, list(roots_present)))
+        self.top_rows = np.concatenate([top, fallback])
+        self.top_product = np.array([self.main_items.index(m) for m in self.main_item[self.top_rows]], dtype=np.int64)
+
+    @classmethod
+    def for_main_items(cls, main_items):
+        return cls(BOMComponent.objects.filter(main_item__in=list(main_items)))
+
+    # ------------------------------------------------------------------ #
+    def _currency_id(self, code):
+        code = code or 'TRY'
+        if code not in self._currency_index:
+            self._currency_index[code] = len(self.currencies)
+            self.currencies.append(code)
+        return self._currency_index[code]
+
+    def _mask(self, where):
+        mask = np.ones(len(self.components), dtype=bool)
+        for key, value in (where or {}).items():
+            selector = SELECTORS.get(key)
+            if selector is None:
+                raise ScenarioError(f"Geçersiz filtre: {key}")
+            mask &= selector(self, value)
+        return mask
+
+    def _prepare(self, scenarios):
+        """Senaryoları S x N dizilerine dönüştürür."""
+        s, n = len(scenarios), len(self.components)
+        arrays = {field: np.tile(self.multipliers[field], (s, 1)) for field in MULTIPLIER_FIELDS}
+        arrays['new_last_purchase_price'] = np.tile(self.override, (s, 1))
+        arrays['new_currency'] = np.tile(self.new_currency, (s, 1))
+        rate_overrides = []
+
+        for row, scenario in enumerate(scenarios):
+            for adjustment in scenario.get('adjustments', []):
+                field = adjustment.get('field')
+                op = adjustment.get('op', 'set')
+                if field not in arrays:
+                    raise ScenarioError(f"Geçersiz alan: {field}")
+                if op not in OPERATIONS or (field == 'new_currency' and op != 'set'):
+                    raise ScenarioError(f"Geçersiz işlem: {field} {op}")
+                mask = self._mask(adjustment.get('where'))
+                target = arrays[field][row]
+                if field == 'new_currency':
+                    target[mask] = self._currency_id(adjustment['value'])
+                    continue
+                value = float(adjustment['value'])
+                if op == 'set':
+                    target[mask] = value
+                elif op == 'mul':
+                    target[mask] *= value
+                else:
+                    target[mask] += value
+            rate_overrides.append({code: float(rate) for code, rate in (scenario.get('rates') or {}).items()})
+
+        # Kur matrisi: S x K; verilmeyen kurlar 1 (TRY) ve "verildi mi" bayrağı
+        for rates in rate_overrides:
+            for code in rates:
+                self._currency_id(code)
+        k = len(self.currencies)
+        rates = np.ones((s, k))
+        given = np.zeros((s, k), dtype=bool)
+        for row, overrides in enumerate(rate_overrides):
+            for code, rate in overrides.items():
+                rates[row, self._currency_index[code]] = rate
+                given[row, self._currency_index[code]] = True
+        arrays['rates'] = rates
+        arrays['rates_given'] = given
+        return arrays
+
+    def evaluate(self, scenarios, include_components=False):
+        """
+        Senaryoları tek vektörel geçişte hesaplar (veritabanına yazmaz).
+        Her senaryo için {'name', 'total', 'material_total', 'products', 'materials'} döndürür:
+        `total`/`products` en üst satırların `updated_cost * quantity` toplamı,
+        `material_total`/`materials` yalnızca ham madde maliyetidir (`rollup_cost` toplamı);
+        include_components=True ise satır bazında birim ve satır maliyetleri de eklenir.
+        """
+        if not scenarios:
+            return []
+        s, n = len(scenarios), len(self.components)
+        a = self._prepare(scenarios)
+        rows = np.arange(s)[:, None]
+
+        # Yaprak birim fiyatı: override varsa override * kur[new_currency],
+        # yoksa senaryoda kuru verilen dövizde last_purchase_price * kur, değilse UPB
+        override = a['new_last_purchase_price']
+        override_rate = a['rates'][rows, a['new_currency']]
+        price_rate = a['rates'][rows, np.broadcast_to(self.currency, (s, n))]
+        price_rate_given = a['rates_given'][rows, np.broadcast_to(self.currency, (s, n))]
+        leaf_unit = np.where(
+            override > 0,
+            override * override_rate,
+            np.where(price_rate_given, self.price * price_rate, self.upb),
+        )
+
+        multiplier = np.ones((s, n))
+        for field in MULTIPLIER_FIELDS:
+            multiplier *= a[field]
+
+        # Birim maliyetler alttan yukarı toplanır (BOMTree ile aynı); çarpanlar yalnızca
+        # satırın kendi `updated_cost` değerine uygulanır, üst seviyeye taşınmaz
+        unit = np.zeros((s, n))
+        line = np.zeros((s, n))
+        group_cost = np.zeros((s, self.group_count))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for _, idx in self.levels:
+                groups = self.group[idx]
+                quantity = self.group_quantity[groups]
+                is_leaf = (override[:, idx] > 0) | ~self.has_children[groups]
+                rolled = np.where(quantity > 0, group_cost[:, groups] / quantity, 0.0)
+                unit[:, idx] = np.where(is_leaf, leaf_unit[:, idx], rolled)
+                line[:, idx] = unit[:, idx] * self.quantity[idx]
+                linked = idx[self.parent_group[idx] >= 0]
+                if linked.size:
+                    np.add.at(group_cost, (slice(None), self.parent_group[linked]), line[:, linked])
+
+        updated = unit * multiplier
+
+        materials = np.zeros((s, len(self.main_items)))
+        np.add.at(materials, (slice(None), self.top_product), line[:, self.top_rows])
+        products = np.zeros((s, len(self.main_items)))
+        np.add.at(products, (slice(None), self.top_product),
+                  updated[:, self.top_rows] * self.quantity[self.top_rows])
+
+        results = []
+        for row, scenario in enumerate(scenarios):
+            result = {
+                'name': scenario.get('name') or f"Senaryo {row + 1}",
+                'total': round(float(products[row].sum()), 2),
+                'material_total': round(float(materials[row].sum()), 2),
+                'products': {m: round(float(v), 2) for m, v in zip(self.main_items, products[row])},
+                'materials': {m: round(float(v), 2) for m, v in zip(self.main_items, materials[row])},
+            }
+            if include_components:
+                result['components'] = [
+                    {'id': int(pk), 'unit_cost': round(float(u), 4),
+                     'rollup_cost': round(float(c), 2), 'updated_cost': round(float(uc), 2)}
+                    for pk, u, c, uc in zip(self.pk, unit[row], line[row], updated[row])
+                ]
+            results.append(result)
+        return results
+
+    # ------------------------------------------------------------------ #
+    def commit(self, scenario):
+        """
+        Senaryonun override değerlerini satırlara yazar ve maliyetleri `BOMTree` ile
+        yeniden hesaplayıp tek `bulk_update` ile kaydeder. Değişen satır sayısını döndürür.
+        Senaryonun `rates` değerleri kaydedilmez (bkz. modül açıklaması).
+        """
+        if scenario.get('rates'):
+            logger.info("Senaryo kurları kaydedilmiyor, maliyetler kayıtlı fiyatlarla hesaplanacak (%s)",
+                        scenario.get('name', ''))
+        a = self._prepare([scenario])
+        changes = {}
+        for i, component in enumerate(self.components):
+            values = {}
+            for field in NUMERIC_FIELDS:
+                new = Decimal(str(round(float(a[field][0, i]), 4)))
+                if field == 'new_last_purchase_price':
+                    new = new.quantize(Decimal('0.01'))
+                if new != getattr(component, field):
+                    values[field] = new
+            currency = self.currencies[a['new_currency'][0, i]]
+            if currency != (component.new_currency or component.currency):
+                values['new_currency'] = currency
+            if values:
+                changes[component.pk] = values
+
+        with transaction.atomic():
+            tree = BOMTree(self.components)
+            tree.apply_overrides(changes)
+            saved = tree.save()
+        logger.info("Senaryo kaydedildi (%s): %d override, %d satır yazıldı",
+                    scenario.get('name', ''), len(changes), saved)
+        return saved
@@ -0,0 +1,29 @@
+# backend/bomcostmanager/tasks.py
+
+from datetime import date
+
+from celery import shared_task
+from sapreports.refresh_coordinator import RefreshCoordinator
+from .services.exchange_rates import refresh_rates
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Kur endpoint'leri ve periyodik görev aynı koordinatör üzerinden tekilleştirilir
+RATE_REFRESH = RefreshCoordinator('bcm_exchange_rates', max_age=15 * 60)
+
+
+@shared_task(bind=True)
+def refresh_exchange_rates(self, days=1, rate_date=None):
+    """
+    Döviz kurlarını sağlayıcıdan çekip `ExchangeRate` tablosuna yazar.
+    rate_date: 'YYYY-MM-DD' (varsayılan bugün); geçmiş bir tarih için kur istendiğinde verilir.
+    """
+    with RATE_REFRESH.track() as run:
+        try:
+            on_date = date.fromisoformat(rate_date) if rate_date else None
+            return {"written": refresh_rates(rate_date=on_date, days=days)}
+        except Exception as e:
+            logger.error(f"Döviz kurları yenilenemedi: {e}")
+            run.fail()
+            return {"error": str(e)}
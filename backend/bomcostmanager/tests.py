@@ -0,0 +1,62 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from .models.bomcomponent_models import BOMComponent
+from .services.bom_tree import BOMTree
+from .services.scenario_engine import ScenarioEngine
+
+MAIN = '30.TEST.M1'
+
+
+def _component(pk, code, level, sub_item, quantity, upb, **fields):
+    return BOMComponent(
+        pk=pk, main_item=MAIN, sub_item=sub_item, component_item_code=code, level=level,
+        type_description='Kalem', quantity=Decimal(quantity), last_purchase_price=Decimal(upb),
+        last_purchase_price_upb=Decimal(upb), **fields,
+    )
+
+
+def _fixture():
+    """Ana mamul → (alt montaj A, yaprak B); A → (yaprak A1, override'lı yaprak A2)."""
+    return [
+        _component(1, MAIN, -1, None, '1', '0'),
+        _component(2, 'A', 0, MAIN, '2', '0', labor_multiplier=Decimal('1.1')),
+        _component(3, 'B', 0, MAIN, '3', '5.00', labor_multiplier=Decimal('1.2')),
+        _component(4, 'A1', 1, 'A', '4', '2.50', overhead_multiplier=Decimal('1.5')),
+        _component(5, 'A2', 1, 'A', '2', '10.00', new_last_purchase_price=Decimal('12.00')),
+    ]
+
+
+class ScenarioEngineParityTests(SimpleTestCase):
+    """`ScenarioEngine.evaluate()` (senaryosuz) ile `BOMTree.rollup()` aynı maliyetleri vermeli."""
+
+    def test_evaluate_matches_bom_tree_rollup(self):
+        tree = BOMTree(_fixture()).rollup()
+        result = ScenarioEngine(_fixture()).evaluate([{}], include_components=True)[0]
+
+        components = {row['id']: row for row in result['components']}
+        for pk, component in tree.nodes.items():
+            self.assertAlmostEqual(components[pk]['rollup_cost'], float(component.rollup_cost), places=2)
+            self.assertAlmostEqual(components[pk]['updated_cost'], float(component.updated_cost), places=2)
+
+        root = tree.nodes[1]
+        self.assertAlmostEqual(result['material_total'], float(root.rollup_cost), places=2)
+        self.assertAlmostEqual(result['total'], float(root.updated_cost * root.quantity), places=2)
+
+    def test_multipliers_are_not_compounded(self):
+        result = ScenarioEngine(_fixture()).evaluate([{}])[0]
+        # A1: 4 * 2.50 = 10, A2: 2 * 12 = 24, B: 3 * 5 = 15 → ham madde 49; çarpanlar üst satıra taşınmaz
+        self.assertEqual(result['material_total'], 49.0)
+        self.assertEqual(result['total'], 49.0)
+
+
+class BOMTreeRootCostTests(SimpleTestCase):
+
+    def test_root_cost_with_root_row(self):
+        tree = BOMTree(_fixture()).rollup()
+        self.assertEqual(tree.root_cost(MAIN), Decimal('49.00'))
+
+    def test_root_cost_without_root_row_sums_level_zero(self):
+        tree = BOMTree([c for c in _fixture() if c.level >= 0]).rollup()
+        self.assertEqual(tree.root_cost(MAIN), Decimal('49.00'))
@@ -12,6 +12,7 @@ from rest_framework.response import Response
 from django.db import transaction as db_transaction
 from ..models.models import CustomerCollection
 from ..models.closinginvoice import ClosingInvoice
+from ..utilities.closing_invoice_info import CUSTOMER_INFO_REFRESH
 from loguru import logger
 
 logger.add("logs/backend.log", rotation="1 MB")
@@ -121,30 +122,39 @@ class CustomerCollectionSimulationView(APIView):
             collection_list = simulation.generate_collection_list()
 
             if collection_list:
+                keys = [item['cari_kod'] for item in collection_list]
                 with db_transaction.atomic():
-                    updated_collection_list = []
-                    for item in collection_list:
-                        closing_invoice, created = ClosingInvoice.objects.update_or_create(
-                            cari_kod=item['cari_kod'],
-                            defaults={
-                                'current_balance': item['current_balance'],
-                                'monthly_balances': item['monthly_balances'],
-                                'cari_ad': item['cari_ad'],
-                                'satici': item['satici'],
-                                'grup': item['grup'],
-                                'odemekosulu': item['odemekosulu']
-                            }
-                        )
-                        updated_collection_list.append({
-                            'cari_kod': closing_invoice.cari_kod,
-                            'cari_ad': closing_invoice.cari_ad,
-                            'satici': closing_invoice.satici,
-                            'grup': closing_invoice.grup,
-                            'current_balance': closing_invoice.current_balance,
-                            'monthly_balances': closing_invoice.monthly_balances,
-                            'odemekosulu': closing_invoice.odemekosulu
-                        })
-                    return JsonResponse(updated_collection_list, safe=False)
+                    ClosingInvoice.objects.bulk_create(
+                        [ClosingInvoice(**item) for item in collection_list],
+                        batch_size=1000,
+                        update_conflicts=True,
+                        unique_fields=['cari_kod'],
+                        update_fields=[
+                            'current_balance', 'monthly_balances', 'cari_ad', 'satici', 'grup', 'odemekosulu',
+                        ],
+                    )
+                    # bulk_create save() çağırmaz; cari bilgileri commit sonrasında tek seferde yenilenir
+                    CUSTOMER_INFO_REFRESH.mark(keys)
+
+                info = {
+                    row['cari_kod']: row
+                    for row in ClosingInvoice.objects.filter(cari_kod__in=keys).values(
+                        'cari_kod', 'cari_ad', 'satici', 'grup', 'odemekosulu',
+                    )
+                }
+                updated_collection_list = [
+                    {
+                        'cari_kod': item['cari_kod'],
+                        'cari_ad': info[item['cari_kod']]['cari_ad'],
+                        'satici': info[item['cari_kod']]['satici'],
+                        'grup': info[item['cari_kod']]['grup'],
+                        'current_balance': item['current_balance'],
+                        'monthly_balances': item['monthly_balances'],
+                        'odemekosulu': info[item['cari_kod']]['odemekosulu'],
+                    }
+                    for item in collection_list
+                ]
+                return JsonResponse(updated_collection_list, safe=False)
             else:
                 return Response({'message': 'Veri bulunamadı.'}, status=status.HTTP_404_NOT_FOUND)
                 
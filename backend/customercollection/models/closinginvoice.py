@@ -2,7 +2,6 @@
 from django.db import models
 from .base import BaseModel
 from django.db.models import JSONField
-from .models import CustomerCollection
 from decimal import Decimal
 
 class ClosingInvoice(models.Model):
@@ -26,11 +25,8 @@ class ClosingInvoice(models.Model):
         self.save()
 
     def save(self, *args, **kwargs):
-        customer_collection = CustomerCollection.objects.filter(cari_kod=self.cari_kod).first()
-        if customer_collection:
-            self.cari_ad = customer_collection.cari_ad
-            self.satici = customer_collection.satici
-            self.grup = customer_collection.grup  
-            self.odemekosulu = customer_collection.odemekosulu
+        from ..utilities.closing_invoice_info import CUSTOMER_INFO_REFRESH
 
         super(ClosingInvoice, self).save(*args, **kwargs)
+        # Cari bilgileri CustomerCollection'dan transaction sonunda toplu olarak yenilenir
+        CUSTOMER_INFO_REFRESH.mark([self.cari_kod])
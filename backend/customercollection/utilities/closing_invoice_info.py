@@ -0,0 +1,37 @@
+# backend/customercollection/utilities/closing_invoice_info.py
+"""
+Kapanış faturalarındaki cari bilgilerinin (cari adı, satıcı, grup, ödeme koşulu) toplu güncellenmesi.
+
+`ClosingInvoice.save()` her kayıtta CustomerCollection'a ayrı sorgu atmak yerine `cari_kod`'u kirli
+işaretler; işaretlenen tüm cariler transaction sonunda tek sorgu ve tek `bulk_update` ile güncellenir.
+"""
+from sapreports.deferred_recompute import DeferredRecompute
+from ..models.closinginvoice import ClosingInvoice
+from ..models.models import CustomerCollection
+
+INFO_FIELDS = ('cari_ad', 'satici', 'grup', 'odemekosulu')
+
+
+def refresh_customer_info(cari_kodlar):
+    """Cari bilgilerini her carinin en eski belgesinden alır (önceki `.first()` davranışı)."""
+    info = {
+        row[0]: row[1:]
+        for row in CustomerCollection.objects.filter(cari_kod__in=cari_kodlar)
+        .order_by('cari_kod', 'belge_tarih', 'id').distinct('cari_kod')
+        .values_list('cari_kod', *INFO_FIELDS)
+    }
+    if not info:
+        return
+
+    changed = []
+    for invoice in ClosingInvoice.objects.filter(cari_kod__in=info).only('id', 'cari_kod', *INFO_FIELDS):
+        values = info[invoice.cari_kod]
+        if tuple(getattr(invoice, field) for field in INFO_FIELDS) != values:
+            for field, value in zip(INFO_FIELDS, values):
+                setattr(invoice, field, value)
+            changed.append(invoice)
+    if changed:
+        ClosingInvoice.objects.bulk_update(changed, INFO_FIELDS, batch_size=1000)
+
+
+CUSTOMER_INFO_REFRESH = DeferredRecompute('customercollection.closing_invoice_info', refresh_customer_info)
@@ -3,7 +3,6 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from django.db import transaction
 from django.db.models import Sum, Q, DecimalField
 from decimal import Decimal
 from django.utils import timezone
@@ -13,10 +12,17 @@ import logging # İyileştirme için eklendi
 from ..models import CustomerSalesRawData
 from ..api.serializers import CustomerSalesDataSerializer, CustomerSalesSummarySerializer
 from ..utils.data_fetcher import fetch_raw_sales_data_from_hana
+from hanadbcon.services.bulk_loader import copy_load
 
 # Loglama için logger oluşturuluyor
 logger = logging.getLogger(__name__)
 
+RAW_DATA_FIELDS = [
+    "satici", "satis_tipi", "cari_grup", "musteri_kodu", "musteri_adi", "toplam_net_spb_eur",
+    "ocak", "subat", "mart", "nisan", "mayis", "haziran",
+    "temmuz", "agustos", "eylul", "ekim", "kasim", "aralik",
+]
+
 def _safe_decimal(value):
     if value in (None, '', 'null', 'NULL'): return 0.0
     try: return float(value)
@@ -109,28 +115,27 @@ class FetchHanaDataView(APIView):
 
         logger.info(f"HANA'dan {len(raw_data)} kayıt çekildi. Veritabanına kaydediliyor...")
 
-        objects_to_create = [
-            CustomerSalesRawData(
-                satici=row.get("Satici", ""), satis_tipi=row.get("SatisTipi", ""),
-                cari_grup=row.get("CariGrup", ""), musteri_kodu=row.get("MusteriKodu", ""),
-                musteri_adi=row.get("MusteriAdi", ""),
-                toplam_net_spb_eur=_safe_decimal(row.get("ToplamNetSPB_EUR")),
-                ocak=_safe_decimal(row.get("Ocak")), subat=_safe_decimal(row.get("Şubat")),
-                mart=_safe_decimal(row.get("Mart")), nisan=_safe_decimal(row.get("Nisan")),
-                mayis=_safe_decimal(row.get("Mayıs")), haziran=_safe_decimal(row.get("Haziran")),
-                temmuz=_safe_decimal(row.get("Temmuz")), agustos=_safe_decimal(row.get("Ağustos")),
-                eylul=_safe_decimal(row.get("Eylül")), ekim=_safe_decimal(row.get("Ekim")),
-                kasim=_safe_decimal(row.get("Kasım")), aralik=_safe_decimal(row.get("Aralık"))
-            ) for row in raw_data
-        ]
+        rows = (
+            {
+                "satici": row.get("Satici", ""), "satis_tipi": row.get("SatisTipi", ""),
+                "cari_grup": row.get("CariGrup", ""), "musteri_kodu": row.get("MusteriKodu", ""),
+                "musteri_adi": row.get("MusteriAdi", ""),
+                "toplam_net_spb_eur": _safe_decimal(row.get("ToplamNetSPB_EUR")),
+                "ocak": _safe_decimal(row.get("Ocak")), "subat": _safe_decimal(row.get("Şubat")),
+                "mart": _safe_decimal(row.get("Mart")), "nisan": _safe_decimal(row.get("Nisan")),
+                "mayis": _safe_decimal(row.get("Mayıs")), "haziran": _safe_decimal(row.get("Haziran")),
+                "temmuz": _safe_decimal(row.get("Temmuz")), "agustos": _safe_decimal(row.get("Ağustos")),
+                "eylul": _safe_decimal(row.get("Eylül")), "ekim": _safe_decimal(row.get("Ekim")),
+                "kasim": _safe_decimal(row.get("Kasım")), "aralik": _safe_decimal(row.get("Aralık"))
+            } for row in raw_data
+        )
 
         try:
-            with transaction.atomic():
-                CustomerSalesRawData.objects.all().delete()
-                CustomerSalesRawData.objects.bulk_create(objects_to_create, batch_size=1000)
+            # Tablo, staging tablosuna COPY + tek INSERT ... SELECT ile tek transaction içinde yenilenir
+            stats = copy_load(CustomerSalesRawData, rows, fields=RAW_DATA_FIELDS, mode='replace')
 
-            logger.info(f"{len(objects_to_create)} kayıt başarıyla PostgreSQL'e aktarıldı.")
-            return Response({"message": f"{len(objects_to_create)} kayıt başarıyla içe aktarıldı."}, status=status.HTTP_201_CREATED)
+            logger.info(f"{stats['written']} kayıt başarıyla PostgreSQL'e aktarıldı ({stats['timings']['total']} sn).")
+            return Response({"message": f"{stats['written']} kayıt başarıyla içe aktarıldı."}, status=status.HTTP_201_CREATED)
         
         except Exception as e:
             logger.error(f"Veritabanına kaydederken hata oluştu: {str(e)}")
@@ -1,18 +1,14 @@
 # backend/customersales/utils/data_fetcher.py
 
-import requests
-from django.conf import settings
+from hanadbcon.services.query_executor import run_query, QueryError
 
-def fetch_raw_sales_data_from_hana(token):
+def fetch_raw_sales_data_from_hana(token=None):
     """
     HANA veritabanından ham satış verilerini çeker.
-    Bu fonksiyon, referans alınan 'salesbudgeteur' yapısına göre güncellenmiştir.
+    Sorgu süreç içinde çalıştırılır.
     """
-    headers = {'Authorization': f'Bearer {token}'}
-    url = f'http://{settings.SERVER_HOST}/api/v2/hanadbcon/query/customersales_v2_data/'
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Hata: {response.status_code}, Mesaj: {response.text}")
-    return None
\ No newline at end of file
+    try:
+        return run_query('customersales_v2_data', json_compatible=True)
+    except QueryError as e:
+        print(f"Hata: {e}")
+    return None
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DpapConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dpap'
+
+    def ready(self):
+        import dpap.signals  # yetki matrisi önbelleğini geçersiz kılan sinyaller
@@ -0,0 +1,21 @@
+# backend/dpap/permissions.py
+from rest_framework import permissions
+
+from .utils.permission_resolver import has_permission
+
+
+class HasAPIAccess(permissions.BasePermission):
+    """
+    Kullanıcının departmanları üzerinden `api_name` API'sine, istek metoduna karşılık gelen
+    CRUD yetkisi olup olmadığını kontrol eder. Yetkiler kullanıcı başına önbelleklenmiş
+    matristen okunur (bkz. dpap.utils.permission_resolver).
+
+    Uygulamalar yalnızca API adını verir:
+        class HasCRMBlogAccess(HasAPIAccess):
+            api_name = 'crmblog'
+    """
+    api_name = None
+    message = "Bu işlemi yapmak için yetkiniz yok. Lütfen yöneticiyle iletişime geçin."
+
+    def has_permission(self, request, view):
+        return has_permission(request.user, self.api_name, request.method)
@@ -0,0 +1,48 @@
+# backend/dpap/signals.py
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from authcentral.models import Department, Position
+from .models.models import API, APIAccessPermission
+from .utils.permission_resolver import invalidate_all, invalidate_users
+
+User = get_user_model()
+
+M2M_ACTIONS = ('post_add', 'post_remove', 'post_clear')
+
+
+@receiver(post_save, sender=API)
+@receiver(post_delete, sender=API)
+@receiver(post_save, sender=APIAccessPermission)
+@receiver(post_delete, sender=APIAccessPermission)
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=Position)
+def invalidate_permission_matrices(sender, **kwargs):
+    """API tanımı veya izinler değiştiğinde tüm kullanıcıların yetki matrisi yenilenir."""
+    transaction.on_commit(invalidate_all)
+
+
+@receiver(m2m_changed, sender=APIAccessPermission.departments.through)
+@receiver(m2m_changed, sender=APIAccessPermission.positions.through)
+def permission_relations_changed(sender, action, **kwargs):
+    if action in M2M_ACTIONS:
+        transaction.on_commit(invalidate_all)
+
+
+@receiver(m2m_changed, sender=User.departments.through)
+@receiver(m2m_changed, sender=User.positions.through)
+def user_membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Departman / pozisyon üyeliği değişen kullanıcıların matrisi yenilenir."""
+    if action not in M2M_ACTIONS:
+        return
+    if not reverse:
+        user_ids = [instance.pk]
+    elif pk_set:
+        user_ids = list(pk_set)
+    else:
+        # department.customuser_set.clear(): etkilenen kullanıcılar artık bilinmiyor
+        transaction.on_commit(invalidate_all)
+        return
+    transaction.on_commit(lambda: invalidate_users(user_ids))
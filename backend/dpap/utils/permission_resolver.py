@@ -0,0 +1,167 @@
+# backend/dpap/utils/permission_resolver.py
+"""
+Kullanıcı bazlı API yetki matrisi.
+
+Uygulamaların permission sınıfları her istekte `APIAccessPermission` ile
+`user.departments` arasında join sorgusu çalıştırıyordu. Artık kullanıcının tüm API'ler
+için geçerli CRUD yetkileri bir kez hesaplanır ve iki katmanda önbelleklenir:
+
+    - Süreç içi sözlük : {user_id: matris}; `DPAP_PERMISSION_LOCAL_TTL` saniyede bir
+                         Redis'teki sürüm numaralarıyla doğrulanır
+    - Redis            : matris, (genel sürüm, kullanıcı sürümü) anahtarıyla saklanır
+
+Geçersiz kılma `dpap.signals` ile yapılır:
+    - API / APIAccessPermission (ve departman / pozisyon ilişkileri) değişirse genel sürüm artar
+    - Kullanıcının departman / pozisyon üyeliği değişirse yalnızca o kullanıcının sürümü artar
+
+Matris iki görünüm içerir:
+    'department' : Kullanıcının departmanlarına tanımlı izinler (uygulama permission sınıfları)
+    'any'        : Departman veya pozisyon üzerinden, aktif API'lere tanımlı izinler (dpap.utils)
+
+Kullanım:
+    from dpap.utils.permission_resolver import has_permission
+
+    has_permission(request.user, 'totalrisk', 'read')
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+CREATE, READ, UPDATE, DELETE = 1, 2, 4, 8
+
+ACTIONS = {
+    'create': CREATE,
+    'read': READ,
+    'update': UPDATE,
+    'delete': DELETE,
+}
+
+# HTTP metodu → gereken yetki (PATCH eski permission sınıflarında da tanımlı değildi)
+METHOD_ACTIONS = {
+    'GET': READ,
+    'HEAD': READ,
+    'OPTIONS': READ,
+    'POST': CREATE,
+    'PUT': UPDATE,
+    'DELETE': DELETE,
+}
+
+GLOBAL_VERSION_KEY = 'dpap:perm:version'
+USER_VERSION_KEY = 'dpap:perm:user:{user_id}:version'
+MATRIX_KEY = 'dpap:perm:user:{user_id}:{global_version}:{user_version}'
+
+_local = {}                 # user_id → (matris, sürüm, doğrulanma zamanı)
+_local_lock = threading.Lock()
+
+
+def _mask(can_create, can_read, can_update, can_delete):
+    return ((CREATE if can_create else 0) | (READ if can_read else 0)
+            | (UPDATE if can_update else 0) | (DELETE if can_delete else 0))
+
+
+def build_matrix(user):
+    """Kullanıcının yetki matrisini veritabanından hesaplar: {'department': {api: maske}, 'any': {...}}."""
+    from ..models.models import APIAccessPermission
+
+    department_ids = list(user.departments.values_list('id', flat=True))
+    position_ids = list(user.positions.values_list('id', flat=True))
+    columns = ('id', 'api__name', 'api__is_active', 'can_create', 'can_read', 'can_update', 'can_delete')
+
+    rows = {}
+    via_department = set()
+    if department_ids:
+        for row in APIAccessPermission.objects.filter(departments__in=department_ids).values_list(*columns):
+            rows[row[0]] = row
+            via_department.add(row[0])
+    if position_ids:
+        for row in APIAccessPermission.objects.filter(positions__in=position_ids).values_list(*columns):
+            rows[row[0]] = row
+
+    matrix = {'department': {}, 'any': {}}
+    for pk, (_, api_name, api_active, *flags) in rows.items():
+        mask = _mask(*flags)
+        if pk in via_department:
+            matrix['department'][api_name] = mask
+        if api_active:
+            matrix['any'][api_name] = mask
+    return matrix
+
+
+def _versions(user_id):
+    user_key = USER_VERSION_KEY.format(user_id=user_id)
+    values = cache.get_many([GLOBAL_VERSION_KEY, user_key])
+    return values.get(GLOBAL_VERSION_KEY, 0), values.get(user_key, 0)
+
+
+def get_matrix(user):
+    """Kullanıcının yetki matrisi; süreç içi → Redis → veritabanı sırasıyla aranır."""
+    user_id = user.pk
+    now = time.monotonic()
+    entry = _local.get(user_id)
+    if entry is not None and now - entry[2] < settings.DPAP_PERMISSION_LOCAL_TTL:
+        return entry[0]
+
+    version = _versions(user_id)
+    if entry is not None and entry[1] == version:
+        with _local_lock:
+            _local[user_id] = (entry[0], version, now)
+        return entry[0]
+
+    key = MATRIX_KEY.format(user_id=user_id, global_version=version[0], user_version=version[1])
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = build_matrix(user)
+        cache.set(key, matrix, timeout=settings.DPAP_PERMISSION_CACHE_TIMEOUT)
+
+    with _local_lock:
+        _local[user_id] = (matrix, version, now)
+    return matrix
+
+
+def has_permission(user, api_name, action, scope='department'):
+    """
+    Kullanıcının `api_name` üzerinde `action` (create/read/update/delete ya da HTTP metodu)
+    yetkisi var mı?  scope: 'department' veya 'any' (bkz. modül açıklaması)
+    """
+    if user is None or not user.is_authenticated:
+        return False
+    required = ACTIONS.get(action) or METHOD_ACTIONS.get(action)
+    if not required:
+        return False
+    return bool(get_matrix(user)[scope].get(api_name, 0) & required)
+
+
+def has_any_access(user, api_name, scope='any'):
+    """Kullanıcı için API'ye tanımlı herhangi bir izin kaydı var mı (yetkiden bağımsız)?"""
+    if user is None or not user.is_authenticated:
+        return False
+    return api_name in get_matrix(user)[scope]
+
+
+# ---------------------------------------------------------------------- #
+# Geçersiz kılma
+# ---------------------------------------------------------------------- #
+def _bump(key):
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:  # anahtar bu arada düştüyse
+            cache.set(key, 1, timeout=None)
+
+
+def invalidate_all():
+    """Tüm kullanıcıların matrislerini geçersiz kılar."""
+    _bump(GLOBAL_VERSION_KEY)
+    with _local_lock:
+        _local.clear()
+
+
+def invalidate_users(user_ids):
+    """Verilen kullanıcıların matrislerini geçersiz kılar."""
+    with _local_lock:
+        for user_id in user_ids:
+            _local.pop(user_id, None)
+    for user_id in user_ids:
+        _bump(USER_VERSION_KEY.format(user_id=user_id))
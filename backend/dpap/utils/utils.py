@@ -2,9 +2,9 @@
 from functools import wraps
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Q
 from authcentral.models import CustomUser 
-from ..models.models import API, APIAccessPermission, APIAuditLog
+from ..models.models import API, APIAuditLog
+from .permission_resolver import has_permission, has_any_access
 
 def has_api_access(user: CustomUser, api_name: str) -> bool:
     """
@@ -17,22 +17,8 @@ def has_api_access(user: CustomUser, api_name: str) -> bool:
     Returns:
         bool: Erişim izni varsa True, yoksa False.
     """
-    if not user.is_authenticated:
-        return False
-
-    # Kullanıcının departman ve pozisyonlarına göre API erişim izni kontrolü
-    user_departments = user.departments.all()
-    user_positions = user.positions.all()
-
-    # İlgili API'ye erişim izni olup olmadığını kontrol et
-    permissions = APIAccessPermission.objects.filter(
-        api__name=api_name,
-        api__is_active=True
-    ).filter(
-        Q(departments__in=user_departments) | Q(positions__in=user_positions)
-    ).first()
-
-    return permissions is not None
+    # Departman veya pozisyon üzerinden tanımlı izin; kullanıcı başına önbelleklenmiş matristen
+    return has_any_access(user, api_name, scope='any')
 
 
 def api_access_required(api_name: str):
@@ -71,34 +57,7 @@ def has_crud_permission(user: CustomUser, api_name: str, action: str) -> bool:
     Returns:
         bool: Yetki varsa True, yoksa False.
     """
-    if not user.is_authenticated:
-        return False
-
-    # Kullanıcının departman ve pozisyonlarına göre CRUD yetkilerini kontrol et
-    user_departments = user.departments.all()
-    user_positions = user.positions.all()
-
-    permissions = APIAccessPermission.objects.filter(
-        api__name=api_name,
-        api__is_active=True
-    ).filter(
-        Q(departments__in=user_departments) | Q(positions__in=user_positions)
-    ).first()
-
-    if not permissions:
-        return False
-
-    # CRUD işlemi yetkisi kontrolü
-    if action == 'create' and permissions.can_create:
-        return True
-    if action == 'read' and permissions.can_read:
-        return True
-    if action == 'update' and permissions.can_update:
-        return True
-    if action == 'delete' and permissions.can_delete:
-        return True
-
-    return False
+    return has_permission(user, api_name, action, scope='any')
 
 
 def log_api_access(user: CustomUser, api_name: str, success: bool):
@@ -4,6 +4,8 @@ from django.conf import settings
 from loguru import logger
 from django.db import DatabaseError
 
+from hanadbcon.utilities.connection_pool import get_pool, PoolTimeoutError
+
 # .env dosyasındaki ayarları yükleyin
 DB_HOST = settings.HANADB_HOST
 DB_PORT = settings.HANADB_PORT
@@ -12,19 +14,23 @@ DB_PASS = settings.HANADB_PASS
 DB_SCHEMA = settings.HANADB_SCHEMA
 
 def create_hana_connection(retries=3):
+    """
+    Ortak HANA bağlantı havuzundan bağlantı alır (hanadbcon.utilities.connection_pool).
+    Dönen bağlantının `close()` çağrısı bağlantıyı havuza iade eder.
+    """
     while retries > 0:
         try:
-            conn = dbapi.connect(
-                address  = DB_HOST,
-                port     = int(DB_PORT),
-                user     = DB_USER,
-                password = DB_PASS,
-                currentSchema = DB_SCHEMA
-            )
+            conn = get_pool().acquire()
+            if DB_SCHEMA:
+                try:
+                    # Havuz, bağlantı iade edilirken şemayı varsayılana döndürür; diğer kullanıcılara sızmaz
+                    conn.set_schema(DB_SCHEMA)
+                except dbapi.Error:
+                    conn.invalidate()
+                    raise
             return conn
-        except dbapi.Error as e:
+        except (dbapi.Error, PoolTimeoutError) as e:
             retries -= 1
             logger.warning(f"HANA Bağlantı Hatası: {str(e)}. Kalan deneme sayısı: {retries}")
 
     raise DatabaseError(f"HANA server ile bağlantı kurulamadı.")
-
@@ -10,7 +10,7 @@ from django.conf import settings
 from filesharehub_v2.api.permissions import ReadOnlyPermission
 from filesharehub_v2.utils.samba_path import secure_join
 from filesharehub_v2.utils.fs_scanner import list_directory
-from filesharehub_v2.tasks.generate_thumbnail import scan_directory_task
+from filesharehub_v2.tasks.generate_thumbnail import scan_directory_task, directory_scan_coordinator
 
 
 class DirectoryView(APIView):
@@ -29,15 +29,17 @@ class DirectoryView(APIView):
         if not os.path.isdir(abs_path):
             return Response({"detail": "Klasör bulunamadı."}, status=404)
 
-        # 3️⃣ Arka planda Celery taramasını tetikle (async)
+        # 3️⃣ Arka planda Celery taramasını tetikle (async); dizin yakın zamanda tarandıysa
+        #     veya taraması sürüyorsa yeni görev oluşturulmaz
+        coordinator = directory_scan_coordinator(abs_path)
         try:
-            scan_directory_task.delay(abs_path)
+            coordinator.request(scan_directory_task, args=(abs_path,))
         except Exception as exc:
             print(f"[ScanTriggerError] Tarama başlatılamadı: {exc}")
 
         # 4️⃣ Anlık dizin verisini döndür
         try:
             data = list_directory(abs_path, rel_path)
-            return Response(data)
+            return Response(data, headers=coordinator.headers())
         except Exception as exc:
             return Response({"detail": f"Listeleme hatası: {exc}"}, status=500)
@@ -1,4 +1,5 @@
 # backend/filesharehub_v2/tasks/generate_thumbnail.py
+import hashlib
 import os
 import time
 from celery import shared_task
@@ -10,6 +11,7 @@ from urllib.parse import unquote
 
 from filesharehub_v2.models.filerecord import FileRecord
 from filesharehub_v2.utils.cache import cache_thumbnail_path
+from sapreports.refresh_coordinator import RefreshCoordinator
 
 @shared_task(bind=True, max_retries=4)
 def generate_thumbnail(self, file_id):
@@ -87,6 +89,12 @@ def generate_thumbnail(self, file_id):
         cache.delete(lock_key)
 
 
+def directory_scan_coordinator(abs_path):
+    """Dizin başına tarama koordinatörü: aynı dizin için yinelenen taramaları tekilleştirir."""
+    digest = hashlib.sha1(abs_path.encode()).hexdigest()
+    return RefreshCoordinator(f"fsh2-scan:{digest}", max_age=getattr(settings, "FILESHAREHUB_SCAN_MAX_AGE", 300))
+
+
 @shared_task(bind=True, max_retries=3)
 def scan_directory_task(self, abs_path):
     """
@@ -94,7 +102,8 @@ def scan_directory_task(self, abs_path):
     """
     from filesharehub_v2.utils.fs_scanner import sync_directory
     try:
-        sync_directory(abs_path)
+        with directory_scan_coordinator(abs_path).track():
+            sync_directory(abs_path)
     except Exception as e:
         print(f"[DirectoryScan-Task-Error] Path: {abs_path} - Hata: {e}")
         raise self.retry(exc=e, countdown=120)
\ No newline at end of file
@@ -1,6 +1,7 @@
 # backend/hanadbcon/admin.py
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models.sq_query_model import SQLQuery
+from .services.query_executor import hana_executor
 from import_export.admin import ImportExportModelAdmin
 
 
@@ -8,9 +9,22 @@ class SQLQueryAdmin(ImportExportModelAdmin):
     """
     SQLQuery modelini yönetmek için admin paneli ayarları.
     """
-    list_display = ('name', 'query_preview', 'departments_list', 'positions_list')
+    list_display = ('name', 'query_preview', 'stream_mode', 'cache_ttl', 'departments_list', 'positions_list')
+    list_filter = ('stream_mode',)
     search_fields = ('name', 'query')
     filter_horizontal = ('departments', 'positions')  # Many-to-Many alanlarını düzenlemek için
+    actions = ['invalidate_result_cache']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Sorgu metni/parametreleri değişmiş olabilir; eski sonuçlar sunulmasın
+        hana_executor.invalidate_cache(obj.name)
+
+    @admin.action(description="Seçili sorguların sonuç önbelleğini temizle")
+    def invalidate_result_cache(self, request, queryset):
+        for query in queryset:
+            hana_executor.invalidate_cache(query.name)
+        messages.success(request, f"{queryset.count()} sorgunun sonuç önbelleği temizlendi.")
 
     def query_preview(self, obj):
         """
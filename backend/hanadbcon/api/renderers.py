@@ -0,0 +1,66 @@
+# backend/hanadbcon/api/renderers.py
+"""
+Sorgu endpoint'leri için kolon bazlı ikili renderer'lar (içerik müzakeresi ile seçilir).
+
+    Accept: application/vnd.apache.arrow.stream   veya   ?format=arrow
+    Accept: application/x-msgpack                 veya   ?format=msgpack
+
+View bu renderer'lar seçildiğinde `ColumnarResult` döndürür; satırlar dict'e çevrilmeden
+doğrudan kolonlara aktarılır.
+"""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from ..utilities.columnar import (
+    ARROW_AVAILABLE,
+    ARROW_STREAM_CONTENT_TYPE,
+    MSGPACK_CONTENT_TYPE,
+    encode_arrow,
+    encode_msgpack,
+)
+
+
+class ColumnarResult:
+    """Kolon adları ve ham satırlar (tuple listesi)."""
+
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+
+
+class ArrowStreamRenderer(BaseRenderer):
+    media_type = ARROW_STREAM_CONTENT_TYPE
+    format = 'arrow'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return encode_arrow(data.columns, data.rows)
+
+
+class MsgpackColumnarRenderer(BaseRenderer):
+    media_type = MSGPACK_CONTENT_TYPE
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return encode_msgpack(data.columns, data.rows)
+
+
+COLUMNAR_RENDERERS = ([ArrowStreamRenderer] if ARROW_AVAILABLE else []) + [MsgpackColumnarRenderer]
+
+
+def is_columnar(renderer):
+    return isinstance(renderer, (ArrowStreamRenderer, MsgpackColumnarRenderer))
+
+
+def use_json_renderer(request):
+    """
+    Hata yanıtları ikili biçimde kodlanamaz; istek kolon bazlı bir biçim istemiş olsa da
+    yanıtın JSON olarak yazılmasını sağlar.
+    """
+    if is_columnar(getattr(request, 'accepted_renderer', None)):
+        request.accepted_renderer = JSONRenderer()
+        request.accepted_media_type = JSONRenderer.media_type
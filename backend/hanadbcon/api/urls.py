@@ -1,8 +1,10 @@
 # URL'ye göre view bağlama
 from django.urls import path
-from .views import SQLQueryView, SQLQueryListView
+from .views import SQLQueryView, SQLQueryListView, HanaPoolStatsView, QueryResultCacheStatsView
 
 urlpatterns = [
     path('query/<str:query_name>/', SQLQueryView.as_view(), name='sqlquery-detail-hana'),
     path('queries/', SQLQueryListView.as_view(), name='sqlquery-list-hana'),
+    path('pool/stats/', HanaPoolStatsView.as_view(), name='hana-pool-stats'),
+    path('cache/stats/', QueryResultCacheStatsView.as_view(), name='query-result-cache-stats'),
 ]
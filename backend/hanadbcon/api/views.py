@@ -3,11 +3,21 @@ from django.urls import reverse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.settings import api_settings
 #from rest_framework.permissions import IsAuthenticated
 #from rest_framework_simplejwt.authentication import JWTAuthentication
 from ..models.sq_query_model import SQLQuery
-from ..utilities.hanadb_config import create_connection
-from django.conf import settings
+from ..services.query_executor import (
+    hana_executor,
+    QueryNotFoundError,
+    QueryParameterError,
+    QueryConnectionError,
+    QueryExecutionError,
+)
+from ..utilities.connection_pool import pool_stats
+from ..services.result_cache import result_cache
+from ..utilities.streaming import build_streaming_response
+from .renderers import COLUMNAR_RENDERERS, ColumnarResult, is_columnar, use_json_renderer
 
 class SQLQueryListView(APIView):
 
@@ -25,48 +35,77 @@ class SQLQueryListView(APIView):
         return Response(queries_list, status=status.HTTP_200_OK)
 
 class SQLQueryView(APIView):
+    """
+    Kayıtlı sorguyu çalıştırıp sonucu JSON döndürür.
+    Sorgu yürütme `services.query_executor` içindedir; aynı süreçteki kodlar HTTP yerine doğrudan onu kullanmalıdır.
+
+    Akış modu (`?stream=ndjson|json|off` veya `SQLQuery.stream_mode`):
+    sonuç `fetchmany` batch'leri halinde okunur ve `StreamingHttpResponse` ile yazılır,
+    böylece büyük sonuç kümeleri bellekte tamamen oluşturulmaz. `?batch_size=` batch boyutunu ezer.
+
+    Kolon bazlı ikili biçim (`Accept: application/vnd.apache.arrow.stream` / `application/x-msgpack`
+    veya `?format=arrow|msgpack`): tipli kolonlar ve tek şema başlığı ile döner, akış modundan önceliklidir.
+    """
     #authentication_classes = [JWTAuthentication]
     #permission_classes = [IsAuthenticated]
+    renderer_classes = list(api_settings.DEFAULT_RENDERER_CLASSES) + COLUMNAR_RENDERERS
 
     def get(self, request, query_name):
-        # SQL sorgusunu adına göre bulma
-        sql_query_instance = SQLQuery.objects.filter(name=query_name).first()
-        if not sql_query_instance:
-            return Response({"error": "Sorgu bulunamadı"}, status=status.HTTP_404_NOT_FOUND)
-
-        # HANA DB bağlantısı
-        connection = create_connection()
-        if not connection:
-            return Response({"error": "Veritabanı bağlantısı kurulamadı"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        # Schema parametresini al, eğer yoksa settings.py'daki varsayılan değeri kullan
-        schema = request.query_params.get('schema', settings.HANADB_SCHEMA)
-        
-        # Sorgu için parametreleri al
-        parameters = []
-        if sql_query_instance.parameters:
-            for param in sql_query_instance.parameters:
-                param_value = request.query_params.get(param['name'])
-                if not param_value:
-                    return Response({"error": f"{param['name']} parametresi eksik"}, status=status.HTTP_400_BAD_REQUEST)
-                parameters.append(param_value)
-
-        # SQL sorgusunu formatlama
-        formatted_query = sql_query_instance.query.replace("{schema}", schema)
-
-        cursor = connection.cursor()
+        # Schema parametresi yoksa settings.py'daki varsayılan değer kullanılır
+        schema = request.query_params.get('schema')
         try:
-            # Parametreleri güvenli şekilde SQL sorgusuna bağla
-            cursor.execute(formatted_query, parameters)
-            rows = cursor.fetchall()
-            columns = [col[0] for col in cursor.description]
-            result = [dict(zip(columns, row)) for row in rows]
-        except Exception as e:
+            instance = hana_executor.get_query(query_name)
+            prepared = hana_executor.prepare(query_name, request.query_params, schema, instance=instance)
+
+            if is_columnar(request.accepted_renderer):
+                columns, rows = hana_executor.fetch_columnar(query_name, prepared=prepared)
+                return Response(ColumnarResult(columns, rows), status=status.HTTP_200_OK)
+
+            stream_mode = request.query_params.get('stream', instance.stream_mode)
+            if stream_mode in (SQLQuery.STREAM_NDJSON, SQLQuery.STREAM_JSON):
+                batch_size = _positive_int(request.query_params.get('batch_size'), instance.fetch_batch_size)
+                batches = hana_executor.iter_batches(query_name, batch_size=batch_size, prepared=prepared)
+                # Sorgu ilk next() çağrısında çalışır; hatalar yanıt başlamadan burada yakalanır
+                columns = next(batches)
+                return build_streaming_response(columns, batches, stream_mode)
+
+            result = hana_executor.execute(query_name, prepared=prepared)
+        except QueryNotFoundError as e:
+            use_json_renderer(request)
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except QueryConnectionError as e:
+            use_json_renderer(request)
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except (QueryParameterError, QueryExecutionError) as e:
+            use_json_renderer(request)
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        finally:
-            cursor.close()
-            connection.close()
 
         return Response(result, status=status.HTTP_200_OK)
 
 
+def _positive_int(value, default):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+class HanaPoolStatsView(APIView):
+    """
+    Bu worker sürecine ait HANA bağlantı havuzu metriklerini döndürür
+    (checkouts, waits, evictions, in_use, idle).
+    """
+
+    def get(self, request):
+        return Response(pool_stats(), status=status.HTTP_200_OK)
+
+
+class QueryResultCacheStatsView(APIView):
+    """
+    Bu worker sürecine ait sorgu sonuç önbelleği metriklerini döndürür
+    (hits, hits_shared, misses, coalesced, evictions, bytes). HANA ve Logo sorguları ortaktır.
+    """
+
+    def get(self, request):
+        return Response(result_cache.stats(), status=status.HTTP_200_OK)
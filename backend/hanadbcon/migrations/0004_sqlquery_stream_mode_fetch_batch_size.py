@@ -0,0 +1,23 @@
+# Generated by Django 5.0.8 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hanadbcon', '0003_alter_sqlquery_guidance_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sqlquery',
+            name='stream_mode',
+            field=models.CharField(choices=[('off', 'Kapalı (tek JSON yanıt)'), ('ndjson', 'NDJSON akışı (satır başına bir JSON nesnesi)'), ('json', 'Parçalı JSON dizi akışı')], default='off', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='sqlquery',
+            name='fetch_batch_size',
+            field=models.PositiveIntegerField(default=1000, help_text='Akış modunda fetchmany batch boyutu'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.8 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hanadbcon', '0004_sqlquery_stream_mode_fetch_batch_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sqlquery',
+            name='cache_ttl',
+            field=models.PositiveIntegerField(default=0, help_text='Sonuç önbelleği süresi (saniye). 0 = kapalı'),
+        ),
+    ]
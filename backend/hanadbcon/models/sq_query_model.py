@@ -6,12 +6,27 @@ from django.contrib.auth.models import Group
 
 
 class SQLQuery(BaseModel):
+    STREAM_OFF = 'off'
+    STREAM_NDJSON = 'ndjson'
+    STREAM_JSON = 'json'
+    STREAM_MODE_CHOICES = [
+        (STREAM_OFF, 'Kapalı (tek JSON yanıt)'),
+        (STREAM_NDJSON, 'NDJSON akışı (satır başına bir JSON nesnesi)'),
+        (STREAM_JSON, 'Parçalı JSON dizi akışı'),
+    ]
+
     name = models.CharField(max_length=100, unique=True)
     query = models.TextField()
     parameters = models.JSONField(default=list, blank=True, null=True)
     departments = models.ManyToManyField(Department, related_name='queries_departments', blank=True)
     positions = models.ManyToManyField(Position, blank=True) 
 
+    # Büyük sonuç kümeleri için varsayılan yanıt modu; `?stream=` parametresi ile istek bazında ezilebilir
+    stream_mode = models.CharField(max_length=10, choices=STREAM_MODE_CHOICES, default=STREAM_OFF)
+    fetch_batch_size = models.PositiveIntegerField(default=1000, help_text="Akış modunda fetchmany batch boyutu")
+    # Sonuç önbelleği süresi (sn); 0 ise sorgu her istekte yeniden çalıştırılır
+    cache_ttl = models.PositiveIntegerField(default=0, help_text="Sonuç önbelleği süresi (saniye). 0 = kapalı")
+
     # SQL sorguları için klavuz metni
     guidance_text = models.TextField(
         default="""
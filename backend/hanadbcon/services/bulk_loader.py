@@ -0,0 +1,262 @@
+# backend/hanadbcon/services/bulk_loader.py
+"""
+PostgreSQL `COPY FROM STDIN` tabanlı toplu yükleyici.
+
+`bulk_create(batch_size=1000)` her 1000 satır için ayrı bir INSERT ifadesi ve her satır için
+bir model nesnesi üretir; milyonluk tablolarda binlerce round-trip demektir. Bu modül:
+
+    1) Hedef tablonun kolonlarıyla geçici bir staging tablosu açar (ON COMMIT DROP)
+    2) Satırları bellekte biriktirmeden CSV olarak `COPY ... FROM STDIN` ile akıtır
+    3) Staging'i tek bir SQL ifadesiyle hedefe birleştirir:
+         insert  : INSERT ... SELECT
+         upsert  : INSERT ... SELECT ... ON CONFLICT (anahtar) DO UPDATE (yalnızca değişen satırlar)
+         replace : hedef tablo boşaltılıp INSERT ... SELECT
+         sync    : upsert + staging'de bulunmayan hedef satırlarının silinmesi
+
+Kullanım:
+    from hanadbcon.services.bulk_loader import copy_load
+
+    stats = copy_load(OrderDetail, rows, fields=['order_number', 'order_date', ...])
+    stats = copy_load(SalesOrderDetail, rows, fields=[...], mode='upsert', unique_fields=['uniq_detail_no'])
+
+`rows` bir `dict` iterable'ıdır (model alan adı → değer). Değerler `bulk_create` ile aynı
+şekilde `field.get_db_prep_save` üzerinden hazırlanır. Yalnızca PostgreSQL desteklenir.
+"""
+import datetime
+import json
+import logging
+import time
+import uuid
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+MODES = ('insert', 'upsert', 'replace', 'sync')
+
+
+class BulkLoadError(Exception):
+    """Toplu yükleme yapılamadı (desteklenmeyen veritabanı, hatalı parametre vb.)."""
+
+
+# ---------------------------------------------------------------------- #
+# CSV kodlama
+# ---------------------------------------------------------------------- #
+def _to_text(value):
+    """Hazırlanmış değeri COPY CSV hücresine çevirir. None tırnaksız boş hücre (NULL) olur."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        text = 'true' if value else 'false'
+    elif isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        text = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        text = json.dumps(value, ensure_ascii=False)
+    elif hasattr(value, 'adapted'):  # psycopg2 Json sarmalayıcısı
+        text = json.dumps(value.adapted, ensure_ascii=False)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        text = '\\x' + bytes(value).hex()
+    else:
+        text = str(value)
+    # Tırnaklı boş hücre boş metin, tırnaksız boş hücre NULL'dur
+    return '"' + text.replace('"', '""') + '"'
+
+
+class _CsvStream:
+    """
+    `copy_expert` için dosya benzeri okuyucu: satırları istendikçe CSV'ye çevirir,
+    böylece tüm veri hiçbir zaman bellekte toplanmaz.
+    """
+
+    def __init__(self, lines):
+        self._lines = lines
+        self._buffer = b''
+        self.rows = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = 1 << 20
+        while len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+            self.rows += 1
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+# ---------------------------------------------------------------------- #
+# Yükleyici
+# ---------------------------------------------------------------------- #
+class CopyLoader:
+    """
+    model         : Hedef Django modeli
+    fields        : COPY ile yüklenecek model alanları
+    mode          : insert | upsert | replace | sync
+    unique_fields : upsert / sync için çakışma anahtarı (unique kısıtı olmalı)
+    update_fields : upsert'te güncellenecek alanlar (varsayılan: anahtar dışındaki tüm `fields`)
+    on_error      : Satır hazırlanırken hata olursa çağrılır: on_error(sıra_no, row, exc);
+                    verilmezse hata yükseltilir
+    """
+
+    def __init__(self, model, fields, mode='insert', unique_fields=None, update_fields=None,
+                 using=None, on_error=None):
+        if mode not in MODES:
+            raise BulkLoadError(f"Geçersiz mod: {mode}")
+        if mode in ('upsert', 'sync') and not unique_fields:
+            raise BulkLoadError(f"'{mode}' modu için unique_fields gerekli")
+
+        self.model = model
+        self.meta = model._meta
+        self.mode = mode
+        self.using = using or router.db_for_write(model)
+        self.connection = connections[self.using]
+        if self.connection.vendor != 'postgresql':
+            raise BulkLoadError("COPY yükleyici yalnızca PostgreSQL ile kullanılabilir")
+
+        self.fields = [self.meta.get_field(name) for name in fields]
+        self.unique_fields = [self.meta.get_field(name) for name in (unique_fields or [])]
+        names = {f.name for f in self.unique_fields}
+        self.update_fields = [
+            self.meta.get_field(name) for name in (update_fields or [f.name for f in self.fields])
+            if name not in names
+        ]
+        self.on_error = on_error
+
+        # Silme, Django'nun CASCADE işlemlerini atlar; ilişkili tabloları olan modellerde kullanılmaz
+        if mode in ('replace', 'sync') and self.meta.related_objects:
+            raise BulkLoadError(f"'{mode}' modu ilişkili kayıtları olan modellerde kullanılamaz: {model.__name__}")
+
+        # Satırlarda gelmeyen ama değeri Python tarafında üretilen alanlar (auto_now, default).
+        # Sabit değerler birleştirme ifadesine tek parametre olarak verilir; callable default'lar
+        # (uuid4 vb.) her satır için ayrı çağrılıp COPY akışına eklenir (`per_row`).
+        loaded = {f.name for f in self.fields}
+        self.generated, self.per_row = [], []
+        for f in self.meta.concrete_fields:
+            if f.name in loaded or f.primary_key:
+                continue
+            if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False):
+                self.generated.append(f)
+            elif f.has_default():
+                (self.per_row if callable(f.default) else self.generated).append(f)
+        self.copied = self.fields + self.per_row
+
+    # ------------------------------------------------------------------ #
+    def _qn(self, name):
+        return self.connection.ops.quote_name(name)
+
+    def _lines(self, rows):
+        connection = self.connection
+        fields = self.fields
+        per_row = self.per_row
+        for index, row in enumerate(rows, start=1):
+            try:
+                cells = [_to_text(f.get_db_prep_save(row.get(f.name), connection)) for f in fields]
+                if per_row:
+                    cells.extend(_to_text(f.get_db_prep_save(f.get_default(), connection)) for f in per_row)
+            except Exception as e:
+                if self.on_error is None:
+                    raise
+                self.on_error(index, row, e)
+                continue
+            yield (','.join(cells) + '\n').encode('utf-8')
+
+    def _generated_values(self):
+        now = timezone.now()
+        values = []
+        for f in self.generated:
+            if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False):
+                value = now.date() if f.get_internal_type() == 'DateField' else now
+            else:
+                value = f.get_default()
+            values.append(f.get_db_prep_save(value, self.connection))
+        return values
+
+    def _merge_sql(self, staging):
+        table = self._qn(self.meta.db_table)
+        loaded = [self._qn(f.column) for f in self.copied]
+        generated = [self._qn(f.column) for f in self.generated]
+        target_columns = ', '.join(loaded + generated)
+        select_columns = ', '.join(loaded + ['%s'] * len(generated))
+
+        select = f'SELECT {select_columns} FROM {staging}'
+        if self.mode in ('upsert', 'sync'):
+            keys = ', '.join(self._qn(f.column) for f in self.unique_fields)
+            # Staging'de aynı anahtar birden fazla kez varsa ON CONFLICT hata verir; sonuncusu kalır
+            select = f'SELECT DISTINCT ON ({keys}) {select_columns} FROM {staging} ORDER BY {keys}, _seq DESC'
+
+        sql = f'INSERT INTO {table} ({target_columns}) {select}'
+        if self.mode in ('upsert', 'sync'):
+            keys = ', '.join(self._qn(f.column) for f in self.unique_fields)
+            update_columns = [self._qn(f.column) for f in self.update_fields]
+            if update_columns:
+                touched = update_columns + [
+                    self._qn(f.column) for f in self.generated if getattr(f, 'auto_now', False)
+                ]
+                assignments = ', '.join(f'{c} = EXCLUDED.{c}' for c in touched)
+                current = ', '.join(f'{table}.{c}' for c in update_columns)
+                incoming = ', '.join(f'EXCLUDED.{c}' for c in update_columns)
+                sql += (
+                    f' ON CONFLICT ({keys}) DO UPDATE SET {assignments}'
+                    f' WHERE ({current}) IS DISTINCT FROM ({incoming})'
+                )
+            else:
+                sql += f' ON CONFLICT ({keys}) DO NOTHING'
+        return sql
+
+    def load(self, rows):
+        """Satırları yükler ve {'staged', 'written', 'deleted', 'timings'} döndürür."""
+        started = time.monotonic()
+        table = self._qn(self.meta.db_table)
+        staging = self._qn(f'_stg_{uuid.uuid4().hex[:12]}')
+        loaded = ', '.join(self._qn(f.column) for f in self.copied)
+        stats = {'staged': 0, 'written': 0, 'deleted': 0, 'timings': {}}
+
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMP TABLE {staging} ON COMMIT DROP AS '
+                f'SELECT {loaded} FROM {table} WITH NO DATA'
+            )
+            # Aynı anahtarın tekrarlarında son gelen satırı seçebilmek için sıra numarası
+            cursor.execute(f'ALTER TABLE {staging} ADD COLUMN _seq bigserial')
+
+            phase = time.monotonic()
+            stream = _CsvStream(self._lines(iter(rows)))
+            raw_cursor = cursor.cursor if hasattr(cursor, 'cursor') else cursor
+            raw_cursor.copy_expert(f'COPY {staging} ({loaded}) FROM STDIN WITH (FORMAT csv)', stream)
+            stats['staged'] = stream.rows
+            stats['timings']['copy'] = round(time.monotonic() - phase, 3)
+
+            phase = time.monotonic()
+            if self.mode == 'replace':
+                cursor.execute(f'DELETE FROM {table}')
+                stats['deleted'] = cursor.rowcount
+            if self.mode == 'sync':
+                match = ' AND '.join(
+                    f's.{self._qn(f.column)} = t.{self._qn(f.column)}' for f in self.unique_fields
+                )
+                cursor.execute(
+                    f'DELETE FROM {table} AS t WHERE NOT EXISTS (SELECT 1 FROM {staging} AS s WHERE {match})'
+                )
+                stats['deleted'] = cursor.rowcount
+
+            cursor.execute(self._merge_sql(staging), self._generated_values())
+            stats['written'] = cursor.rowcount
+            stats['timings']['merge'] = round(time.monotonic() - phase, 3)
+
+        stats['timings']['total'] = round(time.monotonic() - started, 3)
+        logger.info(f"COPY yükleme tamamlandı ({self.meta.db_table}, {self.mode}): {stats}")
+        return stats
+
+
+def copy_load(model, rows, fields, mode='insert', unique_fields=None, update_fields=None,
+              using=None, on_error=None):
+    """`CopyLoader(...).load(rows)` kısayolu."""
+    loader = CopyLoader(model, fields, mode=mode, unique_fields=unique_fields,
+                        update_fields=update_fields, using=using, on_error=on_error)
+    return loader.load(rows)
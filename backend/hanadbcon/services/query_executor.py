@@ -0,0 +1,319 @@
+# backend/hanadbcon/services/query_executor.py
+"""
+Kayıtlı `SQLQuery` sorgularını aynı Django süreci içinde çalıştıran yürütücü.
+
+Rapor uygulamaları eskiden `http://{SERVER_HOST}/api/v2/hanadbcon/query/<ad>/` adresine
+HTTP isteği atıyordu (JWT + JSON serileştirme + ikinci bir gunicorn worker).
+Artık doğrudan bu modül kullanılır; HTTP endpoint'i de bu yürütücünün ince bir sarmalayıcısıdır.
+
+Kullanım:
+    from hanadbcon.services.query_executor import run_query, iter_query
+
+    rows = run_query("supplierpayment")                          # list[dict]
+    rows = run_query("item_purchase_history", {"item_code": "X"})
+    for row in iter_query("salesorderdocsum", batch_size=2000):  # satır satır
+        ...
+    for rows in iter_query_batches("supplierpayment"):           # list[dict] batch'leri
+        ...
+
+`json_compatible=True` verilirse değerler HTTP yanıtındaki haliyle döner
+(Decimal → float, date/datetime → ISO metin); HTTP'den gelen veriyi bekleyen
+mevcut tüketiciler bu modu kullanır.
+
+Uygulamaların `fetch_*_data(token=None)` fonksiyonları ve senkronizasyon görevleri `token`
+parametresini yalnızca geriye dönük uyumluluk için (kuyruktaki eski görev mesajları ve mevcut
+çağıranlar) imzada tutar; süreç içi çalıştırmada JWT gerekmediğinden kullanılmaz.
+"""
+import datetime
+import decimal
+import logging
+import uuid
+from contextlib import contextmanager, ExitStack
+
+from django.conf import settings
+
+from ..models.sq_query_model import SQLQuery
+from ..utilities.connection_pool import hana_connection, is_connection_error, PoolTimeoutError
+from .result_cache import result_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class QueryError(Exception):
+    """Sorgu yürütücüsünün temel hata sınıfı."""
+
+
+class QueryNotFoundError(QueryError):
+    """Verilen isimde kayıtlı sorgu yok."""
+
+
+class QueryParameterError(QueryError):
+    """Sorgunun zorunlu parametrelerinden biri eksik."""
+
+
+class QueryConnectionError(QueryError):
+    """Veritabanı bağlantısı kurulamadı."""
+
+
+class QueryExecutionError(QueryError):
+    """Sorgu veritabanında çalıştırılırken hata oluştu."""
+
+
+# ---------------------------------------------------------------------- #
+# JSON uyumlu değer dönüşümü (DRF JSONEncoder ile aynı sonuç)
+# ---------------------------------------------------------------------- #
+def _datetime_to_json(value):
+    representation = value.isoformat()
+    if representation.endswith('+00:00'):
+        representation = representation[:-6] + 'Z'
+    return representation
+
+
+_JSON_PASSTHROUGH = (str, int, float, bool, type(None))
+
+
+def to_json_compatible(value):
+    """
+    Tek bir hücre değerini, DRF `JSONEncoder` + `json.loads` gidiş-dönüşünün
+    üreteceği değere çevirir (HTTP üzerinden alınan veriyle birebir aynı tipler).
+    """
+    if isinstance(value, _JSON_PASSTHROUGH):
+        return value
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, datetime.datetime):
+        return _datetime_to_json(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return str(value.total_seconds())
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode()
+    return value
+
+
+def _discard_if_broken(conn, exc):
+    """
+    Bağlantı düzeyindeki hatalarda bağlantı havuza geri konmaz. Hata `QueryError` tipine
+    sarmalanmadan önce çağrılır; havuzun kendi kontrolü sarmalanmış hatayı her zaman tanıyamaz.
+    """
+    invalidate = getattr(conn, "invalidate", None)
+    if invalidate is not None and is_connection_error(exc, conn):
+        logger.warning(f"Bozuk veritabanı bağlantısı havuzdan çıkarıldı: {exc}")
+        invalidate()
+
+
+def _close_quietly(cursor):
+    try:
+        cursor.close()
+    except Exception:
+        pass
+
+
+class PreparedQuery:
+    """Çalıştırılmaya hazır sorgu: formatlanmış SQL metni, sıralı parametreler ve önbellek süresi."""
+
+    __slots__ = ("name", "sql", "params", "schema", "cache_ttl")
+
+    def __init__(self, name, sql, params, schema=None, cache_ttl=0):
+        self.name = name
+        self.sql = sql
+        self.params = params
+        self.schema = schema
+        self.cache_ttl = cache_ttl
+
+
+class SQLQueryExecutor:
+    """
+    `SQLQuery` modelindeki kayıtları adına göre bulup çalıştırır.
+
+    model              : SQLQuery model sınıfı (hanadbcon veya logodbcon)
+    connection_factory : `with connection_factory() as conn:` şeklinde bağlantı veren fonksiyon
+    default_schema     : `{schema}` placeholder'ı için varsayılan değer (None ise değiştirme yapılmaz)
+    result_cache       : `SQLQuery.cache_ttl` > 0 olan sorguların sonuçlarını tutan önbellek
+    """
+
+    def __init__(self, model, connection_factory, default_schema=None, label="HANA", result_cache=None):
+        self.model = model
+        self.connection_factory = connection_factory
+        self.default_schema = default_schema
+        self.label = label
+        self.result_cache = result_cache
+
+    # ------------------------------------------------------------------ #
+    # Hazırlık
+    # ------------------------------------------------------------------ #
+    def get_query(self, query_name):
+        instance = self.model.objects.filter(name=query_name).first()
+        if not instance:
+            raise QueryNotFoundError("Sorgu bulunamadı")
+        return instance
+
+    def prepare(self, query_name, params=None, schema=None, instance=None):
+        """
+        Sorguyu bulur, `{schema}` placeholder'ını doldurur ve parametreleri
+        `SQLQuery.parameters` sırasına göre dizer.
+        """
+        instance = instance or self.get_query(query_name)
+        params = params or {}
+
+        bound = []
+        for param in instance.parameters or []:
+            value = params.get(param['name'])
+            if value is None or value == '':
+                raise QueryParameterError(f"{param['name']} parametresi eksik")
+            bound.append(value)
+
+        sql = instance.query
+        if self.default_schema is not None:
+            schema = schema or self.default_schema
+            sql = sql.replace("{schema}", schema)
+        return PreparedQuery(instance.name, sql, bound, schema=schema,
+                             cache_ttl=getattr(instance, "cache_ttl", 0) or 0)
+
+    @contextmanager
+    def _cursor(self, prepared):
+        with ExitStack() as stack:
+            try:
+                conn = stack.enter_context(self.connection_factory())
+            except PoolTimeoutError as e:
+                raise QueryConnectionError(str(e)) from e
+            except Exception as e:
+                logger.error(f"{self.label} veritabanına bağlanırken hata: {e}")
+                raise QueryConnectionError("Veritabanı bağlantısı kurulamadı") from e
+
+            try:
+                cursor = conn.cursor()
+            except Exception as e:
+                _discard_if_broken(conn, e)
+                logger.error(f"{self.label} bağlantısında cursor açılamadı: {e}")
+                raise QueryConnectionError("Veritabanı bağlantısı kurulamadı") from e
+            stack.callback(_close_quietly, cursor)
+            try:
+                if prepared.params:
+                    cursor.execute(prepared.sql, prepared.params)
+                else:
+                    cursor.execute(prepared.sql)
+            except Exception as e:
+                _discard_if_broken(conn, e)
+                logger.error(f"{self.label} sorgusu '{prepared.name}' çalıştırılırken hata: {e}")
+                raise QueryExecutionError(str(e)) from e
+            try:
+                yield cursor
+            except Exception as e:  # fetchall / fetchmany hataları
+                _discard_if_broken(conn, e)
+                raise
+
+    # ------------------------------------------------------------------ #
+    # Yürütme
+    # ------------------------------------------------------------------ #
+    def execute(self, query_name, params=None, schema=None, json_compatible=False, prepared=None):
+        """Sorguyu çalıştırır ve tüm sonucu `list[dict]` olarak döndürür."""
+        columns, rows = self.fetch_columnar(query_name, params, schema, prepared=prepared)
+        if json_compatible:
+            conv = to_json_compatible
+            return [{c: conv(v) for c, v in zip(columns, row)} for row in rows]
+        return [dict(zip(columns, row)) for row in rows]
+
+    def fetch_columnar(self, query_name, params=None, schema=None, prepared=None, use_cache=True):
+        """
+        Sorguyu çalıştırır ve `(kolonlar, ham satır listesi)` döndürür; satırlar dict'e çevrilmez.
+        `cache_ttl` tanımlı sorgular önbellekten sunulur (bkz. `services.result_cache`).
+        """
+        prepared = prepared or self.prepare(query_name, params, schema)
+        if use_cache and self.result_cache is not None and prepared.cache_ttl > 0:
+            key = self.result_cache.make_key(self.label, prepared.name, prepared.schema, prepared.params)
+            return self.result_cache.get_or_compute(key, prepared.cache_ttl, lambda: self._fetch_all(prepared))
+        return self._fetch_all(prepared)
+
+    def _fetch_all(self, prepared):
+        with self._cursor(prepared) as cursor:
+            try:
+                rows = cursor.fetchall()
+            except Exception as e:
+                raise QueryExecutionError(str(e)) from e
+            columns = [col[0] for col in cursor.description]
+        # Sürücüye özgü satır nesneleri (ResultRow / pyodbc.Row) önbellekte saklanabilsin diye tuple'a çevrilir
+        return columns, [tuple(row) for row in rows]
+
+    def invalidate_cache(self, query_name):
+        if self.result_cache is not None:
+            self.result_cache.invalidate(self.label, query_name)
+
+    def iter_batches(self, query_name, params=None, schema=None, batch_size=DEFAULT_BATCH_SIZE,
+                     prepared=None):
+        """
+        Sonucu `fetchmany` ile parça parça okur.
+        İlk olarak kolon listesini, ardından her biri ham satır listesi olan batch'leri üretir:
+
+            batches = executor.iter_batches("x")
+            columns = next(batches)
+            for rows in batches: ...
+        """
+        prepared = prepared or self.prepare(query_name, params, schema)
+        with self._cursor(prepared) as cursor:
+            yield [col[0] for col in cursor.description]
+            while True:
+                try:
+                    rows = cursor.fetchmany(batch_size)
+                except Exception as e:
+                    raise QueryExecutionError(str(e)) from e
+                if not rows:
+                    break
+                yield rows
+
+    def iter_dict_batches(self, query_name, params=None, schema=None, batch_size=DEFAULT_BATCH_SIZE,
+                          json_compatible=False):
+        """
+        Sonucu `list[dict]` batch'leri halinde üretir; senkronizasyon görevleri
+        tüm sonucu belleğe almadan her batch'i ayrı ayrı işleyebilir.
+        """
+        batches = self.iter_batches(query_name, params, schema, batch_size)
+        columns = next(batches)
+        conv = to_json_compatible if json_compatible else None
+        for rows in batches:
+            if conv:
+                yield [{c: conv(v) for c, v in zip(columns, row)} for row in rows]
+            else:
+                yield [dict(zip(columns, row)) for row in rows]
+
+    def iter_rows(self, query_name, params=None, schema=None, batch_size=DEFAULT_BATCH_SIZE,
+                  json_compatible=False):
+        """Sonucu bellekte toplamadan satır satır `dict` olarak üretir."""
+        batches = self.iter_batches(query_name, params, schema, batch_size)
+        columns = next(batches)
+        conv = to_json_compatible if json_compatible else None
+        for rows in batches:
+            for row in rows:
+                if conv:
+                    yield {c: conv(v) for c, v in zip(columns, row)}
+                else:
+                    yield dict(zip(columns, row))
+
+
+hana_executor = SQLQueryExecutor(
+    SQLQuery,
+    connection_factory=hana_connection,
+    default_schema=settings.HANADB_SCHEMA or "",
+    label="HANA",
+    result_cache=result_cache,
+)
+
+
+def run_query(query_name, params=None, schema=None, json_compatible=False):
+    """Kayıtlı HANA sorgusunu süreç içinde çalıştırır ve `list[dict]` döndürür."""
+    return hana_executor.execute(query_name, params, schema, json_compatible=json_compatible)
+
+
+def iter_query(query_name, params=None, schema=None, batch_size=DEFAULT_BATCH_SIZE, json_compatible=False):
+    """Kayıtlı HANA sorgusunu süreç içinde çalıştırır ve satırları tek tek üretir."""
+    return hana_executor.iter_rows(query_name, params, schema, batch_size, json_compatible=json_compatible)
+
+
+def iter_query_batches(query_name, params=None, schema=None, batch_size=DEFAULT_BATCH_SIZE, json_compatible=False):
+    """Kayıtlı HANA sorgusunu süreç içinde çalıştırır ve sonucu `list[dict]` batch'leri halinde üretir."""
+    return hana_executor.iter_dict_batches(query_name, params, schema, batch_size, json_compatible=json_compatible)
@@ -0,0 +1,292 @@
+# backend/hanadbcon/services/result_cache.py
+"""
+Kayıtlı sorgu sonuçları için TTL'li önbellek (hanadbcon ve logodbcon ortak).
+
+Anahtar  : etiket (HANA/LOGO) + sorgu adı + şema + bağlanan parametreler
+Süre     : `SQLQuery.cache_ttl` (saniye); 0 ise önbellek kullanılmaz
+Katmanlar:
+    1) Süreç içi LRU — toplam boyut (`QUERY_RESULT_CACHE_MAX_BYTES`) aşılınca en eski kayıtlar atılır.
+       Boyut serileştirme yapılmadan, örneklenen satırlardan tahmin edilir (bkz. `estimate_size`)
+    2) Paylaşımlı Redis (Django cache) — `QUERY_RESULT_CACHE_SHARED_MAX_BYTES` altındaki sonuçlar
+       worker'lar arasında paylaşılır
+
+Single-flight: aynı anahtar için eşzamanlı istekler sorguyu tek kez çalıştırır; süreç içinde
+bir Event ile, süreçler arasında Redis kilidi (`cache.add`) ile diğerleri sonucu bekler.
+
+Geçersiz kılma: her sorgu adı için Redis'te bir "nesil" sayacı tutulur ve anahtara eklenir.
+`invalidate(ad)` sayacı artırır; böylece tüm worker'lardaki eski kayıtlar kendiliğinden ıskalanır.
+"""
+import hashlib
+import json
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "qrc"
+_SIZE_SAMPLE_ROWS = 32
+
+
+def estimate_size(value):
+    """
+    `(kolonlar, satırlar)` sonucunun bellekteki yaklaşık boyutu (bayt).
+    Tüm sonucu serileştirmek yerine en fazla `_SIZE_SAMPLE_ROWS` satır ölçülür ve satır sayısıyla çarpılır.
+    """
+    if not (isinstance(value, tuple) and len(value) == 2 and isinstance(value[1], list)):
+        return sys.getsizeof(value)
+    columns, rows = value
+    size = sys.getsizeof(rows) + sum(sys.getsizeof(c) for c in columns)
+    if not rows:
+        return size
+    step = max(len(rows) // _SIZE_SAMPLE_ROWS, 1)
+    sample = rows[::step][:_SIZE_SAMPLE_ROWS]
+    per_row = sum(sys.getsizeof(row) + sum(map(sys.getsizeof, row)) for row in sample) / len(sample)
+    return size + int(per_row * len(rows))
+
+
+class _Flight:
+    """Süreç içinde devam eden tek bir sorgu yürütmesi."""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class QueryResultCache:
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, shared_max_bytes=16 * 1024 * 1024,
+                 lock_timeout=600, wait_timeout=600):
+        self.max_bytes = max_bytes
+        self.shared_max_bytes = shared_max_bytes
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._metrics = {
+            "hits": 0,
+            "hits_shared": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "expired": 0,
+            "invalidations": 0,
+            "oversize": 0,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Anahtarlar
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _generation_key(label, name):
+        return f"{_KEY_PREFIX}:gen:{label}:{name}"
+
+    def _generation(self, label, name):
+        try:
+            return cache.get(self._generation_key(label, name), 0)
+        except Exception as e:  # Redis erişilemezse yalnızca yerel katman kullanılır
+            logger.warning(f"Sorgu önbelleği nesil bilgisi okunamadı: {e}")
+            return 0
+
+    def make_key(self, label, name, schema, params):
+        digest = hashlib.sha1(
+            json.dumps([schema, list(params)], default=str, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        return f"{_KEY_PREFIX}:{label}:{name}:{self._generation(label, name)}:{digest}"
+
+    # ------------------------------------------------------------------ #
+    # Yerel katman
+    # ------------------------------------------------------------------ #
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, size, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self._metrics["expired"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            return value
+
+    def _local_set(self, key, value, size, ttl):
+        if size > self.max_bytes:
+            with self._lock:
+                self._metrics["oversize"] += 1
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._metrics["evictions"] += 1
+
+    # ------------------------------------------------------------------ #
+    # Paylaşımlı katman
+    # ------------------------------------------------------------------ #
+    def _shared_get(self, key):
+        try:
+            return cache.get(key)
+        except Exception as e:
+            logger.warning(f"Paylaşımlı sorgu önbelleği okunamadı: {e}")
+            return None
+
+    def _shared_set(self, key, value, size, ttl):
+        if size > self.shared_max_bytes:
+            return
+        try:
+            cache.set(key, value, timeout=ttl)
+        except Exception as e:
+            logger.warning(f"Paylaşımlı sorgu önbelleğine yazılamadı: {e}")
+
+    def _acquire_shared_lock(self, key):
+        try:
+            return cache.add(f"{key}:lock", 1, timeout=self.lock_timeout)
+        except Exception:
+            return True  # Redis yoksa süreçler arası koordinasyon yapılmaz
+
+    def _release_shared_lock(self, key):
+        try:
+            cache.delete(f"{key}:lock")
+        except Exception:
+            pass
+
+    def _wait_for_shared(self, key):
+        """Başka bir süreç aynı sorguyu çalıştırıyorsa sonucu Redis'te bekler."""
+        deadline = time.monotonic() + self.wait_timeout
+        delay = 0.05
+        while time.monotonic() < deadline:
+            value = self._shared_get(key)
+            if value is not None:
+                return value
+            try:
+                if not cache.get(f"{key}:lock"):
+                    return None
+            except Exception:
+                return None
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+        return None
+
+    # ------------------------------------------------------------------ #
+    # Genel API
+    # ------------------------------------------------------------------ #
+    def get_or_compute(self, key, ttl, compute):
+        """
+        Anahtar önbellekte varsa döndürür, yoksa `compute()` çağrılır.
+        Aynı anahtar için eşzamanlı çağrılar tek bir `compute()` sonucunu paylaşır.
+        """
+        value = self._local_get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+            else:
+                self._metrics["coalesced"] += 1
+
+        if not leader:
+            flight.event.wait(self.wait_timeout)
+            if flight.error is not None:
+                raise flight.error
+            if flight.value is not None:
+                return flight.value
+            return compute()
+
+        try:
+            value = self._shared_get(key)
+            if value is not None:
+                with self._lock:
+                    self._metrics["hits_shared"] += 1
+            else:
+                got_lock = self._acquire_shared_lock(key)
+                if not got_lock:
+                    value = self._wait_for_shared(key)
+                    if value is not None:
+                        with self._lock:
+                            self._metrics["coalesced"] += 1
+                if value is None:
+                    with self._lock:
+                        self._metrics["misses"] += 1
+                    try:
+                        value = compute()
+                    finally:
+                        if got_lock:
+                            self._release_shared_lock(key)
+                    size = estimate_size(value)
+                    self._shared_set(key, value, size, ttl)
+                    self._local_set(key, value, size, ttl)
+                    flight.value = value
+                    return value
+
+            size = estimate_size(value)
+            self._local_set(key, value, size, ttl)
+            flight.value = value
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def invalidate(self, label, name):
+        """Sorgunun tüm parametre kombinasyonları için önbelleği geçersiz kılar (tüm worker'larda)."""
+        gen_key = self._generation_key(label, name)
+        try:
+            try:
+                cache.incr(gen_key)
+            except ValueError:
+                cache.set(gen_key, 1, timeout=None)
+        except Exception as e:
+            logger.warning(f"Sorgu önbelleği nesli artırılamadı: {e}")
+
+        prefix = f"{_KEY_PREFIX}:{label}:{name}:"
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                _, size, _ = self._entries.pop(key)
+                self._bytes -= size
+            self._metrics["invalidations"] += 1
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._metrics)
+            data.update({
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "in_flight": len(self._flights),
+            })
+        lookups = data["hits"] + data["hits_shared"] + data["misses"]
+        data["hit_ratio"] = round((data["hits"] + data["hits_shared"]) / lookups, 4) if lookups else 0.0
+        return data
+
+
+result_cache = QueryResultCache(
+    max_bytes=getattr(settings, "QUERY_RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+    shared_max_bytes=getattr(settings, "QUERY_RESULT_CACHE_SHARED_MAX_BYTES", 16 * 1024 * 1024),
+    lock_timeout=getattr(settings, "QUERY_RESULT_CACHE_LOCK_TIMEOUT", 600),
+)
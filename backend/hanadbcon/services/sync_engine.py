@@ -0,0 +1,560 @@
+# backend/hanadbcon/services/sync_engine.py
+"""
+HANA → PostgreSQL bildirimsel (declarative) senkronizasyon motoru.
+
+Rapor uygulamalarında tekrar tekrar elle yazılmış "HANA'dan çek → sil → bulk_create" akışının
+ortak ve tek bir uygulamasıdır. Uygulama yalnızca bir `SyncSpec` tanımlar:
+
+    SUPPLIER_PAYMENT_SYNC = SyncSpec(
+        name='supplierpayment',
+        query_name='supplierpayment',
+        model=SupplierPayment,
+        natural_key=('belge_no', 'cari_kod', 'belge_tarih'),
+        field_map={
+            'belge_no': 'BELGE_NO',
+            'cari_ad': 'CARI_AD',
+            'borc': ('BORC', 0),                       # (kolon, varsayılan)
+            'is_buffer': lambda row: ...,              # türetilmiş alan
+        },
+        progress_group='supplierpayment_group',
+        progress_type='supplierpayment_message',
+    )
+    result = SyncEngine(SUPPLIER_PAYMENT_SYNC).run()
+
+Akış:
+    0) Kilit         : tüm aşamalar tek transaction içinde, tablo başına advisory lock altında çalışır;
+                       aynı tabloya eşzamanlı senkronizasyonlar sıraya girer (çift INSERT oluşmaz)
+    1) Anlık görüntü : hedef tablodan yalnızca doğal anahtar + karşılaştırma alanları okunur
+    2) Kaynak        : sorgu `fetchmany` ile akıtılır, her satır model tiplerine normalize edilir
+    3) Fark          : yeni / değişmiş / artık bulunmayan satırlar belirlenir (değişmeyenlere dokunulmaz)
+    4) Yazma         : batch'ler halinde
+                         - doğal anahtar üzerinde unique kısıt varsa `INSERT ... ON CONFLICT DO UPDATE`
+                         - yoksa `INSERT` + `UPDATE ... FROM (VALUES ...)` (pk üzerinden)
+                       ve kaynakta bulunmayan satırların silinmesi
+    5) Raporlama     : channels grubuna ilerleme mesajları, her aşama için süre ölçümleri
+
+Değişiklik tespiti `compare_fields` değerlerinin karşılaştırılmasıyla, modelde bir özet alanı
+varsa (`hash_field`) yalnızca bu özetin karşılaştırılmasıyla yapılır.
+"""
+import decimal
+import hashlib
+import logging
+import time
+
+from asgiref.sync import async_to_sync
+from django.db import connections, router, transaction
+from django.db.models import DecimalField
+from django.utils import timezone
+
+from .bulk_loader import copy_load
+from .query_executor import DEFAULT_BATCH_SIZE, hana_executor
+
+logger = logging.getLogger(__name__)
+
+
+class SyncError(Exception):
+    """Senkronizasyon motorunun temel hata sınıfı."""
+
+
+class SyncEmptySourceError(SyncError):
+    """Kaynak sorgu hiç satır döndürmedi; hedef tablo boşaltılmadan işlem durduruldu."""
+
+
+# ---------------------------------------------------------------------- #
+# Tanım
+# ---------------------------------------------------------------------- #
+class SyncSpec:
+    """
+    Bir hedef tablonun senkronizasyon tanımı.
+
+    name             : Log / metrik adı
+    query_name       : Kaynak `SQLQuery` adı
+    model            : Hedef Django modeli
+    natural_key      : Satırı kaynakta tekil olarak tanımlayan model alanları
+    field_map        : model alanı -> kaynak kolon adı | (kolon, varsayılan) | callable(row)
+    compare_fields   : Değişiklik tespitinde kullanılacak alanlar (varsayılan: anahtar dışındaki tüm alanlar)
+    hash_field       : Karşılaştırma alanlarının özetinin saklandığı model alanı (opsiyonel)
+    track_fields     : Değişen/silinen satırlar için eski ve yeni değerleri toplanacak alanlar
+                       (ör. özet tablolarını yalnızca etkilenen belgeler için yeniden hesaplamak)
+    scope            : Hedef tablonun bu senkronizasyona ait kısmını seçen filtre (dict)
+    params           : Sorgu parametreleri
+    json_compatible  : Kaynak satırları HTTP dönemindeki tiplerle (float / ISO metin) üretilsin mi
+    delete_missing   : Kaynakta bulunmayan satırlar silinsin mi
+    allow_empty      : Kaynak boş dönerse hedef tablo boşaltılsın mı (varsayılan: hayır, hata)
+    duplicates       : Kaynakta aynı doğal anahtar birden çok kez gelirse hangisi yazılır:
+                       'first' (ilk satır) | 'last' (son satır; satır satır update_or_create ile aynı)
+    batch_size       : Okuma ve yazma batch boyutu
+    copy_threshold   : Yazılacak satır sayısı bu eşiği aşarsa upsert `COPY` + tek `INSERT ... ON CONFLICT`
+                       ile yapılır (bkz. `bulk_loader`); None ise her zaman ORM batch'leri kullanılır
+    progress_group   : İlerleme mesajlarının gönderileceği channels grubu
+    progress_type    : Consumer'daki mesaj işleyicisinin adı (`type` alanı)
+    after_write      : Yazma tamamlandıktan sonra aynı transaction içinde çağrılır: after_write(result)
+    executor         : Kaynak sorgu yürütücüsü (varsayılan: hanadbcon)
+    """
+
+    def __init__(self, name, query_name, model, natural_key, field_map, compare_fields=None,
+                 hash_field=None, track_fields=(), scope=None, params=None, json_compatible=False,
+                 delete_missing=True, allow_empty=False, duplicates='first', batch_size=DEFAULT_BATCH_SIZE,
+                 copy_threshold=5000,
+                 progress_group=None, progress_type='sync_message', after_write=None, executor=None):
+        self.name = name
+        self.query_name = query_name
+        self.model = model
+        self.natural_key = tuple(natural_key)
+        self.field_map = dict(field_map)
+        self.hash_field = hash_field
+        self.track_fields = tuple(track_fields)
+        self.scope = dict(scope or {})
+        self.params = params
+        self.json_compatible = json_compatible
+        self.delete_missing = delete_missing
+        self.allow_empty = allow_empty
+        if duplicates not in ('first', 'last'):
+            raise SyncError(f"Geçersiz duplicates değeri: {duplicates!r}")
+        self.duplicates = duplicates
+        self.batch_size = batch_size
+        self.copy_threshold = copy_threshold
+        self.progress_group = progress_group
+        self.progress_type = progress_type
+        self.after_write = after_write
+        self.executor = executor or hana_executor
+
+        missing = [f for f in self.natural_key if f not in self.field_map]
+        if missing:
+            raise SyncError(f"Doğal anahtar alanları field_map içinde yok: {missing}")
+
+        self.fields = list(self.field_map)
+        self.compare_fields = tuple(
+            compare_fields if compare_fields is not None
+            else [f for f in self.fields if f not in self.natural_key]
+        )
+
+
+class SyncResult:
+    """Senkronizasyon sonucu: sayılar, etkilenen değerler ve aşama süreleri."""
+
+    def __init__(self, name):
+        self.name = name
+        self.received = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.deleted = 0
+        self.duplicates = 0
+        self.touched = {}
+        self.timings = {}
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'received': self.received,
+            'created': self.created,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'deleted': self.deleted,
+            'duplicates': self.duplicates,
+            'touched': {field: len(values) for field, values in self.touched.items()},
+            'timings': self.timings,
+        }
+
+
+# ---------------------------------------------------------------------- #
+# Değer normalizasyonu
+# ---------------------------------------------------------------------- #
+def _make_normalizer(field):
+    """
+    Kaynaktan gelen değeri, alanın veritabanından okunduğundaki Python tipine çevirir;
+    böylece HANA (Decimal/float/metin) ve PostgreSQL değerleri doğrudan karşılaştırılabilir.
+    """
+    if isinstance(field, DecimalField):
+        quantum = decimal.Decimal(1).scaleb(-field.decimal_places)
+
+        def normalize(value):
+            if value is None or value == '':
+                return None
+            if not isinstance(value, decimal.Decimal):
+                value = decimal.Decimal(str(value))
+            try:
+                return value.quantize(quantum)
+            except decimal.InvalidOperation:
+                return value
+        return normalize
+
+    def normalize(value):
+        if value is None:
+            return None
+        return field.to_python(value)
+    return normalize
+
+
+def _make_extractor(spec_value):
+    if callable(spec_value):
+        return spec_value
+    if isinstance(spec_value, tuple):
+        column, default = spec_value
+        return lambda row: row.get(column, default)
+    return lambda row: row[spec_value]
+
+
+def _row_hash(values):
+    payload = '\x1f'.join('' if value is None else str(value) for value in values)
+    return hashlib.md5(payload.encode('utf-8')).hexdigest()
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ---------------------------------------------------------------------- #
+# Motor
+# ---------------------------------------------------------------------- #
+class SyncEngine:
+
+    def __init__(self, spec, progress_callback=None):
+        self.spec = spec
+        self.progress_callback = progress_callback
+        self.model = spec.model
+        self.meta = spec.model._meta
+        self.db = router.db_for_write(spec.model)
+
+        self._fields = {name: self.meta.get_field(name) for name in spec.fields}
+        self._extractors = [(name, _make_extractor(src)) for name, src in spec.field_map.items()]
+        self._normalizers = {name: _make_normalizer(field) for name, field in self._fields.items()}
+        self._auto_now = [f.name for f in self.meta.concrete_fields if getattr(f, 'auto_now', False)]
+        self._channel_layer = None
+
+    # ------------------------------------------------------------------ #
+    # İlerleme
+    # ------------------------------------------------------------------ #
+    def _notify(self, message, message_type='process_update', done=None, total=None):
+        if self.progress_callback and done is not None and total:
+            try:
+                self.progress_callback(done, total, message)
+            except Exception as e:
+                logger.warning(f"{self.spec.name}: ilerleme geri çağrısı başarısız: {e}")
+
+        if not self.spec.progress_group:
+            return
+        try:
+            if self._channel_layer is None:
+                from channels.layers import get_channel_layer
+                self._channel_layer = get_channel_layer()
+            async_to_sync(self._channel_layer.group_send)(
+                self.spec.progress_group,
+                {'type': self.spec.progress_type, 'message': message, 'message_type': message_type},
+            )
+        except Exception as e:  # İlerleme mesajı senkronizasyonu durdurmamalı
+            logger.warning(f"{self.spec.name}: ilerleme mesajı gönderilemedi: {e}")
+
+    # ------------------------------------------------------------------ #
+    # Yardımcılar
+    # ------------------------------------------------------------------ #
+    def _conflict_target_is_unique(self):
+        key = set(self.spec.natural_key)
+        if len(key) == 1 and self._fields[self.spec.natural_key[0]].unique:
+            return True
+        for fields in self.meta.unique_together:
+            if set(fields) == key:
+                return True
+        for constraint in self.meta.constraints:
+            fields = getattr(constraint, 'fields', None)
+            if fields and set(fields) == key and getattr(constraint, 'condition', None) is None:
+                return True
+        return False
+
+    def _lock_table(self):
+        """
+        Aynı hedef tabloya eşzamanlı senkronizasyonları transaction sonuna kadar sıraya sokar.
+        Bekleyen çalıştırma kilidi aldıktan sonra anlık görüntüyü okuduğu için öncekinin yazdıklarını görür.
+        """
+        connection = connections[self.db]
+        if connection.vendor != 'postgresql':
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [f"sync_engine:{self.meta.db_table}"])
+
+    def _queryset(self):
+        return self.model._default_manager.using(self.db).filter(**self.spec.scope)
+
+    def _map(self, row):
+        values = {}
+        normalizers = self._normalizers
+        for name, extract in self._extractors:
+            values[name] = normalizers[name](extract(row))
+        return values
+
+    def _compare_value(self, values):
+        if self.spec.hash_field:
+            return _row_hash([values[f] for f in self.spec.compare_fields])
+        return tuple(values[f] for f in self.spec.compare_fields)
+
+    def _iter_source(self, rows):
+        if rows is not None:
+            yield from rows
+            return
+        executor = self.spec.executor
+        for batch in executor.iter_dict_batches(
+            self.spec.query_name, self.spec.params, batch_size=self.spec.batch_size,
+            json_compatible=self.spec.json_compatible,
+        ):
+            yield from batch
+
+    # ------------------------------------------------------------------ #
+    # Aşamalar
+    # ------------------------------------------------------------------ #
+    def _snapshot(self):
+        """Hedef tablodan anahtar -> (pk, karşılaştırma değeri, takip değerleri) sözlüğü."""
+        spec = self.spec
+        key_len = len(spec.natural_key)
+        compare = [spec.hash_field] if spec.hash_field else list(spec.compare_fields)
+        columns = list(spec.natural_key) + ['pk'] + compare + list(spec.track_fields)
+        key_norm = [self._normalizers[f] for f in spec.natural_key]
+        compare_norm = [] if spec.hash_field else [self._normalizers[f] for f in spec.compare_fields]
+
+        existing = {}
+        for record in self._queryset().values_list(*columns).iterator(chunk_size=5000):
+            key = tuple(norm(v) for norm, v in zip(key_norm, record[:key_len]))
+            pk = record[key_len]
+            rest = record[key_len + 1:]
+            if spec.hash_field:
+                current = rest[0]
+            else:
+                current = tuple(norm(v) for norm, v in zip(compare_norm, rest[:len(compare)]))
+            existing[key] = (pk, current, rest[len(compare):])
+        return existing
+
+    def _unique_rows(self, rows, result):
+        """Kaynak satırlarını doğal anahtara göre tekilleştirip (anahtar, değerler) üretir (bkz. `duplicates`)."""
+        spec = self.spec
+        if spec.duplicates == 'last':
+            latest = {}
+            for row in self._iter_source(rows):
+                values = self._map(row)
+                key = tuple(values[f] for f in spec.natural_key)
+                if key in latest:
+                    result.duplicates += 1
+                latest[key] = values
+            yield from latest.items()
+            return
+
+        seen = set()
+        for row in self._iter_source(rows):
+            values = self._map(row)
+            key = tuple(values[f] for f in spec.natural_key)
+            if key in seen:
+                result.duplicates += 1
+                continue
+            seen.add(key)
+            yield key, values
+
+    def _diff(self, existing, rows, result):
+        spec = self.spec
+        seen = set()
+        to_create, to_update = [], []
+        touched = {field: set() for field in spec.track_fields}
+
+        for key, values in self._unique_rows(rows, result):
+            seen.add(key)
+
+            current_value = self._compare_value(values)
+            if spec.hash_field:
+                values[spec.hash_field] = current_value
+
+            current = existing.get(key)
+            if current is None:
+                to_create.append(values)
+            elif current[1] != current_value:
+                to_update.append((current[0], values))
+                for field, old in zip(spec.track_fields, current[2]):
+                    touched[field].add(old)
+            else:
+                continue
+            for field in spec.track_fields:
+                touched[field].add(values[field])
+
+            if len(seen) % (spec.batch_size * 10) == 0:
+                self._notify(f"{len(seen)} kayıt okundu", done=len(seen))
+
+        to_delete = []
+        if spec.delete_missing:
+            for key, (pk, _, tracked) in existing.items():
+                if key not in seen:
+                    to_delete.append(pk)
+                    for field, old in zip(spec.track_fields, tracked):
+                        touched[field].add(old)
+
+        result.received = len(seen)
+        result.created = len(to_create)
+        result.updated = len(to_update)
+        result.unchanged = len(seen) - len(to_create) - len(to_update)
+        result.deleted = len(to_delete)
+        result.touched = touched
+        return to_create, to_update, to_delete
+
+    def _write_fields(self):
+        fields = [f for f in self.spec.fields if f not in self.spec.natural_key]
+        if self.spec.hash_field and self.spec.hash_field not in fields:
+            fields.append(self.spec.hash_field)
+        fields.extend(f for f in self._auto_now if f not in fields)
+        return fields
+
+    def _upsert(self, rows):
+        """INSERT ... ON CONFLICT (doğal anahtar) DO UPDATE."""
+        update_fields = self._write_fields()
+        objs = [self.model(**values) for values in rows]
+        self.model._default_manager.using(self.db).bulk_create(
+            objs,
+            batch_size=self.spec.batch_size,
+            update_conflicts=True,
+            unique_fields=list(self.spec.natural_key),
+            update_fields=update_fields,
+        )
+
+    def _copy_fields(self):
+        fields = list(self.spec.fields)
+        if self.spec.hash_field and self.spec.hash_field not in fields:
+            fields.append(self.spec.hash_field)
+        return fields
+
+    def _copy_upsert(self, rows):
+        """Büyük yüklemelerde: staging tablosuna COPY + tek `INSERT ... ON CONFLICT DO UPDATE`."""
+        update_fields = [f for f in self._write_fields() if f not in self._auto_now]
+        copy_load(
+            self.model, rows, self._copy_fields(),
+            mode='upsert',
+            unique_fields=list(self.spec.natural_key),
+            update_fields=update_fields,
+            using=self.db,
+        )
+
+    def _use_copy(self, count):
+        threshold = self.spec.copy_threshold
+        return threshold is not None and count >= threshold and connections[self.db].vendor == 'postgresql'
+
+    def _insert(self, rows):
+        objs = [self.model(**values) for values in rows]
+        self.model._default_manager.using(self.db).bulk_create(objs, batch_size=self.spec.batch_size)
+
+    def _update_by_pk(self, rows):
+        """`UPDATE t SET ... FROM (VALUES ...) v WHERE t.pk = v.pk` — batch başına tek ifade."""
+        connection = connections[self.db]
+        fields = self._write_fields()
+        if connection.vendor != 'postgresql':
+            objs = []
+            for pk, values in rows:
+                obj = self.model(pk=pk, **values)
+                objs.append(obj)
+            self.model._default_manager.using(self.db).bulk_update(objs, fields, batch_size=self.spec.batch_size)
+            return
+
+        qn = connection.ops.quote_name
+        pk_field = self.meta.pk
+        columns = [pk_field] + [self.meta.get_field(f) for f in fields]
+        placeholder = '(' + ', '.join(f'%s::{c.db_type(connection)}' for c in columns) + ')'
+        column_list = ', '.join(qn(c.column) for c in columns)
+        assignments = ', '.join(f'{qn(c.column)} = v.{qn(c.column)}' for c in columns[1:])
+        now = timezone.now()
+
+        with connection.cursor() as cursor:
+            for chunk in _chunks(rows, self.spec.batch_size):
+                params = []
+                for pk, values in chunk:
+                    params.append(pk)
+                    for field in columns[1:]:
+                        value = now if field.name in self._auto_now else values.get(field.name)
+                        params.append(field.get_db_prep_save(value, connection))
+                sql = (
+                    f'UPDATE {qn(self.meta.db_table)} AS t SET {assignments} '
+                    f'FROM (VALUES {", ".join([placeholder] * len(chunk))}) AS v({column_list}) '
+                    f'WHERE t.{qn(pk_field.column)} = v.{qn(pk_field.column)}'
+                )
+                cursor.execute(sql, params)
+
+    def _delete(self, pks):
+        manager = self.model._default_manager.using(self.db)
+        for chunk in _chunks(pks, self.spec.batch_size):
+            manager.filter(pk__in=chunk).delete()
+
+    def _apply(self, to_create, to_update, to_delete, result):
+        total = len(to_create) + len(to_update)
+        if self._conflict_target_is_unique():
+            upserts = to_create + [values for _, values in to_update]
+            if self._use_copy(total):
+                self._copy_upsert(upserts)
+                self._notify(f"{total}/{total} kayıt yazıldı", done=total, total=total)
+            else:
+                step = self.spec.batch_size * 10
+                for i, chunk in enumerate(_chunks(upserts, step)):
+                    self._upsert(chunk)
+                    done = min((i + 1) * step, total)
+                    self._notify(f"{done}/{total} kayıt yazıldı", done=done, total=total)
+        else:
+            if self._use_copy(len(to_create)):
+                copy_load(self.model, to_create, self._copy_fields(), mode='insert', using=self.db)
+            else:
+                for chunk in _chunks(to_create, self.spec.batch_size * 10):
+                    self._insert(chunk)
+            if to_update:
+                self._update_by_pk(to_update)
+            if total:
+                self._notify(f"{total}/{total} kayıt yazıldı", done=total, total=total)
+        result.timings['write'] = round(time.monotonic() - self._phase_started, 3)
+
+        self._phase_started = time.monotonic()
+        if to_delete:
+            self._delete(to_delete)
+        result.timings['delete'] = round(time.monotonic() - self._phase_started, 3)
+
+    # ------------------------------------------------------------------ #
+    # Genel API
+    # ------------------------------------------------------------------ #
+    def run(self, rows=None):
+        """
+        Senkronizasyonu çalıştırır ve `SyncResult` döndürür.
+        `rows` verilirse kaynak sorgu çalıştırılmaz, bu satırlar (dict iterable) kullanılır.
+        """
+        spec = self.spec
+        result = SyncResult(spec.name)
+        started = time.monotonic()
+
+        self._notify(f"{spec.name} senkronizasyonu başladı", message_type='info')
+
+        with transaction.atomic(using=self.db):
+            self._phase_started = time.monotonic()
+            self._lock_table()
+            result.timings['lock'] = round(time.monotonic() - self._phase_started, 3)
+
+            self._phase_started = time.monotonic()
+            existing = self._snapshot()
+            result.timings['snapshot'] = round(time.monotonic() - self._phase_started, 3)
+
+            self._phase_started = time.monotonic()
+            to_create, to_update, to_delete = self._diff(existing, rows, result)
+            result.timings['fetch_diff'] = round(time.monotonic() - self._phase_started, 3)
+            del existing
+
+            if result.received == 0 and not spec.allow_empty:
+                raise SyncEmptySourceError(f"'{spec.query_name}' sorgusu boş sonuç döndürdü")
+
+            self._phase_started = time.monotonic()
+            self._apply(to_create, to_update, to_delete, result)
+            if spec.after_write:
+                self._phase_started = time.monotonic()
+                spec.after_write(result)
+                result.timings['after_write'] = round(time.monotonic() - self._phase_started, 3)
+
+        result.timings['total'] = round(time.monotonic() - started, 3)
+        logger.info(f"Senkronizasyon tamamlandı: {result.as_dict()}")
+        self._notify(
+            f"{spec.name} senkronizasyonu tamamlandı ({result.timings['total']} sn). "
+            f"Yeni: {result.created}, Güncellenen: {result.updated}, "
+            f"Değişmeyen: {result.unchanged}, Silinen: {result.deleted}",
+            message_type='success',
+        )
+        return result
+
+
+def run_sync(spec, rows=None, progress_callback=None):
+    """`SyncEngine(spec).run()` kısayolu."""
+    return SyncEngine(spec, progress_callback=progress_callback).run(rows=rows)
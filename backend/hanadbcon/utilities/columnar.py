@@ -0,0 +1,177 @@
+# backend/hanadbcon/utilities/columnar.py
+"""
+Sorgu sonuçları için kolon bazlı (columnar) ikili taşıma biçimleri.
+
+JSON'da kolon adları her satırda tekrar eder, Decimal ve tarih değerleri metne çevrilir.
+Bu modül sonucu tek bir şema başlığı ve tipli kolonlar halinde kodlar:
+
+    - Apache Arrow IPC stream  (application/vnd.apache.arrow.stream) — birincil biçim
+    - msgpack columnar         (application/x-msgpack)                — pyarrow yoksa yedek biçim
+
+msgpack yükü:
+    {"columns": [...], "types": [...], "length": N, "data": [[kolon0 değerleri], [kolon1 değerleri], ...]}
+Decimal / date / datetime / time değerleri msgpack ext tipleri ile taşınır ve
+`decode_msgpack` tarafından orijinal Python tiplerine geri çevrilir.
+"""
+import datetime
+import decimal
+import io
+import json
+
+import msgpack
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # pyarrow opsiyonel; yoksa yalnızca msgpack sunulur
+    pa = None
+    pa_ipc = None
+
+ARROW_STREAM_CONTENT_TYPE = 'application/vnd.apache.arrow.stream'
+MSGPACK_CONTENT_TYPE = 'application/x-msgpack'
+
+ARROW_AVAILABLE = pa is not None
+
+# msgpack ext tip kodları
+_EXT_DECIMAL = 1
+_EXT_DATE = 2
+_EXT_DATETIME = 3
+_EXT_TIME = 4
+
+
+# ---------------------------------------------------------------------- #
+# Ortak yardımcılar
+# ---------------------------------------------------------------------- #
+def _transpose(columns, rows):
+    """Satır listesini kolon listelerine çevirir."""
+    if not rows:
+        return [[] for _ in columns]
+    return [list(col) for col in zip(*rows)]
+
+
+def _column_type_name(values):
+    """msgpack şeması için kolonun ilk dolu değerinden tip adı çıkarır."""
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            return 'bool'
+        if isinstance(value, int):
+            return 'int'
+        if isinstance(value, float):
+            return 'float'
+        if isinstance(value, decimal.Decimal):
+            return 'decimal'
+        if isinstance(value, datetime.datetime):
+            return 'datetime'
+        if isinstance(value, datetime.date):
+            return 'date'
+        if isinstance(value, datetime.time):
+            return 'time'
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return 'binary'
+        return 'string'
+    return 'null'
+
+
+# ---------------------------------------------------------------------- #
+# msgpack
+# ---------------------------------------------------------------------- #
+def _msgpack_default(value):
+    if isinstance(value, decimal.Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(value).encode('ascii'))
+    if isinstance(value, datetime.datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode('ascii'))
+    if isinstance(value, datetime.date):
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode('ascii'))
+    if isinstance(value, datetime.time):
+        return msgpack.ExtType(_EXT_TIME, value.isoformat().encode('ascii'))
+    if isinstance(value, memoryview):
+        return bytes(value)
+    raise TypeError(f"msgpack ile kodlanamayan tip: {type(value)!r}")
+
+
+def _msgpack_ext_hook(code, data):
+    text = data.decode('ascii')
+    if code == _EXT_DECIMAL:
+        return decimal.Decimal(text)
+    if code == _EXT_DATETIME:
+        return datetime.datetime.fromisoformat(text)
+    if code == _EXT_DATE:
+        return datetime.date.fromisoformat(text)
+    if code == _EXT_TIME:
+        return datetime.time.fromisoformat(text)
+    return msgpack.ExtType(code, data)
+
+
+def encode_msgpack(columns, rows):
+    data = _transpose(columns, rows)
+    payload = {
+        'columns': list(columns),
+        'types': [_column_type_name(values) for values in data],
+        'length': len(rows),
+        'data': data,
+    }
+    return msgpack.packb(payload, default=_msgpack_default, use_bin_type=True)
+
+
+def decode_msgpack(content):
+    """msgpack columnar yükünü `list[dict]` olarak çözer."""
+    payload = msgpack.unpackb(content, ext_hook=_msgpack_ext_hook, raw=False)
+    columns = payload['columns']
+    if not payload['length']:
+        return []
+    return [dict(zip(columns, values)) for values in zip(*payload['data'])]
+
+
+# ---------------------------------------------------------------------- #
+# Arrow IPC stream
+# ---------------------------------------------------------------------- #
+def _arrow_array(values):
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Karışık tipli kolonlar metne çevrilir
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+
+def encode_arrow(columns, rows):
+    if pa is None:
+        raise RuntimeError("pyarrow yüklü değil; Arrow biçimi kullanılamaz.")
+    arrays = [_arrow_array(values) for values in _transpose(columns, rows)]
+    batch = pa.RecordBatch.from_arrays(arrays, names=list(columns))
+    sink = io.BytesIO()
+    with pa_ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue()
+
+
+def decode_arrow(content):
+    """Arrow IPC stream yükünü `list[dict]` olarak çözer."""
+    if pa is None:
+        raise RuntimeError("pyarrow yüklü değil; Arrow yanıtı çözülemez.")
+    table = pa_ipc.open_stream(content).read_all()
+    return table.to_pylist()
+
+
+# ---------------------------------------------------------------------- #
+# İçerik tipine göre çözme
+# ---------------------------------------------------------------------- #
+def accept_header(prefer_arrow=True):
+    """İstemcilerin göndereceği Accept başlığı: Arrow > msgpack > JSON."""
+    types = []
+    if prefer_arrow and ARROW_AVAILABLE:
+        types.append(ARROW_STREAM_CONTENT_TYPE)
+    types.append(f'{MSGPACK_CONTENT_TYPE};q=0.9')
+    types.append('application/json;q=0.5')
+    return ', '.join(types)
+
+
+def decode_response_body(content_type, content):
+    """Yanıt içerik tipine göre gövdeyi `list[dict]` olarak çözer (JSON dahil)."""
+    media_type = (content_type or '').split(';')[0].strip()
+    if media_type == ARROW_STREAM_CONTENT_TYPE:
+        return decode_arrow(content)
+    if media_type == MSGPACK_CONTENT_TYPE:
+        return decode_msgpack(content)
+    return json.loads(content)
@@ -0,0 +1,451 @@
+# backend/hanadbcon/utilities/connection_pool.py
+"""
+Süreç (process) genelinde paylaşılan, thread-safe HANA bağlantı havuzu.
+
+Her istekte yeni bir `hdbcli.dbapi` bağlantısı açmak yerine (TLS + auth el sıkışması)
+bağlantılar havuzda tutulur ve yeniden kullanılır:
+
+    - Sınırlı boyut   : aynı anda en fazla `max_size` bağlantı açık olur.
+    - Sağlık kontrolü : uzun süre boşta kalan bağlantı, teslim edilmeden önce `SELECT 1 FROM DUMMY` ile test edilir.
+    - Boşta tahliye   : `idle_timeout` süresinden uzun boşta kalan bağlantılar kapatılır.
+    - Maksimum ömür   : `max_lifetime` süresini dolduran bağlantılar yenilenir.
+    - Oturum sıfırlama: `set_schema()` ile değiştirilen şema, bağlantı iade edilirken varsayılana döndürülür.
+    - Sızıntı koruması: `close()` çağrılmadan çöpe giden bağlantının yeri havuza geri kazandırılır.
+
+Kullanım:
+    from hanadbcon.utilities.connection_pool import hana_connection
+
+    with hana_connection() as conn:
+        cursor = conn.cursor()
+        ...
+
+`get_pool().acquire()` ile alınan bağlantının `close()` metodu bağlantıyı kapatmaz,
+havuza iade eder; bu sayede mevcut `connection.close()` çağrıları değişmeden çalışır.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Havuzdan belirtilen süre içinde bağlantı alınamadığında fırlatılır."""
+
+
+# Havuz doluyken bekleyen thread'in sızan bağlantıları kontrol etme aralığı (sn)
+_ORPHAN_POLL_INTERVAL = 1.0
+
+
+class _PoolEntry:
+    __slots__ = ("raw", "created_at", "last_used_at", "default_schema", "schema")
+
+    def __init__(self, raw):
+        now = time.monotonic()
+        self.raw = raw
+        self.created_at = now
+        self.last_used_at = now
+        self.default_schema = None  # bağlantının açılıştaki şeması (ilk set_schema'da okunur)
+        self.schema = None          # set_schema ile ayarlanan oturum şeması
+
+
+class PooledConnection:
+    """
+    Havuzdan alınan bağlantı için ince bir sarmalayıcı.
+    `close()` çağrısı bağlantıyı havuza iade eder; diğer tüm öznitelikler gerçek bağlantıya yönlendirilir.
+    """
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+
+    def __getattr__(self, name):
+        entry = self.__dict__.get("_entry")
+        if entry is None:
+            raise AttributeError(f"Bağlantı havuza iade edildi, '{name}' kullanılamaz.")
+        return getattr(entry.raw, name)
+
+    def close(self):
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool.release(entry)
+
+    def invalidate(self):
+        """Bağlantıyı havuza iade etmek yerine kalıcı olarak kapatır (bozuk bağlantılar için)."""
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool.release(entry, discard=True)
+
+    def set_schema(self, schema):
+        """
+        Oturum şemasını ayarlar. Bağlantı paylaşımlı olduğundan havuz, iade sırasında şemayı
+        bağlantının açılıştaki şemasına geri döndürür; bir sonraki kullanıcıya sızmaz.
+        """
+        entry = self._entry
+        if entry is None:
+            raise AttributeError("Bağlantı havuza iade edildi, 'set_schema' kullanılamaz.")
+        if entry.schema == schema:
+            return
+        cursor = entry.raw.cursor()
+        try:
+            if entry.default_schema is None:
+                cursor.execute("SELECT CURRENT_SCHEMA FROM DUMMY")
+                entry.default_schema = cursor.fetchone()[0]
+            cursor.execute(f'SET SCHEMA "{schema}"')
+        finally:
+            cursor.close()
+        entry.schema = schema
+
+    def __del__(self):
+        # close() unutulduysa bağlantının yeri sonsuza dek dolu kalmasın. Çöp toplayıcı herhangi bir
+        # thread'de ve havuz kilidi tutulurken de çalışabileceğinden burada kilit alınmaz;
+        # bağlantı yetim listesine eklenir ve havuz bir sonraki alımda onu kapatır.
+        entry = self.__dict__.get("_entry")
+        if entry is not None:
+            self._entry = None
+            self._pool._orphans.append(entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class HanaConnectionPool:
+    """
+    Sınırlı boyutlu, thread-safe bağlantı havuzu.
+
+    `connect_fn` parametresi yeni bir ham bağlantı döndüren fonksiyondur; verilmezse
+    `hanadb_config.open_raw_connection` kullanılır.
+    """
+
+    def __init__(self, connect_fn=None, max_size=10, checkout_timeout=30.0,
+                 idle_timeout=300.0, max_lifetime=3600.0, health_check_after=30.0):
+        self._connect_fn = connect_fn
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+
+        self._idle = deque()
+        self._orphans = deque()  # close() çağrılmadan çöpe giden bağlantılar (bkz. PooledConnection.__del__)
+        self._in_use = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._metrics = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "timeouts": 0,
+            "created": 0,
+            "evictions_idle": 0,
+            "evictions_lifetime": 0,
+            "evictions_unhealthy": 0,
+            "discarded": 0,
+            "leaked": 0,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Dahili yardımcılar
+    # ------------------------------------------------------------------ #
+    def _connect(self):
+        connect_fn = self._connect_fn
+        if connect_fn is None:
+            from .hanadb_config import open_raw_connection
+            connect_fn = open_raw_connection
+        return connect_fn()
+
+    @staticmethod
+    def _close_raw(raw):
+        try:
+            raw.close()
+        except Exception as e:  # bağlantı zaten kopmuş olabilir
+            logger.debug(f"HANA bağlantısı kapatılırken hata (yok sayıldı): {e}")
+
+    def _is_expired(self, entry, now):
+        return self.max_lifetime and (now - entry.created_at) > self.max_lifetime
+
+    def _is_idle_too_long(self, entry, now):
+        return self.idle_timeout and (now - entry.last_used_at) > self.idle_timeout
+
+    def _is_healthy(self, entry, now):
+        raw = entry.raw
+        try:
+            if hasattr(raw, "isconnected") and not raw.isconnected():
+                return False
+            if (now - entry.last_used_at) < self.health_check_after:
+                return True
+            cursor = raw.cursor()
+            try:
+                cursor.execute("SELECT 1 FROM DUMMY")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            return True
+        except Exception as e:
+            logger.warning(f"HANA bağlantısı sağlık kontrolünden geçemedi: {e}")
+            return False
+
+    def _reset_session(self, entry):
+        """set_schema ile değiştirilen şemayı açılıştaki şemaya döndürür."""
+        if entry.schema is None or entry.schema == entry.default_schema:
+            entry.schema = None
+            return
+        cursor = entry.raw.cursor()
+        try:
+            cursor.execute(f'SET SCHEMA "{entry.default_schema}"')
+        finally:
+            cursor.close()
+        entry.schema = None
+
+    def _reclaim_orphans(self):
+        """close() edilmeden çöpe giden bağlantıları kapatır ve yerlerini havuza geri kazandırır."""
+        while True:
+            try:
+                entry = self._orphans.popleft()
+            except IndexError:
+                return
+            logger.warning("HANA bağlantısı close() çağrılmadan bırakılmış; bağlantı kapatılıp havuza geri kazandırıldı.")
+            with self._cond:
+                self._metrics["leaked"] += 1
+            # Yarım kalan işlem/oturum durumu bilinmediğinden bağlantı yeniden kullanılmaz
+            self.release(entry, discard=True)
+
+    def _evict_stale_locked(self, now):
+        """Boşta bekleyen ve süresi dolmuş bağlantıları ayıklar. Kilit tutulurken çağrılır."""
+        stale = []
+        keep = deque()
+        while self._idle:
+            entry = self._idle.popleft()
+            if self._is_expired(entry, now):
+                self._metrics["evictions_lifetime"] += 1
+                stale.append(entry)
+            elif self._is_idle_too_long(entry, now):
+                self._metrics["evictions_idle"] += 1
+                stale.append(entry)
+            else:
+                keep.append(entry)
+        self._idle = keep
+        return stale
+
+    # ------------------------------------------------------------------ #
+    # Genel API
+    # ------------------------------------------------------------------ #
+    def acquire(self, timeout=None):
+        """
+        Havuzdan bir bağlantı alır. Havuz doluysa `timeout` saniye bekler,
+        süre dolarsa `PoolTimeoutError` fırlatır.
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        wait_started = None
+
+        while True:
+            self._reclaim_orphans()
+            entry = None
+            create_new = False
+            reclaim = False
+            with self._cond:
+                stale = self._evict_stale_locked(time.monotonic())
+                while not self._idle and self._in_use + len(self._idle) >= self.max_size:
+                    if self._orphans:
+                        reclaim = True
+                        break
+                    if not waited:
+                        waited = True
+                        wait_started = time.monotonic()
+                        self._metrics["waits"] += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics["timeouts"] += 1
+                        for s in stale:
+                            self._close_raw(s.raw)
+                        raise PoolTimeoutError(
+                            f"HANA bağlantı havuzundan {timeout} sn içinde bağlantı alınamadı "
+                            f"(max_size={self.max_size})."
+                        )
+                    self._cond.wait(min(remaining, _ORPHAN_POLL_INTERVAL))
+                if not reclaim:
+                    if self._idle:
+                        entry = self._idle.pop()  # LIFO: en sıcak bağlantı önce
+                    else:
+                        create_new = True
+                    self._in_use += 1
+                    if waited:
+                        self._metrics["wait_time_total"] += time.monotonic() - wait_started
+
+            for s in stale:
+                self._close_raw(s.raw)
+            if reclaim:
+                continue  # döngü başında yetim bağlantılar geri kazanılır
+
+            if create_new:
+                try:
+                    entry = _PoolEntry(self._connect())
+                except Exception:
+                    with self._cond:
+                        self._in_use -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._metrics["created"] += 1
+                    self._metrics["checkouts"] += 1
+                return PooledConnection(self, entry)
+
+            if self._is_healthy(entry, time.monotonic()):
+                with self._cond:
+                    self._metrics["checkouts"] += 1
+                return PooledConnection(self, entry)
+
+            # Sağlıksız bağlantı: kapat ve döngüyü tekrarla
+            self._close_raw(entry.raw)
+            with self._cond:
+                self._in_use -= 1
+                self._metrics["evictions_unhealthy"] += 1
+                self._cond.notify()
+
+    def release(self, entry, discard=False):
+        """Bağlantıyı havuza iade eder. `discard=True` ise bağlantı kapatılır."""
+        now = time.monotonic()
+        if not discard and self._is_expired(entry, now):
+            discard = True
+            with self._cond:
+                self._metrics["evictions_lifetime"] += 1
+        elif discard:
+            with self._cond:
+                self._metrics["discarded"] += 1
+
+        if discard:
+            self._close_raw(entry.raw)
+        else:
+            try:
+                # autocommit kapalı bağlantılarda yarım kalan işlemleri temizle
+                if hasattr(entry.raw, "getautocommit") and not entry.raw.getautocommit():
+                    entry.raw.rollback()
+                self._reset_session(entry)
+            except Exception:
+                self._close_raw(entry.raw)
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if not discard:
+                entry.last_used_at = now
+                self._idle.append(entry)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        `with pool.connection() as conn:` şeklinde kullanım için.
+        Blok içinde veritabanı hatası oluşursa bağlantı havuza geri konulmaz.
+        """
+        conn = self.acquire(timeout=timeout)
+        try:
+            yield conn
+        except Exception as e:
+            if is_connection_error(e, conn):
+                conn.invalidate()
+            raise
+        finally:
+            conn.close()
+
+    def close_all(self):
+        """Boşta bekleyen tüm bağlantıları kapatır (kullanımdakiler iade edildiğinde havuza döner)."""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+        for entry in idle:
+            self._close_raw(entry.raw)
+
+    def stats(self):
+        """Havuz metriklerini döndürür."""
+        with self._cond:
+            data = dict(self._metrics)
+            data.update({
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "pid": os.getpid(),
+            })
+        data["wait_time_total"] = round(data["wait_time_total"], 4)
+        return data
+
+
+# hdbcli'nin bağlantı kopmasında döndürdüğü hata kodları; sürücü bunları çoğunlukla düz `dbapi.Error` olarak fırlatır
+_CONNECTION_ERROR_CODES = frozenset({
+    -10709,  # Connection failed
+    -10807,  # Connection down
+    -10108,  # Session has been reconnected
+    -10821,  # Session not connected
+})
+
+
+def is_connection_error(exc, conn=None):
+    """
+    Hatanın bağlantıyı kullanılamaz hale getirip getirmediğini belirler (SQL hataları bağlantıyı bozmaz).
+    Üst katmanlar hatayı kendi tipine sarmalayabildiği için `__cause__` da incelenir;
+    `conn` verilirse bağlantının hâlâ açık olup olmadığına da bakılır.
+    """
+    try:
+        from hdbcli import dbapi
+    except ImportError:  # pragma: no cover
+        return False
+    for error in (exc, exc.__cause__):
+        if isinstance(error, (dbapi.OperationalError, dbapi.InterfaceError)):
+            return True
+        if isinstance(error, dbapi.Error) and getattr(error, "errorcode", None) in _CONNECTION_ERROR_CODES:
+            return True
+    if conn is not None and hasattr(conn, "isconnected"):
+        try:
+            return not conn.isconnected()
+        except Exception:
+            return True
+    return False
+
+
+# ---------------------------------------------------------------------- #
+# Süreç genelinde tek havuz
+# ---------------------------------------------------------------------- #
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Süreç genelindeki HANA havuzunu döndürür.
+    Celery/gunicorn fork sonrası çocuk süreçte yeni bir havuz oluşturulur;
+    ebeveynden kalan soketler paylaşılmaz.
+    """
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = HanaConnectionPool(
+                max_size=getattr(settings, "HANADB_POOL_MAX_SIZE", 10),
+                checkout_timeout=getattr(settings, "HANADB_POOL_TIMEOUT", 30),
+                idle_timeout=getattr(settings, "HANADB_POOL_IDLE_TIMEOUT", 300),
+                max_lifetime=getattr(settings, "HANADB_POOL_MAX_LIFETIME", 3600),
+                health_check_after=getattr(settings, "HANADB_POOL_HEALTH_CHECK_AFTER", 30),
+            )
+            _pool_pid = pid
+    return _pool
+
+
+def hana_connection(timeout=None):
+    """`with hana_connection() as conn:` kısayolu."""
+    return get_pool().connection(timeout=timeout)
+
+
+def pool_stats():
+    return get_pool().stats()
@@ -3,25 +3,34 @@ from hdbcli import dbapi
 from django.conf import settings
 import logging
 
+from .connection_pool import get_pool, PoolTimeoutError
+
 # Logger nesnesi oluştur
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+
+def open_raw_connection():
+    """
+    HANA veritabanına havuzdan bağımsız, yeni bir fiziksel bağlantı açar.
+    Havuz yeni bağlantı ihtiyacında bu fonksiyonu kullanır.
+    """
+    return dbapi.connect(
+        address=settings.HANADB_HOST,
+        port=int(settings.HANADB_PORT),
+        user=settings.HANADB_USER,
+        password=settings.HANADB_PASS,
+        autocommit=True
+    )
+
+
 def create_connection():
     """
-    HANA veritabanına bağlantı oluşturur ve bağlantı nesnesini döndürür.
+    HANA bağlantı havuzundan bir bağlantı alır ve döndürür.
+    Dönen nesnenin `close()` metodu bağlantıyı kapatmaz, havuza iade eder.
     """
     try:
-        connection = dbapi.connect(
-            address=settings.HANADB_HOST,
-            port=int(settings.HANADB_PORT),
-            user=settings.HANADB_USER,
-            password=settings.HANADB_PASS,
-            autocommit=True
-        )
-        return connection
-    except dbapi.Error as e:
+        return get_pool().acquire()
+    except (dbapi.Error, PoolTimeoutError) as e:
         logger.error(f"HANA veritabanına bağlanırken hata: {str(e)}")
         return None
-
-
@@ -0,0 +1,60 @@
+# backend/hanadbcon/utilities/stream_client.py
+"""
+hanadbcon/logodbcon sorgu endpoint'lerini uzaktan tüketen istemci yardımcıları.
+
+    - `fetch_remote_query`       : Arrow IPC / msgpack kolon bazlı biçimi isteyip `list[dict]` döndürür.
+    - `iter_remote_query_batches`: NDJSON akış modunu batch batch tüketir.
+
+Aynı süreçteki kod için `hanadbcon.services.query_executor.iter_query_batches` tercih edilmelidir;
+bu modül, sorguyu başka bir sunucudaki endpoint üzerinden çalıştırmak gereken durumlar içindir.
+
+Kullanım:
+    for rows in iter_remote_query_batches(url, token, batch_size=2000):
+        MyModel.objects.bulk_create([...])
+"""
+import json
+import logging
+
+import requests
+
+from .columnar import accept_header, decode_response_body
+
+logger = logging.getLogger(__name__)
+
+
+def iter_remote_query_rows(url, token=None, params=None, timeout=900):
+    """Endpoint'i `stream=ndjson` ile çağırır ve satırları geldikçe `dict` olarak üretir."""
+    params = dict(params or {})
+    params['stream'] = 'ndjson'
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+
+    with requests.get(url, headers=headers, params=params, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line:
+                yield json.loads(line)
+
+
+def iter_remote_query_batches(url, token=None, params=None, batch_size=1000, timeout=900):
+    """`iter_remote_query_rows` çıktısını `batch_size` uzunluğunda `list[dict]` parçalarına böler."""
+    batch = []
+    for row in iter_remote_query_rows(url, token=token, params=params, timeout=timeout):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def fetch_remote_query(url, token=None, params=None, timeout=900, prefer_arrow=True):
+    """
+    Endpoint'i kolon bazlı ikili biçimle (Arrow > msgpack > JSON) çağırır ve sonucu `list[dict]` döndürür.
+    Arrow/msgpack yanıtlarında Decimal ve tarih değerleri orijinal Python tipleriyle gelir.
+    """
+    headers = {'Accept': accept_header(prefer_arrow=prefer_arrow)}
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    response = requests.get(url, headers=headers, params=params, timeout=timeout)
+    response.raise_for_status()
+    return decode_response_body(response.headers.get('Content-Type'), response.content)
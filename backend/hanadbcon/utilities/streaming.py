@@ -0,0 +1,72 @@
+# backend/hanadbcon/utilities/streaming.py
+"""
+Büyük sorgu sonuçlarını bellekte toplamadan HTTP yanıtına akıtan yardımcılar.
+
+İki biçim desteklenir:
+    - ndjson : her satır ayrı bir JSON nesnesi, satır sonu ile ayrılır (application/x-ndjson)
+    - json   : parça parça yazılan tek bir JSON dizi (application/json)
+
+Her iki biçimde de yalnızca bir `fetchmany` batch'i kadar veri bellekte tutulur.
+"""
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+JSON_CONTENT_TYPE = 'application/json'
+
+_encoder = JSONEncoder(ensure_ascii=False)
+
+
+def _encode_rows(columns, rows):
+    encode = _encoder.encode
+    return [encode(dict(zip(columns, row))) for row in rows]
+
+
+def _close_batches(batches):
+    # İstemci bağlantıyı keserse cursor kapanıp bağlantı havuza hemen dönsün
+    close = getattr(batches, 'close', None)
+    if close:
+        close()
+
+
+def ndjson_chunks(columns, batches):
+    """Her batch için satır başına bir JSON nesnesi içeren tek bir bayt parçası üretir."""
+    try:
+        for rows in batches:
+            encoded = _encode_rows(columns, rows)
+            if encoded:
+                yield ('\n'.join(encoded) + '\n').encode('utf-8')
+    finally:
+        _close_batches(batches)
+
+
+def json_array_chunks(columns, batches):
+    """Sonucu `[`, virgülle ayrılmış nesneler ve `]` olarak parça parça üretir."""
+    try:
+        yield b'['
+        first = True
+        for rows in batches:
+            encoded = _encode_rows(columns, rows)
+            if not encoded:
+                continue
+            chunk = ','.join(encoded)
+            yield (chunk if first else ',' + chunk).encode('utf-8')
+            first = False
+        yield b']'
+    finally:
+        _close_batches(batches)
+
+
+def build_streaming_response(columns, batches, mode):
+    """
+    `iter_batches` çıktısından (kolonlar alınmış olarak) akış yanıtı oluşturur.
+    `mode`: 'ndjson' veya 'json'
+    """
+    if mode == 'ndjson':
+        response = StreamingHttpResponse(ndjson_chunks(columns, batches), content_type=NDJSON_CONTENT_TYPE)
+    else:
+        response = StreamingHttpResponse(json_array_chunks(columns, batches), content_type=JSON_CONTENT_TYPE)
+    # nginx tamponlamasını kapat; istemci ilk batch'i hemen alsın
+    response['X-Accel-Buffering'] = 'no'
+    response['Cache-Control'] = 'no-cache'
+    return response
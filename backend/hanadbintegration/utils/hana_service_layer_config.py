@@ -22,6 +22,9 @@ class HANADBServiceLayerConfig:
     RETRY_COUNT = env.int("SAP_RETRY_COUNT", default=3)
     CERT_PATH = env("SAP_CERT_PATH", default="/etc/ssl/certs/sap_ca_bundle.crt")  
     TLS_VERIFY = env.bool("SAP_TLS_VERIFY", default=True)
+    HTTP_POOL_MAXSIZE = env.int("SAP_HTTP_POOL_MAXSIZE", default=10)  # thread başına keep-alive bağlantı
+    BATCH_SIZE = env.int("SAP_BATCH_SIZE", default=100)  # tek $batch çağrısındaki en fazla istek
+    SESSION_POOL_SIZE = env.int("SAP_SESSION_POOL_SIZE", default=4)  # worker'lar arasında paylaşılan B1SESSION sayısı
 
     @classmethod
     def get_auth_payload(cls):
@@ -0,0 +1,460 @@
+# backend/hanadbintegration/utils/service_layer_client.py
+"""
+SAP Business One Service Layer istemcisi.
+
+Eskiden her stok kartı gönderimi `/Login` ile yeni bir oturum açıyor, productconfigv2 ise
+thread-safe olmayan ve hiç yenilenmeyen modül seviyesinde bir cookie tutuyordu. Bu modül:
+
+    - Worker (süreç) başına, thread başına keep-alive `requests.Session` (bağlantı havuzlu HTTPAdapter)
+    - Tüm worker'lar arasında paylaşılan küçük bir B1SESSION havuzu (Django cache / Redis). Service Layer
+      aynı oturumdaki istekleri sırayla işlediğinden istekler `session_pool_size` oturuma dağıtılır.
+      `SessionTimeout` süresine göre geçerlilik takibi; süresi dolan veya 401 dönen oturumda otomatik yeniden login
+    - Aynı anda süresi dolan oturum için tek login (oturum başına Redis kilidi)
+    - OData `$batch`: N isteği tek HTTP round-trip'te gönderir (`client.batch([...])`)
+
+Kullanım:
+    from hanadbintegration.utils.service_layer_client import get_client, BatchRequest
+
+    client = get_client()
+    item = client.get("Items('A100')").json()
+    results = client.batch([BatchRequest('POST', 'Items', payload) for payload in payloads])
+    for res in results:
+        res.status, res.json()
+"""
+import hashlib
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.core.cache import cache
+
+from .exceptions import HANADBIntegrationError
+from .hana_service_layer_config import HANADBServiceLayerConfig
+
+logger = logging.getLogger(__name__)
+
+CRLF = "\r\n"
+
+
+class ServiceLayerError(HANADBIntegrationError):
+    """Service Layer isteği yapılamadı veya oturum açılamadı."""
+
+
+class ServiceLayerAuthError(ServiceLayerError):
+    """Service Layer `/Login` başarısız."""
+
+
+# ---------------------------------------------------------------------- #
+# $batch
+# ---------------------------------------------------------------------- #
+class BatchRequest:
+    """
+    `$batch` içindeki tek bir istek.
+    method : GET / POST / PATCH / DELETE
+    path   : Service Layer köküne göre yol (ör. "Items" veya "Items('A100')")
+    body   : JSON gövdesi (GET için None)
+    headers: İsteğe özel başlıklar (ör. {"Prefer": "odata.maxpagesize=100"})
+    group  : Yazma istekleri kendi changeset'i içinde gönderilir (biri hata alırsa diğerleri
+             etkilenmez); aynı `group` değerine sahip ardışık yazma istekleri tek changeset'te
+             (hep-ya-hiç) toplanır
+    """
+
+    __slots__ = ("method", "path", "body", "headers", "group")
+
+    def __init__(self, method, path, body=None, headers=None, group=None):
+        self.method = method.upper()
+        self.path = path.lstrip("/")
+        self.body = body
+        self.headers = headers or {}
+        self.group = group
+
+
+class BatchResponse:
+    """`$batch` yanıtındaki tek bir isteğin sonucu."""
+
+    __slots__ = ("status", "headers", "text")
+
+    def __init__(self, status, headers, text):
+        self.status = status
+        self.headers = headers
+        self.text = text
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+    def json(self):
+        return json.loads(self.text) if self.text.strip() else None
+
+    def error_message(self):
+        try:
+            return self.json()["error"]["message"]["value"]
+        except Exception:
+            return self.text
+
+
+def _http_part(request, base_path, content_id=None):
+    lines = ["Content-Type: application/http", "Content-Transfer-Encoding: binary"]
+    if content_id is not None:
+        lines.append(f"Content-ID: {content_id}")
+    lines.append("")
+    lines.append(f"{request.method} {base_path}/{request.path} HTTP/1.1")
+    lines.extend(f"{key}: {value}" for key, value in request.headers.items())
+    if request.body is not None:
+        body = json.dumps(request.body, ensure_ascii=False, default=str)
+        lines.append("Content-Type: application/json")
+        lines.append("")
+        lines.append(body)
+    else:
+        lines.append("")
+    lines.append("")
+    return CRLF.join(lines)
+
+
+def build_batch_body(requests_, base_path):
+    """
+    İstekleri OData `multipart/mixed` gövdesine dönüştürür; `(content_type, body_bytes)` döndürür.
+    GET istekleri doğrudan batch içine, yazma istekleri changeset'ler içine yerleştirilir.
+    """
+    boundary = f"batch_{uuid.uuid4().hex}"
+    parts = []
+    index = 0
+    while index < len(requests_):
+        request = requests_[index]
+        if request.method == "GET":
+            parts.append(_http_part(request, base_path))
+            index += 1
+            continue
+
+        # Aynı gruptaki ardışık yazma istekleri tek changeset
+        group = [request]
+        index += 1
+        while (request.group is not None and index < len(requests_)
+               and requests_[index].method != "GET" and requests_[index].group == request.group):
+            group.append(requests_[index])
+            index += 1
+
+        changeset = f"changeset_{uuid.uuid4().hex}"
+        inner = []
+        for content_id, item in enumerate(group, start=1):
+            inner.append(f"--{changeset}{CRLF}" + _http_part(item, base_path, content_id))
+        inner.append(f"--{changeset}--{CRLF}")
+        parts.append(f"Content-Type: multipart/mixed;boundary={changeset}{CRLF}{CRLF}" + "".join(inner))
+
+    body = "".join(f"--{boundary}{CRLF}{part}" for part in parts) + f"--{boundary}--{CRLF}"
+    return f"multipart/mixed;boundary={boundary}", body.encode("utf-8")
+
+
+def _boundary_of(content_type):
+    for piece in (content_type or "").split(";"):
+        piece = piece.strip()
+        if piece.lower().startswith("boundary="):
+            return piece.split("=", 1)[1].strip('"')
+    return None
+
+
+def _split_headers(block):
+    if block.startswith("\n"):  # başlıksız blok
+        return {}, "", block[1:]
+    head, _, rest = block.partition("\n\n")
+    headers = {}
+    for line in head.split("\n"):
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+    return headers, head, rest
+
+
+def parse_batch_response(content_type, content):
+    """`$batch` yanıtını istek sırasıyla `BatchResponse` listesine çözer (changeset'ler düzleştirilir)."""
+    boundary = _boundary_of(content_type)
+    if not boundary:
+        raise ServiceLayerError("Geçersiz $batch yanıtı: boundary bulunamadı")
+    text = content.decode("utf-8") if isinstance(content, bytes) else content
+    text = text.replace("\r\n", "\n")
+
+    results = []
+    for part in text.split(f"--{boundary}")[1:]:
+        if part.startswith("--"):
+            break
+        part = part.lstrip("\n")
+        headers, _, rest = _split_headers(part)
+        part_type = headers.get("content-type", "")
+        if part_type.lower().startswith("multipart/mixed"):
+            results.extend(parse_batch_response(part_type, rest))
+            continue
+
+        # Gömülü HTTP yanıtı: durum satırı, başlıklar, boş satır, gövde
+        status_line, _, http_rest = rest.partition("\n")
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise ServiceLayerError(f"Geçersiz $batch yanıt satırı: {status_line!r}")
+        response_headers, _, body = _split_headers(http_rest)
+        results.append(BatchResponse(status, response_headers, body.strip("\n")))
+    return results
+
+
+# ---------------------------------------------------------------------- #
+# İstemci
+# ---------------------------------------------------------------------- #
+class ServiceLayerClient:
+
+    # Oturumun süresi dolmadan bu kadar saniye önce yenilenir
+    EXPIRY_MARGIN = 60
+
+    def __init__(self, base_url, company_db, username, password, timeout=30, verify=True,
+                 pool_maxsize=10, max_batch_size=100, session_pool_size=4):
+        self.base_url = base_url.rstrip("/")
+        self.base_path = urlsplit(self.base_url).path.rstrip("/")
+        self.company_db = company_db
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.verify = verify
+        self.pool_maxsize = pool_maxsize
+        self.max_batch_size = max_batch_size
+        self.session_pool_size = max(int(session_pool_size), 1)
+
+        identity = f"{self.base_url}|{company_db}|{username}"
+        self._cache_key = f"sl:session:{hashlib.sha1(identity.encode()).hexdigest()}"
+        self._local = threading.local()
+        self._login_locks = [threading.Lock() for _ in range(self.session_pool_size)]
+        # Worker'lar aynı oturumdan başlamasın diye sıra rastgele bir yerden başlar
+        self._slots = itertools.count(random.randrange(self.session_pool_size))
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        """
+        Fork sonrası (Celery prefork, gunicorn) üst süreçten kopyalanan keep-alive soketleri ve
+        kilitler kullanılmaz; süreç değiştiyse süreç içi durum sıfırlanır. Modül düzeyinde tutulan
+        istemciler (ör. productconfigv2) de böylece fork'a karşı güvenlidir.
+        """
+        if self._pid != os.getpid():
+            self._local = threading.local()
+            self._login_locks = [threading.Lock() for _ in range(self.session_pool_size)]
+            self._pid = os.getpid()
+
+    # ------------------------------------------------------------------ #
+    # HTTP oturumu (keep-alive)
+    # ------------------------------------------------------------------ #
+    def _http(self):
+        self._check_fork()
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.verify = self.verify
+            session.headers.update({"Accept": "application/json"})
+            self._local.session = session
+        return session
+
+    # ------------------------------------------------------------------ #
+    # B1SESSION
+    # ------------------------------------------------------------------ #
+    def _next_slot(self):
+        return next(self._slots) % self.session_pool_size
+
+    def _slot_key(self, slot):
+        return f"{self._cache_key}:{slot}"
+
+    def _local_sessions(self):
+        self._check_fork()
+        sessions = getattr(self._local, "b1sessions", None)
+        if sessions is None:
+            sessions = self._local.b1sessions = {}
+        return sessions
+
+    def _cached_session(self, slot):
+        try:
+            data = cache.get(self._slot_key(slot))
+        except Exception as e:
+            logger.warning(f"[SL] Paylaşımlı oturum okunamadı: {e}")
+            data = self._local_sessions().get(slot)
+        if data and data["expires_at"] - self.EXPIRY_MARGIN > time.time():
+            return data
+        return None
+
+    def _store_session(self, slot, data):
+        self._local_sessions()[slot] = data
+        try:
+            cache.set(self._slot_key(slot), data, timeout=max(int(data["expires_at"] - time.time()), 1))
+        except Exception as e:
+            logger.warning(f"[SL] Paylaşımlı oturum yazılamadı: {e}")
+
+    def invalidate_session(self, session_id=None, slot=None):
+        """
+        Oturumu paylaşımlı önbellekten siler (yalnızca hâlâ aynı oturumsa).
+        `slot` verilmezse havuzdaki tüm oturumlar silinir.
+        """
+        slots = range(self.session_pool_size) if slot is None else [slot]
+        for index in slots:
+            self._local_sessions().pop(index, None)
+            try:
+                current = cache.get(self._slot_key(index))
+                if current and (session_id is None or current["session_id"] == session_id):
+                    cache.delete(self._slot_key(index))
+            except Exception:
+                pass
+
+    def _login(self, slot):
+        payload = {"CompanyDB": self.company_db, "UserName": self.username, "Password": self.password}
+        try:
+            response = self._http().post(f"{self.base_url}/Login", json=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise ServiceLayerError(f"Service Layer'a bağlanılamadı: {e}") from e
+        if response.status_code != 200:
+            raise ServiceLayerAuthError("SAP Service Layer oturum açma başarısız",
+                                        response.status_code, response.text)
+        body = response.json()
+        data = {
+            "session_id": body.get("SessionId"),
+            "route_id": response.cookies.get("ROUTEID"),
+            "expires_at": time.time() + int(body.get("SessionTimeout", 30)) * 60,
+        }
+        self._store_session(slot, data)
+        logger.info(f"[SL] Yeni Service Layer oturumu açıldı (havuz sırası {slot})")
+        return data
+
+    def session(self, force_login=False, slot=None):
+        """
+        Havuzdaki bir B1SESSION bilgisini döndürür; yoksa veya süresi dolmuşsa o oturum için tek bir login yapar.
+        `slot` verilmezse istekler oturumlara sırayla dağıtılır.
+        """
+        self._check_fork()
+        slot = self._next_slot() if slot is None else slot % self.session_pool_size
+        if not force_login:
+            data = self._cached_session(slot)
+            if data:
+                return data
+
+        with self._login_locks[slot]:
+            if not force_login:
+                data = self._cached_session(slot)
+                if data:
+                    return data
+
+            lock_key = f"{self._slot_key(slot)}:login"
+            try:
+                got_lock = cache.add(lock_key, 1, timeout=self.timeout + 5)
+            except Exception:
+                got_lock = True
+            if not got_lock:
+                # Başka bir worker bu oturum için login oluyor; kısa süre oturumun yazılmasını bekle
+                deadline = time.monotonic() + self.timeout
+                while time.monotonic() < deadline:
+                    time.sleep(0.2)
+                    data = self._cached_session(slot)
+                    if data:
+                        return data
+            try:
+                return self._login(slot)
+            finally:
+                if got_lock:
+                    try:
+                        cache.delete(lock_key)
+                    except Exception:
+                        pass
+
+    def _auth_headers(self, data):
+        cookie = f"B1SESSION={data['session_id']}"
+        if data.get("route_id"):
+            cookie += f"; ROUTEID={data['route_id']}"
+        return {"Cookie": cookie}
+
+    # ------------------------------------------------------------------ #
+    # İstekler
+    # ------------------------------------------------------------------ #
+    def request(self, method, path, json_body=None, params=None, headers=None, data=None):
+        """
+        Service Layer'a istek atar. Oturum düşmüşse (401) bir kez yeniden login olup tekrar dener.
+        `path` Service Layer köküne göredir: "Items('A100')".
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        slot = self._next_slot()
+        for attempt in range(2):
+            session_data = self.session(force_login=attempt > 0, slot=slot)
+            request_headers = self._auth_headers(session_data)
+            if headers:
+                request_headers.update(headers)
+            try:
+                response = self._http().request(
+                    method, url, json=json_body, params=params, data=data,
+                    headers=request_headers, timeout=self.timeout,
+                )
+            except requests.RequestException as e:
+                raise ServiceLayerError(f"Service Layer isteği başarısız: {e}") from e
+            if response.status_code != 401:
+                return response
+            logger.info("[SL] Oturum geçersiz (401), yeniden login olunuyor")
+            self.invalidate_session(session_data["session_id"], slot=slot)
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, json_body=None, **kwargs):
+        return self.request("POST", path, json_body=json_body, **kwargs)
+
+    def patch(self, path, json_body=None, **kwargs):
+        return self.request("PATCH", path, json_body=json_body, **kwargs)
+
+    def batch(self, batch_requests):
+        """
+        İstekleri OData `$batch` ile gönderir ve istek sırasıyla `BatchResponse` listesi döndürür.
+        `max_batch_size`'dan uzun listeler birden fazla `$batch` çağrısına bölünür.
+        """
+        batch_requests = list(batch_requests)
+        results = []
+        for start in range(0, len(batch_requests), self.max_batch_size):
+            chunk = batch_requests[start:start + self.max_batch_size]
+            content_type, body = build_batch_body(chunk, self.base_path)
+            response = self.request("POST", "$batch", data=body, headers={"Content-Type": content_type})
+            if response.status_code not in (200, 202):
+                raise ServiceLayerError("$batch isteği başarısız", response.status_code, response.text)
+            results.extend(parse_batch_response(response.headers.get("Content-Type"), response.content))
+        return results
+
+
+# ---------------------------------------------------------------------- #
+# Süreç başına istemci
+# ---------------------------------------------------------------------- #
+_clients = {}
+_clients_lock = threading.Lock()
+_clients_pid = os.getpid()
+
+
+def get_client(verify=None):
+    """
+    `HANADBServiceLayerConfig` ayarlarıyla süreç başına tek istemci döndürür
+    (fork sonrası yeni süreçte yeniden oluşturulur). İstemciler, oturumun gerçekten kullandığı
+    TLS doğrulama değerine (CA dosyası yolu veya False) göre ayrılır.
+    """
+    global _clients, _clients_pid
+    config = HANADBServiceLayerConfig
+    verify = config.get_verify_tls() if verify is None else verify
+    key = (config.BASE_URL, config.COMPANY_DB, config.USERNAME, verify)
+    with _clients_lock:
+        if _clients_pid != os.getpid():
+            _clients = {}
+            _clients_pid = os.getpid()
+        client = _clients.get(key)
+        if client is None:
+            client = ServiceLayerClient(
+                config.BASE_URL, config.COMPANY_DB, config.USERNAME, config.PASSWORD,
+                timeout=config.TIMEOUT, verify=verify,
+                pool_maxsize=config.HTTP_POOL_MAXSIZE, max_batch_size=config.BATCH_SIZE,
+                session_pool_size=config.SESSION_POOL_SIZE,
+            )
+            _clients[key] = client
+        return client
@@ -1,14 +1,12 @@
 # backend/logocustomerbalance/utilities/data_fetcher.py
-import requests
-from django.conf import settings
+from logodbcon.services.query_executor import run_query, QueryError
 
-def fetch_logo_db_data(token):
-    headers = {'Authorization': f'Bearer {token}'}
-    url = 'http://10.130.212.112/api/v2/logodbcon/query/logocustomerbalance/'
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Hata: {response.status_code}, Mesaj: {response.text}")
+def fetch_logo_db_data(token=None):
+    """
+    'logocustomerbalance' Logo sorgusunu süreç içinde çalıştırır (HTTP loopback yok).
+    """
+    try:
+        return run_query('logocustomerbalance', json_compatible=True)
+    except QueryError as e:
+        print(f"Hata: {e}")
     return None
-
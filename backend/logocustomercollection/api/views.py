@@ -6,49 +6,41 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from ..tasks import save_raw_transactions, generate_aging_summaries
+from ..tasks import AGING_REFRESH, sync_customer_collection
 from ..serializers import LogoCustomerCollectionAgingSummarySerializer
 from ..models.closinginvoice import LogoCustomerCollectionAgingSummary
-from ..models.models import LogoCustomerCollectionTransaction
 from django.db.models import Max
 from datetime import datetime, timezone
 
 class FetchLogoDataView(APIView):
     """
-    Logo DB'den API üstünden ham veriyi çeker ve yaşlandırma özet tablosunu yeniden oluşturur.
-    Endpoint: /api/v2/logocustomercollection/fetch-hana-data/
+    Logo DB'den ham veriyi senkronize edip değişen müşterilerin yaşlandırmasını yenileyen
+    arka plan görevini başlatır ve hemen döner. Görevin bittiği `last-updated/` uç noktasındaki
+    `refreshInProgress` alanından izlenir.
+    Endpoint: /api/v2/logocustomercollection/fetch-logo-data/
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        token = request.headers.get("Authorization", "").replace("Bearer ", "")
-        if not token:
-            return Response(
-                {"error": "Token eksik veya geçersiz."},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-
         try:
-            # Ham tabloyu ve özet tabloyu sıfırla
-            LogoCustomerCollectionTransaction.objects.all().delete()
-            LogoCustomerCollectionAgingSummary.objects.all().delete()
-
-            # Celery görevleri senkron şekilde çağrılıyor
-            raw_result = save_raw_transactions(token)
-            summary_result = generate_aging_summaries()
-
-            return Response({
-                "status": "success",
-                "message": f"{raw_result} | {summary_result}",
-                "lastUpdated": datetime.now().strftime("%d-%m-%Y %H:%M"),
-            }, status=status.HTTP_200_OK)
-
+            refresh = AGING_REFRESH.request(sync_customer_collection, force=True)
         except Exception as e:
             return Response({
                 "status": "error",
-                "message": f"Veri çekme veya analiz sırasında hata oluştu: {str(e)}"
+                "message": f"Senkronizasyon görevi başlatılamadı: {str(e)}"
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+        message = (
+            "Logo verisi arka planda güncelleniyor."
+            if refresh["enqueued"] else "Logo verisi zaten güncelleniyor."
+        )
+        return Response({
+            "status": "queued",
+            "message": message,
+            "taskId": refresh.get("task_id"),
+            "refreshInProgress": refresh["in_progress"],
+        }, status=status.HTTP_202_ACCEPTED)
+
 
 class CustomerAgingSummaryView(APIView):
     """
@@ -81,6 +73,7 @@ class LastUpdatedView(APIView):
                 "lastUpdated": latest.isoformat() if latest else None,
                 "serverTime": datetime.now(timezone.utc).astimezone().isoformat(),
                 "timezone": "TRT (UTC+3)",
+                "refreshInProgress": AGING_REFRESH.in_progress(),
             },
             status=status.HTTP_200_OK,
         )
\ No newline at end of file
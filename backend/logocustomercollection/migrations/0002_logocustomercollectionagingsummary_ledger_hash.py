@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logocustomercollection', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logocustomercollectionagingsummary',
+            name='ledger_hash',
+            field=models.CharField(blank=True, default='', help_text='Özetin hesaplandığı ham hareketlerin ve yaşlandırma ayının özeti (bkz. utilities/aging.py)', max_length=32, verbose_name='Defter Parmak İzi'),
+        ),
+    ]
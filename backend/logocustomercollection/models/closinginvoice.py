@@ -23,6 +23,10 @@ class LogoCustomerCollectionAgingSummary(TimeStampedModel, DecimalFieldMixin, Lo
         verbose_name="Güncel Bakiye", db_index=True
     )
     aylik_kalan_borc = models.JSONField(null=True, verbose_name="Aylık Kalan Borçlar")
+    ledger_hash = models.CharField(
+        max_length=32, blank=True, default="", verbose_name="Defter Parmak İzi",
+        help_text="Özetin hesaplandığı ham hareketlerin ve yaşlandırma ayının özeti (bkz. utilities/aging.py)"
+    )
 
     class Meta:
         verbose_name = "Müşteri Özet Yaşlandırma"
@@ -0,0 +1,121 @@
+# backend/logocustomercollection/utilities/aging.py
+"""
+Müşteri yaşlandırma özetlerinin artımlı (yalnızca değişen cariler için) yeniden hesaplanması.
+
+Her özet satırı, hesaplandığı andaki defterin parmak izini (`ledger_hash`) saklar:
+
+    ledger_hash = md5(yaşlandırma ayı + md5(carinin tüm ham hareketleri, yıl/ay sırasıyla))
+
+Carilerin güncel parmak izleri tek bir GROUP BY sorgusuyla PostgreSQL'de hesaplanır; yalnızca
+saklanan izden farklı olan cariler FIFO ile yeniden yaşlandırılır (bkz. sapreports.fifo_aging).
+Yaşlandırma ayı ize dahil olduğundan ay dönümünde tüm özetler bir kez yenilenir; ham
+hareketi kalmayan carilerin özetleri silinir.
+"""
+import hashlib
+from datetime import date
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.db import transaction
+from django.db.models import TextField, Value
+from django.db.models.functions import MD5, Cast, Concat
+
+from sapreports.fifo_aging import fifo_age, month_index
+from ..models.models import LogoCustomerCollectionTransaction
+from ..models.closinginvoice import LogoCustomerCollectionAgingSummary
+
+
+def _text(field):
+    return Cast(field, output_field=TextField())
+
+
+def ledger_fingerprints(cari_kodlar=None, as_of=None):
+    """{cari_kod: parmak izi}; `cari_kodlar` verilmezse tüm cariler."""
+    as_of = as_of or date.today()
+    period = f"{as_of.year}-{as_of.month:02d}"
+
+    queryset = LogoCustomerCollectionTransaction.objects.all()
+    if cari_kodlar is not None:
+        queryset = queryset.filter(cari_kod__in=cari_kodlar)
+
+    line = Concat(
+        _text("yil"), Value("-"), _text("ay"), Value(":"),
+        _text("borc"), Value(":"), _text("alacak"), Value(":"), "cari_ad",
+        output_field=TextField(),
+    )
+    rows = (
+        queryset.order_by()
+        .values("cari_kod")
+        .annotate(digest=MD5(StringAgg(line, delimiter="|", ordering=("yil", "ay"))))
+        .values_list("cari_kod", "digest")
+    )
+    return {
+        cari_kod: hashlib.md5(f"{period}|{digest}".encode()).hexdigest()
+        for cari_kod, digest in rows
+    }
+
+
+def _build_summaries(fingerprints, as_of=None, everyone=False):
+    """Verilen carilerin özet nesnelerini FIFO yaşlandırmayla oluşturur (kaydetmez)."""
+    queryset = LogoCustomerCollectionTransaction.objects.all()
+    if not everyone:  # tam yeniden hesaplamada on binlerce elemanlı IN listesi kurulmaz
+        queryset = queryset.filter(cari_kod__in=list(fingerprints))
+    rows = queryset.order_by("yil", "ay").values_list("cari_kod", "cari_ad", "yil", "ay", "borc", "alacak")
+    columns = list(zip(*rows))
+    if not columns:
+        return []
+    cari_kodlar, cari_adlar, yillar, aylar, borclar, alacaklar = columns
+
+    # Ay sırasına göre okunduğu için her carinin en güncel adı kalır
+    cari_ad_map = dict(zip(cari_kodlar, cari_adlar))
+
+    result = fifo_age(cari_kodlar, month_index(yillar, aylar), borclar, alacaklar, as_of=as_of)
+    labels = result.labels()
+    return [
+        LogoCustomerCollectionAgingSummary(
+            cari_kod=cari_kod,
+            cari_ad=cari_ad_map[cari_kod],
+            guncel_bakiye=bakiye,
+            aylik_kalan_borc=[[label, float(value)] for label, value in zip(labels, kovalar)],
+            ledger_hash=fingerprints[cari_kod],
+        )
+        for cari_kod, bakiye, kovalar in result.rows()
+    ]
+
+
+def recompute_aging_summaries(cari_kodlar=None, force=False, as_of=None):
+    """
+    Parmak izi değişen carilerin özetlerini yeniden hesaplar.
+
+    cari_kodlar : Yalnızca bu cariler kontrol edilir (varsayılan: tümü)
+    force       : Parmak izine bakmadan yeniden hesapla
+    Dönüş       : {'checked', 'recomputed', 'deleted'}
+    """
+    fingerprints = ledger_fingerprints(cari_kodlar, as_of=as_of)
+
+    summaries = LogoCustomerCollectionAgingSummary.objects.all()
+    if cari_kodlar is not None:
+        summaries = summaries.filter(cari_kod__in=cari_kodlar)
+    stored = dict(summaries.values_list("cari_kod", "ledger_hash"))
+
+    stale = {
+        cari_kod: fingerprint
+        for cari_kod, fingerprint in fingerprints.items()
+        if force or stored.get(cari_kod) != fingerprint
+    }
+    orphans = [cari_kod for cari_kod in stored if cari_kod not in fingerprints]
+
+    with transaction.atomic():
+        if orphans:
+            LogoCustomerCollectionAgingSummary.objects.filter(cari_kod__in=orphans).delete()
+        if stale:
+            LogoCustomerCollectionAgingSummary.objects.bulk_create(
+                _build_summaries(
+                    stale, as_of=as_of, everyone=cari_kodlar is None and len(stale) == len(fingerprints)
+                ),
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=["cari_kod"],
+                update_fields=["cari_ad", "guncel_bakiye", "aylik_kalan_borc", "ledger_hash", "updated_at"],
+            )
+
+    return {"checked": len(fingerprints), "recomputed": len(stale), "deleted": len(orphans)}
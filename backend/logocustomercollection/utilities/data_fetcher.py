@@ -1,22 +1,19 @@
 # backend/logocustomercollection/utilities/data_fetcher.py
-import requests
+from logodbcon.services.query_executor import run_query, QueryError
 
-def fetch_logo_db_data(token):
+def fetch_logo_db_data(token=None):
     """
     Logo ERP veritabanına ait logocustomercollection datasını çeken fonksiyon.
-    Dış IP üzerinden tanımlı bir API'ye GET isteği atar.
+    Kayıtlı logodbcon sorgusu süreç içinde çalıştırılır (HTTP loopback yok).
 
     Parametre:
-        token (str): JWT Bearer Token
+        token (str): Geriye dönük uyumluluk için tutulur, kullanılmaz.
 
     Dönüş:
-        JSON (list[dict]) → Logo DB'den dönen veri seti
+        list[dict] → Logo DB'den dönen veri seti (HTTP yanıtı ile aynı JSON tipleri)
     """
-    headers = {'Authorization': f'Bearer {token}'}
-    url = 'http://10.130.212.112/api/v2/logodbcon/query/logocustomercollection/'
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Hata: {response.status_code}, Mesaj: {response.text}")
+    try:
+        return run_query('logocustomercollection', json_compatible=True)
+    except QueryError as e:
+        print(f"Hata: {e}")
     return None
@@ -0,0 +1,29 @@
+# backend/logocustomercollection/utilities/sync_spec.py
+from decimal import Decimal
+
+from hanadbcon.services.sync_engine import SyncSpec
+from logodbcon.services.query_executor import logo_executor
+from ..models.models import LogoCustomerCollectionTransaction
+
+
+def _amount(column):
+    """Virgüllü formatı temizleyip Decimal'e çevirir."""
+    return lambda row: Decimal(str(row[column]).replace(",", ""))
+
+
+LOGO_CUSTOMER_COLLECTION_SYNC = SyncSpec(
+    name='logocustomercollection',
+    query_name='logocustomercollection',
+    model=LogoCustomerCollectionTransaction,
+    natural_key=('cari_kod', 'ay', 'yil'),
+    field_map={
+        'cari_kod': 'Cari Kod',
+        'cari_ad': 'Cari Ad',
+        'ay': 'Ay',
+        'yil': 'Yıl',
+        'borc': _amount('Borç'),
+        'alacak': _amount('Alacak'),
+    },
+    json_compatible=True,
+    executor=logo_executor,
+)
@@ -1,13 +1,25 @@
 # backend/logodbcon/admin.py
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models.sq_query_model import SQLQuery
+from .services.query_executor import logo_executor
 from import_export.admin import ImportExportModelAdmin
 
 
 class SQLQueryAdmin(ImportExportModelAdmin):
-    list_display = ('name', 'query_preview', 'departments_list', 'positions_list')
+    list_display = ('name', 'query_preview', 'cache_ttl', 'departments_list', 'positions_list')
     search_fields = ('name', 'query')
     filter_horizontal = ('departments', 'positions')
+    actions = ['invalidate_result_cache']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        logo_executor.invalidate_cache(obj.name)
+
+    @admin.action(description="Seçili sorguların sonuç önbelleğini temizle")
+    def invalidate_result_cache(self, request, queryset):
+        for query in queryset:
+            logo_executor.invalidate_cache(query.name)
+        messages.success(request, f"{queryset.count()} sorgunun sonuç önbelleği temizlendi.")
 
     def query_preview(self, obj):
         return obj.query[:50] + '...' if len(obj.query) > 50 else obj.query
@@ -3,8 +3,16 @@ from django.urls import reverse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.settings import api_settings
+from hanadbcon.api.renderers import COLUMNAR_RENDERERS, ColumnarResult, is_columnar, use_json_renderer
 from ..models.sq_query_model import SQLQuery
-from ..utilities.logodb_config import create_connection
+from ..services.query_executor import (
+    logo_executor,
+    QueryNotFoundError,
+    QueryParameterError,
+    QueryConnectionError,
+    QueryExecutionError,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,28 +30,25 @@ class SQLQueryListView(APIView):
         return Response(queries_list, status=status.HTTP_200_OK)
 
 class SQLQueryView(APIView):
-    def get(self, request, query_name):
-        sql_query_instance = SQLQuery.objects.filter(name=query_name).first()
-        if not sql_query_instance:
-            return Response({"error": "Sorgu bulunamadı"}, status=status.HTTP_404_NOT_FOUND)
-
-        connection = create_connection()
-        if not connection:
-            logger.error("Veritabanı bağlantısı kurulamadı.")
-            return Response({"error": "Veritabanı bağlantısı kurulamadı"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    # JSON varsayılan; Arrow IPC / msgpack kolon bazlı biçimler içerik müzakeresi ile seçilir
+    renderer_classes = list(api_settings.DEFAULT_RENDERER_CLASSES) + COLUMNAR_RENDERERS
 
-        formatted_query = sql_query_instance.query
-        cursor = connection.cursor()
+    def get(self, request, query_name):
         try:
-            cursor.execute(formatted_query)
-            rows = cursor.fetchall()
-            columns = [col[0] for col in cursor.description]
-            result = [dict(zip(columns, row)) for row in rows]
-        except Exception as e:
+            if is_columnar(request.accepted_renderer):
+                columns, rows = logo_executor.fetch_columnar(query_name, params=request.query_params)
+                return Response(ColumnarResult(columns, rows), status=status.HTTP_200_OK)
+            result = logo_executor.execute(query_name, params=request.query_params)
+        except QueryNotFoundError as e:
+            use_json_renderer(request)
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except QueryConnectionError as e:
+            logger.error("Veritabanı bağlantısı kurulamadı.")
+            use_json_renderer(request)
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except (QueryParameterError, QueryExecutionError) as e:
             logger.error(f"SQL sorgusu çalıştırılırken hata: {str(e)}")
+            use_json_renderer(request)
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        finally:
-            cursor.close()
-            connection.close()
 
         return Response(result, status=status.HTTP_200_OK)
@@ -11,6 +11,8 @@ class SQLQuery(BaseModel):
     parameters = models.JSONField(default=list, blank=True, null=True)
     departments = models.ManyToManyField(Department, related_name='logodbcon_queries_departments', blank=True)
     positions = models.ManyToManyField(Position, related_name='logodbcon_positions', blank=True) 
+    # Sonuç önbelleği süresi (sn); 0 ise sorgu her istekte yeniden çalıştırılır
+    cache_ttl = models.PositiveIntegerField(default=0, help_text="Sonuç önbelleği süresi (saniye). 0 = kapalı")
 
     # SQL sorguları için klavuz metni
     guidance_text = models.TextField(
@@ -0,0 +1,58 @@
+# backend/logodbcon/services/query_executor.py
+"""
+Kayıtlı Logo `SQLQuery` sorgularını süreç içinde çalıştıran yürütücü.
+Yürütme mantığı `hanadbcon.services.query_executor.SQLQueryExecutor` ile ortaktır.
+
+Kullanım:
+    from logodbcon.services.query_executor import run_query
+    rows = run_query("logocustomercollection", json_compatible=True)
+"""
+from contextlib import contextmanager
+
+from hanadbcon.services.result_cache import result_cache
+from hanadbcon.services.query_executor import (
+    SQLQueryExecutor,
+    DEFAULT_BATCH_SIZE,
+    QueryError,
+    QueryNotFoundError,
+    QueryParameterError,
+    QueryConnectionError,
+    QueryExecutionError,
+)
+
+from ..models.sq_query_model import SQLQuery
+from ..utilities.logodb_config import create_connection
+
+
+@contextmanager
+def logo_connection():
+    """Logo ODBC bağlantısını açar ve blok sonunda kapatır."""
+    connection = create_connection()
+    if connection is None:
+        raise QueryConnectionError("Veritabanı bağlantısı kurulamadı")
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+# Logo sorgularında `{schema}` placeholder'ı kullanılmaz
+logo_executor = SQLQueryExecutor(SQLQuery, connection_factory=logo_connection, label="LOGO",
+                                 result_cache=result_cache)
+
+
+def run_query(query_name, params=None, json_compatible=False):
+    """Kayıtlı Logo sorgusunu süreç içinde çalıştırır ve `list[dict]` döndürür."""
+    return logo_executor.execute(query_name, params, json_compatible=json_compatible)
+
+
+def iter_query(query_name, params=None, batch_size=DEFAULT_BATCH_SIZE, json_compatible=False):
+    """Kayıtlı Logo sorgusunu süreç içinde çalıştırır ve satırları tek tek üretir."""
+    return logo_executor.iter_rows(query_name, params, batch_size=batch_size, json_compatible=json_compatible)
+
+
+__all__ = [
+    "logo_executor", "run_query", "iter_query",
+    "QueryError", "QueryNotFoundError", "QueryParameterError",
+    "QueryConnectionError", "QueryExecutionError",
+]
@@ -0,0 +1,55 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mailservice', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maillog',
+            name='body',
+            field=models.TextField(blank=True, default='', verbose_name='İçerik'),
+        ),
+        migrations.AddField(
+            model_name='maillog',
+            name='content_subtype',
+            field=models.CharField(default='html', help_text="'html' veya 'plain'", max_length=10, verbose_name='İçerik Tipi'),
+        ),
+        migrations.AddField(
+            model_name='maillog',
+            name='html_alternative',
+            field=models.TextField(blank=True, help_text='Düz metin gövdeye eklenecek HTML sürümü (multipart)', null=True, verbose_name='HTML Alternatif'),
+        ),
+        migrations.AddField(
+            model_name='maillog',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Deneme Sayısı'),
+        ),
+        migrations.AddField(
+            model_name='maillog',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Sonraki Deneme'),
+        ),
+        migrations.AddIndex(
+            model_name='maillog',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='mailservice_status_c1b726_idx'),
+        ),
+        migrations.CreateModel(
+            name='MailAttachment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filename', models.CharField(max_length=255, verbose_name='Dosya Adı')),
+                ('content', models.BinaryField(verbose_name='İçerik')),
+                ('mimetype', models.CharField(default='application/octet-stream', max_length=100, verbose_name='MIME Tipi')),
+                ('mail_log', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachments', to='mailservice.maillog', verbose_name='Mail')),
+            ],
+            options={
+                'verbose_name': 'Mail Eki',
+                'verbose_name_plural': 'Mail Ekleri',
+            },
+        ),
+    ]
@@ -92,12 +92,45 @@ class MailLog(SoftDeleteModel):
         blank=True,
         verbose_name="İlişkili Nesne ID"
     )
+
+    # Kuyruk alanları (bkz. services/mail_queue.py)
+    body = models.TextField(
+        blank=True,
+        default='',
+        verbose_name="İçerik"
+    )
+
+    content_subtype = models.CharField(
+        max_length=10,
+        default='html',
+        verbose_name="İçerik Tipi",
+        help_text="'html' veya 'plain'"
+    )
+
+    html_alternative = models.TextField(
+        null=True,
+        blank=True,
+        verbose_name="HTML Alternatif",
+        help_text="Düz metin gövdeye eklenecek HTML sürümü (multipart)"
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Deneme Sayısı"
+    )
+
+    next_attempt_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Sonraki Deneme"
+    )
     
     class Meta:
         verbose_name = "Mail Logu"
         verbose_name_plural = "Mail Logları"
         indexes = [
             models.Index(fields=['mail_type', 'status']),
+            models.Index(fields=['status', 'next_attempt_at']),
             models.Index(fields=['related_object_type', 'related_object_id']),
             models.Index(fields=['created_by_email']),
             models.Index(fields=['created_by_id']),
@@ -113,4 +146,37 @@ class MailLog(SoftDeleteModel):
         User = get_user_model()
         if self.created_by_id:
             return User.objects.filter(id=self.created_by_id).first()
-        return None
\ No newline at end of file
+        return None
+
+
+class MailAttachment(models.Model):
+    """Kuyruktaki bir maile ait ek dosya"""
+
+    mail_log = models.ForeignKey(
+        MailLog,
+        on_delete=models.CASCADE,
+        related_name='attachments',
+        verbose_name="Mail"
+    )
+
+    filename = models.CharField(
+        max_length=255,
+        verbose_name="Dosya Adı"
+    )
+
+    content = models.BinaryField(
+        verbose_name="İçerik"
+    )
+
+    mimetype = models.CharField(
+        max_length=100,
+        default='application/octet-stream',
+        verbose_name="MIME Tipi"
+    )
+
+    class Meta:
+        verbose_name = "Mail Eki"
+        verbose_name_plural = "Mail Ekleri"
+
+    def __str__(self):
+        return self.filename
@@ -0,0 +1,223 @@
+# backend/mailservice/services/mail_queue.py
+"""
+Asenkron mail kuyruğu.
+
+Servisler maili doğrudan SMTP'ye göndermek yerine `enqueue_mail()` ile kuyruğa bırakır;
+çağrı yalnızca bir `MailLog` (ve varsa ek) kaydı oluşturup hemen döner. Gönderimi Celery
+üzerindeki `mailservice.tasks.dispatch_pending_mails` yapar:
+
+    1) Bekleyen (PENDING, deneme zamanı gelmiş) kayıtlar `SKIP LOCKED` ile kilitlenip tek
+       sorguda SENDING'e çekilir; aynı anda çalışan worker'lar aynı maili almaz
+    2) Batch'teki tüm mailler tek SMTP bağlantısı üzerinden gönderilir (bağlantı koparsa
+       bir kez yeniden açılır)
+    3) Sonuçlar tek `bulk_update` ile yazılır; başarısız mailler `MAIL_QUEUE_RETRY_BACKOFF * 2^deneme`
+       saniye sonra yeniden denenir, `MAIL_QUEUE_MAX_ATTEMPTS` denemeden sonra FAILED olur
+
+Kullanım:
+    from mailservice.services.mail_queue import enqueue_mail
+
+    enqueue_mail(
+        subject="Satınalma Onayı",
+        body=html_content,
+        recipients=["a@tunacelik.com.tr"],
+        mail_type='NOTIFICATION',
+        attachments=[("onay.pdf", pdf_bytes, "application/pdf")],
+    )
+"""
+import logging
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from mailservice.models.models import MailLog, MailAttachment
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_SCHEDULED_KEY = 'mailservice:dispatch_scheduled'
+
+
+# ---------------------------------------------------------------------- #
+# Kuyruğa ekleme
+# ---------------------------------------------------------------------- #
+def enqueue_mail(subject, body, recipients, mail_type='NOTIFICATION', sender=None,
+                 content_subtype='html', html_alternative=None, attachments=None,
+                 created_by=None, related_object_type=None, related_object_id=None):
+    """
+    Maili kuyruğa ekler ve `MailLog` kaydını döndürür; SMTP'ye bağlanmaz.
+
+    attachments : [(dosya adı, içerik bytes, mime tipi), ...]
+    Gönderim, çağıran transaction commit edildikten sonra tetiklenir.
+    """
+    recipients = sorted({r for r in recipients if r})
+    if not recipients:
+        raise ValueError("Mail alıcısı bulunamadı.")
+    attachments = list(attachments or [])
+
+    mail_log = MailLog.objects.create(
+        mail_type=mail_type,
+        subject=subject[:255],
+        recipients=recipients,
+        sender=sender or settings.DEFAULT_FROM_EMAIL,
+        created_by=created_by,
+        created_by_email=getattr(created_by, 'email', None),
+        has_attachments=bool(attachments),
+        related_object_type=related_object_type,
+        related_object_id=related_object_id,
+        status='PENDING',
+        body=body,
+        content_subtype=content_subtype,
+        html_alternative=html_alternative,
+    )
+    if attachments:
+        MailAttachment.objects.bulk_create([
+            MailAttachment(mail_log=mail_log, filename=filename, content=content, mimetype=mimetype)
+            for filename, content, mimetype in attachments
+        ])
+
+    transaction.on_commit(schedule_dispatch)
+    return mail_log
+
+
+def schedule_dispatch():
+    """
+    Gönderim görevini kuyruğa alır. Art arda eklenen mailler için tek görev planlanır;
+    görev başlarken işareti kaldırdığı için sonradan eklenen mail kaçmaz.
+    """
+    if not cache.add(DISPATCH_SCHEDULED_KEY, 1, timeout=settings.MAIL_QUEUE_STALE_AFTER):
+        return
+    from mailservice.tasks import dispatch_pending_mails
+    try:
+        dispatch_pending_mails.apply_async(countdown=1)
+    except Exception as e:  # Broker erişilemezse periyodik görev maili yine gönderir
+        cache.delete(DISPATCH_SCHEDULED_KEY)
+        logger.warning(f"[MAIL_QUEUE] Gönderim görevi kuyruğa alınamadı: {e}")
+
+
+# ---------------------------------------------------------------------- #
+# Gönderim
+# ---------------------------------------------------------------------- #
+def _build_message(mail_log, connection):
+    email = EmailMultiAlternatives(
+        subject=mail_log.subject,
+        body=mail_log.body,
+        from_email=mail_log.sender,
+        to=mail_log.recipients,
+        connection=connection,
+    )
+    email.content_subtype = mail_log.content_subtype or 'html'
+    if mail_log.html_alternative:
+        email.attach_alternative(mail_log.html_alternative, 'text/html')
+    for attachment in mail_log.attachments.all():
+        email.attach(attachment.filename, bytes(attachment.content), attachment.mimetype)
+    return email
+
+
+def _claim_batch(batch_size):
+    """Gönderim zamanı gelmiş bekleyen kayıtları kilitleyip SENDING'e çeker."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            MailLog.objects.select_for_update(skip_locked=True)
+            .filter(status='PENDING', is_deleted=False)
+            .exclude(next_attempt_at__gt=now)
+            .order_by('created_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if ids:
+            MailLog.objects.filter(id__in=ids).update(status='SENDING', updated_at=now)
+    return list(MailLog.objects.filter(id__in=ids).prefetch_related('attachments').order_by('created_at'))
+
+
+def release_stale_mails():
+    """Worker çökmesi nedeniyle SENDING'de kalan kayıtları yeniden kuyruğa alır."""
+    cutoff = timezone.now() - timedelta(seconds=settings.MAIL_QUEUE_STALE_AFTER)
+    return MailLog.objects.filter(status='SENDING', updated_at__lt=cutoff).update(
+        status='PENDING', updated_at=timezone.now()
+    )
+
+
+def dispatch_pending(batch_size=None):
+    """
+    Bekleyen mailleri tek SMTP bağlantısı üzerinden gönderir.
+
+    Dönüş: {'sent', 'retry', 'failed', 'has_more'}
+    """
+    batch_size = batch_size or settings.MAIL_QUEUE_BATCH_SIZE
+    mails = _claim_batch(batch_size)
+    stats = {'sent': 0, 'retry': 0, 'failed': 0}
+    if not mails:
+        stats['has_more'] = False
+        return stats
+
+    connect_error = None
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        logger.error(f"[MAIL_QUEUE] SMTP bağlantısı açılamadı: {e}")
+        connection = None
+        connect_error = e
+
+    try:
+        for mail_log in mails:
+            if connection is None:
+                _mark_failed_attempt(mail_log, connect_error, stats)
+                continue
+            try:
+                try:
+                    _build_message(mail_log, connection).send(fail_silently=False)
+                except smtplib.SMTPServerDisconnected:
+                    connection.close()
+                    connection.open()
+                    _build_message(mail_log, connection).send(fail_silently=False)
+            except Exception as e:
+                _mark_failed_attempt(mail_log, e, stats)
+            else:
+                mail_log.status = 'SENT'
+                mail_log.sent_at = timezone.now()
+                mail_log.error_message = None
+                mail_log.next_attempt_at = None
+                mail_log.attempts += 1
+                stats['sent'] += 1
+    finally:
+        if connection is not None:
+            connection.close()
+
+        now = timezone.now()
+        for mail_log in mails:
+            if mail_log.status == 'SENDING':  # beklenmeyen hata: yeniden denensin
+                mail_log.status = 'PENDING'
+            mail_log.updated_at = now  # bulk_update auto_now alanını kendisi güncellemez
+        MailLog.objects.bulk_update(
+            mails,
+            ['status', 'sent_at', 'error_message', 'attempts', 'next_attempt_at', 'updated_at'],
+            batch_size=500,
+        )
+
+    # Hemen gönderilebilecek başka mail kaldı mı (yeniden denemeleri periyodik görev alır)
+    stats['has_more'] = MailLog.objects.filter(
+        status='PENDING', is_deleted=False, next_attempt_at__isnull=True
+    ).exists()
+    logger.info(f"[MAIL_QUEUE] {stats}")
+    return stats
+
+
+def _mark_failed_attempt(mail_log, error, stats):
+    mail_log.attempts += 1
+    mail_log.error_message = str(error)
+    if mail_log.attempts >= settings.MAIL_QUEUE_MAX_ATTEMPTS:
+        mail_log.status = 'FAILED'
+        mail_log.next_attempt_at = None
+        stats['failed'] += 1
+        logger.error(f"[MAIL_QUEUE] Mail gönderilemedi (#{mail_log.id}, {mail_log.subject}): {error}")
+    else:
+        delay = settings.MAIL_QUEUE_RETRY_BACKOFF * 2 ** (mail_log.attempts - 1)
+        mail_log.status = 'PENDING'
+        mail_log.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        stats['retry'] += 1
+        logger.warning(f"[MAIL_QUEUE] Mail #{mail_log.id} {delay} sn sonra yeniden denenecek: {error}")
@@ -1,13 +1,11 @@
 # backend/mailservice/services/send_sofitel_supplier_balance_report_email_task.py
 
 from django.utils.timezone import localtime
-from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 from django.utils import timezone
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from authcentral.models import Department
-from mailservice.models.models import MailLog
+from mailservice.services.mail_queue import enqueue_mail
 
 User = get_user_model()
 
@@ -24,7 +22,6 @@ class SofitelSupplierBalanceReportMailService:
             return []
 
     def send_mail(self, context: dict, report_date: str):
-        mail_log = None
         try:
             recipients = self.get_mail_recipients()
             if not recipients:
@@ -40,44 +37,19 @@ class SofitelSupplierBalanceReportMailService:
 
             template_html = 'mailservice/report_orchestrator/sofitel_supplier_balance_report/sofitel_supplier_balance_report_email.html'
 
-            mail_log = MailLog.objects.create(
-                mail_type='Rapor',
-                subject=subject,
-                recipients=recipients,
-                sender=settings.DEFAULT_FROM_EMAIL,
-                created_by=None,
-                created_by_email=None,
-                has_attachments=False,
-                related_object_type='sofitel_supplier_balance_report',
-                related_object_id=None,
-                status='PENDING'
-            )
-
             html_content = render_to_string(template_html, context)
 
-            email = EmailMessage(
+            # Kuyruğa ekle — SMTP gönderimi mailservice worker'ında yapılır
+            enqueue_mail(
                 subject=subject,
                 body=html_content,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=recipients
+                recipients=recipients,
+                mail_type='Rapor',
+                related_object_type='sofitel_supplier_balance_report',
             )
-            email.content_subtype = "html"
-
-            mail_log.status = 'SENDING'
-            mail_log.save()
-
-            email.send(fail_silently=False)
-
-            mail_log.status = 'SENT'
-            mail_log.sent_at = timezone.now()
-            mail_log.save()
             return True
 
         except Exception as e:
-            if mail_log:
-                mail_log.status = 'FAILED'
-                mail_log.error_message = str(e)
-                mail_log.save()
-            print(f"[MAIL ERROR] Sofitel tedarikçi bakiyesi maili gönderilemedi: {str(e)}")
+            print(f"[MAIL ERROR] Sofitel tedarikçi bakiyesi maili kuyruğa alınamadı: {str(e)}")
             return False
 
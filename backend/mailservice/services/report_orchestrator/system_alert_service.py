@@ -1,12 +1,10 @@
 # File: backend/mailservice/services/report_orchestrator/system_alert_service.py
 
-from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 from django.utils import timezone
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from authcentral.models import Department
-from mailservice.models.models import MailLog
+from mailservice.services.mail_queue import enqueue_mail
 import logging
 
 User = get_user_model()
@@ -28,7 +26,6 @@ class SystemAlertService:
             return []
 
     def send_alert(self, api_name: str, error_message: str, report_context: dict = None):
-        mail_log = None
         try:
             recipients = self.get_recipients()
             if not recipients:
@@ -45,41 +42,20 @@ class SystemAlertService:
                 **(report_context or {}),
             }
 
-            mail_log = MailLog.objects.create(
-                mail_type='Sistem Uyarısı',
-                subject=subject,
-                recipients=recipients,
-                sender=settings.DEFAULT_FROM_EMAIL,
-                created_by=None,
-                created_by_email=None,
-                has_attachments=False,
-                related_object_type=api_name,
-                related_object_id=None,
-                status='PENDING'
-            )
-
             logger.info(f"[MAIL_ALERT] Şablon render ediliyor: {template_path}")
             html_content = render_to_string(template_path, context)
 
-            email = EmailMessage(
+            # Kuyruğa ekle — SMTP gönderimi mailservice worker'ında yapılır
+            enqueue_mail(
                 subject=subject,
                 body=html_content,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=recipients
+                recipients=recipients,
+                mail_type='Sistem Uyarısı',
+                related_object_type=api_name,
             )
-            email.content_subtype = "html"
-            email.send(fail_silently=False)
-
-            mail_log.status = 'SENT'
-            mail_log.sent_at = timezone.now()
-            mail_log.save()
-            logger.info(f"[MAIL_ALERT] {api_name} uyarı maili gönderildi.")
+            logger.info(f"[MAIL_ALERT] {api_name} uyarı maili kuyruğa alındı.")
             return True
 
         except Exception as e:
-            logger.error(f"[MAIL_ALERT_ERROR] {api_name} için mail gönderimi başarısız: {str(e)}")
-            if mail_log:
-                mail_log.status = 'FAILED'
-                mail_log.error_message = str(e)
-                mail_log.save()
+            logger.error(f"[MAIL_ALERT_ERROR] {api_name} için mail kuyruğa alınamadı: {str(e)}")
             return False
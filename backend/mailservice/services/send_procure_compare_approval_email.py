@@ -1,15 +1,12 @@
 # File: backend/mailservice/services/send_procure_compare_approval_email.py
 
-from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
-from django.utils import timezone
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from authcentral.models import Department
 from weasyprint import HTML
 import json
 
-from mailservice.models.models import MailLog
+from mailservice.services.mail_queue import enqueue_mail
 from procure_compare.models.approval import PurchaseApproval
 
 User = get_user_model()
@@ -62,82 +59,53 @@ class ProcureCompareApprovalMailService:
                 template_pdf = 'mailservice/procure_compare_approval_email_pdf.html'
                 filename_suffix = 'onay'
 
-            # ✅ Mail Log Kaydı
-            mail_log = MailLog.objects.create(
-                mail_type='Bildirim',
+            detay = approval.satir_detay_json or {}
+
+            teklif_fiyatlari_raw = detay.get("teklif_fiyatlari", {})
+            if isinstance(teklif_fiyatlari_raw, str):
+                try:
+                    teklif_fiyatlari = json.loads(teklif_fiyatlari_raw)
+                except Exception:
+                    teklif_fiyatlari = {}
+            else:
+                teklif_fiyatlari = teklif_fiyatlari_raw
+
+            referans_teklifler = detay.get("referans_teklifler", [])
+            if isinstance(referans_teklifler, str):
+                try:
+                    referans_teklifler = json.loads(referans_teklifler)
+                except Exception:
+                    referans_teklifler = []
+
+            context = {
+                "approval": approval,
+                "detay": detay,
+                "teklif_fiyatlari": teklif_fiyatlari,
+                "referans_teklifler": referans_teklifler,
+            }
+
+            html_content = render_to_string(template_html, context)
+            pdf_content = self._generate_pdf(context, template_pdf)
+
+            # ✅ Kuyruğa ekle — SMTP gönderimi mailservice worker'ında yapılır
+            enqueue_mail(
                 subject=subject,
+                body=html_content,
                 recipients=recipients,
-                sender=settings.DEFAULT_FROM_EMAIL,
+                mail_type='Bildirim',
                 created_by=approval.kullanici,
-                created_by_email=approval.kullanici.email,
-                has_attachments=True,
                 related_object_type='PurchaseApproval',
                 related_object_id=approval.id,
-                status='PENDING'
-            )
-
-            try:
-                detay = approval.satir_detay_json or {}
-
-                teklif_fiyatlari_raw = detay.get("teklif_fiyatlari", {})
-                if isinstance(teklif_fiyatlari_raw, str):
-                    try:
-                        teklif_fiyatlari = json.loads(teklif_fiyatlari_raw)
-                    except Exception:
-                        teklif_fiyatlari = {}
-                else:
-                    teklif_fiyatlari = teklif_fiyatlari_raw
-
-                referans_teklifler = detay.get("referans_teklifler", [])
-                if isinstance(referans_teklifler, str):
-                    try:
-                        referans_teklifler = json.loads(referans_teklifler)
-                    except Exception:
-                        referans_teklifler = []
-
-                context = {
-                    "approval": approval,
-                    "detay": detay,
-                    "teklif_fiyatlari": teklif_fiyatlari,
-                    "referans_teklifler": referans_teklifler,
-                }
-
-                # ✅ E-posta Gönderimi
-                html_content = render_to_string(template_html, context)
-                pdf_content = self._generate_pdf(context, template_pdf)
-
-                email = EmailMessage(
-                    subject=mail_log.subject,
-                    body=html_content,
-                    from_email=mail_log.sender,
-                    to=recipients
-                )
-                email.content_subtype = "html"
-
-                email.attach(
+                attachments=[(
                     f'satinalma_{filename_suffix}_{approval.belge_no}.pdf',
                     pdf_content,
                     'application/pdf'
-                )
-
-                mail_log.status = 'SENDING'
-                mail_log.save()
-
-                email.send(fail_silently=False)
-
-                mail_log.status = 'SENT'
-                mail_log.sent_at = timezone.now()
-                mail_log.save()
-                return True
-
-            except Exception as e:
-                mail_log.status = 'FAILED'
-                mail_log.error_message = str(e)
-                mail_log.save()
-                return False
+                )],
+            )
+            return True
 
         except Exception as e:
-            print(f"[MAIL ERROR] Satınalma onay maili gönderilemedi: {str(e)}")
+            print(f"[MAIL ERROR] Satınalma onay maili kuyruğa alınamadı: {str(e)}")
             return False
 
     def _generate_pdf(self, context, template_pdf):
@@ -1,10 +1,9 @@
 # backend/mailservice/services/stockcardintegration/update_stock_card_on_hanadb.py
 
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from stockcardintegration.models.models import StockCard
+from mailservice.services.mail_queue import enqueue_mail
 
 User = get_user_model()
 
@@ -27,12 +26,13 @@ def send_stockcard_update_success_email(stock_card: StockCard, updated_by):
 
     recipients = get_recipients(updated_by)
 
-    send_mail(
+    enqueue_mail(
         subject=subject,
-        message="",
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=recipients,
-        html_message=html_content
+        body=html_content,
+        recipients=recipients,
+        created_by=updated_by,
+        related_object_type='StockCard',
+        related_object_id=stock_card.id,
     )
 
 
@@ -48,10 +48,11 @@ def send_stockcard_update_failure_email(stock_card: StockCard, updated_by, error
 
     recipients = get_recipients(updated_by)
 
-    send_mail(
+    enqueue_mail(
         subject=subject,
-        message="",
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=recipients,
-        html_message=html_content
+        body=html_content,
+        recipients=recipients,
+        created_by=updated_by,
+        related_object_type='StockCard',
+        related_object_id=stock_card.id,
     )
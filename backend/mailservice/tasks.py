@@ -0,0 +1,28 @@
+# backend/mailservice/tasks.py
+
+from celery import shared_task
+from django.core.cache import cache
+import logging
+
+from .services.mail_queue import DISPATCH_SCHEDULED_KEY, dispatch_pending, release_stale_mails
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, ignore_result=True)
+def dispatch_pending_mails(self):
+    """
+    Kuyruktaki mailleri batch'ler halinde gönderir. `enqueue_mail()` tarafından tetiklenir;
+    periyodik çağrı ise yeniden denemeleri ve kaçan kayıtları toplar.
+    """
+    # İşaret gönderimden önce kaldırılır; bu sırada eklenen mail yeni bir görev planlar
+    cache.delete(DISPATCH_SCHEDULED_KEY)
+
+    released = release_stale_mails()
+    if released:
+        logger.warning(f"[MAIL_QUEUE] SENDING durumunda kalan {released} mail yeniden kuyruğa alındı")
+
+    stats = dispatch_pending()
+    if stats['has_more']:
+        self.apply_async(countdown=1)
+    return stats
@@ -1,10 +1,9 @@
 # backend/mailservice/utils/report_failure_notifier.py
 
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from authcentral.models import Department
+from mailservice.services.mail_queue import enqueue_mail
 
 def notify_report_failure(api_name: str, error_message: str, report_context: dict):
     try:
@@ -24,16 +23,16 @@ def notify_report_failure(api_name: str, error_message: str, report_context: dic
             }
         )
 
-        send_mail(
+        # Kuyruğa ekle — SMTP gönderimi ve yeniden denemeler mailservice worker'ında yapılır
+        enqueue_mail(
             subject=subject,
-            message="",
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=recipients,
-            html_message=body,
-            fail_silently=False
+            body=body,
+            recipients=recipients,
+            mail_type='Sistem Uyarısı',
+            related_object_type=api_name,
         )
         return True
 
     except Exception as e:
-        print(f"[MAIL ERROR] Bilgi Sistem uyarı maili gönderilemedi: {str(e)}")
+        print(f"[MAIL ERROR] Bilgi Sistem uyarı maili kuyruğa alınamadı: {str(e)}")
         return False
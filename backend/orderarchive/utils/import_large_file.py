@@ -2,6 +2,7 @@
 from openpyxl import load_workbook
 from orderarchive.models import OrderDetail
 from datetime import datetime
+from hanadbcon.services.bulk_loader import copy_load
 
 def preserve_text(value):
     """
@@ -36,63 +37,68 @@ def convert_to_date(value):
     except (ValueError, TypeError):
         return None
 
+# Excel başlığı -> model alanı, dönüştürücü
+COLUMN_MAP = [
+    ("seller", "Satici", preserve_text),
+    ("order_number", "SipNo", preserve_text),
+    ("order_date", "SipTarih", convert_to_date),
+    ("year", "Yil", convert_to_int_or_none),  # Yıl için None döndürüyoruz
+    ("month", "Ay", convert_to_int_or_none),  # Ay için None döndürüyoruz
+    ("delivery_date", "TeslimTarih", convert_to_date),
+    ("country", "Ulke", preserve_text),
+    ("city", "Sehir", preserve_text),
+    ("customer_code", "MusteriKod", preserve_text),
+    ("customer_name", "MusteriAd", preserve_text),
+    ("document_description", "BelgeAciklama", preserve_text),
+    ("color_code", "RenkKod", preserve_text),
+    ("detail_description", "DetayAciklama1-2-3", preserve_text),
+    ("line_number", "SiraNo", convert_to_int_or_none),
+    ("item_code", "KalemKod", preserve_text),
+    ("item_description", "KalemTanim", preserve_text),
+    ("quantity", "Miktar", preserve_text),
+    ("unit_price", "BirimFiyat", preserve_text),
+    ("vat_percentage", "KdvYuzde", preserve_text),
+    ("vat_amount", "KdvTutar", preserve_text),
+    ("discount_rate", "IskOran", preserve_text),
+    ("discount_amount", "IsktoluTutar", preserve_text),
+    ("currency", "Doviz", preserve_text),
+    ("exchange_rate", "Kur", preserve_text),
+    ("currency_price", "DovizFiyat", preserve_text),
+    ("currency_movement_amount", "DovizHareketTutar", preserve_text),
+]
+
+
 def import_large_file(file_path, chunk_size=10000):
     """
-    Büyük Excel dosyalarını parça parça veritabanına aktarır.
+    Büyük Excel dosyalarını veritabanına aktarır.
+    Satırlar model nesnesi oluşturulmadan `COPY FROM STDIN` ile akıtılır (bkz. hanadbcon.services.bulk_loader);
+    `chunk_size` yalnızca ilerleme çıktısının sıklığını belirler.
     """
     wb = load_workbook(file_path, read_only=True)
     sheet = wb.active
     headers = [cell.value for cell in next(sheet.iter_rows(max_row=1))]
 
-    rows_to_save = []
     errors = []
-    row_count = 0
+    counter = {"rows": 0}
 
-    for row in sheet.iter_rows(min_row=2, values_only=True):
-        row_data = dict(zip(headers, row))
-        row_count += 1
+    def iter_rows():
+        for row in sheet.iter_rows(min_row=2, values_only=True):
+            row_data = dict(zip(headers, row))
+            counter["rows"] += 1
+            if counter["rows"] % chunk_size == 0:
+                print(f"{counter['rows']} satır okundu.")
+            yield {field: convert(row_data.get(column)) for field, column, convert in COLUMN_MAP}
 
-        try:
-            rows_to_save.append(OrderDetail(
-                seller=preserve_text(row_data.get("Satici")),
-                order_number=preserve_text(row_data.get("SipNo")),
-                order_date=convert_to_date(row_data.get("SipTarih")),
-                year=convert_to_int_or_none(row_data.get("Yil")),  # Yıl için None döndürüyoruz
-                month=convert_to_int_or_none(row_data.get("Ay")),  # Ay için None döndürüyoruz
-                delivery_date=convert_to_date(row_data.get("TeslimTarih")),
-                country=preserve_text(row_data.get("Ulke")),
-                city=preserve_text(row_data.get("Sehir")),
-                customer_code=preserve_text(row_data.get("MusteriKod")),
-                customer_name=preserve_text(row_data.get("MusteriAd")),
-                document_description=preserve_text(row_data.get("BelgeAciklama")),
-                color_code=preserve_text(row_data.get("RenkKod")),
-                detail_description=preserve_text(row_data.get("DetayAciklama1-2-3")),
-                line_number=convert_to_int_or_none(row_data.get("SiraNo")),
-                item_code=preserve_text(row_data.get("KalemKod")),
-                item_description=preserve_text(row_data.get("KalemTanim")),
-                quantity=preserve_text(row_data.get("Miktar")),
-                unit_price=preserve_text(row_data.get("BirimFiyat")),
-                vat_percentage=preserve_text(row_data.get("KdvYuzde")),
-                vat_amount=preserve_text(row_data.get("KdvTutar")),
-                discount_rate=preserve_text(row_data.get("IskOran")),
-                discount_amount=preserve_text(row_data.get("IsktoluTutar")),
-                currency=preserve_text(row_data.get("Doviz")),
-                exchange_rate=preserve_text(row_data.get("Kur")),
-                currency_price=preserve_text(row_data.get("DovizFiyat")),
-                currency_movement_amount=preserve_text(row_data.get("DovizHareketTutar")),
-            ))
-        except Exception as e:
-            errors.append(f"Satır {row_count}: {e} - {row_data}")
-            continue
+    def on_error(index, row, exc):
+        errors.append(f"Satır {index}: {exc} - {row}")
 
-        if len(rows_to_save) >= chunk_size:
-            OrderDetail.objects.bulk_create(rows_to_save)
-            print(f"{len(rows_to_save)} satır yüklendi.")
-            rows_to_save = []
-
-    if rows_to_save:
-        OrderDetail.objects.bulk_create(rows_to_save)
-        print(f"{len(rows_to_save)} satır yüklendi.")
+    stats = copy_load(
+        OrderDetail,
+        iter_rows(),
+        fields=[field for field, _, _ in COLUMN_MAP],
+        on_error=on_error,
+    )
+    print(f"{stats['written']} satır yüklendi.")
 
     if errors:
         error_log_file = "/var/www/sapb1reportsv2/backend/logs/error_log.txt"
@@ -101,5 +107,4 @@ def import_large_file(file_path, chunk_size=10000):
                 f.write(error + "\n")
         print(f"{len(errors)} hata loglandı. Ayrıntılar: {error_log_file}")
 
-    print(f"Toplam {row_count} satır işlendi.")
-
+    print(f"Toplam {counter['rows']} satır işlendi.")
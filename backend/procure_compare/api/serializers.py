@@ -7,6 +7,7 @@ from procure_compare.models import (
     PurchaseComparison,
     PurchaseApproval
 )
+from procure_compare.services.transformer import QUOTE_PRICE_RE
 
 
 class PurchaseOrderSerializer(serializers.ModelSerializer):
@@ -28,7 +29,7 @@ class PurchaseComparisonSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = PurchaseComparison
-        fields = "__all__"
+        exclude = ["row_hash"]
         read_only_fields = ["teklif_fiyatlari_list", "uyari_var_mi"]
         
 
@@ -50,8 +51,7 @@ class PurchaseComparisonSerializer(serializers.ModelSerializer):
                     vade_gun = "0"
                     teslim_gun = "0"
 
-                import re
-                match = re.match(r"([\d.,]+)\s+(\w{3})\s+\(Kur:\s*([\d.,]+)\)", fiyat_raw)
+                match = QUOTE_PRICE_RE.match(fiyat_raw)
                 if not match:
                     continue
                 fiyat = float(match[1].replace(",", "."))
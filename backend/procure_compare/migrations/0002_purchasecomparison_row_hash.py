@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('procure_compare', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purchasecomparison',
+            name='row_hash',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
@@ -32,6 +32,9 @@ class PurchaseComparison(models.Model):
     teklif_fiyatlari_json = JSONField(null=True, blank=True)
     teklif_fiyatlari_list = JSONField(null=True, blank=True)
 
+    # Senkronizasyonda değişiklik tespiti için içerik özeti (bkz. services/db_sync.py)
+    row_hash = models.CharField(max_length=32, blank=True, default='')
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
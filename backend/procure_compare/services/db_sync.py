@@ -1,36 +1,79 @@
 # File: backend/procure_compare/services/db_sync.py
+"""
+PurchaseComparison için artımlı senkronizasyon.
 
+Eski akış tüm kayıtları transaction dışında silip yeniden ekliyordu; senkronizasyon sürerken
+okuyanlar boş tablo görebiliyordu. Artık `hanadbcon.services.sync_engine` ile `uniq_detail_no`
+anahtarına göre:
+
+    1) Teklif metinleri tek seferde (Celery görevinde gerekirse paralel) parse edilir, tekrar edenler bir kez
+    2) Her satır için içerik özeti (row_hash) hesaplanır; özeti değişmeyen satırlara dokunulmaz
+    3) Yeni / değişen satırlar `INSERT ... ON CONFLICT DO UPDATE`, HANA'da artık olmayanlar silinir
+    4) Tüm yazma tek transaction içinde yapılır; kaynak boş dönerse tablo boşaltılmaz
+"""
 import logging
+
+from hanadbcon.services.sync_engine import SyncEngine, SyncSpec, SyncEmptySourceError
 from procure_compare.models import PurchaseComparison
 from procure_compare.services.transformer import transform_procure_compare_data
 
 logger = logging.getLogger("procure_compare")  # 🔥 merkezi log kontrol
 
-def sync_procure_compare_data(raw_data):
+SYNC_FIELDS = (
+    "uniq_detail_no", "belge_no", "tedarikci_kod", "tedarikci_ad", "belge_tarih", "teslim_tarih",
+    "belge_status", "belge_aciklamasi", "sevk_adres", "kalem_grup", "satir_status", "satir_no",
+    "kalem_kod", "kalem_tanimi", "birim", "sip_miktar", "detay_kur", "detay_doviz",
+    "net_fiyat_dpb", "net_tutar_ypb", "referans_teklifler", "teklif_fiyatlari_json",
+    "teklif_fiyatlari_list",
+)
+
+PROCURE_COMPARE_SYNC = SyncSpec(
+    name="procure_compare",
+    query_name="procure_compare",
+    model=PurchaseComparison,
+    natural_key=("uniq_detail_no",),
+    field_map={field: field for field in SYNC_FIELDS},  # satırlar transform sonrası model alan adlarıyla gelir
+    # teklif_fiyatlari_list, teklif_fiyatlari_json'dan türetildiği için özete katılmaz
+    compare_fields=[f for f in SYNC_FIELDS if f not in ("uniq_detail_no", "teklif_fiyatlari_list")],
+    hash_field="row_hash",
+    batch_size=1000,
+)
+
+
+def sync_procure_compare_data(raw_data, parallel=False):
     """
-    SAP HANA'dan gelen verileri dönüştürür ve veritabanına kaydeder.
-    Mevcut verileri siler, yenilerini topluca ekler.
+    SAP HANA'dan gelen verileri dönüştürür ve yalnızca farkları veritabanına uygular.
+    `parallel=True` teklif parse işlemini süreç havuzuna dağıtır; yalnızca Celery görevinden verilir.
+
+    Dönüş: {'received', 'created', 'updated', 'unchanged', 'deleted', 'duration'}
+           (hata veya boş kaynakta None; mevcut veri korunur)
     """
 
     try:
-        transformed_data = transform_procure_compare_data(raw_data)
+        transformed_data = transform_procure_compare_data(raw_data, parallel=parallel)
 
         if not transformed_data:
-            return
+            return None
 
         # Sadece hata varsa log yazılır
-        empty_quotes = [d for d in transformed_data if not d.get("teklif_fiyatlari_list")]
+        empty_quotes = sum(1 for d in transformed_data if not d.get("teklif_fiyatlari_list"))
         if empty_quotes:
-            logger.error(f"{len(empty_quotes)} kayıt 'teklif_fiyatlari_list' alanı boş!")
-
-        # Eski veriyi temizle
-        PurchaseComparison.objects.all().delete()
+            logger.error(f"{empty_quotes} kayıt 'teklif_fiyatlari_list' alanı boş!")
 
-        # Yeni veriyi ekle
-        comparisons = [PurchaseComparison(**item) for item in transformed_data]
-        PurchaseComparison.objects.bulk_create(comparisons)
+        result = SyncEngine(PROCURE_COMPARE_SYNC).run(rows=transformed_data)
 
         # Başarı loglanmaz — sistem sessiz çalışır
+        return {
+            "received": result.received,
+            "created": result.created,
+            "updated": result.updated,
+            "unchanged": result.unchanged,
+            "deleted": result.deleted,
+            "duration": result.timings["total"],
+        }
 
+    except SyncEmptySourceError as e:
+        logger.error(f"Senkronizasyon durduruldu, mevcut veri korundu: {e}")
     except Exception as e:
         logger.exception(f"Senkronizasyon sırasında hata oluştu: {e}")
+    return None
@@ -1,30 +1,18 @@
 # File: procure_compare/services/hana_fetcher.py
-import requests
-from django.conf import settings
 from django.core.cache import cache
 from loguru import logger
+from hanadbcon.services.query_executor import run_query, QueryError
 
-def fetch_hana_procure_compare_data(token, days=None):
+def fetch_hana_procure_compare_data(token=None, days=None):
     """
     SAP HANA'dan satınalma teklif ve sipariş karşılaştırma verisini çeker.
+    Sorgu süreç içinde çalıştırılır.
     """
+    params = {'days': days} if days else None
     try:
-        headers = {'Authorization': f'Bearer {token}'}
-        url = f"http://{settings.SERVER_HOST}/api/v2/hanadbcon/query/procure_compare/"
-        if days:
-            url += f"?days={days}"
-
-        response = requests.get(url, headers=headers, timeout=60)
-
-        if response.status_code == 200:
-            
-            return response.json()
-        else:
-            logger.error(f"HANA API Hatası - Status: {response.status_code}, Mesaj: {response.text}")
-            return None
-
-    except requests.exceptions.RequestException as e:
-        logger.error(f"HANA API bağlantı hatası: {e}")
+        return run_query('procure_compare', params, json_compatible=True)
+    except QueryError as e:
+        logger.error(f"HANA sorgu hatası: {e}")
         return None
 
 
@@ -44,30 +32,19 @@ def fetch_item_purchase_history(token, item_code):
                 "data": cached_data
             }
 
-        headers = {'Authorization': f'Bearer {token}'}
-        url = f"http://{settings.SERVER_HOST}/api/v2/hanadbcon/query/item_purchase_history/?item_code={item_code}"
-
-        response = requests.get(url, headers=headers, timeout=60)
+        result = run_query('item_purchase_history', {'item_code': item_code}, json_compatible=True)
 
-        if response.status_code == 200:
-            result = response.json()
-
-            if isinstance(result, list):
-                cache.set(cache_key, result, timeout=60*60*2)  # 2 saatlik cache
-                
-                return {
-                    "source": "hana",
-                    "data": result
-                }
-            else:
-                
-                return None
+        if isinstance(result, list):
+            cache.set(cache_key, result, timeout=60*60*2)  # 2 saatlik cache
+            
+            return {
+                "source": "hana",
+                "data": result
+            }
         else:
-            logger.error(f"HATA - HANA API Status: {response.status_code} - {response.text}")
+            
             return None
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"HANA bağlantı hatası: {e}")
+    except QueryError as e:
+        logger.error(f"HANA sorgu hatası: {e}")
         return None
-
-
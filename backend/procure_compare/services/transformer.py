@@ -3,44 +3,115 @@
 import json
 import re
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
 
 logger = logging.getLogger("procure_compare")  # 🔥 merkezi sistem
 
-def parse_teklif_fiyatlari(teklif_json_str):
+# "12,50 USD (Kur: 32,1500)" → fiyat, döviz, kur (modül yüklenirken bir kez derlenir)
+QUOTE_PRICE_RE = re.compile(r"([\d.,]+)\s+(\w{3})\s+\(Kur:\s*([\d.,]+)\)")
+
+_json_loads = json.JSONDecoder().decode
+
+
+def _parse_quotes(teklif_json_str):
+    teklif_json = _json_loads(teklif_json_str)
+    parsed_list = []
+    for firma, fiyat_str in teklif_json.items():
+        if isinstance(fiyat_str, dict):
+            # Yeni format: {"fiyat": "...", "vade_gun": .., "teslim_gun": ..}
+            fiyat_str = fiyat_str.get("fiyat", "")
+        match = QUOTE_PRICE_RE.match(fiyat_str)
+        if match:
+            fiyat = float(match[1].replace(",", "."))
+            doviz = match[2]
+            kur = float(match[3].replace(",", "."))
+            local_price = fiyat * kur
+            parsed_list.append({
+                "firma": firma,
+                "fiyat": fiyat,
+                "kur": kur,
+                "doviz": doviz,
+                "local_price": round(local_price, 6)
+            })
+    return parsed_list
+
+
+@lru_cache(maxsize=8192)
+def _parse_quotes_cached(teklif_json_str):
     try:
-        teklif_json = json.loads(teklif_json_str)
-        parsed_list = []
-        for firma, fiyat_str in teklif_json.items():
-            match = re.match(r"([\d.,]+)\s+(\w{3})\s+\(Kur:\s*([\d.,]+)\)", fiyat_str)
-            if match:
-                fiyat = float(match[1].replace(",", "."))
-                doviz = match[2]
-                kur = float(match[3].replace(",", "."))
-                local_price = fiyat * kur
-                parsed_list.append({
-                    "firma": firma,
-                    "fiyat": fiyat,
-                    "kur": kur,
-                    "doviz": doviz,
-                    "local_price": round(local_price, 6)
-                })
-        return parsed_list
+        return tuple(_parse_quotes(teklif_json_str))
     except Exception as e:
         logger.error(f"Teklif fiyatları parse edilemedi: {e}")  # 🔻 WARNING yerine ERROR
-        return []
+        return ()
+
+
+def parse_teklif_fiyatlari(teklif_json_str):
+    """
+    Teklif fiyatları JSON metnini listeye çevirir. Aynı teklif metni birçok satırda
+    tekrarlandığı için sonuçlar metne göre önbelleklenir; her çağrı yeni bir liste döndürür.
+    """
+    return [dict(quote) for quote in _parse_quotes_cached(teklif_json_str or "{}")]
 
 
-def transform_procure_compare_data(raw_data):
+def _parse_chunk(texts):
+    results = []
+    for text in texts:
+        try:
+            results.append(_parse_quotes(text))
+        except Exception:
+            results.append(None)
+    return results
+
+
+def parse_teklif_fiyatlari_many(texts, parallel=False):
+    """
+    Birden fazla teklif metnini tek seferde parse eder: {metin: liste}.
+
+    Tekrarlanan metinler bir kez işlenir. `parallel=True` verilir ve farklı metin sayısı
+    `PROCURE_PARSE_PARALLEL_THRESHOLD` değerini aşarsa parse işlemi `PROCURE_PARSE_WORKERS` süreç
+    arasında paylaştırılır (regex/JSON işi GIL'e bağlı olduğu için thread yerine süreç kullanılır).
+    Paralel mod yalnızca Celery görevlerinden istenir; gunicorn isteği içinde süreç fork edilmez.
+    Süreç açılamayan ortamlarda (ör. Celery prefork worker'ları daemon süreçtir) sırayla parse edilir.
+    """
+    unique = list(dict.fromkeys(text or "{}" for text in texts))
+    workers = settings.PROCURE_PARSE_WORKERS
+    if parallel and workers > 1 and len(unique) >= settings.PROCURE_PARSE_PARALLEL_THRESHOLD:
+        chunk_size = -(-len(unique) // (workers * 4))
+        chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = [quotes for chunk in pool.map(_parse_chunk, chunks) for quotes in chunk]
+        except (AssertionError, OSError, RuntimeError) as e:
+            logger.warning(f"Paralel teklif parse başlatılamadı, sıralı devam ediliyor: {e}")
+        else:
+            results = {}
+            for text, quotes in zip(unique, parsed):
+                if quotes is None:
+                    quotes = parse_teklif_fiyatlari(text)  # hatayı tek yerden logla
+                results[text] = quotes
+            return results
+
+    return {text: parse_teklif_fiyatlari(text) for text in unique}
+
+
+def transform_procure_compare_data(raw_data, parallel=False):
     transformed = []
 
     if not isinstance(raw_data, list):
         logger.error("Beklenen veri tipi liste değil!")  # ⚠️ sadece ERROR
         return []
 
+    quotes = parse_teklif_fiyatlari_many(
+        (item.get("TeklifFiyatlariJSON", "{}") for item in raw_data), parallel=parallel
+    )
+
     for item in raw_data:
         try:
             teklif_fiyatlari_json = item.get("TeklifFiyatlariJSON", "{}")
-            teklif_fiyatlari_list = parse_teklif_fiyatlari(teklif_fiyatlari_json)
+            teklif_fiyatlari_list = quotes[teklif_fiyatlari_json or "{}"]
 
             transformed_item = {
                 "uniq_detail_no": item.get("UniqDetailNo"),
@@ -68,12 +139,6 @@ def transform_procure_compare_data(raw_data):
                 "teklif_fiyatlari_list": teklif_fiyatlari_list
             }
 
-            # Bu log da kaldırıldı veya düşürüldü
-            # logger.warning(...) ❌
-            if not teklif_fiyatlari_list:
-                # Sessizce geç, loglama yok
-                pass
-
             transformed.append(transformed_item)
 
         except Exception as e:
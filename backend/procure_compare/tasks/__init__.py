@@ -1,5 +1,5 @@
 # backend/procure_compare/tasks/__init__.py
 from __future__ import absolute_import, unicode_literals
 
-from .sync_procure_data import sync_procure_compare_data
+from .sync_procure_data import fetch_and_sync_procure_compare_data
 
@@ -12,7 +12,8 @@ from ..serializers import VariantSerializer
 from ...services.variant_service import (
     create_variant_with_selections,
     preview_variant,
-    update_variant_price_from_sap
+    update_variant_price_from_sap,
+    bulk_update_variant_prices_from_sap,
 )
 from ...services.sap_service_layer import get_price_by_item_code 
 from ...services.rule_engine import is_valid_combination
@@ -89,6 +90,24 @@ class VariantViewSet(viewsets.ModelViewSet):
         else:
             return Response({"detail": message}, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=False, methods=['post'], url_path='bulk-update-price-from-sap')
+    def bulk_update_price(self, request):
+        """
+        Birden fazla varyantın fiyatını SAP'den tek seferde günceller.
+        Body: {"variant_ids": [1, 2, ...], "price_list": 1}
+        """
+        variant_ids = request.data.get("variant_ids")
+        if not isinstance(variant_ids, list) or not variant_ids:
+            return Response({"detail": "variant_ids listesi gereklidir."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            variant_ids = [int(pk) for pk in variant_ids]
+            price_list = int(request.data.get("price_list", 1))
+        except (TypeError, ValueError):
+            return Response({"detail": "variant_ids ve price_list tam sayı olmalıdır."}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = bulk_update_variant_prices_from_sap(variant_ids, price_list=price_list)
+        return Response(result, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['get'], url_path='get-sap-price')
     def get_sap_price(self, request):
         reference_code = request.query_params.get('reference_code', None)
@@ -17,6 +17,7 @@ from .variant_service import (
     preview_variant,
     batch_create_variants,
     update_variant_price_from_sap, # Bu fonksiyonu da dışarıya açalım
+    bulk_update_variant_prices_from_sap,
 )
 
 from .rule_engine import (
@@ -28,6 +29,7 @@ from .rule_engine import (
 # GÜNCELLEME: Küme parantezleri {} normal parantezler () ile değiştirildi.
 from .sap_service_layer import (
     get_price_by_item_code,
+    get_prices_by_item_codes,
 )
 
 __all__ = [
@@ -41,8 +43,10 @@ __all__ = [
     "preview_variant",
     "batch_create_variants",
     "update_variant_price_from_sap", # GÜNCELLEME: __all__ listesine eklendi
+    "bulk_update_variant_prices_from_sap",
     "is_valid_combination",
     "apply_rules",
     "create_rule_from_template",
     "get_price_by_item_code", # GÜNCELLEME: __all__ listesine eklendi
+    "get_prices_by_item_codes",
 ]
\ No newline at end of file
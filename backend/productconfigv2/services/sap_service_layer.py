@@ -1,69 +1,130 @@
 # backend/productconfigv2/services/sap_service_layer.py
-import requests
-import json
 from django.conf import settings
 from decimal import Decimal
+from urllib.parse import urlencode, quote
+
+from hanadbintegration.utils.service_layer_client import (
+    ServiceLayerClient, ServiceLayerError, BatchRequest,
+)
+
+# Tek `$filter` sorgusundaki en fazla ürün kodu (URL uzunluğu sınırı)
+FILTER_CHUNK_SIZE = 40
+
+_client = None
+
+
+def _get_client():
+    """
+    productconfigv2 ayarlarıyla (settings.SAP_*) paylaşımlı Service Layer istemcisi.
+    Oturum tüm worker'lar arasında önbellekte paylaşılır; süresi dolunca otomatik yenilenir.
+    """
+    global _client
+    if _client is None:
+        _client = ServiceLayerClient(
+            settings.SAP_SERVICE_LAYER_URL,
+            settings.SAP_COMPANY_DB,
+            settings.SAP_USERNAME,
+            settings.SAP_PASSWORD,
+            timeout=settings.SAP_TIMEOUT,
+            verify=settings.SAP_TLS_VERIFY,
+        )
+    return _client
+
+
+def _price_from_item(data, price_list):
+    """Items yanıtındaki `ItemPrices` listesinden istenen fiyat listesinin fiyatını bulur."""
+    if data and 'ItemPrices' in data and isinstance(data['ItemPrices'], list):
+        # PriceList'i bizim istediğimiz olan (varsayılan 1) fiyat objesini buluyoruz.
+        price_entry = next((item for item in data['ItemPrices'] if item['PriceList'] == price_list), None)
+        if price_entry and price_entry.get('Price') is not None:
+            return Decimal(str(price_entry['Price']))
+    return None
 
-_session = None
-
-def _login():
-    """SAP Service Layer'a login olur ve session cookie'lerini döner."""
-    global _session
-    login_payload = {
-        "CompanyDB": settings.SAP_COMPANY_DB,
-        "UserName": settings.SAP_USERNAME,
-        "Password": settings.SAP_PASSWORD,
-    }
-    login_url = f"{settings.SAP_SERVICE_LAYER_URL}/Login"
-    response = requests.post(
-        login_url, data=json.dumps(login_payload), 
-        verify=settings.SAP_TLS_VERIFY, timeout=settings.SAP_TIMEOUT
-    )
-    response.raise_for_status()
-    _session = response.cookies
-    return response.cookies
 
 def get_price_by_item_code(item_code: str, price_list: int = 1):
     """
     Verilen ürün koduna göre SAP Service Layer'dan fiyatı çeker.
     Başarılı olursa (True, fiyat), başarısız olursa (False, hata_mesajı) döner.
     """
-    global _session
     try:
-        session_cookies = _session or _login()
-        
-        # GÜNCELLEME: URL'i ItemPrices yerine doğrudan Items'a yapıyoruz. 
-        # Service Layer, ItemPrices listesini otomatik olarak döndürür.
-        item_url = f"{settings.SAP_SERVICE_LAYER_URL}/Items('{item_code}')"
-        
-        response = requests.get(
-            item_url, cookies=session_cookies, 
-            verify=settings.SAP_TLS_VERIFY, timeout=settings.SAP_TIMEOUT
-        )
-        
-        if response.status_code == 401:
-            session_cookies = _login()
-            response = requests.get(item_url, cookies=session_cookies, verify=settings.SAP_TLS_VERIFY)
+        # Service Layer, ItemPrices listesini Items belgesiyle birlikte döndürür.
+        response = _get_client().get(f"Items('{item_code}')", params={'$select': 'ItemCode,ItemPrices'})
 
         if response.status_code != 200:
             error_message = f"SAP API Hatası: Status {response.status_code}, Yanıt: {response.text}"
             return False, error_message
 
         data = response.json()
-        
-        # GÜNCELLEME: İç içe olan doğru JSON yapısını burada işliyoruz.
-        if 'ItemPrices' in data and isinstance(data['ItemPrices'], list):
-            # PriceList'i bizim istediğimiz olan (varsayılan 1) fiyat objesini buluyoruz.
-            price_entry = next((item for item in data['ItemPrices'] if item['PriceList'] == price_list), None)
-            
-            if price_entry and price_entry.get('Price') is not None:
-                # Fiyatı bulduk, başarıyla döndürüyoruz.
-                return True, Decimal(price_entry['Price'])
+        price = _price_from_item(data, price_list)
+        if price is not None:
+            return True, price
 
         # Eğer ItemPrices listesi veya içinde doğru fiyat bulunamazsa hata döndür.
         return False, f"Yanıt başarılı ancak aranan fiyata ulaşılamadı. Gelen yanıt: {data}"
 
-    except requests.exceptions.RequestException as e:
+    except ServiceLayerError as e:
+        error_message = f"SAP Service Layer'a bağlanırken hata: {str(e)}"
+        return False, error_message
+
+
+def _items_price_query(codes):
+    """Birden fazla ürün için yalnızca ItemCode ve ItemPrices alanlarını isteyen OData sorgusu."""
+    item_filter = " or ".join("ItemCode eq '{}'".format(code.replace("'", "''")) for code in codes)
+    query = urlencode({'$select': 'ItemCode,ItemPrices', '$filter': item_filter}, quote_via=quote, safe="$,'")
+    return f"Items?{query}"
+
+
+def _next_link(data):
+    return data.get('@odata.nextLink') or data.get('odata.nextLink')
+
+
+def get_prices_by_item_codes(item_codes, price_list: int = 1):
+    """
+    Birden fazla ürün kodunun fiyatını toplu çeker: kodlar `FILTER_CHUNK_SIZE`'lık
+    `$filter=ItemCode eq ... or ...` sorgularına bölünür ve tüm sorgular tek bir
+    OData `$batch` isteğiyle gönderilir.
+    {item_code: (True, fiyat) | (False, hata_mesajı)} döner; SAP'de bulunmayan kodlar da hata olarak yer alır.
+    """
+    codes = list(dict.fromkeys(code for code in item_codes if code))
+    if not codes:
+        return {}
+
+    client = _get_client()
+    chunks = [codes[i:i + FILTER_CHUNK_SIZE] for i in range(0, len(codes), FILTER_CHUNK_SIZE)]
+    prices = {}
+    try:
+        results = client.batch(
+            BatchRequest('GET', _items_price_query(chunk),
+                         headers={'Prefer': f'odata.maxpagesize={len(chunk)}'})
+            for chunk in chunks
+        )
+        for chunk, result in zip(chunks, results):
+            if not result.ok:
+                message = f"SAP API Hatası: Status {result.status}, Yanıt: {result.error_message()}"
+                prices.update({code: (False, message) for code in chunk})
+                continue
+
+            data = result.json() or {}
+            items = list(data.get('value', []))
+            # Sunucu sayfa boyutunu daraltmışsa kalan sayfalar ayrıca çekilir
+            next_link = _next_link(data)
+            while next_link:
+                page = client.get(next_link)
+                if page.status_code != 200:
+                    break
+                page_data = page.json()
+                items.extend(page_data.get('value', []))
+                next_link = _next_link(page_data)
+
+            for item in items:
+                price = _price_from_item(item, price_list)
+                prices[item['ItemCode']] = (True, price) if price is not None else (
+                    False, "Yanıt başarılı ancak aranan fiyata ulaşılamadı."
+                )
+    except ServiceLayerError as e:
         error_message = f"SAP Service Layer'a bağlanırken hata: {str(e)}"
-        _session = None
-        return False, error_message
\ No newline at end of file
+        return {code: prices.get(code, (False, error_message)) for code in codes}
+
+    for code in codes:
+        prices.setdefault(code, (False, f"'{code}' SAP'de bulunamadı."))
+    return prices
@@ -1,4 +1,5 @@
 from django.db import transaction
+from django.utils import timezone
 from django.core.exceptions import ValidationError
 from ..models import (
     Variant, VariantSelection, Product,
@@ -7,7 +8,7 @@ from ..models import (
 )
 from ..utils.price_calculator import calculate_variant_price
 from ..utils.variant_code_generator import generate_variant_code, generate_variant_description
-from .sap_service_layer import get_price_by_item_code
+from .sap_service_layer import get_price_by_item_code, get_prices_by_item_codes
 import logging
 
 logger = logging.getLogger(__name__)
@@ -187,10 +188,10 @@ def update_variant_price_from_sap(variant_id):
             return False, "Bu varyant için bir referans kodu (55'li) bulunmuyor."
 
         # Yeni SAP servisimizden fiyatı sorgula
-        sap_price = get_price_by_item_code(variant.reference_code)
+        success, sap_price = get_price_by_item_code(variant.reference_code)
 
-        if sap_price is None:
-            return False, f"'{variant.reference_code}' için SAP'de fiyat bulunamadı veya Service Layer'a bağlanılamadı."
+        if not success:
+            return False, f"'{variant.reference_code}' için SAP'de fiyat bulunamadı veya Service Layer'a bağlanılamadı. ({sap_price})"
         
         # Fiyatı al ve güncelle
         variant.total_price = sap_price
@@ -201,4 +202,70 @@ def update_variant_price_from_sap(variant_id):
     except Variant.DoesNotExist:
         return False, "Varyant bulunamadı."
     except Exception as e:
-        return False, f"Bilinmeyen bir hata oluştu: {str(e)}"
\ No newline at end of file
+        return False, f"Bilinmeyen bir hata oluştu: {str(e)}"
+
+
+def bulk_update_variant_prices_from_sap(variant_ids, price_list=1):
+    """
+    Birden fazla varyantın fiyatını SAP'den toplu olarak günceller.
+    Tüm referans kodları tek bir toplu Service Layer isteğiyle sorgulanır ve
+    fiyatı değişen varyantlar tek bir `bulk_update` ile kaydedilir.
+
+    Returns:
+        dict: {
+            "updated": [variant_id, ...],
+            "unchanged": [variant_id, ...],
+            "not_found": [{"variant_id", "reference_code", "error"}, ...],
+            "missing_variants": [variant_id, ...],
+        }
+    """
+    variant_ids = list(dict.fromkeys(variant_ids))
+    variants = list(Variant.objects.filter(id__in=variant_ids))
+    found_ids = {variant.id for variant in variants}
+    result = {
+        "updated": [],
+        "unchanged": [],
+        "not_found": [],
+        "missing_variants": [pk for pk in variant_ids if pk not in found_ids],
+    }
+
+    priced = []
+    for variant in variants:
+        if not variant.reference_code:
+            result["not_found"].append({
+                "variant_id": variant.id,
+                "reference_code": None,
+                "error": "Bu varyant için bir referans kodu (55'li) bulunmuyor.",
+            })
+        else:
+            priced.append(variant)
+
+    prices = get_prices_by_item_codes([variant.reference_code for variant in priced], price_list=price_list)
+
+    now = timezone.now()
+    to_update = []
+    for variant in priced:
+        success, value = prices.get(variant.reference_code, (False, "SAP yanıtında bulunamadı."))
+        if not success:
+            result["not_found"].append({
+                "variant_id": variant.id,
+                "reference_code": variant.reference_code,
+                "error": value,
+            })
+            continue
+        if variant.total_price == value:
+            result["unchanged"].append(variant.id)
+            continue
+        variant.total_price = value
+        variant.updated_at = now  # bulk_update auto_now alanını kendisi güncellemez
+        to_update.append(variant)
+        result["updated"].append(variant.id)
+
+    if to_update:
+        Variant.objects.bulk_update(to_update, ["total_price", "updated_at"], batch_size=500)
+
+    logger.info(
+        f"Toplu SAP fiyat güncellemesi: {len(result['updated'])} güncellendi, "
+        f"{len(result['unchanged'])} değişmedi, {len(result['not_found'])} bulunamadı"
+    )
+    return result
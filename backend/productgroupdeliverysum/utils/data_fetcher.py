@@ -1,22 +1,15 @@
 # backend/productgroupdeliverysum/utils/data_fetcher.py
-import requests
-from django.conf import settings
 from loguru import logger
+from hanadbcon.services.query_executor import run_query, QueryError
 
-def fetch_hana_db_data(token):
-    headers = {'Authorization': f'Bearer {token}'}
-    url = f'http://{settings.SERVER_HOST}/api/v2/hanadbcon/query/productgroupdeliverysum/'
-
+def fetch_hana_db_data(token=None):
+    """
+    'productgroupdeliverysum' HANA sorgusunu süreç içinde çalıştırır (HTTP loopback yok).
+    """
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # Eğer HTTP hatası varsa, exception fırlatır
-        data = response.json()
-        
-        # Log ekleyelim ve veriyi kontrol edelim
-        logger.info(f"HANA DB'den gelen veri: {data}")
-        
+        data = run_query('productgroupdeliverysum', json_compatible=True)
+        logger.info(f"HANA DB'den gelen kayıt sayısı: {len(data)}")
         return data
-    except requests.RequestException as e:
+    except QueryError as e:
         logger.error(f"Hata: {e}")
-        logger.error(f"Response content: {response.text}")
         return None
@@ -1,13 +1,12 @@
 # backend/productpicturevalidation/utilities/data_fetcher.py
-import requests
-from django.conf import settings
+from hanadbcon.services.query_executor import run_query, QueryError
 
-def fetch_hana_db_data(token):
-    headers = {'Authorization': f'Bearer {token}'}
-    url = f'http://{settings.SERVER_HOST}/api/v2/hanadbcon/query/productpicture/'
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
+def fetch_hana_db_data(token=None):
+    """
+    'productpicture' HANA sorgusunu süreç içinde çalıştırır (HTTP loopback yok).
+    """
+    try:
+        return run_query('productpicture', json_compatible=True)
+    except QueryError:
         # Hata işleme...
         return None
@@ -7,7 +7,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.core.cache import cache
 from ..models.models import RawMaterialWarehouseStock
 from ..serializers import RawMaterialWarehouseStockSerializer
-from ..tasks import fetch_and_update_hana_data
+from ..tasks import fetch_and_update_hana_data, STOCK_REFRESH
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 import logging
@@ -41,22 +41,26 @@ class ListView(APIView):
     authentication_classes = [JWTAuthentication]
 
     def get(self, request):
-        token = str(request.auth)
-        fetch_and_update_hana_data.delay(token)
+        # Liste okuması senkronizasyon tetiklemez; veri periyodik görev veya FetchHanaDataView ile yenilenir
         stocks = RawMaterialWarehouseStock.objects.all().distinct('kalem_kod')
         serializer = RawMaterialWarehouseStockSerializer(stocks, many=True)
-        return Response(serializer.data)
+        return Response(serializer.data, headers=STOCK_REFRESH.headers())
 
 class FetchHanaDataView(APIView):
     permission_classes = [IsAuthenticated]
     authentication_classes = [JWTAuthentication]
 
     def get(self, request):
-        token = str(request.auth)
-        fetch_and_update_hana_data.delay(token)
-        return Response({
-            "message": "Veri çekme işlemi başlatıldı. Sonuçlar arka planda güncellenecek."
-        }, status=status.HTTP_200_OK)
+        # Aynı anda gelen / veri zaten tazeyken gelen istekler yeni görev oluşturmaz
+        force = request.query_params.get('force') in ('1', 'true')
+        refresh = STOCK_REFRESH.request(fetch_and_update_hana_data, force=force)
+        if refresh['enqueued']:
+            message = "Veri çekme işlemi başlatıldı. Sonuçlar arka planda güncellenecek."
+        elif refresh['reason'] == 'fresh':
+            message = "Veriler güncel, yenileme gerekmedi."
+        else:
+            message = "Veri çekme işlemi zaten devam ediyor."
+        return Response({"message": message, "refresh": refresh}, status=status.HTTP_200_OK)
 
 class UpdateSelectionView(APIView):
     permission_classes = [IsAuthenticated]
@@ -103,9 +107,6 @@ class FilteredListView(APIView):
     authentication_classes = [JWTAuthentication]
     
     def get(self, request):
-        token = str(request.auth)
-        fetch_and_update_hana_data.delay(token)
-        
         stocks = RawMaterialWarehouseStock.objects.all()
         
         if request.session.get('hide_zero_stock'):
@@ -113,7 +114,7 @@ class FilteredListView(APIView):
         
         stocks = stocks.distinct('kalem_kod')
         serializer = RawMaterialWarehouseStockSerializer(stocks, many=True)
-        return Response(serializer.data)
+        return Response(serializer.data, headers=STOCK_REFRESH.headers())
 
 class CreateUpdateView(APIView):
     permission_classes = [IsAuthenticated]
@@ -4,108 +4,61 @@ from celery import shared_task
 from celery_progress.backend import ProgressRecorder
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from datetime import datetime
-from .models.models import RawMaterialWarehouseStock
-from .utilities.data_fetcher import fetch_hana_db_data
+from hanadbcon.services.sync_engine import SyncEngine, SyncEmptySourceError
+from sapreports.refresh_coordinator import RefreshCoordinator
+from .utilities.sync_spec import RAW_MATERIAL_STOCK_SYNC
 import logging
-from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Liste/yenile istekleri ve periyodik görev aynı koordinatör üzerinden tekilleştirilir
+STOCK_REFRESH = RefreshCoordinator('rawmaterialwarehousestock')
+
+
+def _send_message(message):
+    async_to_sync(get_channel_layer().group_send)(
+        'rawmaterialwarehousestock_group',
+        {
+            'type': 'rawmaterialwarehousestock_message',
+            'message': message
+        }
+    )
+
+
 @shared_task(bind=True)
-def fetch_and_update_hana_data(self, token):
+def fetch_and_update_hana_data(self, token=None):
+    """
+    HANA stok verisini tek seferde yüklenen anahtar haritasıyla karşılaştırır ve yalnızca
+    yeni/değişen satırları `INSERT ... ON CONFLICT` batch'leriyle yazar; HANA'da olmayanları siler.
+    İlerleme her satırda değil, batch'ler halinde raporlanır.
+    """
     progress_recorder = ProgressRecorder(self)
-    channel_layer = get_channel_layer()
-    try:
-        logger.info("Fetching data from HANA DB")
-        hana_data = fetch_hana_db_data(token)
-        
-        if not hana_data:
-            logger.warning("No data fetched from HANA DB")
-            async_to_sync(channel_layer.group_send)(
-                'rawmaterialwarehousestock_group',
-                {
-                    'type': 'rawmaterialwarehousestock_message',
-                    'message': 'Failed to fetch data from HANA DB or no new data found.'
-                }
-            )
-            return
-        
-        total_data = len(hana_data)
-        logger.info(f"Fetched {total_data} items from HANA DB")
-
-        # Kalem kodlarının benzersizliğini kontrol et
-        kalem_kod_count = defaultdict(int)
-        for item in hana_data:
-            kalem_kod_count[item['KalemKod']] += 1
-        
-        duplicate_kalem_kods = [k for k, v in kalem_kod_count.items() if v > 1]
-        if duplicate_kalem_kods:
-            logger.warning(f"Duplicate kalem_kod found in HANA data: {duplicate_kalem_kods}")
-            async_to_sync(channel_layer.group_send)(
-                'rawmaterialwarehousestock_group',
-                {
-                    'type': 'rawmaterialwarehousestock_message',
-                    'message': f'Duplicate kalem_kod found in HANA data: {duplicate_kalem_kods}'
-                }
-            )
 
-        # HANA'dan gelen tüm kalem kodlarını topla
-        hana_item_codes = set(item['KalemKod'] for item in hana_data)
+    def report_progress(done, total, description):
+        progress_recorder.set_progress(done, total, description=description)
 
-        # HANA veritabanındaki her bir kalem kod için veritabanını güncelle veya oluştur
-        for i, item in enumerate(hana_data):
-            try:
-                stock, created = RawMaterialWarehouseStock.objects.update_or_create(
-                    kalem_kod=item['KalemKod'],
-                    defaults={
-                        'depo_kodu': item['DepoKod'],
-                        'kalem_grup_ad': item['KalemGrupAd'],
-                        'stok_kalem': item['StokKalem'] == 'Y',
-                        'satis_kalem': item['SatisKalem'] == 'Y',
-                        'satinalma_kalem': item['SatinalmaKalem'] == 'Y',
-                        'yapay_kalem': item['YapayKalem'] == 'Y',
-                        'kalem_tanim': item.get('Kalemtanim') or 'Bilinmeyen',
-                        'stok_olcu_birim': item.get('StokOlcuBirim') or 'None',
-                        'depo_stok': item['DepoStok'],
-                        'siparis_edilen_miktar': item['AcikSiparisEdilenMiktar'],
-                        'son_satinalma_fiyat': item['SonSatınalmaFiyat'],
-                        'son_satinalma_fatura_tarih': datetime.strptime(item['SonSatinalmaFaturaTarih'], '%d.%m.%Y').date(),
-                        'verilen_siparisler': item['VerilenSiparisler'],
-                        'secili': False,
-                        'hide_zero_stock': False,
-                    }
-                )
-                logger.info(f"Processed item {i + 1}/{total_data}: {item['KalemKod']}")
-                progress_recorder.set_progress(i + 1, total_data, description=f"Processing {i + 1} of {total_data}")
-            except Exception as e:
-                logger.error(f"Error processing item {item['KalemKod']}: {str(e)}")
-                async_to_sync(channel_layer.group_send)(
-                    'rawmaterialwarehousestock_group',
-                    {
-                        'type': 'rawmaterialwarehousestock_message',
-                        'message': f'Error processing item {item["KalemKod"]}: {str(e)}'
-                    }
-                )
+    with STOCK_REFRESH.track() as run:
+        try:
+            logger.info("Fetching data from HANA DB")
+            result = SyncEngine(RAW_MATERIAL_STOCK_SYNC, progress_callback=report_progress).run()
+        except SyncEmptySourceError:
+            run.fail()
+            logger.warning("No data fetched from HANA DB")
+            _send_message('Failed to fetch data from HANA DB or no new data found.')
+            return
+        except Exception as e:
+            run.fail()
+            logger.error(f"An error occurred: {str(e)}")
+            _send_message(f'An error occurred: {str(e)}')
+            return
 
-        # HANA'da olmayan kalem kodlarını API veritabanından sil
-        deleted_count = RawMaterialWarehouseStock.objects.exclude(kalem_kod__in=hana_item_codes).delete()[0]
-        logger.info(f"Deleted {deleted_count} items that were not in HANA data")
+    if result.duplicates:
+        logger.warning(f"{result.duplicates} duplicate kalem_kod found in HANA data; last occurrence kept")
+        _send_message(f'Duplicate kalem_kod found in HANA data: {result.duplicates} earlier rows overridden')
 
-        logger.info("Successfully fetched and updated raw material warehouse stock data.")
-        async_to_sync(channel_layer.group_send)(
-            'rawmaterialwarehousestock_group',
-            {
-                'type': 'rawmaterialwarehousestock_message',
-                'message': 'Raw material warehouse stock data successfully fetched and updated.'
-            }
-        )
-    except Exception as e:
-        logger.error(f"An error occurred: {str(e)}")
-        async_to_sync(channel_layer.group_send)(
-            'rawmaterialwarehousestock_group',
-            {
-                'type': 'rawmaterialwarehousestock_message',
-                'message': f'An error occurred: {str(e)}'
-            }
-        )
\ No newline at end of file
+    logger.info(
+        f"Raw material warehouse stock synced: {result.created} created, {result.updated} updated, "
+        f"{result.unchanged} unchanged, {result.deleted} deleted ({result.timings['total']}s)"
+    )
+    _send_message('Raw material warehouse stock data successfully fetched and updated.')
+    return result.as_dict()
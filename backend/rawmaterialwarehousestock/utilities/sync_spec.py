@@ -0,0 +1,54 @@
+# backend/rawmaterialwarehousestock/utilities/sync_spec.py
+from datetime import datetime
+import logging
+
+from hanadbcon.services.sync_engine import SyncSpec
+from ..models.models import RawMaterialWarehouseStock
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INVOICE_DATE = datetime(1900, 1, 1).date()
+
+
+def _flag(column):
+    return lambda item: item[column] == 'Y'
+
+
+def _invoice_date(item):
+    """'dd.mm.yyyy' biçimindeki tarihi çevirir; okunamazsa modelin varsayılan tarihini kullanır."""
+    value = item.get('SonSatinalmaFaturaTarih')
+    try:
+        return datetime.strptime(value, '%d.%m.%Y').date()
+    except (TypeError, ValueError):
+        logger.warning(f"Geçersiz fatura tarihi ({item.get('KalemKod')}): {value!r}")
+        return DEFAULT_INVOICE_DATE
+
+
+RAW_MATERIAL_STOCK_SYNC = SyncSpec(
+    name='rawmaterialwarehousestock',
+    query_name='raw_material_warehouse_stock',
+    model=RawMaterialWarehouseStock,
+    natural_key=('kalem_kod',),
+    field_map={
+        'kalem_kod': 'KalemKod',
+        'depo_kodu': 'DepoKod',
+        'kalem_grup_ad': 'KalemGrupAd',
+        'stok_kalem': _flag('StokKalem'),
+        'satis_kalem': _flag('SatisKalem'),
+        'satinalma_kalem': _flag('SatinalmaKalem'),
+        'yapay_kalem': _flag('YapayKalem'),
+        'kalem_tanim': lambda item: item.get('Kalemtanim') or 'Bilinmeyen',
+        'stok_olcu_birim': lambda item: item.get('StokOlcuBirim') or 'None',
+        'depo_stok': 'DepoStok',
+        'siparis_edilen_miktar': 'AcikSiparisEdilenMiktar',
+        'son_satinalma_fiyat': 'SonSatınalmaFiyat',
+        'son_satinalma_fatura_tarih': _invoice_date,
+        'verilen_siparisler': 'VerilenSiparisler',
+        'secili': lambda item: False,
+        'hide_zero_stock': lambda item: False,
+    },
+    json_compatible=True,
+    duplicates='last',  # eski satır satır update_or_create döngüsü gibi son satır geçerli
+    progress_group='rawmaterialwarehousestock_group',
+    progress_type='rawmaterialwarehousestock_message',
+)
@@ -31,7 +31,7 @@ class APIReportModelAdmin(ImportExportMixin, admin.ModelAdmin):
             "fields": ("api_name", "mode", "is_active")
         }),
         ("Veri Çekme Ayarları", {
-            "fields": ("trigger_url", "data_pull_url", "wait_seconds")
+            "fields": ("trigger_url", "data_pull_url", "refresh_dataset", "wait_seconds")
         }),
         ("Kural ve Özet Veri", {
             "fields": ("rule_json", "result_json")
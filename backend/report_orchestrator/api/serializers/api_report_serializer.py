@@ -22,7 +22,7 @@ class APIReportSerializer(serializers.ModelSerializer):
             "mode_label",
             "trigger_url",
             "data_pull_url",
- 
+            "refresh_dataset",
             "wait_seconds",
             "rule_json",
             "result_json",
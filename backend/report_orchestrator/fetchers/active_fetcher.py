@@ -1,35 +1,118 @@
 # backend/report_orchestrator/fetchers/active_fetcher.py
+"""
+Aktif modlu raporlar için tetikleme ve tamamlanma tespiti.
 
+Tetiklenen yenilemenin bitişi sabit bir süre uyuyarak beklenmez; yenileme görevleri
+`sapreports.refresh_coordinator.RefreshCoordinator.track()` ile Redis'e tazelik işareti yazar
+(`refresh:<veri seti>:last`). Tetiklemeden önceki işaret "bilet" (ticket) içinde saklanır ve
+işaret değişip yenileme kilidi düştüğünde veri hazır sayılır.
+
+Kontroller artan aralıklarla yapılır (bkz. `next_poll_delay`); Celery görevi beklerken worker'ı
+tutmaz, kendini bir sonraki kontrol için yeniden kuyruğa alır (bkz. tasks/run_report.py).
+Raporda veri seti tanımlı değilse `wait_seconds` kadar beklenir.
+"""
 import time
 import requests
 from typing import Tuple
 import logging
 
+from django.conf import settings
+
+from sapreports.refresh_coordinator import RefreshCoordinator
+
 logger = logging.getLogger(__name__)
 
+TRIGGER_TIMEOUT = 10  # tetikleme isteği için (sn)
+PULL_TIMEOUT = 60  # veri çekme isteği için (sn)
+
+
+def trigger_refresh(trigger_url: str, refresh_dataset: str = "") -> Tuple[dict, str]:
+    """
+    trigger_url ile yenilemeyi tetikler.
+
+    Returns:
+        (ticket, error_message) — ticket JSON uyumludur, Celery görev argümanı olarak taşınabilir:
+        {"triggered_at": epoch, "dataset": veri seti, "baseline": tetikleme öncesi tazelik işareti,
+         "ready": tetikleme yanıtı verinin zaten taze olduğunu bildirdiyse True}
+    """
+    ticket = {
+        "triggered_at": time.time(),
+        "dataset": refresh_dataset or "",
+        "baseline": RefreshCoordinator(refresh_dataset).last_refreshed() if refresh_dataset else None,
+        "ready": False,
+    }
+    try:
+        trigger_response = requests.post(trigger_url, timeout=TRIGGER_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"[active_fetcher] Tetikleme ağ hatası: {str(e)}")
+        return {}, f"Ağ hatası: {str(e)}"
+
+    if trigger_response.status_code not in [200, 202]:
+        return {}, f"Tetikleme başarısız oldu: {trigger_response.status_code}"
+
+    ticket["ready"] = _reported_fresh(trigger_response)
+    return ticket, ""
+
+
+def _reported_fresh(response) -> bool:
+    """RefreshCoordinator.request yanıtı "veri zaten taze, görev kuyruğa alınmadı" diyorsa True."""
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    return isinstance(body, dict) and body.get("enqueued") is False and body.get("reason") == "fresh"
+
 
-def fetch_active_mode_data(trigger_url: str, data_pull_url: str, wait_seconds: int = 300) -> Tuple[dict, str]:
+def is_refresh_complete(ticket: dict) -> bool:
+    """Tetiklenen yenileme bitti mi? (tazelik işareti değişti ve yenileme kilidi düştü)"""
+    if ticket.get("ready"):
+        return True
+    if not ticket.get("dataset"):
+        return False
+    coordinator = RefreshCoordinator(ticket["dataset"])
+    if coordinator.in_progress():
+        return False
+    last = coordinator.last_refreshed()
+    return last is not None and last != ticket.get("baseline")
+
+
+def next_poll_delay(attempt: int) -> int:
+    """Kontroller arası bekleme: REPORT_ORCH_POLL_INITIAL'den başlayıp ikiye katlanır, REPORT_ORCH_POLL_MAX ile sınırlıdır."""
+    return min(settings.REPORT_ORCH_POLL_INITIAL * 2 ** attempt, settings.REPORT_ORCH_POLL_MAX)
+
+
+def fetch_active_mode_data(
+    trigger_url: str, data_pull_url: str, wait_seconds: int = 300, refresh_dataset: str = ""
+) -> Tuple[dict, str]:
     """
-    Aktif modlu raporlarda:
+    Aktif modlu raporlarda (senkron kullanım):
     - trigger_url ile veri tetiklenir
-    - wait_seconds kadar beklenir
+    - yenileme bitene kadar (en fazla wait_seconds) artan aralıklarla beklenir
     - data_pull_url'den sonuç çekilir
-    Hata varsa mesaj döner.
-    
+    Hata varsa mesaj döner. Celery görevlerinde worker'ı tutmamak için tasks/run_report.py akışı kullanılır.
+
     Returns:
         (result_json, error_message)
     """
     try:
-        trigger_response = requests.post(trigger_url, timeout=10)
-
-        if trigger_response.status_code not in [200, 202]:
-            return {}, f"Tetikleme başarısız oldu: {trigger_response.status_code}"
+        ticket, error = trigger_refresh(trigger_url, refresh_dataset)
+        if error:
+            return {}, error
 
-        logger.info(f"[active_fetcher] Bekleniyor: {wait_seconds} sn")
-        time.sleep(wait_seconds)
+        deadline = ticket["triggered_at"] + wait_seconds
+        attempt = 0
+        while not is_refresh_complete(ticket):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                logger.warning(f"[active_fetcher] Yenileme {wait_seconds} sn içinde bitmedi, mevcut veri çekiliyor.")
+                break
+            delay = min(next_poll_delay(attempt), remaining) if ticket["dataset"] else remaining
+            logger.info(f"[active_fetcher] Bekleniyor: {delay:.0f} sn")
+            time.sleep(delay)
+            attempt += 1
 
         logger.info(f"[active_fetcher] Veri çekiliyor: {data_pull_url}")
-        data_response = requests.get(data_pull_url, timeout=15)
+        data_response = requests.get(data_pull_url, timeout=PULL_TIMEOUT)
         data_response.raise_for_status()
 
         return data_response.json(), ""
@@ -0,0 +1,27 @@
+# backend/report_orchestrator/management/commands/benchmark_rule_engine.py
+from django.core.management.base import BaseCommand, CommandError
+
+from report_orchestrator.rules.benchmark import run_benchmark
+
+
+class Command(BaseCommand):
+    help = "rule_engine derlenmiş planını sentetik veri üzerinde önceki satır bazlı motorla kıyaslar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500_000, help="Sentetik satır sayısı (varsayılan: 500000)")
+        parser.add_argument("--repeat", type=int, default=3, help="Her motor için tekrar sayısı; en iyi süre alınır")
+        parser.add_argument("--seed", type=int, default=42, help="Veri üretimi için rastgelelik tohumu")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{options['rows']} satırlık sentetik veri üzerinde kıyaslanıyor...")
+        result = run_benchmark(rows=options["rows"], repeat=options["repeat"], seed=options["seed"])
+
+        self.stdout.write(f"Eşleşen satır     : {result['matched_rows']}")
+        self.stdout.write(f"Plan derleme      : {result['compile_seconds'] * 1000:.2f} ms")
+        self.stdout.write(f"Satır bazlı motor : {result['reference_seconds']:.3f} sn")
+        self.stdout.write(f"Derlenmiş plan    : {result['plan_seconds']:.3f} sn")
+        self.stdout.write(f"Hızlanma          : {result['speedup']:.2f}x")
+
+        if not result["results_match"]:
+            raise CommandError("Derlenmiş planın sonucu satır bazlı motorla aynı değil.")
+        self.stdout.write(self.style.SUCCESS("Sonuçlar aynı."))
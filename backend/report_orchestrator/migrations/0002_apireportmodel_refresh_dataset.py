@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report_orchestrator', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apireportmodel',
+            name='refresh_dataset',
+            field=models.CharField(blank=True, default='', help_text="Tetiklenen yenilemenin RefreshCoordinator veri seti adı (örn. 'logocustomercollection'); doluysa yenileme biter bitmez veri çekilir, boşsa wait_seconds kadar beklenir", max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='apireportmodel',
+            name='wait_seconds',
+            field=models.IntegerField(default=300, help_text='Tetikleme sonrası en fazla bekleme süresi (aktif mod için saniye cinsinden)'),
+        ),
+    ]
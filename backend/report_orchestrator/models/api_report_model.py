@@ -40,7 +40,17 @@ class APIReportModel(models.Model):
 
     wait_seconds = models.IntegerField(
         default=300,
-        help_text="Tetikleme sonrası bekleme süresi (aktif mod için saniye cinsinden)"
+        help_text="Tetikleme sonrası en fazla bekleme süresi (aktif mod için saniye cinsinden)"
+    )
+
+    refresh_dataset = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        help_text=(
+            "Tetiklenen yenilemenin RefreshCoordinator veri seti adı (örn. 'logocustomercollection'); "
+            "doluysa yenileme biter bitmez veri çekilir, boşsa wait_seconds kadar beklenir"
+        )
     )
 
     rule_json = JSONField(
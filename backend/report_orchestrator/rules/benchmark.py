@@ -0,0 +1,161 @@
+# File: backend/report_orchestrator/rules/benchmark.py
+"""
+rule_engine mikro kıyaslaması.
+
+Sentetik bir bakiye veri kümesi (varsayılan 500.000 satır) üzerinde derlenmiş plan ile önceki
+satır bazlı motor (`reference_apply_rules`) çalıştırılır; süreler raporlanır ve sonuçların
+aynı olduğu doğrulanır.
+
+Kullanım:
+    python manage.py benchmark_rule_engine --rows 500000 --repeat 3
+"""
+import copy
+import math
+import random
+import time
+from collections import defaultdict
+from typing import List, Dict, Any
+
+from .rule_engine import _compile_cached, _is_numeric, _to_float, apply_rules, compile_rules
+
+GROUPS = ["YURTICI", "YURTDISI", "PROJE", "BAYI"]
+SELLERS = ["Ahmet", "Ayşe", "Mehmet", "Zeynep", "Can"]
+
+BENCHMARK_RULES = {
+    "filters": {
+        "Grup": "YURTICI",
+        "Bakiye": {"gt": 1000, "lt": 900000},
+        "Vade": {"gt": 0},
+    },
+    "sort_field": "Bakiye",
+    "sort_order": "desc",
+    "top": 10,
+    "fields": ["MuhatapKod", "MuhatapAd", "Grup", "Bakiye", "Vade", "Limit"],
+    "retry_attempts": 2,
+    "retry_interval": 60,
+}
+
+
+def build_dataset(rows: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Canlı API çıktısına benzer satırlar: sayılar çoğunlukla float, bir kısmı metin
+    ("12345,67", "1.234.567" gibi) ve eksik alanlar.
+    """
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        balance = round(rng.uniform(-50000, 1000000), 2)
+        if i % 7 == 0:
+            balance = f"{balance:.2f}".replace(".", ",")
+        row = {
+            "MuhatapKod": f"M{i % 20000:05d}",
+            "MuhatapAd": f"Muhatap {i % 20000}",
+            "Grup": GROUPS[i % len(GROUPS)],
+            "Satici": SELLERS[i % len(SELLERS)],
+            "Bakiye": balance,
+            "Vade": rng.randint(-30, 120),
+            "Limit": f"{rng.randint(1, 999)}.{rng.randint(0, 999):03d}.000" if i % 5 == 0 else rng.randint(0, 10 ** 6),
+        }
+        if i % 11 == 0:
+            del row["Vade"]
+        data.append(row)
+    return data
+
+
+def reference_apply_rules(data: List[Dict[str, Any]], rules: Dict[str, Any]) -> Dict[str, Any]:
+    """Önceki satır bazlı motor (karşılaştırma için; kural doğrulaması hariç)."""
+    original_data = data.copy()
+    data = data.copy()
+    filters = rules.get("filters", {})
+    sort_by = rules.get("sort_field") or rules.get("sort_by")
+    sort_order = rules.get("sort_order", "asc")
+    limit = rules.get("top") or rules.get("limit")
+    selected_fields = rules.get("fields")
+
+    for field, condition in filters.items():
+        if isinstance(condition, dict):
+            for operator, value in condition.items():
+                if operator == "gt":
+                    data = [item for item in data if _to_float(item.get(field, 0)) > value]
+                elif operator == "lt":
+                    data = [item for item in data if _to_float(item.get(field, 0)) < value]
+                elif operator == "eq":
+                    data = [item for item in data if item.get(field) == value]
+        else:
+            data = [item for item in data if item.get(field) == condition]
+
+    if sort_by:
+        data.sort(key=lambda x: _to_float(x.get(sort_by, 0)), reverse=(sort_order == "desc"))
+
+    if limit and isinstance(limit, int):
+        data = data[:limit]
+
+    if selected_fields:
+        data = [{field: item.get(field) for field in selected_fields} for item in data]
+
+    ignore_fields = {"MuhatapKod", "VergiNo", "IBAN", "Telefon", "Satici", "Grup", "MuhatapAd"}
+    numeric_fields = [
+        key for key, val in (data[0].items() if data else ())
+        if key not in ignore_fields and _is_numeric(val)
+    ]
+
+    subtotal = defaultdict(float)
+    cumulative_total = defaultdict(float)
+    for item in data:
+        for field in numeric_fields:
+            subtotal[field] += _to_float(item.get(field, 0))
+    for item in original_data:
+        for field in numeric_fields:
+            cumulative_total[field] += _to_float(item.get(field, 0))
+
+    return {
+        "filtered_data": data,
+        "totals": {"subtotal": dict(subtotal), "cumulative": dict(cumulative_total)},
+    }
+
+
+def _same_totals(left: Dict[str, float], right: Dict[str, float]) -> bool:
+    """Toplamlar tolerans olmadan, bit düzeyinde karşılaştırılır."""
+    return left.keys() == right.keys() and all(
+        left[key] == right[key] or (math.isnan(left[key]) and math.isnan(right[key])) for key in left
+    )
+
+
+def _best_of(func, repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_benchmark(rows: int = 500_000, repeat: int = 3, rules: Dict[str, Any] = None, seed: int = 42) -> Dict[str, Any]:
+    """Her iki motoru `repeat` kez çalıştırır; en iyi süreleri ve sonuç eşitliğini döndürür."""
+    rules = copy.deepcopy(rules or BENCHMARK_RULES)
+    data = build_dataset(rows, seed)
+
+    _compile_cached.cache_clear()
+    started = time.perf_counter()
+    compile_rules(rules)
+    compile_seconds = time.perf_counter() - started
+
+    expected = reference_apply_rules(data, rules)
+    actual = apply_rules(data, rules)
+    matches = (
+        actual["filtered_data"] == expected["filtered_data"]
+        and _same_totals(actual["totals"]["subtotal"], expected["totals"]["subtotal"])
+        and _same_totals(actual["totals"]["cumulative"], expected["totals"]["cumulative"])
+    )
+
+    reference_seconds = _best_of(lambda: reference_apply_rules(data, rules), repeat)
+    plan_seconds = _best_of(lambda: apply_rules(data, rules), repeat)
+    return {
+        "rows": rows,
+        "matched_rows": len(actual["filtered_data"]),
+        "results_match": matches,
+        "compile_seconds": compile_seconds,
+        "reference_seconds": reference_seconds,
+        "plan_seconds": plan_seconds,
+        "speedup": reference_seconds / plan_seconds if plan_seconds else math.inf,
+    }
@@ -1,8 +1,152 @@
 # File: backend/report_orchestrator/rules/rule_engine.py
+"""
+rule_json → derlenmiş çalıştırma planı (`RulePlan`).
 
-from typing import List, Dict, Any
-from collections import defaultdict
+Kurallar her çalıştırmada satır satır yorumlanmaz; bir kez plana derlenir ve plan aynı
+rule_json için önbellekte tutulur (`compile_rules`). Plan veriyi kolon bazında işler:
+
+    1) Kuralların kullandığı her alan bir kez okunur ve tipli kolona dönüştürülür
+       (float64 dizisi; sayısal metinler NumPy metin işlemleriyle topluca çözümlenir)
+    2) Tüm filtreler NumPy maskeleri olarak hesaplanıp tek maskede birleştirilir
+    3) Sıralama / limit indeks dizisi üzerinde yapılır, satırlar en sonda bir kez seçilir
+    4) Ara toplam ve kümülatif toplam tüm sayısal alanlar için tek matris üzerinden hesaplanır;
+       toplama önceki motordaki gibi satır sırasıyla yapılır (`_sequential_sums`)
+
+Satırlar ve toplamlar önceki satır bazlı motorla bit düzeyinde aynıdır (bkz. rules/benchmark.py).
+"""
+import json
 import re
+from functools import lru_cache
+from itertools import compress, repeat
+from typing import List, Dict, Any
+
+import numpy as np
+
+NUMERIC_IGNORE_FIELDS = frozenset({"MuhatapKod", "VergiNo", "IBAN", "Telefon", "Satici", "Grup", "MuhatapAd"})
+PLAN_CACHE_SIZE = 128
+
+_NON_NUMERIC = re.compile(r"[^\d,.-]")
+_NUMBER_TYPES = frozenset({int, float})
+_TEXT_TYPES = frozenset({str})
+_COMPARISONS = {"gt": np.greater, "lt": np.less}
+
+
+class _Columns:
+    """Veri kümesinin kolonları; her alan en fazla bir kez okunur ve dönüştürülür."""
+
+    def __init__(self, data: List[Dict[str, Any]]):
+        self.data = data
+        self.size = len(data)
+        self._raw = {}
+        self._objects = {}
+        self._floats = {}
+
+    def raw(self, field: str) -> list:
+        column = self._raw.get(field)
+        if column is None:
+            column = self._raw[field] = list(map(dict.get, self.data, repeat(field)))
+        return column
+
+    def objects(self, field: str) -> np.ndarray:
+        column = self._objects.get(field)
+        if column is None:
+            column = self._objects[field] = np.fromiter(self.raw(field), dtype=object, count=self.size)
+        return column
+
+    def floats(self, field: str) -> np.ndarray:
+        column = self._floats.get(field)
+        if column is None:
+            column = self._floats[field] = _float_column(self.raw(field))
+        return column
+
+
+class RulePlan:
+    """
+    Derlenmiş rule_json:
+    - filters    : [(alan, karşılaştırma ufunc'ı veya None (eşitlik), değer)]
+    - sort_by    : Sıralama alanı (sayısal), descending ile yönü
+    - limit      : top / limit
+    - fields     : Çıktıda tutulacak alanlar
+    retry_attempts ve retry_interval derleme sırasında doğrulanır (işlenmez).
+    """
+
+    def __init__(self, rules: Dict[str, Any]):
+        retry_attempts = rules.get("retry_attempts")
+        retry_interval = rules.get("retry_interval")
+        if retry_attempts is not None and not isinstance(retry_attempts, int):
+            raise ValueError("retry_attempts must be an integer")
+        if retry_interval is not None and not isinstance(retry_interval, int):
+            raise ValueError("retry_interval must be an integer")
+
+        self.filters = []
+        for field, condition in (rules.get("filters") or {}).items():
+            if isinstance(condition, dict):
+                for operator, value in condition.items():
+                    if operator in _COMPARISONS:
+                        self.filters.append((field, _COMPARISONS[operator], value))
+                    elif operator == "eq":
+                        self.filters.append((field, None, value))
+            else:
+                self.filters.append((field, None, condition))
+
+        self.sort_by = rules.get("sort_field") or rules.get("sort_by")
+        self.descending = rules.get("sort_order", "asc") == "desc"
+        limit = rules.get("top") or rules.get("limit")
+        self.limit = int(limit) if limit and isinstance(limit, int) else None
+        self.fields = rules.get("fields") or None
+
+    def execute(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        columns = _Columns(data)
+
+        # 1. Filtreleme (tüm koşullar tek maskede)
+        mask = np.ones(columns.size, dtype=bool)
+        for field, compare, value in self.filters:
+            if compare is None:
+                mask &= _equals(columns, field, value)
+            else:
+                mask &= compare(columns.floats(field), value)
+        index = np.flatnonzero(mask)
+
+        # 2. Sıralama (kararlı; eşit değerler gelen sırayı korur)
+        if self.sort_by:
+            keys = columns.floats(self.sort_by)[index]
+            index = index[np.argsort(-keys if self.descending else keys, kind="stable")]
+
+        # 3. Limit (Top)
+        if self.limit is not None:
+            index = index[:self.limit]
+
+        # 4. Alan seçimi (fields)
+        rows = [data[i] for i in index.tolist()]
+        if self.fields:
+            rows = [{field: item.get(field) for field in self.fields} for item in rows]
+
+        # 5-6. Sayısal alanlar ve toplamlar
+        numeric_fields = _numeric_fields(rows)
+        subtotal, cumulative = {}, {}
+        if numeric_fields:
+            matrix = np.vstack([columns.floats(field) for field in numeric_fields])
+            subtotal = dict(zip(numeric_fields, _sequential_sums(matrix[:, index])))
+            cumulative = dict(zip(numeric_fields, _sequential_sums(matrix)))
+
+        return {
+            "filtered_data": rows,
+            "totals": {
+                "subtotal": subtotal,
+                "cumulative": cumulative
+            }
+        }
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _compile_cached(key: str) -> RulePlan:
+    return RulePlan(json.loads(key))
+
+
+def compile_rules(rules: Dict[str, Any]) -> RulePlan:
+    """rule_json'ı plana derler; aynı rule_json için önbellekteki plan döner."""
+    return _compile_cached(json.dumps(rules, sort_keys=True, default=str))
+
 
 def apply_rules(data: List[Dict[str, Any]], rules: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -14,80 +158,104 @@ def apply_rules(data: List[Dict[str, Any]], rules: Dict[str, Any]) -> Dict[str,
     - sayısal alanlar için ara toplam ve kümülatif toplam döner
     - retry_attempts ve retry_interval gibi operational configleri doğrular (işlemez)
     """
-    original_data = data.copy()
-    filters = rules.get("filters", {})
-    sort_by = rules.get("sort_field") or rules.get("sort_by")  
-    sort_order = rules.get("sort_order", "asc")
-    limit = rules.get("top") or rules.get("limit")
-    selected_fields = rules.get("fields")
-
-    # Operational config validation
-    retry_attempts = rules.get("retry_attempts")
-    retry_interval = rules.get("retry_interval")
-    if retry_attempts is not None and not isinstance(retry_attempts, int):
-        raise ValueError("retry_attempts must be an integer")
-    if retry_interval is not None and not isinstance(retry_interval, int):
-        raise ValueError("retry_interval must be an integer")
-
-    # 1. Filtreleme
-    for field, condition in filters.items():
-        if isinstance(condition, dict):
-            for operator, value in condition.items():
-                if operator == "gt":
-                    data = [item for item in data if _to_float(item.get(field, 0)) > value]
-                elif operator == "lt":
-                    data = [item for item in data if _to_float(item.get(field, 0)) < value]
-                elif operator == "eq":
-                    data = [item for item in data if item.get(field) == value]
-        else:
-            data = [item for item in data if item.get(field) == condition]
-
-    # 2. Sıralama
-    if sort_by:
-        data.sort(key=lambda x: _to_float(x.get(sort_by, 0)), reverse=(sort_order == "desc"))
-
-    # 3. Limit (Top)
-    if limit and isinstance(limit, int):
-        data = data[:limit]
-
-    # 4. Alan seçimi (fields)
-    if selected_fields:
-        data = [
-            {field: item.get(field) for field in selected_fields}
-            for item in data
-        ]
-
-    # 5. Sayısal alanları belirle
-    def get_numeric_fields(sample: List[Dict[str, Any]]) -> List[str]:
-        if not sample:
-            return []
-        ignore_fields = {"MuhatapKod", "VergiNo", "IBAN", "Telefon", "Satici", "Grup", "MuhatapAd"}
-        return [
-            key for key, val in sample[0].items()
-            if key not in ignore_fields and _is_numeric(val)
-        ]
-
-    numeric_fields = get_numeric_fields(data)
-
-    # 6. Toplamları hesapla
-    subtotal = defaultdict(float)
-    cumulative_total = defaultdict(float)
-
-    for item in data:
-        for field in numeric_fields:
-            subtotal[field] += _to_float(item.get(field, 0))
-
-    for item in original_data:
-        for field in numeric_fields:
-            cumulative_total[field] += _to_float(item.get(field, 0))
-
-    return {
-        "filtered_data": data,
-        "totals": {
-            "subtotal": dict(subtotal),
-            "cumulative": dict(cumulative_total)
-        }
-    }
+    return compile_rules(rules).execute(data)
+
+
+def _equals(columns: _Columns, field: str, value: Any) -> np.ndarray:
+    if isinstance(value, (list, dict)):  # Dizi/sözlük değerlerinde NumPy yayınlama yapılmasın
+        return np.fromiter((item == value for item in columns.raw(field)), dtype=bool, count=columns.size)
+    return np.asarray(columns.objects(field) == value, dtype=bool)
+
+
+def _numeric_fields(rows: List[Dict[str, Any]]) -> List[str]:
+    if not rows:
+        return []
+    return [
+        key for key, val in rows[0].items()
+        if key not in NUMERIC_IGNORE_FIELDS and _is_numeric(val)
+    ]
+
+
+def _sequential_sums(matrix: np.ndarray) -> List[float]:
+    """
+    Her satırın soldan sağa sıralı toplamı (0.0 + x0 + x1 + ...). `ndarray.sum` ikili (pairwise)
+    toplama yaptığından son basamakta farklı sonuç verebilir; `cumsum` önceki motordaki `+=`
+    döngüsüyle aynı sırayı izler. Baştaki 0.0, -0.0 sonuçlarını da `+=` gibi 0.0'a çevirir.
+    """
+    if not matrix.shape[1]:
+        return [0.0] * matrix.shape[0]
+    return (np.cumsum(matrix, axis=1)[:, -1] + 0.0).tolist()
+
+
+def _float_column(values: list) -> np.ndarray:
+    """
+    Kolon → float64 dizisi (`_to_float` ile aynı sonuç). JSON sayıları doğrudan, yalnızca rakam,
+    virgül, nokta ve eksi içeren metinler NumPy metin işlemleriyle topluca dönüştürülür; kalan
+    değerler (None, para birimi/boşluk içeren metinler, ...) için `_to_float` her farklı değerde bir kez çalışır.
+    """
+    size = len(values)
+    kinds = list(map(type, values))
+    is_number = list(map(_NUMBER_TYPES.__contains__, kinds))
+    numeric = np.array(is_number, dtype=bool)
+    count = int(numeric.sum())
+    if count == size:
+        return np.fromiter(values, dtype=np.float64, count=size)
+
+    column = np.zeros(size, dtype=np.float64)
+    column[numeric] = np.fromiter(compress(values, is_number), dtype=np.float64, count=count)
+
+    is_text = list(map(_TEXT_TYPES.__contains__, kinds))
+    texts = np.flatnonzero(is_text)
+    if texts.size:
+        parsed, clean = _parse_plain_numbers(list(compress(values, is_text)))
+        column[texts[clean]] = parsed[clean]
+        numeric[texts[clean]] = True
+
+    others = np.flatnonzero(~numeric)
+    if others.size:
+        rest = [values[i] for i in others.tolist()]
+        try:
+            parsed = {val: _to_float(val) for val in set(rest)}
+            column[others] = np.fromiter(map(parsed.__getitem__, rest), dtype=np.float64, count=len(rest))
+        except TypeError:  # hash'lenemeyen değerler (liste/sözlük)
+            column[others] = np.fromiter(map(_to_float, rest), dtype=np.float64, count=len(rest))
+    return column
+
+
+def _parse_plain_numbers(texts: list):
+    """
+    `_to_float` kurallarının yalnızca [0-9,.-] karakterlerinden oluşan metinler için vektörel karşılığı.
+    (değerler, uygun metin maskesi) döner; maskede olmayan metinler çağıran tarafta tek tek çözülür.
+    """
+    texts = np.array(texts, dtype=str)
+    clean = np.strings.str_len(np.strings.strip(texts, "0123456789,.-")) == 0
+
+    commas = np.strings.count(texts, ",")
+    dots = np.strings.count(texts, ".")
+    minus = np.strings.count(texts, "-")
+    to_dot = (commas == 1) & (dots == 0)          # "1234,56" → "1234.56"
+    drop_dots = ~to_dot & (dots > 1)              # "1.234.567" → "1234567"
+    if to_dot.any():
+        texts[to_dot] = np.strings.replace(texts[to_dot], ",", ".")
+    if drop_dots.any():
+        texts[drop_dots] = np.strings.replace(texts[drop_dots], ".", "")
+    dots = np.where(to_dot, 1, np.where(drop_dots, 0, dots))
+    commas = np.where(to_dot, 0, commas)
+
+    # float() için geçerli biçim: virgül yok, en fazla bir nokta, eksi yalnızca başta, en az bir rakam;
+    # geçersiz olanlar `_to_float`'taki gibi 0.0 olur
+    valid = (
+        clean
+        & (commas == 0)
+        & (dots <= 1)
+        & ((minus == 0) | ((minus == 1) & np.strings.startswith(texts, "-")))
+        & (np.strings.str_len(texts) - dots - minus > 0)
+    )
+    values = np.zeros(len(texts), dtype=np.float64)
+    valid_texts = texts[valid].tolist()
+    values[valid] = np.fromiter(map(float, valid_texts), dtype=np.float64, count=len(valid_texts))
+    return values, clean
+
 
 def _is_numeric(val: Any) -> bool:
     try:
@@ -101,7 +269,7 @@ def _to_float(val: Any) -> float:
         return float(val)
     try:
         val_str = str(val)
-        val_str = re.sub(r"[^\d,.-]", "", val_str)
+        val_str = _NON_NUMERIC.sub("", val_str)
         if ',' in val_str and val_str.count(',') == 1 and '.' not in val_str:
             val_str = val_str.replace(',', '.')
         elif val_str.count('.') > 1:
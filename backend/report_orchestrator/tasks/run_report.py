@@ -1,6 +1,7 @@
 # path: backend/report_orchestrator/tasks/run_report.py
 
 import time
+import uuid
 import requests
 import logging
 from celery import shared_task
@@ -8,6 +9,9 @@ from django.utils.timezone import now
 
 from report_orchestrator.models.api_report_model import APIReportModel
 from report_orchestrator.models.api_execution_log import APIExecutionLog
+from report_orchestrator.fetchers.active_fetcher import (
+    PULL_TIMEOUT, is_refresh_complete, next_poll_delay, trigger_refresh,
+)
 from report_orchestrator.rules.rule_engine import apply_rules
 from report_orchestrator.utils.time_utils import now_tr
 from report_orchestrator.utils.lock_utils import TaskLock
@@ -21,15 +25,33 @@ DEFAULT_RETRY_INTERVAL = 60
 LOCK_TIMEOUT = 300  # saniye
 
 @shared_task(bind=True, name="report_orchestrator.tasks.run_report", max_retries=5)
-def run_report(self, api_name: str):
-    start_time = time.time()
+def run_report(self, api_name: str, ticket: dict = None):
+    """
+    Raporu çalıştırır. Aktif modda önce trigger_url tetiklenir; yenileme bitene kadar görev
+    worker'ı tutmadan artan aralıklarla kendini yeniden kuyruğa alır (`ticket` ile) ve veri
+    hazır olur olmaz (en geç wait_seconds sonunda) devam eder (bkz. fetchers/active_fetcher.py).
+
+    Lock adımlar arasında bırakılmaz: süresi bir sonraki kontrole kadar uzatılır ve sonraki adım
+    bilet içindeki token ile lock'u devralır; böylece arada zamanlanmış bir çalıştırma başlayıp
+    ikinci bir yenileme tetikleyemez. Lock'u alamayan adım bileti düşürmez, yeniden kuyruğa alır.
+    """
+    start_time = ticket["triggered_at"] if ticket else time.time()
     status = "SUCCESS"
     error_msg = ""
     result_json = {}
     report = None
+    waiting = False
 
-    lock = TaskLock(api_name, timeout=LOCK_TIMEOUT)
+    lock_token = ticket["lock"] if ticket and ticket.get("lock") else uuid.uuid4().hex
+    lock = TaskLock(api_name, timeout=LOCK_TIMEOUT, token=lock_token)
     if not lock.acquire():
+        if ticket:
+            countdown = next_poll_delay(ticket.get("attempt", 0))
+            run_report.apply_async(
+                (api_name,), {"ticket": {**ticket, "attempt": ticket.get("attempt", 0) + 1}}, countdown=countdown
+            )
+            logger.warning(f"[LOCKED] {api_name} için lock başka bir görevde, bilet {countdown} sn sonra yeniden denenecek.")
+            return
         logger.warning(f"[LOCKED] {api_name} için aktif görev zaten çalışıyor. İşlem atlandı.")
         return
 
@@ -39,7 +61,26 @@ def run_report(self, api_name: str):
         retry_attempts = rule.get("retry_attempts", DEFAULT_RETRY_ATTEMPTS)
         retry_interval = rule.get("retry_interval", DEFAULT_RETRY_INTERVAL)
 
-        response = requests.get(report.data_pull_url)
+        if report.mode == "active" and report.trigger_url:
+            if ticket is None:
+                ticket, trigger_error = trigger_refresh(report.trigger_url, report.refresh_dataset)
+                if trigger_error:
+                    raise ValueError(trigger_error)
+                ticket["lock"] = lock_token
+
+            countdown = _next_check_countdown(report, ticket)
+            if countdown:
+                # Lock sonraki adım kuyruktan alınana kadar geçerli kalsın
+                lock.extend(countdown + LOCK_TIMEOUT)
+                attempt = ticket.get("attempt", 0)
+                run_report.apply_async(
+                    (api_name,), {"ticket": {**ticket, "attempt": attempt + 1}}, countdown=countdown
+                )
+                waiting = True
+                logger.info(f"[WAIT] {api_name} - yenileme sürüyor, {countdown} sn sonra tekrar kontrol edilecek.")
+                return
+
+        response = requests.get(report.data_pull_url, timeout=PULL_TIMEOUT)
         response.raise_for_status()
         raw_data = response.json()
 
@@ -100,11 +141,29 @@ def run_report(self, api_name: str):
 
     finally:
         duration = int(time.time() - start_time)
-        if report:
+        if report and not waiting:
             APIExecutionLog.objects.create(
                 api=report,
                 status=status,
                 error_message=error_msg,
                 duration_seconds=duration
             )
-        lock.release()
+        if not waiting:
+            lock.release()
+
+
+def _next_check_countdown(report, ticket: dict) -> int:
+    """
+    Veri hazırsa veya bekleme süresi (wait_seconds) dolduysa 0, aksi halde bir sonraki
+    kontrole kadar beklenecek süre (sn). Veri seti tanımsızsa kalan sürenin tamamı beklenir.
+    """
+    remaining = ticket["triggered_at"] + report.wait_seconds - time.time()
+    if remaining <= 0:
+        if not is_refresh_complete(ticket):
+            logger.warning(f"[WAIT] {report.api_name} - yenileme {report.wait_seconds} sn içinde bitmedi, mevcut veri çekiliyor.")
+        return 0
+    if is_refresh_complete(ticket):
+        return 0
+    if not ticket.get("dataset"):
+        return max(1, int(remaining))
+    return max(1, min(next_poll_delay(ticket.get("attempt", 0)), int(remaining)))
@@ -9,26 +9,38 @@ class TaskLock:
     """
     Basit bir cache tabanlı görev kilitleyici.
     Aynı görev eşzamanlı çalışmasın diye Redis üzerinden lock kullanır.
+    Lock değeri sahibin `token`'ıdır; aynı token ile gelen işlem (örn. kendini yeniden kuyruğa
+    almış görevin sonraki adımı) lock'u devralır.
     """
 
-    def __init__(self, key: str, timeout: int = 300):
+    def __init__(self, key: str, timeout: int = 300, token: str = "locked"):
         """
         :param key: Benzersiz lock anahtarı (örnek: 'report_lock_custumer_balance_top20')
         :param timeout: Lock'un saniye bazlı süresi (varsayılan: 300 saniye)
+        :param token: Lock sahibini belirten değer
         """
         self.key = f"tasklock:{key}"
         self.timeout = timeout
+        self.token = token
         self.acquired = False
 
     def acquire(self) -> bool:
-        """Lock'u alır. Eğer başka işlem o anda lock'u almışsa False döner."""
-        self.acquired = cache.add(self.key, "locked", self.timeout)
+        """Lock'u alır (aynı token'a aitse devralır). Eğer başka işlem o anda lock'u almışsa False döner."""
+        self.acquired = cache.add(self.key, self.token, self.timeout)
+        if not self.acquired and cache.get(self.key) == self.token:
+            self.acquired = bool(cache.touch(self.key, self.timeout))
         if not self.acquired:
             logger.warning(f"[LOCK] Aktif lock bulundu: {self.key}")
         return self.acquired
 
-    def release(self):
-        """Eğer lock bu işlem tarafından alındıysa bırakır."""
+    def extend(self, timeout: int):
+        """Alınmış lock'un süresini şimdiden itibaren `timeout` saniyeye uzatır (bırakmadan bekleme için)."""
         if self.acquired:
+            cache.touch(self.key, timeout)
+
+    def release(self):
+        """Eğer lock bu işlem tarafından alındıysa (ve hâlâ ona aitse) bırakır."""
+        if self.acquired and cache.get(self.key) == self.token:
             cache.delete(self.key)
             logger.info(f"[LOCK] Lock serbest bırakıldı: {self.key}")
+        self.acquired = False
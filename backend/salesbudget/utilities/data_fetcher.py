@@ -1,13 +1,12 @@
 # backend/salesbudget/utilities/data_fetcher.py
-import requests
-from django.conf import settings
+from hanadbcon.services.query_executor import run_query, QueryError
 
-def fetch_hana_db_data(token):
-    headers = {'Authorization': f'Bearer {token}'}
-    url = f'http://{settings.SERVER_HOST}/api/v2/hanadbcon/query/salesbudget/'
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Hata: {response.status_code}, Mesaj: {response.text}")
-    return None
\ No newline at end of file
+def fetch_hana_db_data(token=None):
+    """
+    'salesbudget' HANA sorgusunu süreç içinde çalıştırır (HTTP loopback yok).
+    """
+    try:
+        return run_query('salesbudget', json_compatible=True)
+    except QueryError as e:
+        print(f"Hata: {e}")
+    return None
@@ -1,15 +1,13 @@
 # backend/salesofferdocsum/utilities/data_fetcher.py
-import requests
-from django.conf import settings
+from hanadbcon.services.query_executor import run_query, QueryError
 
-def fetch_hana_db_data(token, last_update=None):
-    headers = {'Authorization': f'Bearer {token}'}
-    url = f'http://{settings.SERVER_HOST}/api/v2/hanadbcon/query/salesofferdocsum/'
-    if last_update:
-        url += f'?last_update={last_update.isoformat()}'
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Hata: {response.status_code}, Mesaj: {response.text}")
-    return None
\ No newline at end of file
+def fetch_hana_db_data(token=None, last_update=None):
+    """
+    'salesofferdocsum' HANA sorgusunu süreç içinde çalıştırır (HTTP loopback yok).
+    """
+    params = {'last_update': last_update.isoformat()} if last_update else None
+    try:
+        return run_query('salesofferdocsum', params, json_compatible=True)
+    except QueryError as e:
+        print(f"Hata: {e}")
+    return None
@@ -1,15 +1,13 @@
 # backend/salesofferdocsum/utilities/pivottablesv2/yearlymonthlysummarybycustomer_data_fetcher.py
-import requests
-from django.conf import settings
+from hanadbcon.services.query_executor import run_query, QueryError
 
-def fetch_yearly_monthly_summary_by_customer_data(token, last_update=None):
-    headers = {'Authorization': f'Bearer {token}'}
-    url = f'http://{settings.SERVER_HOST}/api/v2/hanadbcon/query/sales_offer_pivottables_yearlymonthlysummarybycustomer/'
-    if last_update:
-        url += f'?last_update={last_update.isoformat()}'
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Hata: {response.status_code}, Mesaj: {response.text}")
-    return None
\ No newline at end of file
+def fetch_yearly_monthly_summary_by_customer_data(token=None, last_update=None):
+    """
+    'sales_offer_pivottables_yearlymonthlysummarybycustomer' HANA sorgusunu süreç içinde çalıştırır (HTTP loopback yok).
+    """
+    params = {'last_update': last_update.isoformat()} if last_update else None
+    try:
+        return run_query('sales_offer_pivottables_yearlymonthlysummarybycustomer', params, json_compatible=True)
+    except QueryError as e:
+        print(f"Hata: {e}")
+    return None
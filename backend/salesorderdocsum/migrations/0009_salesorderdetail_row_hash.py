@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salesorderdocsum', '0008_documentsummary_brut_tutar_spb'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salesorderdetail',
+            name='row_hash',
+            field=models.CharField(blank=True, default='', max_length=32, verbose_name='Satır Özeti'),
+        ),
+    ]
@@ -40,6 +40,7 @@ class SalesOrderDetail(BaseModel):
     acik_net_tutar_ypb = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Açık Net Tutar YPB", default=0.0)
     acik_net_tutar_spb = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Açık Net Tutar SPB", default=0.0)
     brut_tutar_spb = models.DecimalField(max_digits=16, decimal_places=2, verbose_name="BrutTutarSPB", default=0.0)
+    row_hash = models.CharField(max_length=32, blank=True, default='', verbose_name="Satır Özeti")
 
     class Meta:
         verbose_name = "Açık Sipariş Detayı"
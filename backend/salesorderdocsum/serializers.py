@@ -7,7 +7,7 @@ from .models.docsum import DocumentSummary
 class SalesOrderDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = SalesOrderDetail
-        fields = '__all__'
+        exclude = ['row_hash']  # Senkronizasyon için iç alan; API çıktısına dahil edilmez
         read_only_fields = ['id', 'created_at', 'updated_at']  # Opsiyonel olarak belirtilebilir
 
 
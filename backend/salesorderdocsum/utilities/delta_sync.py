@@ -0,0 +1,134 @@
+# backend/salesorderdocsum/utilities/delta_sync.py
+"""
+SalesOrderDetail için artımlı (delta) senkronizasyon.
+
+Eski akış her yenilemede tüm SalesOrderDetail/DocumentSummary kayıtlarını silip HANA verisini
+baştan yüklüyor, tüm özetleri yeniden hesaplıyor ve `cache.clear()` çağırıyordu.
+Fark çıkarma ve yazma `hanadbcon.services.sync_engine` ile `uniq_detail_no` anahtarına göre yapılır:
+
+    1) Gelen her satır için içerik özeti (row_hash) hesaplanır.
+    2) Yeni ya da özeti değişmiş satırlar tek `INSERT ... ON CONFLICT DO UPDATE` ile yazılır.
+    3) HANA'da artık bulunmayan satırlar silinir.
+    4) Yalnızca etkilenen `belge_no`'ların DocumentSummary kayıtları yeniden hesaplanır.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+
+from hanadbcon.services.sync_engine import SyncEngine, SyncSpec
+from ..models.salesorderdetail import SalesOrderDetail
+from ..models.docsum import DocumentSummary
+
+API_NAME = 'salesorderdocsum'
+BATCH_SIZE = 1000
+
+# model alanı -> HANA kolonu ((kolon, varsayılan): kolon gelmeyebilir)
+FIELD_MAP = {
+    'uniq_detail_no': 'UniqDetailNo',
+    'belge_no': 'BelgeNo',
+    'satici': 'Satici',
+    'belge_tarih': 'BelgeTarih',
+    'teslim_tarih': 'TeslimTarih',
+    'belge_onay': 'BelgeOnay',
+    'belge_durum': 'BelgeStatus',
+    'belge_aciklamasi': 'BelgeAciklamasi',
+    'sevk_adres': 'SevkAdres',
+    'musteri_kod': 'MusteriKod',
+    'musteri_ad': 'MusteriAd',
+    'satis_tipi': 'SatisTipi',
+    'kalem_grup': 'KalemGrup',
+    'satir_durum': 'SatirStatus',
+    'satir_no': 'SatirNo',
+    'kalem_kod': 'KalemKod',
+    'kalem_tanimi': 'KalemTanimi',
+    'birim': 'Birim',
+    'siparis_miktari': ('SipMiktar', 0),
+    'sevk_miktari': ('SevkMiktar', 0),
+    'kalan_miktar': ('KalanMiktar', 0),
+    'liste_fiyat_dpb': ('ListeFiyatDPB', 0),
+    'detay_kur': ('DetayKur', 1),
+    'detay_doviz': 'DetayDoviz',
+    'iskonto_oran': ('IskontoOran', 0),
+    'net_fiyat_dpb': ('NetFiyatDPB', 0),
+    'net_tutar_ypb': ('NetTutarYPB', 0),
+    'net_tutar_spb': ('NetTutarSPB', 0),
+    'acik_net_tutar_ypb': ('AcikNetTutarYPB', 0),
+    'acik_net_tutar_spb': ('AcikNetTutarSPB', 0),
+    'brut_tutar_spb': ('BrutTutarSPB', 0),
+}
+
+SUMMARY_GROUP_FIELDS = (
+    'belge_no', 'satici', 'belge_tarih', 'teslim_tarih', 'belge_onay',
+    'belge_durum', 'belge_aciklamasi', 'musteri_kod', 'musteri_ad',
+    'sevk_adres', 'satis_tipi',
+)
+SUMMARY_SUM_FIELDS = ('net_tutar_ypb', 'net_tutar_spb', 'acik_net_tutar_ypb', 'acik_net_tutar_spb', 'brut_tutar_spb')
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def rebuild_document_summaries(belge_nos):
+    """Verilen belge numaralarının özetlerini silip detay satırlarından yeniden hesaplar."""
+    belge_nos = list(belge_nos)
+    for chunk in _chunks(belge_nos, BATCH_SIZE):
+        DocumentSummary.objects.filter(belge_no__in=chunk).delete()
+
+        summaries = SalesOrderDetail.objects.filter(belge_no__in=chunk).values(
+            *SUMMARY_GROUP_FIELDS
+        ).annotate(**{field: Sum(field) for field in SUMMARY_SUM_FIELDS})
+
+        DocumentSummary.objects.bulk_create(
+            [DocumentSummary(**summary) for summary in summaries],
+            batch_size=BATCH_SIZE,
+        )
+
+
+def _invalidate_cache(touched_belge_nos):
+    keys = [f'{API_NAME}_old_sales_order_details', f'{API_NAME}_document_summaries']
+    keys.extend(f'{API_NAME}_document_summary_{belge_no}' for belge_no in touched_belge_nos)
+    for chunk in _chunks(keys, BATCH_SIZE):
+        cache.delete_many(chunk)
+
+
+def _after_write(result):
+    touched = result.touched['belge_no']
+    if touched:
+        rebuild_document_summaries(touched)
+        transaction.on_commit(lambda: _invalidate_cache(touched))
+
+
+SALES_ORDER_DETAIL_SYNC = SyncSpec(
+    name=API_NAME,
+    query_name='salesorderdocsum',
+    model=SalesOrderDetail,
+    natural_key=('uniq_detail_no',),
+    field_map=FIELD_MAP,
+    hash_field='row_hash',
+    track_fields=('belge_no',),  # belge_no değişmiş olabilir; eski ve yeni belgenin özeti yenilenir
+    batch_size=BATCH_SIZE,
+    after_write=_after_write,
+)
+
+
+def sync_sales_order_details(rows=None):
+    """
+    HANA verisini mevcut tabloyla karşılaştırıp yalnızca farkları uygular.
+    `rows` verilmezse 'salesorderdocsum' sorgusu doğrudan akıtılır.
+
+    Dönüş: {'received', 'documents', 'created', 'updated', 'unchanged', 'deleted', 'touched_documents', 'duration'}
+    """
+    result = SyncEngine(SALES_ORDER_DETAIL_SYNC).run(rows=rows)
+
+    return {
+        'received': result.received,
+        'documents': DocumentSummary.objects.count(),
+        'created': result.created,
+        'updated': result.updated,
+        'unchanged': result.unchanged,
+        'deleted': result.deleted,
+        'touched_documents': len(result.touched['belge_no']),
+        'duration': result.timings['total'],
+    }
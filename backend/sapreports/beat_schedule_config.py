@@ -15,6 +15,22 @@ BEAT_SCHEDULE = {
         'task': 'filesharehub_v2.tasks.fix_thumbnails_task.run_fix_thumbnails',
         'schedule': crontab(hour=4, minute=0),
     },
+    'refresh-bcm-exchange-rates-hourly': {
+        'task': 'bomcostmanager.tasks.refresh_exchange_rates',
+        'schedule': crontab(minute=5),             # her saat başı +5 dk (ORTT gün içinde girilebilir)
+    },
+    'dispatch-pending-mails-every-minute': {
+        'task': 'mailservice.tasks.dispatch_pending_mails',
+        'schedule': 60.0,                          # yeniden denemeler ve kaçan kayıtlar için
+    },
+    'reap-stale-task-runs-every-5-minutes': {
+        'task': 'taskorchestrator.tasks.reap_stale_task_runs',
+        'schedule': 300.0,                         # sert süre sınırıyla öldürülen çalıştırmaları kapatır
+    },
+    'purge-expired-jwt-blacklist-daily': {
+        'task': 'authcentral.tasks.purge_expired_blacklisted_tokens',
+        'schedule': crontab(minute=30, hour=3),
+    },
     'clean-logs-every-2h': {                       # 👈 isim de güncellendi
         'task': 'sapreports.tasks.log_cleanup.clean_log_files',
         'schedule': crontab(minute=0, hour='*/2'), # ⏲️ her 2 saatte bir
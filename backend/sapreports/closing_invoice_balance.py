@@ -0,0 +1,70 @@
+# backend/sapreports/closing_invoice_balance.py
+"""
+Kapanış faturası bakiyelerinin toplu yeniden hesaplanması (supplierpayment ve tunainssupplierpayment).
+
+Ödeme sinyalleri yalnızca `cari_kod`'u kirli işaretler (bkz. <uygulama>/api/closinginvoice_view.py);
+işaretlenen tüm cariler commit sonrasında tek gruplu toplam sorgusu ve tek toplu yazımla güncellenir.
+
+Kullanım:
+    CLOSING_INVOICE_BALANCES = closing_invoice_balances(
+        'supplierpayment.closing_balance', SupplierPayment, ClosingInvoice
+    )
+"""
+from decimal import Decimal
+from functools import partial
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from sapreports.deferred_recompute import DeferredRecompute
+
+ZERO = Decimal('0.00')
+
+
+def recompute_closing_balances(payment_model, invoice_model, cari_kodlar):
+    """
+    Verilen carilerin `current_balance` (borç - alacak) ve cari bilgilerini günceller;
+    bakiyesi sıfırlanan veya hareketi kalmayan carilerin kapanış faturası silinir.
+    `monthly_balances` simülasyona aittir, burada değiştirilmez.
+    """
+    payments = payment_model.objects.filter(cari_kod__in=cari_kodlar)
+    totals = {
+        row['cari_kod']: (row['total_debt'] or ZERO) - (row['total_credit'] or ZERO)
+        for row in payments.order_by().values('cari_kod').annotate(
+            total_debt=Sum('borc'), total_credit=Sum('alacak'),
+        )
+    }
+    # Cari bilgisi en eski belgeden alınır (önceki `.first()` davranışı)
+    info = {
+        row[0]: row[1:]
+        for row in payments.order_by('cari_kod', 'belge_tarih', 'id').distinct('cari_kod')
+        .values_list('cari_kod', 'cari_ad', 'iban', 'odemekosulu')
+    }
+
+    now = timezone.now()
+    invoices = []
+    for cari_kod, balance in totals.items():
+        if balance == 0:
+            continue
+        cari_ad, iban, odemekosulu = info[cari_kod]
+        invoices.append(invoice_model(
+            cari_kod=cari_kod, cari_ad=cari_ad, iban=iban, odemekosulu=odemekosulu,
+            current_balance=balance, created_at=now, updated_at=now,
+        ))
+
+    stale = set(cari_kodlar) - {invoice.cari_kod for invoice in invoices}
+    if stale:
+        invoice_model.objects.filter(cari_kod__in=stale).delete()
+    if invoices:
+        invoice_model.objects.bulk_create(
+            invoices,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['cari_kod'],
+            update_fields=['cari_ad', 'iban', 'odemekosulu', 'current_balance', 'updated_at'],
+        )
+
+
+def closing_invoice_balances(name, payment_model, invoice_model):
+    """Uygulamanın ödeme / kapanış faturası modelleri için ertelenmiş bakiye hesaplayıcısı."""
+    return DeferredRecompute(name, partial(recompute_closing_balances, payment_model, invoice_model))
@@ -0,0 +1,132 @@
+# backend/sapreports/deferred_recompute.py
+"""
+Ertelenmiş, toplu özet yeniden hesaplaması.
+
+Kayıt bazlı sinyaller (post_save / post_delete) her kayıtta ilgili anahtarın (ör. `cari_kod`)
+özetini yeniden hesaplıyordu; N satırlık bir yazma N kez toplama sorgusu demekti. Bunun yerine
+sinyaller yalnızca anahtarı "kirli" olarak işaretler, hesaplama bir kez ve tüm anahtarlar için
+birlikte yapılır:
+
+    - `deferred()` bloğu içinde  : blok bitiminde
+    - transaction içinde         : commit sonrasında (`on_commit`); rollback'te hiç çalışmaz
+    - ikisi de yoksa             : hemen (autocommit, eski davranışla aynı)
+
+Kullanım:
+    BALANCES = DeferredRecompute('supplierpayment.closing_balance', recompute_balances)
+
+    @receiver(post_save, sender=SupplierPayment)
+    def mark(sender, instance, **kwargs):
+        BALANCES.mark([instance.cari_kod])
+
+    with BALANCES.deferred():
+        ...   # çok sayıda kayıt; hesaplama blok sonunda tek sefer
+"""
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def _dead():
+    """Kayıtlı batch yokken `local.batch` yerine geçen (ölü zayıf referans gibi davranır)."""
+    return None
+
+
+class _Batch:
+    """
+    Tek bir transaction'a bağlı kirli anahtarlar.
+    Batch'e tek güçlü referans `on_commit` ile kaydedilen `flush`'tır; thread'de yalnızca zayıf
+    referans tutulur. Rollback (transaction veya savepoint) hook'u düşürdüğünde batch de serbest
+    kalır ve bir sonraki `mark` yeni batch açar.
+    """
+
+    __slots__ = ('owner', 'keys', '__weakref__')
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.keys = set()
+
+    def flush(self):
+        local = self.owner._local
+        if getattr(local, 'batch', _dead)() is self:
+            local.batch = _dead
+        self.owner._run(self.keys)
+
+
+class DeferredRecompute:
+    """
+    name      : Log adı
+    recompute : callable(keys: set) — kirli anahtarların özetlerini tek seferde hesaplar
+    using     : Transaction'ı izlenecek veritabanı
+    """
+
+    def __init__(self, name, recompute, using=DEFAULT_DB_ALIAS):
+        self.name = name
+        self.recompute = recompute
+        self.using = using
+        self._local = threading.local()
+
+    def mark(self, keys):
+        """Anahtarları kirli işaretler; hesaplama zamanı modül açıklamasındaki sıraya göre belirlenir."""
+        keys = {key for key in keys if key is not None}
+        if not keys:
+            return
+        local = self._local
+
+        if getattr(local, 'depth', 0):
+            local.collected.update(keys)
+            return
+
+        connection = transaction.get_connection(self.using)
+        if not connection.in_atomic_block:
+            self._run(keys)
+            return
+
+        # Aynı transaction'da kayıtlı bir batch varsa ona ekle; hook'u rollback ile düşmüşse
+        # (savepoint / transaction geri alındı) batch serbest kalmıştır, yeni bir batch aç
+        batch = getattr(local, 'batch', _dead)()
+        if batch is None:
+            batch = _Batch(self)
+            local.batch = weakref.ref(batch)
+            transaction.on_commit(batch.flush, using=self.using)
+        batch.keys.update(keys)
+
+    def discard(self):
+        """
+        Bekleyen kirli anahtarları bırakır; özetler tamamen yeniden yazıldığında (ör. tam simülasyon)
+        aynı transaction'daki tekil hesaplamalar gereksizdir ve yeni veriyi ezmemelidir.
+        """
+        local = self._local
+        if getattr(local, 'depth', 0):
+            local.collected.clear()
+        batch = getattr(local, 'batch', _dead)()
+        if batch is not None:
+            batch.keys.clear()
+
+    @contextmanager
+    def deferred(self):
+        """Blok boyunca işaretlenen anahtarları toplar, blok sonunda tek seferde işler (iç içe kullanılabilir)."""
+        local = self._local
+        if not getattr(local, 'depth', 0):
+            local.collected = set()
+        local.depth = getattr(local, 'depth', 0) + 1
+        try:
+            yield self
+        finally:
+            local.depth -= 1
+            if not local.depth:
+                keys, local.collected = local.collected, set()
+                self.mark(keys)
+
+    def _run(self, keys):
+        if not keys:
+            return
+        try:
+            self.recompute(set(keys))
+        except Exception:
+            logger.exception(f"[{self.name}] {len(keys)} anahtar için yeniden hesaplama başarısız")
+            raise
@@ -0,0 +1,139 @@
+# backend/sapreports/fifo_aging.py
+"""
+Ortak FIFO yaşlandırma motoru (müşteri alacakları ve tedarikçi borçları).
+
+Defter tüm cariler için sütun dizileri olarak verilir (cari, ay, fatura tutarı, ödeme tutarı);
+ödemeler her carinin en eski faturalarından başlanarak düşülür ve kalan tutarlar
+"Öncesi" + son `window` takvim ayı kovalarına dağıtılır. Hesap cari başına döngü kurmadan,
+tek sıralama ve kümülatif toplamlarla numpy üzerinde yapılır:
+
+    1) Satırlar (cari, ay) sırasına dizilir
+    2) Cari içi kümülatif fatura toplamı: kalan = clip(kümülatif - ödeme havuzu, 0, fatura)
+    3) Kalanlar (cari, kova) çiftine göre `bincount` ile toplanır
+
+Tutarlar kuruş cinsinden int64 olarak işlenir (kayan nokta yuvarlama hatası birikmez).
+Negatif fatura satırları (iade/düzeltme) ödeme havuzuna eklenir; faturaları aşan ödeme fazlası
+yaşlandırmaya girmez (carinin bakiyesi sıfır olur).
+
+Kullanım:
+    from sapreports.fifo_aging import fifo_age, months_from_dates
+
+    result = fifo_age(cari_kodlari, months_from_dates(tarihler), borclar, alacaklar)
+    for cari_kod, bakiye, kovalar in result.rows():
+        ...   # kovalar: [Öncesi, Ay-3, Ay-2, Ay-1, Bu Ay] (Decimal)
+"""
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+MONTH_ABBR = {
+    1: "Oca", 2: "Şub", 3: "Mar", 4: "Nis", 5: "May", 6: "Haz",
+    7: "Tem", 8: "Ağu", 9: "Eyl", 10: "Eki", 11: "Kas", 12: "Ara",
+}
+CENT = Decimal("0.01")
+
+
+def month_index(year, month):
+    """(yıl, ay) → ardışık ay numarası; dizilerle de çalışır."""
+    return np.asarray(year, dtype=np.int64) * 12 + np.asarray(month, dtype=np.int64) - 1
+
+
+def month_parts(index):
+    """Ay numarası → (yıl, ay)."""
+    return int(index) // 12, int(index) % 12 + 1
+
+
+def months_from_dates(dates):
+    """'YYYY-MM-DD' metinleri (veya date nesneleri) → ay numaraları; satır satır `strptime` yapılmaz."""
+    months = np.asarray(dates).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    return months + 1970 * 12
+
+
+def to_cents(values):
+    """Decimal / float dizisi → kuruş (int64)."""
+    if isinstance(values, np.ndarray):
+        floats = values.astype(np.float64)
+    else:  # Decimal listesinde object dizisi üzerinden dönüşüm çok daha yavaş
+        floats = np.fromiter(map(float, values), dtype=np.float64, count=len(values))
+    return np.rint(floats * 100).astype(np.int64)
+
+
+def _sum_by(index, values, size):
+    return np.rint(np.bincount(index, weights=values, minlength=size)).astype(np.int64)
+
+
+@dataclass
+class AgingResult:
+    """
+    keys     : Benzersiz cari kodları (sıralı)
+    buckets  : (cari sayısı, window + 1) kuruş; 0. sütun "Öncesi", son sütun içinde bulunulan ay
+    balances : Cari başına kalan toplam (kuruş)
+    months   : Son `window` ayın ay numaraları (eskiden yeniye)
+    """
+    keys: np.ndarray
+    buckets: np.ndarray
+    balances: np.ndarray
+    months: list
+
+    def labels(self, style="short"):
+        """Kova etiketleri: 'short' → ['Öncesi', 'Nis25', ...], 'iso' → ['oncesi', '2025-04', ...]"""
+        if style == "iso":
+            return ["oncesi"] + ["%d-%02d" % month_parts(m) for m in self.months]
+        labels = []
+        for m in self.months:
+            year, month = month_parts(m)
+            labels.append(f"{MONTH_ABBR[month]}{str(year)[-2:]}")
+        return ["Öncesi"] + labels
+
+    def rows(self):
+        """(cari kodu, bakiye, [kova tutarları]) üçlüleri; tutarlar Decimal."""
+        buckets = self.buckets.tolist()
+        for key, balance, row in zip(self.keys.tolist(), self.balances.tolist(), buckets):
+            yield key, Decimal(balance) * CENT, [Decimal(value) * CENT for value in row]
+
+
+def fifo_age(keys, months, invoices, payments, as_of=None, window=4):
+    """
+    Tüm defteri tek geçişte FIFO yaşlandırır.
+
+    keys     : Satırın carisi (cari kodu)
+    months   : Satırın ay numarası (bkz. `month_index`, `months_from_dates`)
+    invoices : Yaşlandırılan tutar (müşteri için borç, tedarikçi için alacak)
+    payments : Faturalara mahsup edilen tutar (müşteri için alacak, tedarikçi için borç)
+    as_of    : Yaşlandırma tarihi (varsayılan bugün); bu aydan sonraki kayıtlar bu aya yazılır
+    """
+    as_of = as_of or date.today()
+    end = as_of.year * 12 + as_of.month - 1
+    start = end - window + 1
+    window_months = list(range(start, end + 1))
+
+    keys = np.asarray(keys, dtype=str)
+    if not len(keys):
+        empty = np.zeros(0, dtype=np.int64)
+        return AgingResult(keys, empty.reshape(0, window + 1), empty, window_months)
+
+    codes, key_idx = np.unique(keys, return_inverse=True)
+    size = len(codes)
+    months = np.asarray(months, dtype=np.int64)
+    invoices = to_cents(invoices)
+    payments = to_cents(payments)
+
+    # Negatif fatura (iade) ödeme havuzuna eklenir
+    pool = _sum_by(key_idx, payments - np.minimum(invoices, 0), size)
+
+    order = np.lexsort((months, key_idx))
+    k = key_idx[order]
+    m = months[order]
+    inv = np.maximum(invoices[order], 0)
+
+    # Cari içi kümülatif toplam = genel kümülatif - carinin başlangıcından önceki toplam
+    cumulative = np.cumsum(inv)
+    starts = np.searchsorted(k, np.arange(size))
+    before = np.concatenate(([0], cumulative))[starts]
+    remaining = np.clip(cumulative - before[k] - pool[k], 0, inv)
+
+    column = np.clip(m - start + 1, 0, window)
+    buckets = _sum_by(k * (window + 1) + column, remaining, size * (window + 1)).reshape(size, window + 1)
+    return AgingResult(codes, buckets, buckets.sum(axis=1), window_months)
@@ -0,0 +1,164 @@
+# backend/sapreports/refresh_coordinator.py
+"""
+Rapor veri setleri için yenileme (refresh) koordinatörü.
+
+Liste/yenile endpoint'leri her istekte aynı Celery görevini kuyruğa atıyordu; çok kullanıcılı
+kullanımda bu, aynı veri seti için yüzlerce yinelenen görev demektir. Koordinatör, veri seti
+başına Redis (Django cache) üzerinde üç anahtar tutar:
+
+    refresh:<ad>:last     → son başarılı yenilemenin zamanı (epoch)
+    refresh:<ad>:running  → kuyrukta / çalışmakta olan yenileme kilidi (cache.add)
+    refresh:<ad>:debounce → kısa aralıklarla gelen isteklerin tek isteğe indirgenmesi
+
+Kullanım:
+    STOCK_REFRESH = RefreshCoordinator('rawmaterialwarehousestock', max_age=300)
+
+    # View
+    status = STOCK_REFRESH.request(fetch_and_update_hana_data)
+    # -> {'enqueued': True/False, 'reason': 'enqueued' | 'fresh' | 'in_progress' | 'debounced', ...}
+
+    # Celery görevi
+    with STOCK_REFRESH.track() as run:
+        ...            # hata yükseltmeden başarısız biterse: run.fail()
+"""
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class _Run:
+    """`track()` bloğu içindeki tek bir yenileme çalışması."""
+
+    __slots__ = ('ok',)
+
+    def __init__(self):
+        self.ok = True
+
+    def fail(self):
+        self.ok = False
+
+
+class RefreshCoordinator:
+    """
+    dataset      : Veri seti adı (anahtar öneki)
+    max_age      : Veri bu süreden (sn) yeniyse yenileme atlanır
+    debounce     : Bu süre (sn) içinde gelen tekrar istekleri yok sayılır
+    lock_timeout : Görev hiç bitmezse (worker çökmesi vb.) kilidin kendiliğinden düşeceği süre (sn)
+    """
+
+    def __init__(self, dataset, max_age=None, debounce=None, lock_timeout=None):
+        self.dataset = dataset
+        self.max_age = max_age if max_age is not None else getattr(settings, 'REFRESH_DEFAULT_MAX_AGE', 300)
+        self.debounce = debounce if debounce is not None else getattr(settings, 'REFRESH_DEFAULT_DEBOUNCE', 15)
+        self.lock_timeout = lock_timeout or getattr(settings, 'REFRESH_LOCK_TIMEOUT', 1800)
+
+    # ------------------------------------------------------------------ #
+    def _key(self, name):
+        return f"refresh:{self.dataset}:{name}"
+
+    def last_refreshed(self):
+        """Son başarılı yenilemenin epoch zamanı (hiç yoksa None)."""
+        try:
+            return cache.get(self._key('last'))
+        except Exception as e:
+            logger.warning(f"[Refresh] {self.dataset} zaman bilgisi okunamadı: {e}")
+            return None
+
+    def in_progress(self):
+        try:
+            return bool(cache.get(self._key('running')))
+        except Exception:
+            return False
+
+    def status(self):
+        """Çağırana veri tazeliğini ve yenileme durumunu bildirir."""
+        last = self.last_refreshed()
+        age = round(time.time() - last, 1) if last else None
+        return {
+            'dataset': self.dataset,
+            'last_refreshed_at': datetime.fromtimestamp(last, tz=dt_timezone.utc).isoformat() if last else None,
+            'age_seconds': age,
+            'max_age_seconds': self.max_age,
+            'fresh': age is not None and age < self.max_age,
+            'in_progress': self.in_progress(),
+        }
+
+    def headers(self):
+        """Liste yanıtlarına eklenebilecek tazelik başlıkları."""
+        status = self.status()
+        return {
+            'X-Data-Refreshed-At': status['last_refreshed_at'] or '',
+            'X-Data-Refresh-In-Progress': 'true' if status['in_progress'] else 'false',
+        }
+
+    # ------------------------------------------------------------------ #
+    def request(self, task, args=(), kwargs=None, force=False):
+        """
+        Gerekliyse `task`'ı kuyruğa atar. Aynı veri seti için kuyrukta/çalışan bir görev varsa
+        ya da veri `max_age`'den yeniyse (force değilse) yeni görev oluşturulmaz.
+        """
+        def result(enqueued, reason, **extra):
+            data = self.status()
+            data.update({'enqueued': enqueued, 'reason': reason}, **extra)
+            return data
+
+        try:
+            if not force:
+                last = self.last_refreshed()
+                if last and time.time() - last < self.max_age:
+                    return result(False, 'fresh')
+
+            if self.debounce and not cache.add(self._key('debounce'), 1, timeout=self.debounce):
+                return result(False, 'debounced')
+
+            if not cache.add(self._key('running'), time.time(), timeout=self.lock_timeout):
+                return result(False, 'in_progress')
+        except Exception as e:
+            # Redis erişilemezse eski davranışa dön: görevi doğrudan kuyruğa at
+            logger.warning(f"[Refresh] {self.dataset} koordinasyon anahtarlarına erişilemedi: {e}")
+
+        try:
+            async_result = task.apply_async(args=args, kwargs=kwargs or {})
+        except Exception:
+            self._release()
+            raise
+        logger.info(f"[Refresh] {self.dataset} yenilemesi kuyruğa alındı: {async_result.id}")
+        return result(True, 'enqueued', task_id=async_result.id)
+
+    @contextmanager
+    def track(self):
+        """
+        Görev gövdesini sarar: çalışma süresince kilidi tutar, başarıyla biterse
+        son yenileme zamanını yazar, her durumda kilidi bırakır.
+        Hata yükseltmeden biten görevler `run.fail()` ile başarısız işaretlenebilir.
+        """
+        try:
+            cache.set(self._key('running'), time.time(), timeout=self.lock_timeout)
+        except Exception:
+            pass
+        run = _Run()
+        try:
+            yield run
+            if run.ok:
+                self.mark_refreshed()
+        finally:
+            self._release()
+
+    def mark_refreshed(self):
+        """Veri setini şu an itibarıyla taze işaretler (görev dışı, senkron yenilemeler için de)."""
+        try:
+            cache.set(self._key('last'), time.time(), timeout=None)
+        except Exception as e:
+            logger.warning(f"[Refresh] {self.dataset} zaman bilgisi yazılamadı: {e}")
+
+    def _release(self):
+        try:
+            cache.delete(self._key('running'))
+        except Exception:
+            pass
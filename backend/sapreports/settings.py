@@ -41,6 +41,13 @@ HANADB_USER = os.getenv('HANADB_USER')
 HANADB_PASS = os.getenv('HANADB_PASS')
 HANADB_SCHEMA = os.getenv('HANADB_SCHEMA')
 
+# HANA bağlantı havuzu (hanadbcon.utilities.connection_pool)
+HANADB_POOL_MAX_SIZE = int(os.getenv('HANADB_POOL_MAX_SIZE', 10))
+HANADB_POOL_TIMEOUT = float(os.getenv('HANADB_POOL_TIMEOUT', 30))  # havuzdan bağlantı bekleme süresi (sn)
+HANADB_POOL_IDLE_TIMEOUT = float(os.getenv('HANADB_POOL_IDLE_TIMEOUT', 300))  # boşta bekleyen bağlantının ömrü (sn)
+HANADB_POOL_MAX_LIFETIME = float(os.getenv('HANADB_POOL_MAX_LIFETIME', 3600))  # bağlantının maksimum ömrü (sn)
+HANADB_POOL_HEALTH_CHECK_AFTER = float(os.getenv('HANADB_POOL_HEALTH_CHECK_AFTER', 30))  # bu süreden uzun boşta kalan bağlantı test edilir
+
 # SAP B1 Service Layer Ayarları
 SAP_SERVICE_LAYER_URL = os.getenv('SAP_SERVICE_LAYER_URL')
 SAP_COMPANY_DB = os.getenv('SAP_COMPANY_DB')
@@ -70,6 +77,12 @@ EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "tunaapp@tunacelik.com.tr")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "tunaapp@tunacelik.com.tr")
 
+# Mail kuyruğu (mailservice.services.mail_queue)
+MAIL_QUEUE_BATCH_SIZE = int(os.getenv("MAIL_QUEUE_BATCH_SIZE", 50))  # tek SMTP bağlantısıyla gönderilecek mail sayısı
+MAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv("MAIL_QUEUE_MAX_ATTEMPTS", 5))  # bu denemeden sonra FAILED
+MAIL_QUEUE_RETRY_BACKOFF = int(os.getenv("MAIL_QUEUE_RETRY_BACKOFF", 60))  # ilk yeniden deneme gecikmesi (sn), her denemede 2 katı
+MAIL_QUEUE_STALE_AFTER = int(os.getenv("MAIL_QUEUE_STALE_AFTER", 600))  # SENDING'de bu süreden uzun kalan mail yeniden kuyruğa alınır (sn)
+
 # .env dosyasından veya doğrudan sabit bir değerden NETWORK_FOLDER_PATH alın
 PRIMARY_PATH = os.getenv("NETWORK_FOLDER_PRIMARY")
 FALLBACK_PATH = os.getenv("NETWORK_FOLDER_FALLBACK", "/mnt/product_picture")
@@ -276,7 +289,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    #'authcentral.middleware.CheckBlacklistedTokenMiddleware',  # Güncellenmiş yol
+    'authcentral.middleware.CheckBlacklistedTokenMiddleware',  # Bloom filtresi; DB'ye yalnızca olası eşleşmede gider
 ]
 
 
@@ -322,6 +335,34 @@ CACHE_TTL = 5 * 1
 
 CACHE_CLEAR_THRESHOLD = 1000
 
+# hanadbcon/logodbcon sorgu sonuç önbelleği (hanadbcon.services.result_cache)
+QUERY_RESULT_CACHE_MAX_BYTES = int(os.getenv('QUERY_RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))  # worker başına yerel LRU (tahmini boyut)
+QUERY_RESULT_CACHE_SHARED_MAX_BYTES = int(os.getenv('QUERY_RESULT_CACHE_SHARED_MAX_BYTES', 16 * 1024 * 1024))  # Redis'e yazılacak en büyük sonuç (tahmini boyut)
+QUERY_RESULT_CACHE_LOCK_TIMEOUT = int(os.getenv('QUERY_RESULT_CACHE_LOCK_TIMEOUT', 600))  # single-flight kilit süresi (sn)
+
+# dpap yetki matrisi önbelleği (dpap.utils.permission_resolver)
+DPAP_PERMISSION_CACHE_TIMEOUT = int(os.getenv('DPAP_PERMISSION_CACHE_TIMEOUT', 3600))  # Redis'teki matrisin ömrü (sn)
+DPAP_PERMISSION_LOCAL_TTL = int(os.getenv('DPAP_PERMISSION_LOCAL_TTL', 5))  # süreç içi matrisin sürüm kontrolü aralığı (sn)
+
+# Rapor yenileme koordinatörü (sapreports.refresh_coordinator)
+REFRESH_DEFAULT_MAX_AGE = int(os.getenv('REFRESH_DEFAULT_MAX_AGE', 300))  # bu süreden yeni veri yenilenmez (sn)
+REFRESH_DEFAULT_DEBOUNCE = int(os.getenv('REFRESH_DEFAULT_DEBOUNCE', 15))  # tekrar isteklerin yok sayıldığı süre (sn)
+REFRESH_LOCK_TIMEOUT = int(os.getenv('REFRESH_LOCK_TIMEOUT', 1800))  # bitmeyen görev kilidinin düşme süresi (sn)
+
+# report_orchestrator aktif mod bekleme (report_orchestrator.fetchers.active_fetcher)
+REPORT_ORCH_POLL_INITIAL = int(os.getenv('REPORT_ORCH_POLL_INITIAL', 5))  # tetiklemeden sonraki ilk tazelik kontrolü (sn)
+REPORT_ORCH_POLL_MAX = int(os.getenv('REPORT_ORCH_POLL_MAX', 60))  # kontroller arası en uzun aralık (sn)
+
+# bomcostmanager döviz kuru servisi (bomcostmanager.services.exchange_rates)
+BCM_RATE_PROVIDERS = os.getenv('BCM_RATE_PROVIDERS', 'hana,exchangerate_api')  # sırayla denenen sağlayıcılar
+BCM_RATE_STATIC = os.getenv('BCM_RATE_STATIC', '')  # 'static' sağlayıcı için: "USD=32.5,EUR=35.1"
+BCM_RATE_LRU_SIZE = int(os.getenv('BCM_RATE_LRU_SIZE', 1024))  # worker başına kur önbelleği
+BCM_RATE_LRU_TTL = int(os.getenv('BCM_RATE_LRU_TTL', 300))  # worker içi kur kayıtları bu süre sonra yeniden okunur (sn)
+
+# procure_compare senkronizasyonu (procure_compare.services.transformer)
+PROCURE_PARSE_PARALLEL_THRESHOLD = int(os.getenv('PROCURE_PARSE_PARALLEL_THRESHOLD', 20000))  # bu sayının üstündeki farklı teklif metni paralel parse edilir
+PROCURE_PARSE_WORKERS = int(os.getenv('PROCURE_PARSE_WORKERS', min(4, os.cpu_count() or 1)))  # paralel parse süreç sayısı
+
 # Celery Configuration Options
 CELERY_BROKER_URL = f"redis://:{REDIS_PASS}@{REDIS_HOST}:{REDIS_PORT}/0"
 CELERY_RESULT_BACKEND = f"redis://:{REDIS_PASS}@{REDIS_HOST}:{REDIS_PORT}/0"
@@ -342,6 +383,11 @@ CELERY_TASK_SOFT_TIME_LIMIT = 540  # 4.5 dakika uyarı, 5 dakikada öldür
 
 STARTUP_TASK_SYNC = True
 
+# taskorchestrator DAG yürütücüsü (taskorchestrator.utils.dispatcher)
+TASKORCH_SLOT_RETRY_COUNTDOWN = int(os.getenv('TASKORCH_SLOT_RETRY_COUNTDOWN', 15))  # eşzamanlılık slotu boş değilse yeniden deneme aralığı (sn)
+TASKORCH_SLOT_MAX_WAIT = int(os.getenv('TASKORCH_SLOT_MAX_WAIT', 3600))  # slot için en fazla bu kadar beklenir, sonra çalıştırma başarısız sayılır (sn)
+TASKORCH_DEPENDENCY_MAX_AGE = int(os.getenv('TASKORCH_DEPENDENCY_MAX_AGE', 3600))  # bu süre içinde başarıyla çalışmış üst bağımlılıklar yeniden çalıştırılmaz (sn, 0: her zaman çalıştır)
+
 # Zamanlanmış görevler (beat) settings.py içinde
 from report_orchestrator.config.celery_settings import CELERY_BEAT_SCHEDULE as REPORT_ORCHESTRATOR_SCHEDULE
 from sapreports.beat_schedule_config import BEAT_SCHEDULE as CORE_BEAT_SCHEDULE
@@ -411,6 +457,11 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),  # Kullanılan token sınıfları
 }
 
+# JWT kara listesi (authcentral.services.token_blacklist)
+JWT_BLACKLIST_BLOOM_CAPACITY = int(os.getenv('JWT_BLACKLIST_BLOOM_CAPACITY', 100000))  # filtre boyutu (beklenen iptal sayısı)
+JWT_BLACKLIST_BLOOM_ERROR_RATE = float(os.getenv('JWT_BLACKLIST_BLOOM_ERROR_RATE', 0.001))  # yanlış pozitif oranı (DB'ye gidilen istekler)
+JWT_BLACKLIST_REBUILD_INTERVAL = int(os.getenv('JWT_BLACKLIST_REBUILD_INTERVAL', 3600))  # süresi geçenleri düşmek için yeniden kurulum aralığı (sn)
+
 
 AUTH_PASSWORD_VALIDATORS = [] # django customuser basit sifre kabul etmesi icin
 
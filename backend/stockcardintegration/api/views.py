@@ -8,6 +8,7 @@ from .serializers import StockCardSerializer
 from ..models.models import StockCard
 from .permissions import IsStockCardAuthorizedUser
 from stockcardintegration.services import send_stock_card_to_hanadb, update_stock_card_on_hanadb
+from stockcardintegration.services import send_stock_cards_batch, deferred_sap_sync
 from mailservice.services.stockcardintegration.update_stock_card_on_hanadb import send_stockcard_update_success_email
 from mailservice.services.stockcardintegration.update_stock_card_on_hanadb import send_stockcard_update_failure_email
 from stockcardintegration.services.mail.send_stockcard_summary_email import send_stockcard_summary_email
@@ -255,24 +256,28 @@ class BulkStockCardCreateView(APIView):
         created_cards = []
         errors = []
 
-        for entry in payload_list:
-            item_code = entry.get("item_code")
-            if not item_code:
-                errors.append({"item_code": None, "error": "`item_code` alanı eksik."})
-                continue
-
-            existing_card = StockCard.objects.filter(item_code=item_code).first()
-            if existing_card:
-                errors.append({"item_code": item_code, "error": "Bu stok kartı zaten mevcut."})
-                continue
-
-            serializer = StockCardSerializer(data=entry)
-            if serializer.is_valid():
-                instance = serializer.save(created_by=request.user)
-                created_cards.append(instance)
-                send_stock_card_to_hanadb.delay(instance.id, skip_email=True)
-            else:
-                errors.append({"item_code": item_code, "error": serializer.errors})
+        # Kartlar kaydedilirken tek tek gönderilmez; hepsi tek bir $batch isteğiyle kuyruğa alınır
+        with deferred_sap_sync():
+            for entry in payload_list:
+                item_code = entry.get("item_code")
+                if not item_code:
+                    errors.append({"item_code": None, "error": "`item_code` alanı eksik."})
+                    continue
+
+                existing_card = StockCard.objects.filter(item_code=item_code).first()
+                if existing_card:
+                    errors.append({"item_code": item_code, "error": "Bu stok kartı zaten mevcut."})
+                    continue
+
+                serializer = StockCardSerializer(data=entry)
+                if serializer.is_valid():
+                    instance = serializer.save(created_by=request.user)
+                    created_cards.append(instance)
+                else:
+                    errors.append({"item_code": item_code, "error": serializer.errors})
+
+        if created_cards:
+            send_stock_cards_batch.delay([card.id for card in created_cards])
 
         # Tek özet mail gönder
         send_stockcard_summary_email(
@@ -103,10 +103,11 @@ class StockCard(BaseModel):
         super().save(*args, **kwargs)
 
         # Lazy Import burada! Circular Import hatasını engellemek için servisi burada çağırıyoruz.
-        from stockcardintegration.services import send_stock_card_to_hanadb, update_stock_card_on_hanadb
+        from stockcardintegration.services import send_stock_card_to_hanadb, update_stock_card_on_hanadb, is_sap_sync_deferred
 
         # Yeni bir kayıt oluşturulduğunda veya güncellendiğinde senkronizasyon başlat
-        if is_new or self.hana_status == "pending":
+        # (toplu yüklemede gönderim `deferred_sap_sync` ile ertelenir ve $batch ile yapılır)
+        if (is_new or self.hana_status == "pending") and not is_sap_sync_deferred():
             send_stock_card_to_hanadb(self.id)
 
     def mark_as_synced(self):
@@ -1,11 +1,19 @@
 # backend/stockcardintegration/services/__init__.py
-from .sap.create_stock_card import send_stock_card_to_hanadb
+from .sap.create_stock_card import (
+    send_stock_card_to_hanadb,
+    send_stock_cards_batch,
+    deferred_sap_sync,
+    is_sap_sync_deferred,
+)
 from .sap.update_stock_card import update_stock_card_on_hanadb
 from .sap.get_item_from_sap import get_item_from_sap
 from .sap.create_or_update_card import create_or_update_stock_card_by_code
 
 __all__ = [
     "send_stock_card_to_hanadb",
+    "send_stock_cards_batch",
+    "deferred_sap_sync",
+    "is_sap_sync_deferred",
     "update_stock_card_on_hanadb",
     "get_item_from_sap",
     "create_or_update_stock_card_by_code"
@@ -1,9 +1,9 @@
 # backend/stockcardintegration/services/mail/send_stockcard_summary_email.py
-from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
-from django.conf import settings
 from django.contrib.auth import get_user_model
 
+from mailservice.services.mail_queue import enqueue_mail
+
 ITEMS_GROUP_LABELS = {105: "MAMUL", 112: "GİRSBERGER", 103: "TİCARİ"}
 
 
@@ -58,12 +58,12 @@ def send_stockcard_summary_email(
     text_body = render_to_string("mail/stockcard_summary_email.txt", context)
     html_body = render_to_string("mail/stockcard_summary_email.html", context)
 
-    # 🔸 Multipart e-posta
-    email = EmailMultiAlternatives(
+    # 🔸 Multipart e-posta — kuyruğa eklenir, SMTP gönderimi mailservice worker'ında yapılır
+    enqueue_mail(
         subject=subject,
         body=text_body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=get_stockcard_recipients(to_email),
+        content_subtype="plain",
+        html_alternative=html_body,
+        recipients=get_stockcard_recipients(to_email),
+        related_object_type="StockCard",
     )
-    email.attach_alternative(html_body, "text/html")
-    email.send(fail_silently=False)
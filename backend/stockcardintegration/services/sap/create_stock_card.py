@@ -1,14 +1,36 @@
 # backend/stockcardintegration/services/sap/create_stock_card.py
 
-import requests
-from django.conf import settings
+import threading
+from contextlib import contextmanager
 from stockcardintegration.models.models import StockCard
 from hanadbintegration.utils.hana_service_layer_config import HANADBServiceLayerConfig
+from hanadbintegration.utils.service_layer_client import get_client, BatchRequest, ServiceLayerError
 from stockcardintegration.utils.logs import log_stockcard_request, log_stockcard_error
 from stockcardintegration.utils.exceptions import StockCardIntegrationError
 from stockcardintegration.services.formatters.stockcard_formatter import build_sap_stock_card_payload
 from celery import shared_task
 
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred_sap_sync():
+    """
+    Blok içinde kaydedilen stok kartları `StockCard.save()` sırasında tek tek SAP'ya gönderilmez;
+    çağıran taraf kartları sonra `send_stock_cards_batch` ile toplu gönderir.
+    """
+    previous = getattr(_deferred, "active", False)
+    _deferred.active = True
+    try:
+        yield
+    finally:
+        _deferred.active = previous
+
+
+def is_sap_sync_deferred():
+    return getattr(_deferred, "active", False)
+
+
 @shared_task(bind=True)
 def send_stock_card_to_hanadb(self, stock_card_id, skip_email=True):
     response = None
@@ -23,35 +45,9 @@ def send_stock_card_to_hanadb(self, stock_card_id, skip_email=True):
         hana_url = HANADBServiceLayerConfig.get_hanadbintegration_url()
         payload = build_sap_stock_card_payload(stock_card)
 
-        # Login
-        log_stockcard_request("LOGIN", f"{HANADBServiceLayerConfig.BASE_URL}/Login", 0, "Login başlatılıyor")
-        auth_payload = HANADBServiceLayerConfig.get_auth_payload()
-        auth_response = requests.post(
-            f"{HANADBServiceLayerConfig.BASE_URL}/Login",
-            json=auth_payload,
-            timeout=HANADBServiceLayerConfig.TIMEOUT,
-            verify=HANADBServiceLayerConfig.TLS_VERIFY
-        )
-
-        if auth_response.status_code != 200:
-            log_stockcard_error(f"LOGIN HATASI: {auth_response.status_code} | {auth_response.text}")
-            raise StockCardIntegrationError("SAP HANA oturum açma başarısız")
-
-        session_id = auth_response.json().get("SessionId")
-        headers = {
-            "Content-Type": "application/json",
-            "Cookie": f"B1SESSION={session_id}"
-        }
-
-        # POST to SAP
+        # POST to SAP (oturum paylaşımlı istemci tarafından yönetilir; gerekirse login olunur)
         log_stockcard_request("POST", hana_url, 0, f"POST verisi: {payload}")
-        response = requests.post(
-            hana_url,
-            json=payload,
-            headers=headers,
-            timeout=HANADBServiceLayerConfig.TIMEOUT,
-            verify=HANADBServiceLayerConfig.TLS_VERIFY
-        )
+        response = get_client().post("Items", json_body=payload)
 
         log_stockcard_request("POST", hana_url, response.status_code, response.text)
 
@@ -66,8 +62,8 @@ def send_stock_card_to_hanadb(self, stock_card_id, skip_email=True):
         log_stockcard_error(f"Stok kartı bulunamadı: ID {stock_card_id}")
         raise StockCardIntegrationError("Stok kartı bulunamadı")
 
-    except requests.RequestException as req_err:
-        error_msg = f"İstek hatası: {str(req_err)}"
+    except ServiceLayerError as sl_err:
+        error_msg = f"İstek hatası: {str(sl_err)}"
         log_stockcard_error(error_msg)
         raise StockCardIntegrationError(error_msg)
 
@@ -75,3 +71,51 @@ def send_stock_card_to_hanadb(self, stock_card_id, skip_email=True):
         error_msg = f"Genel SAP hatası: {str(ex)}"
         log_stockcard_error(error_msg)
         raise StockCardIntegrationError(error_msg)
+
+
+@shared_task(bind=True)
+def send_stock_cards_batch(self, stock_card_ids):
+    """
+    Birden fazla stok kartını tek bir OData `$batch` isteğiyle SAP'ya gönderir.
+    Her kart kendi changeset'inde gider; hatalı kart diğerlerinin kaydını engellemez.
+    """
+    cards = [
+        card for card in StockCard.objects.filter(id__in=stock_card_ids).order_by("id")
+        if card.hana_status != "completed"
+    ]
+    if not cards:
+        return {"sent": 0, "synced": 0, "failed": 0}
+
+    hana_url = f"{HANADBServiceLayerConfig.BASE_URL}/$batch"
+    batch_requests = []
+    for card in cards:
+        payload = build_sap_stock_card_payload(card)
+        log_stockcard_request("POST", hana_url, 0, f"BATCH POST verisi: {payload}")
+        batch_requests.append(BatchRequest("POST", "Items", payload))
+
+    try:
+        results = get_client().batch(batch_requests)
+    except Exception as ex:
+        error_msg = f"$batch isteği başarısız: {str(ex)}"
+        log_stockcard_error(error_msg)
+        for card in cards:
+            card.mark_as_failed()
+        raise StockCardIntegrationError(error_msg)
+
+    synced, failed = [], []
+    for card, result in zip(cards, results):
+        log_stockcard_request("POST", hana_url, result.status, f"{card.item_code}: {result.text}")
+        if result.ok:
+            card.mark_as_synced()
+            synced.append(card.item_code)
+        else:
+            card.mark_as_failed()
+            failed.append({"item_code": card.item_code, "error": result.error_message()})
+            log_stockcard_error(f"{card.item_code} SAP'ya gönderilemedi: {result.error_message()}")
+
+    # Yanıtta eksik parça varsa (ör. sunucu batch'i yarıda kestiyse) kalan kartlar başarısız sayılır
+    for card in cards[len(results):]:
+        card.mark_as_failed()
+        failed.append({"item_code": card.item_code, "error": "$batch yanıtında sonuç yok"})
+
+    return {"sent": len(cards), "synced": len(synced), "failed": len(failed), "errors": failed}
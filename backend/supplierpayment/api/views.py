@@ -225,31 +225,9 @@ class FetchHanaDbDataView(BaseHanaDataView):
                         SupplierPayment.objects.bulk_update(update_objects, fields_to_update, batch_size=1000)
                 
                 # Kapanış faturalarını güncelleme - API çağrısı yerine doğrudan fonksiyonu çağır
-                from ..api.closinginvoice_view import SupplierPaymentSimulation
                 simulation = SupplierPaymentSimulation()
                 simulation.process_transactions()
-                payment_list = simulation.generate_payment_list()
-                
-                # ClosingInvoice modeli için toplu güncelleme
-                if payment_list:
-                    from ..models.closinginvoice import ClosingInvoice
-                    ClosingInvoice.objects.all().delete()  # Mevcut kapanış faturalarını temizle
-                    
-                    closing_invoices = []
-                    for item in payment_list:
-                        if float(item['current_balance']) == 0:
-                            continue
-                            
-                        closing_invoice = ClosingInvoice(
-                            cari_kod=item['cari_kod'],
-                            cari_ad=item.get('cari_ad', 'Unknown'),
-                            current_balance=item['current_balance'],
-                            monthly_balances=item['monthly_balances']
-                        )
-                        closing_invoices.append(closing_invoice)
-                    
-                    if closing_invoices:
-                        ClosingInvoice.objects.bulk_create(closing_invoices, batch_size=1000)
+                simulation.save_closing_invoices()
             
             # İşlem süresini hesapla
             elapsed_time = time.time() - start_time
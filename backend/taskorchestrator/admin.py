@@ -5,11 +5,12 @@ from django.utils.html import format_html
 from import_export.admin import ImportExportModelAdmin  # 🔁 İçe/dışa aktarım desteği
 from .models.task_definition import TaskDefinition
 from .models.scheduled_task import ScheduledTask
+from .models.task_run import TaskRun
 
 
 @admin.register(TaskDefinition)
 class TaskDefinitionAdmin(ImportExportModelAdmin):  # ⬅️ Burada değişti
-    list_display = ("name", "function_path", "is_active", "created_at", "updated_at")
+    list_display = ("name", "function_path", "queue", "concurrency_limit", "is_active", "created_at", "updated_at")
     list_filter = ("is_active",)
     search_fields = ("name", "function_path", "description")
     ordering = ("name",)
@@ -19,6 +20,9 @@ class TaskDefinitionAdmin(ImportExportModelAdmin):  # ⬅️ Burada değişti
         (None, {
             "fields": ("name", "function_path", "description", "is_active")
         }),
+        ("Çalıştırma Ayarları", {
+            "fields": ("queue", "timeout", "concurrency_limit"),
+        }),
         ("Zaman Bilgisi", {
             "fields": ("created_at", "updated_at"),
         }),
@@ -34,10 +38,11 @@ class ScheduledTaskAdmin(ImportExportModelAdmin):  # ⬅️ Burada da değişti
     search_fields = ("name", "task__name")
     ordering = ("-enabled", "name")
     readonly_fields = ("created_at", "updated_at")
+    filter_horizontal = ("depends_on",)
 
     fieldsets = (
         (None, {
-            "fields": ("name", "task", "crontab", "parameters", "enabled", "notes")
+            "fields": ("name", "task", "crontab", "parameters", "depends_on", "enabled", "notes")
         }),
         ("Zaman Bilgisi", {
             "fields": ("last_run_at", "created_at", "updated_at"),
@@ -50,3 +55,20 @@ class ScheduledTaskAdmin(ImportExportModelAdmin):  # ⬅️ Burada da değişti
             obj.crontab.__str__()
         )
     colored_crontab.short_description = "Crontab"
+
+
+@admin.register(TaskRun)
+class TaskRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "scheduled_task", "status", "trigger", "level", "queue", "duration", "wait_time", "created_at"
+    )
+    list_filter = ("status", "trigger", "queue")
+    search_fields = ("scheduled_task__name", "graph_id", "celery_task_id")
+    ordering = ("-created_at",)
+    list_select_related = ("scheduled_task",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
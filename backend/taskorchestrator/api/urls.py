@@ -5,12 +5,14 @@ from rest_framework.routers import DefaultRouter
 from taskorchestrator.api.views.scheduled_task_view import ScheduledTaskViewSet
 from taskorchestrator.api.views.task_definition_view import TaskDefinitionViewSet
 from taskorchestrator.api.views.task_launcher_view import TaskLauncherView
+from taskorchestrator.api.views.task_run_view import TaskRunViewSet
 
 app_name = "taskorchestrator"
 
 router = DefaultRouter()
 router.register(r'scheduled-task', ScheduledTaskViewSet, basename='scheduled-task')
 router.register(r'task-definition', TaskDefinitionViewSet, basename='task-definition')
+router.register(r'task-runs', TaskRunViewSet, basename='task-runs')
 
 urlpatterns = [
     path('', include(router.urls)),
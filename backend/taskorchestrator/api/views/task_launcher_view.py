@@ -32,7 +32,7 @@ class TaskLauncherView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            run_scheduled_task.delay(task.id)
+            run_scheduled_task.delay(task.id, trigger="manual")
 
             return Response(
                 {"detail": f"{task.name} görevi kuyruğa eklendi."},
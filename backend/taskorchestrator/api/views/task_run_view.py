@@ -0,0 +1,65 @@
+# backend/taskorchestrator/api/views/task_run_view.py
+
+import uuid
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Max, Q
+from django.utils import timezone
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.viewsets import ReadOnlyModelViewSet
+from taskorchestrator.models.task_run import TaskRun
+from taskorchestrator.serializers.task_run_serializer import TaskRunSerializer
+
+
+class TaskRunViewSet(ReadOnlyModelViewSet):
+    """
+    Görev çalıştırma geçmişi (salt okunur).
+    Filtreler: ?scheduled_task=<id>&status=<durum>&graph_id=<uuid>
+    Sadece admin kullanıcılar erişebilir.
+    """
+    serializer_class = TaskRunSerializer
+    permission_classes = [IsAdminUser]
+
+    def get_queryset(self):
+        queryset = TaskRun.objects.select_related("scheduled_task")
+        params = self.request.query_params
+        for field, parse in (("scheduled_task", int), ("status", str), ("graph_id", uuid.UUID)):
+            if params.get(field):
+                try:
+                    value = parse(params[field])
+                except ValueError:
+                    # Geçersiz filtre veritabanına kadar gidip 500'e dönüşmesin
+                    raise ValidationError({field: f"Geçersiz değer: {params[field]}"})
+                queryset = queryset.filter(**{field: value})
+        return queryset
+
+    @action(detail=False, methods=["get"])
+    def summary(self, request):
+        """
+        Kapasite planlaması için görev bazında özet (varsayılan son 30 gün, ?days=N).
+        """
+        try:
+            days = max(1, int(request.query_params.get("days", 30)))
+        except ValueError:
+            days = 30
+
+        failed = Q(status__in=[TaskRun.STATUS_FAILED, TaskRun.STATUS_TIMEOUT])
+        rows = (
+            TaskRun.objects.filter(created_at__gte=timezone.now() - timedelta(days=days))
+            .values("scheduled_task", "scheduled_task__name")
+            .annotate(
+                runs=Count("id"),
+                succeeded=Count("id", filter=Q(status=TaskRun.STATUS_SUCCESS)),
+                failed=Count("id", filter=failed),
+                skipped=Count("id", filter=Q(status=TaskRun.STATUS_SKIPPED)),
+                avg_duration=Avg("duration"),
+                max_duration=Max("duration"),
+                avg_wait_time=Avg("wait_time"),
+                max_wait_time=Max("wait_time"),
+            )
+            .order_by("scheduled_task__name")
+        )
+        return Response(list(rows))
@@ -0,0 +1,59 @@
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taskorchestrator', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskdefinition',
+            name='queue',
+            field=models.CharField(blank=True, help_text='Görevin gönderileceği Celery kuyruğu (boşsa varsayılan kuyruk)', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='taskdefinition',
+            name='timeout',
+            field=models.PositiveIntegerField(blank=True, help_text='Saniye cinsinden süre sınırı (boşsa CELERY_TASK_TIME_LIMIT)', null=True),
+        ),
+        migrations.AddField(
+            model_name='taskdefinition',
+            name='concurrency_limit',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Bu görevden aynı anda en fazla kaç tane çalışabilir (0: sınırsız)'),
+        ),
+        migrations.AddField(
+            model_name='scheduledtask',
+            name='depends_on',
+            field=models.ManyToManyField(blank=True, help_text='Bu görevden önce (aynı çalıştırmada) tamamlanması gereken görevler', related_name='dependents', to='taskorchestrator.scheduledtask'),
+        ),
+        migrations.CreateModel(
+            name='TaskRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('graph_id', models.UUIDField(db_index=True, default=uuid.uuid4, help_text='Aynı tetiklemeye ait çalıştırmalar')),
+                ('level', models.PositiveSmallIntegerField(default=0, help_text='Bağımlılık grafiğindeki katman (0: ilk çalışanlar)')),
+                ('trigger', models.CharField(choices=[('beat', 'Zamanlayıcı'), ('manual', 'Manuel')], default='beat', max_length=10)),
+                ('status', models.CharField(choices=[('PENDING', 'Bekliyor'), ('RUNNING', 'Çalışıyor'), ('SUCCESS', 'Başarılı'), ('FAILED', 'Başarısız'), ('TIMEOUT', 'Zaman Aşımı'), ('SKIPPED', 'Atlandı')], default='PENDING', max_length=10)),
+                ('queue', models.CharField(blank=True, max_length=100)),
+                ('celery_task_id', models.CharField(blank=True, max_length=255)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration', models.FloatField(blank=True, help_text='Saniye', null=True)),
+                ('wait_time', models.FloatField(blank=True, help_text='Planlanmadan başlamaya kadar geçen süre (sn)', null=True)),
+                ('scheduled_task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='taskorchestrator.scheduledtask')),
+            ],
+            options={
+                'verbose_name': 'Görev Çalıştırması',
+                'verbose_name_plural': 'Görev Çalıştırmaları',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['scheduled_task', '-created_at'], name='taskorchest_schedul_887b3f_idx'), models.Index(fields=['status', 'created_at'], name='taskorchest_status_7e4127_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.8
+
+from django.db import migrations, models
+
+
+def reset_default_limits(apps, schema_editor):
+    # 0002 mevcut tüm tanımlara varsayılan olarak 1 yazmıştı; bu, aynı tanımı kullanan görevleri
+    # grafikte sıraya sokuyordu. Varsayılan artık 0 (sınırsız).
+    TaskDefinition = apps.get_model('taskorchestrator', 'TaskDefinition')
+    TaskDefinition.objects.filter(concurrency_limit=1).update(concurrency_limit=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taskorchestrator', '0002_task_dag_and_runs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='taskdefinition',
+            name='concurrency_limit',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Bu görevden aynı anda en fazla kaç tane çalışabilir (0: sınırsız)'),
+        ),
+        migrations.RunPython(reset_default_limits, migrations.RunPython.noop),
+    ]
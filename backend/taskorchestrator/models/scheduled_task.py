@@ -13,6 +13,10 @@ class ScheduledTask(models.Model):
     task = models.ForeignKey(TaskDefinition, on_delete=models.CASCADE, related_name="scheduled_tasks")
     crontab = models.ForeignKey(CrontabSchedule, on_delete=models.CASCADE)
     parameters = models.JSONField(default=dict, blank=True, help_text="Göreve gönderilecek parametreler")
+    depends_on = models.ManyToManyField(
+        "self", symmetrical=False, blank=True, related_name="dependents",
+        help_text="Bu görevden önce (aynı çalıştırmada) tamamlanması gereken görevler"
+    )
     enabled = models.BooleanField(default=True)
     last_run_at = models.DateTimeField(null=True, blank=True)
     notes = models.TextField(blank=True, help_text="Sistem yöneticisi notları")
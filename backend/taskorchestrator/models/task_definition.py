@@ -14,6 +14,20 @@ class TaskDefinition(models.Model):
     )
     description = models.TextField(blank=True, help_text="Görevin ne yaptığına dair açıklama")
     is_active = models.BooleanField(default=True, help_text="Bu görev planlamaya açık mı?")
+
+    # Çalıştırma ayarları (bkz. utils/dispatcher.py)
+    queue = models.CharField(
+        max_length=100, blank=True,
+        help_text="Görevin gönderileceği Celery kuyruğu (boşsa varsayılan kuyruk)"
+    )
+    timeout = models.PositiveIntegerField(
+        null=True, blank=True,
+        help_text="Saniye cinsinden süre sınırı (boşsa CELERY_TASK_TIME_LIMIT)"
+    )
+    concurrency_limit = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Bu görevden aynı anda en fazla kaç tane çalışabilir (0: sınırsız)"
+    )
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
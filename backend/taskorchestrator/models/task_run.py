@@ -0,0 +1,60 @@
+# backend/taskorchestrator/models/task_run.py
+
+import uuid
+from django.db import models
+from taskorchestrator.models.scheduled_task import ScheduledTask
+
+
+class TaskRun(models.Model):
+    """
+    Bir ScheduledTask'in tek bir çalıştırma kaydı.
+    Aynı tetiklemeyle planlanan görevler (bağımlılıklarıyla birlikte) aynı `graph_id`'yi paylaşır.
+    Süre ve durum geçmişi kapasite planlaması için tutulur.
+    """
+    STATUS_PENDING = "PENDING"
+    STATUS_RUNNING = "RUNNING"
+    STATUS_SUCCESS = "SUCCESS"
+    STATUS_FAILED = "FAILED"
+    STATUS_TIMEOUT = "TIMEOUT"
+    STATUS_SKIPPED = "SKIPPED"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Bekliyor"),
+        (STATUS_RUNNING, "Çalışıyor"),
+        (STATUS_SUCCESS, "Başarılı"),
+        (STATUS_FAILED, "Başarısız"),
+        (STATUS_TIMEOUT, "Zaman Aşımı"),
+        (STATUS_SKIPPED, "Atlandı"),
+    ]
+
+    TRIGGER_CHOICES = [
+        ("beat", "Zamanlayıcı"),
+        ("manual", "Manuel"),
+    ]
+
+    graph_id = models.UUIDField(default=uuid.uuid4, db_index=True, help_text="Aynı tetiklemeye ait çalıştırmalar")
+    scheduled_task = models.ForeignKey(ScheduledTask, on_delete=models.CASCADE, related_name="runs")
+    level = models.PositiveSmallIntegerField(default=0, help_text="Bağımlılık grafiğindeki katman (0: ilk çalışanlar)")
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES, default="beat")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    queue = models.CharField(max_length=100, blank=True)
+    celery_task_id = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration = models.FloatField(null=True, blank=True, help_text="Saniye")
+    wait_time = models.FloatField(null=True, blank=True, help_text="Planlanmadan başlamaya kadar geçen süre (sn)")
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Görev Çalıştırması"
+        verbose_name_plural = "Görev Çalıştırmaları"
+        indexes = [
+            models.Index(fields=["scheduled_task", "-created_at"], name="taskorchest_schedul_887b3f_idx"),
+            models.Index(fields=["status", "created_at"], name="taskorchest_status_7e4127_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.scheduled_task.name} | {self.status} ({self.created_at:%d.%m.%Y %H:%M})"
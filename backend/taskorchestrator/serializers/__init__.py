@@ -1,2 +1,3 @@
 from .scheduled_task_serializer import ScheduledTaskSerializer
 from .task_definition_serializer import TaskDefinitionSerializer  # (zaten varsa sorun yok)
+from .task_run_serializer import TaskRunSerializer
@@ -5,6 +5,7 @@ from inspect import signature
 from django.utils.module_loading import import_string
 from taskorchestrator.models.task_definition import TaskDefinition
 from taskorchestrator.models.scheduled_task import ScheduledTask
+from taskorchestrator.utils.dispatcher import dependency_edges, upstream_closure
 
 class ScheduledTaskSerializer(serializers.ModelSerializer):
     task_name = serializers.CharField(source='task.name', read_only=True)
@@ -20,6 +21,7 @@ class ScheduledTaskSerializer(serializers.ModelSerializer):
             "crontab",        # FK (ID)
             "crontab_schedule",  # Readable cron
             "parameters",
+            "depends_on",     # M2M (ID listesi)
             "enabled",
             "last_run_at",
             "notes",
@@ -71,3 +73,21 @@ class ScheduledTaskSerializer(serializers.ModelSerializer):
         # ----------------------------------------------------------------------
 
         return value
+
+    def validate_depends_on(self, value):
+        """
+        • Görev kendisine bağımlı olamaz
+        • Yeni bağımlılıklar döngü oluşturamaz (bağımlılıklardan geriye doğru bu göreve ulaşılmamalı)
+        """
+        if not self.instance or not value:
+            return value
+
+        dep_ids = {dep.id for dep in value}
+        if self.instance.id in dep_ids:
+            raise serializers.ValidationError("Görev kendisine bağımlı olamaz.")
+
+        edges = dependency_edges()
+        edges[self.instance.id] = dep_ids
+        if self.instance.id in upstream_closure(dep_ids, edges):
+            raise serializers.ValidationError("Bu bağımlılıklar bir döngü oluşturuyor.")
+        return value
@@ -12,6 +12,9 @@ class TaskDefinitionSerializer(serializers.ModelSerializer):
             "function_path",
             "description",
             "is_active",
+            "queue",
+            "timeout",
+            "concurrency_limit",
             "created_at",
             "updated_at",
         ]
@@ -0,0 +1,29 @@
+# backend/taskorchestrator/serializers/task_run_serializer.py
+
+from rest_framework import serializers
+from taskorchestrator.models.task_run import TaskRun
+
+
+class TaskRunSerializer(serializers.ModelSerializer):
+    scheduled_task_name = serializers.CharField(source="scheduled_task.name", read_only=True)
+
+    class Meta:
+        model = TaskRun
+        fields = [
+            "id",
+            "graph_id",
+            "scheduled_task",       # FK (ID)
+            "scheduled_task_name",  # Readable task name
+            "level",
+            "trigger",
+            "status",
+            "queue",
+            "celery_task_id",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "duration",
+            "wait_time",
+        ]
+        read_only_fields = fields
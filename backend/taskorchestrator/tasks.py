@@ -1,18 +1,64 @@
 # backend/taskorchestrator/tasks.py
 
 from celery import shared_task
-from taskorchestrator.utils.dispatcher import run_task
+from django.conf import settings
+from django.utils import timezone
+from taskorchestrator.models.task_run import TaskRun
+from taskorchestrator.utils.dispatcher import (
+    concurrency_slot, dispatch, execute_run, fail_run, reap_stale_runs,
+)
 from taskorchestrator.utils.logger_config import logger  # 🔥 Merkezi log kullanımı
 
 
 @shared_task(bind=True, name="taskorchestrator.tasks.run_scheduled_task")
-def run_scheduled_task(self, task_id: int):
+def run_scheduled_task(self, task_id: int, trigger: str = "beat"):
     """
     Celery tarafından tetiklenen ana görev fonksiyonu.
-    Verilen ScheduledTask ID'sine göre ilgili fonksiyonu çalıştırır.
-    Sadece hata durumları loglanır.
+    Verilen ScheduledTask'i bağımlılıklarıyla birlikte planlayıp kuyruğa gönderir
+    (bkz. utils/dispatcher.py). Sadece hata durumları loglanır.
     """
     try:
-        run_task(task_id)
+        graph_id = dispatch(task_id, trigger=trigger)
+        return str(graph_id) if graph_id else None
     except Exception as e:
         logger.exception(f"🔥 Celery run_scheduled_task hatası: {str(e)}")
+
+
+@shared_task(bind=True, name="taskorchestrator.tasks.execute_scheduled_task", max_retries=None)
+def execute_scheduled_task(self, run_id: int):
+    """
+    Çalıştırma grafiğindeki tek bir görev.
+    Görev tanımının eşzamanlılık slotu doluysa `TASKORCH_SLOT_RETRY_COUNTDOWN` saniye sonra
+    yeniden denenir; `TASKORCH_SLOT_MAX_WAIT` aşılırsa çalıştırma başarısız sayılır.
+    """
+    try:
+        run = TaskRun.objects.select_related("scheduled_task__task").get(id=run_id)
+    except TaskRun.DoesNotExist:
+        logger.error(f"❌ TaskRun bulunamadı (id={run_id})")
+        return
+
+    if run.status != TaskRun.STATUS_PENDING:
+        logger.warning(f"⚠️ TaskRun zaten işlenmiş, atlanıyor (id={run_id}, durum={run.status})")
+        return
+
+    with concurrency_slot(run.scheduled_task.task, run.id) as acquired:
+        if not acquired:
+            waited = (timezone.now() - run.created_at).total_seconds()
+            if waited < settings.TASKORCH_SLOT_MAX_WAIT:
+                raise self.retry(countdown=settings.TASKORCH_SLOT_RETRY_COUNTDOWN)
+            fail_run(run, f"Eşzamanlılık slotu {int(waited)} sn içinde boşalmadı.")
+            raise RuntimeError(f"Eşzamanlılık slotu alınamadı: {run.scheduled_task.name}")
+
+        execute_run(run, self.request.id)
+
+
+@shared_task(name="taskorchestrator.tasks.reap_stale_task_runs")
+def reap_stale_task_runs():
+    """
+    Worker'ın sert süre sınırıyla öldürdüğü (veya worker çökmesiyle yarım kalan) çalıştırmaları
+    TIMEOUT, grafikte onları bekleyenleri SKIPPED yapar (bkz. dispatcher.reap_stale_runs).
+    """
+    try:
+        return reap_stale_runs()
+    except Exception as e:
+        logger.exception(f"🔥 Celery reap_stale_task_runs hatası: {str(e)}")
@@ -1,29 +1,248 @@
 # backend/taskorchestrator/utils/dispatcher.py
+"""
+ScheduledTask yürütücüsü.
 
-from taskorchestrator.models.scheduled_task import ScheduledTask
+Bir görev tetiklendiğinde (beat veya manuel) kendisi ve etkin durumdaki üst bağımlılıkları
+(`depends_on`) tek bir çalıştırma grafiği olarak planlanır. Son `TASKORCH_DEPENDENCY_MAX_AGE` saniye
+içinde başarıyla çalışmış üst bağımlılıklar (ve yalnızca onlar üzerinden ulaşılanlar) yeniden
+çalıştırılmaz; her alt görev tetiklemesi ortak bağımlılıkları tekrar çalıştırmasın:
+
+    1) Grafik topolojik katmanlara ayrılır; aynı katmandaki görevler birbirinden bağımsızdır
+    2) Her görev için PENDING bir `TaskRun` kaydı (ortak `graph_id`) oluşturulur
+    3) Her katman bir Celery `group`'u olur, katmanlar `chain` ile bağlanır (group → group
+       zinciri Celery tarafından chord'a çevrilir); bir katman tamamen bitmeden sonraki başlamaz
+    4) Her görev kendi TaskDefinition ayarlarıyla gönderilir: `queue`, `timeout` ve
+       `concurrency_limit` (aynı tanımdan aynı anda çalışabilecek örnek sayısı, 0: sınırsız)
+
+Bir görev başarısız olursa (veya süre sınırını aşarsa) sonraki katmanlardaki çalıştırmalar
+SKIPPED olarak işaretlenir ve zincir durur. Worker görevi sert süre sınırıyla öldürdüğünde bu
+işaretleme yapılamaz; RUNNING'de kalan çalıştırmaları `reap_stale_runs` (beat) kapatır.
+"""
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from celery import chain, group
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
 from django.utils.module_loading import import_string
+
+from taskorchestrator.models.scheduled_task import ScheduledTask
+from taskorchestrator.models.task_run import TaskRun
 from taskorchestrator.utils.logger_config import logger  # 🔥 Merkezi logger kullanımı
 
+SLOT_KEY = "taskorch:slot:{definition_id}:{index}"
+HARD_LIMIT_MARGIN = 30  # soft limit ile worker'ın görevi öldürmesi arasındaki süre (sn)
+
+
+class DependencyCycleError(Exception):
+    """Görev bağımlılıkları döngü içeriyor."""
+
+
+# ---------------------------------------------------------------------- #
+# Planlama
+# ---------------------------------------------------------------------- #
+def dependency_edges():
+    """Tüm bağımlılıklar: {görev id: {bağımlı olduğu görev id'leri}} (tek sorgu)."""
+    edges = {}
+    through = ScheduledTask.depends_on.through
+    for task_id, dep_id in through.objects.values_list("from_scheduledtask_id", "to_scheduledtask_id"):
+        edges.setdefault(task_id, set()).add(dep_id)
+    return edges
+
 
-def run_task(task_id: int) -> None:
+def upstream_closure(task_ids, edges, allowed=None):
+    """`task_ids` ve (yalnızca `allowed` içindekiler üzerinden) tüm üst bağımlılıkları."""
+    seen = set(task_ids)
+    stack = list(task_ids)
+    while stack:
+        for dep_id in edges.get(stack.pop(), ()):
+            if dep_id not in seen and (allowed is None or dep_id in allowed):
+                seen.add(dep_id)
+                stack.append(dep_id)
+    return seen
+
+
+def build_plan(root):
     """
-    ScheduledTask ID'si verilen görevi çalıştırır.
-    İlgili TaskDefinition.function_path import edilir ve parametrik şekilde çağrılır.
-    Sadece hata durumları loglanır.
+    Görevin çalıştırma planı: [[katman 0 görevleri], [katman 1 görevleri], ...]
+    Pasif veya yakın zamanda başarıyla çalışmış bağımlılıklar (ve yalnızca onlar üzerinden
+    ulaşılan görevler) plana alınmaz; kök görev her zaman plandadır.
     """
-    try:
-        task = ScheduledTask.objects.get(id=task_id)
+    edges = dependency_edges()
+    candidates = ScheduledTask.objects.filter(enabled=True)
+    max_age = settings.TASKORCH_DEPENDENCY_MAX_AGE
+    if max_age:
+        candidates = candidates.exclude(last_run_at__gte=timezone.now() - timedelta(seconds=max_age))
+    node_ids = upstream_closure({root.id}, edges, allowed=set(candidates.values_list("id", flat=True)))
+    nodes = {task.id: task for task in ScheduledTask.objects.select_related("task").filter(id__in=node_ids)}
 
-        if not task.enabled:
-            return  # Pasif görevse sessiz çık
+    remaining = {task_id: edges.get(task_id, set()) & node_ids for task_id in node_ids}
+    done = set()
+    levels = []
+    while remaining:
+        ready = sorted(task_id for task_id, deps in remaining.items() if deps <= done)
+        if not ready:
+            names = ", ".join(nodes[task_id].name for task_id in sorted(remaining))
+            raise DependencyCycleError(f"Bağımlılık döngüsü: {names}")
+        levels.append([nodes[task_id] for task_id in ready])
+        done.update(ready)
+        for task_id in ready:
+            del remaining[task_id]
+    return levels
 
-        func_path = task.task.function_path
-        func = import_string(func_path)
 
-        func(**task.parameters)
+def _signature(run, definition):
+    from taskorchestrator.tasks import execute_scheduled_task
 
+    options = {}
+    if definition.queue:
+        options["queue"] = definition.queue
+    if definition.timeout:
+        options["soft_time_limit"] = definition.timeout
+        options["time_limit"] = definition.timeout + HARD_LIMIT_MARGIN
+    return execute_scheduled_task.si(run.id).set(**options)
+
+
+def dispatch(task_id: int, trigger: str = "beat"):
+    """
+    Görevi bağımlılıklarıyla birlikte Celery'ye gönderir ve `graph_id`'yi döndürür.
+    Görev bulunamazsa veya pasifse None döner.
+    """
+    try:
+        root = ScheduledTask.objects.select_related("task").get(id=task_id)
     except ScheduledTask.DoesNotExist:
         logger.error(f"❌ ScheduledTask bulunamadı (id={task_id})")
+        return None
+    if not root.enabled:
+        return None  # Pasif görevse sessiz çık
+
+    levels = build_plan(root)
+    graph_id = uuid.uuid4()
+    runs = TaskRun.objects.bulk_create([
+        TaskRun(graph_id=graph_id, scheduled_task=task, level=level, trigger=trigger, queue=task.task.queue)
+        for level, tasks in enumerate(levels)
+        for task in tasks
+    ])
+    definitions = {task.id: task.task for tasks in levels for task in tasks}
+
+    stages = []
+    for level in range(len(levels)):
+        stages.append(group(
+            _signature(run, definitions[run.scheduled_task_id]) for run in runs if run.level == level
+        ))
+    workflow = stages[0] if len(stages) == 1 else chain(*stages)
+    workflow.apply_async()
+    return graph_id
+
 
-    except Exception as e:
-        logger.exception(f"🔥 Görev çalıştırılırken hata oluştu (id={task_id}): {str(e)}")
+# ---------------------------------------------------------------------- #
+# Yürütme
+# ---------------------------------------------------------------------- #
+@contextmanager
+def concurrency_slot(definition, run_id):
+    """
+    Görev tanımı için boş bir eşzamanlılık slotu ayırır; slot alınamazsa False verir.
+    Slotlar worker çökmesine karşı süre sınırından biraz uzun bir TTL ile tutulur.
+    """
+    limit = definition.concurrency_limit
+    if not limit:
+        yield True
+        return
+
+    ttl = (definition.timeout or settings.CELERY_TASK_TIME_LIMIT) + HARD_LIMIT_MARGIN * 2
+    key = None
+    for index in range(limit):
+        candidate = SLOT_KEY.format(definition_id=definition.id, index=index)
+        if cache.add(candidate, run_id, timeout=ttl):
+            key = candidate
+            break
+    try:
+        yield key is not None
+    finally:
+        if key is not None:
+            cache.delete(key)
+
+
+def skip_downstream(run):
+    """Aynı grafikte, başarısız çalıştırmadan sonraki katmanlarda bekleyenleri SKIPPED yapar."""
+    return TaskRun.objects.filter(
+        graph_id=run.graph_id, status=TaskRun.STATUS_PENDING, level__gt=run.level
+    ).update(status=TaskRun.STATUS_SKIPPED, finished_at=timezone.now())
+
+
+def _finish(run, status, started, error=""):
+    run.status = status
+    run.error = error
+    run.finished_at = timezone.now()
+    run.duration = round(time.monotonic() - started, 3)
+    run.save(update_fields=["status", "error", "finished_at", "duration"])
+
+
+def fail_run(run, error):
+    """Hiç başlayamayan çalıştırmayı başarısız sayar (örn. slot bekleme süresi doldu)."""
+    run.status = TaskRun.STATUS_FAILED
+    run.error = error
+    run.finished_at = timezone.now()
+    run.save(update_fields=["status", "error", "finished_at"])
+    skip_downstream(run)
+
+
+def execute_run(run, celery_task_id=""):
+    """
+    TaskRun'ı çalıştırır, süre/durum bilgisini yazar.
+    Hata veya zaman aşımında sonraki katmanları atlar ve hatayı yeniden fırlatır (zincir durur).
+    """
+    scheduled = run.scheduled_task
+    now = timezone.now()
+    run.status = TaskRun.STATUS_RUNNING
+    run.started_at = now
+    run.wait_time = round((now - run.created_at).total_seconds(), 3)
+    run.celery_task_id = celery_task_id or ""
+    run.save(update_fields=["status", "started_at", "wait_time", "celery_task_id"])
+
+    started = time.monotonic()
+    try:
+        func = import_string(scheduled.task.function_path)
+        func(**scheduled.parameters)
+    except SoftTimeLimitExceeded:
+        logger.error(f"⏱️ Görev süre sınırını aştı: {scheduled.name} (run={run.id})")
+        _finish(run, TaskRun.STATUS_TIMEOUT, started, "Süre sınırı aşıldı.")
+        skip_downstream(run)
+        raise
+    except Exception:
+        logger.exception(f"🔥 Görev çalıştırılırken hata oluştu: {scheduled.name} (run={run.id})")
+        _finish(run, TaskRun.STATUS_FAILED, started, traceback.format_exc())
+        skip_downstream(run)
+        raise
+
+    _finish(run, TaskRun.STATUS_SUCCESS, started)
+    ScheduledTask.objects.filter(id=scheduled.id).update(last_run_at=run.finished_at)
+
+
+def reap_stale_runs():
+    """
+    Sert süre sınırını (veya worker çökmesini) aşıp hâlâ RUNNING görünen çalıştırmaları TIMEOUT,
+    aynı grafikte bekleyen sonraki katmanları SKIPPED yapar. Kapatılan çalıştırma sayısını döndürür.
+    """
+    now = timezone.now()
+    reaped = 0
+    for run in TaskRun.objects.select_related("scheduled_task__task").filter(status=TaskRun.STATUS_RUNNING):
+        limit = run.scheduled_task.task.timeout or settings.CELERY_TASK_TIME_LIMIT
+        if run.started_at and run.started_at + timedelta(seconds=limit + HARD_LIMIT_MARGIN * 2) > now:
+            continue
+        # Koşullu güncelleme: bu arada kendi bitişini yazmış çalıştırmaya dokunma
+        updated = TaskRun.objects.filter(id=run.id, status=TaskRun.STATUS_RUNNING).update(
+            status=TaskRun.STATUS_TIMEOUT,
+            error="Worker görevi süre sınırında sonlandırdı (veya çöktü).",
+            finished_at=now,
+        )
+        if updated:
+            logger.error(f"⏱️ Sonlandırılmış çalıştırma kapatıldı: {run.scheduled_task.name} (run={run.id})")
+            skip_downstream(run)
+            reaped += 1
+    return reaped
@@ -0,0 +1,48 @@
+# backend/tunainssupplierpayment/utilities/sync_spec.py
+from datetime import datetime
+
+from loguru import logger
+
+from hanadbcon.services.sync_engine import SyncSpec
+from ..models.models import SupplierPayment
+from ..api.closinginvoice_view import SupplierPaymentSimulation
+
+
+def _is_buffer(row):
+    """Cari yıl dışındaki belgeler buffer (devreden) kaydı sayılır."""
+    return str(row['BELGE_TARIH']).split('-')[0] != str(datetime.now().year)
+
+
+def _update_closing_invoices(result):
+    """Kapanış faturalarını, senkronizasyonla aynı transaction içinde günceller."""
+    if not (result.created or result.updated or result.deleted):
+        logger.info("Değişiklik yok, kapanış faturaları yeniden hesaplanmadı.")
+        return
+    logger.info("Kapanış faturaları güncelleniyor...")
+    simulation = SupplierPaymentSimulation()
+    simulation.process_transactions()
+    simulation.save_closing_invoices()
+    logger.info("Kapanış faturaları güncellendi.")
+
+
+SUPPLIER_PAYMENT_SYNC = SyncSpec(
+    name='tunainssupplierpayment',
+    query_name='tunainssupplierpayment',
+    model=SupplierPayment,
+    natural_key=('belge_no', 'cari_kod', 'belge_tarih'),
+    field_map={
+        'belge_no': 'BELGE_NO',
+        'cari_kod': 'CARI_KOD',
+        'cari_ad': 'CARI_AD',
+        'belge_tarih': 'BELGE_TARIH',
+        'iban': 'IBAN',
+        'odemekosulu': 'ODEMEKOSULU',
+        'borc': 'BORC',
+        'alacak': 'ALACAK',
+        'is_buffer': _is_buffer,
+    },
+    json_compatible=True,
+    progress_group='supplierpayment_group',
+    progress_type='supplierpayment_message',
+    after_write=_update_closing_invoices,
+)
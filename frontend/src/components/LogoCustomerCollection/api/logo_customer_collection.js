@@ -44,11 +44,26 @@ export const fetchLastUpdated = async () => {
   }
 };
 
+/**
+ * Arka plandaki senkron + yaşlandırma görevi bitene kadar last-updated uç noktasını yoklar.
+ * Görev bittiğinde son bilgiyi, süre dolarsa null döner.
+ */
+export const waitForRefresh = async ({ interval = 2000, timeout = 120000 } = {}) => {
+  const deadline = Date.now() + timeout;
+  while (Date.now() < deadline) {
+    const info = await fetchLastUpdated();
+    if (!info.refreshInProgress) return info;
+    await new Promise((resolve) => setTimeout(resolve, interval));
+  }
+  return null;
+};
+
 /**
  * Ortak export objesi
  */
 export const logoCustomerCollectionAPI = {
   fetchCustomerAgingSummary,
   fetchLogoData,
-  fetchLastUpdated
+  fetchLastUpdated,
+  waitForRefresh
 };
@@ -4,6 +4,7 @@ import {
   fetchCustomerAgingSummary,
   fetchLogoData,
   fetchLastUpdated,
+  waitForRefresh,
 } from '../api/logo_customer_collection';
 
 const useLogoCustomerCollection = () => {
@@ -42,7 +43,8 @@ const useLogoCustomerCollection = () => {
   const fetchLiveSummary = useCallback(async () => {
     setLoading(true); setError(null);
     try {
-      await fetchLogoData();          // Logo DB’den senkron
+      await fetchLogoData();          // Logo DB’den senkron (arka planda başlar)
+      await waitForRefresh();         // değişen carilerin yaşlandırması bitene kadar bekle
       // ✔ Senkrondan sonra her iki veriyi de tazele
       await fetchLocalSummary();
       await fetchLastUpdatedData();
@@ -1,10 +1,10 @@
 // frontend/src/components/LogoCustomerCollection/hooks/useLogoCustomerCollectionProgress.js
 import { useState } from 'react';
-import { fetchLogoData } from '../api/logo_customer_collection';
+import { fetchLogoData, waitForRefresh } from '../api/logo_customer_collection';
 
 /**
  * Logo DB’den canlı veri senkronunu tetikler.
- * Senkron bittiğinde true döner (200 OK) – Container yeniden özet veriyi çeker.
+ * Senkron arka planda bittiğinde true döner – Container yeniden özet veriyi çeker.
  */
 const useLogoCustomerCollectionProgress = () => {
   const [loading, setLoading]   = useState(false);
@@ -17,6 +17,7 @@ const useLogoCustomerCollectionProgress = () => {
     setMessage('');
     try {
       const res = await fetchLogoData();          // /backend/.../fetch-logo-data/
+      await waitForRefresh();
       setMessage(res.message || 'Veri güncellendi');
       return true;                                //  ⬅️ container için sinyal
     } catch (e) {